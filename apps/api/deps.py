@@ -9,11 +9,24 @@ from packages.core.storage import EvidenceStore, LocalEvidenceStore, MinioEviden
 
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker | None = None
+_temporal_client: Client | None = None
 
 
 async def get_temporal_client(settings: Settings | None = None) -> Client:
-    cfg = settings or get_settings()
-    return await Client.connect(cfg.temporal_address, namespace=cfg.temporal_namespace)
+    """Shared Temporal client; connects once instead of per request."""
+    global _temporal_client
+    if _temporal_client is None:
+        cfg = settings or get_settings()
+        _temporal_client = await Client.connect(
+            cfg.temporal_address, namespace=cfg.temporal_namespace
+        )
+    return _temporal_client
+
+
+def set_temporal_client(client: Client | None) -> None:
+    """Use an existing client (e.g. a Temporal test environment) for API calls."""
+    global _temporal_client
+    _temporal_client = client
 
 
 async def get_db_session_factory(settings: Settings | None = None) -> async_sessionmaker:
@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
+import hashlib
+import hmac
+import json
+
 import cv2
 import numpy as np
-from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, UploadFile
+from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, Request, UploadFile
 from temporalio.client import Client
 from temporalio.exceptions import TemporalError, WorkflowAlreadyStartedError
 
 from apps.api.deps import get_db_session_factory, get_evidence_store, get_temporal_client
 from apps.api.schemas import (
     ApproveRequest,
+    StartCampaignRequest,
+    StartCampaignResponse,
     StartChangeRequest,
     StartChangeResponse,
     UploadEvidenceResponse,
 )
+from apps.worker.workflows.campaign_workflow import CampaignChange, CampaignInput, CampaignWorkflow
 from apps.worker.workflows.change_execution_workflow import ChangeExecutionWorkflow, WorkflowInput
 from packages.core.config import get_settings
 from packages.core.kafka import KafkaEventBus, set_kafka_bus, get_kafka_bus, INFRASENTINEL_TOPICS
@@ -29,6 +36,12 @@ from packages.core.runtime import (
 from packages.core.storage import MinioEvidenceStore
 from packages.core.vision.quality import compute_image_quality
 from packages.cv.guidance import retake_guidance
+from services.mcp_netbox.src.cache import get_cmdb_cache
+from services.mcp_netbox.src.invalidation import (
+    apply_invalidation,
+    check_invalidation_backend,
+    publish_invalidation,
+)
 
 app = FastAPI(title="InfraSentinel API")
 
@@ -54,6 +67,7 @@ def _require_read_auth(x_infra_key: str | None = Header(None, alias="X-INFRA-KEY
 @app.on_event("startup")
 async def startup() -> None:
     settings = get_settings()
+    check_invalidation_backend(settings)
     settings.local_evidence_dir.mkdir(parents=True, exist_ok=True)
     configure_observability(settings)
     await get_db_session_factory(settings)
@@ -103,7 +117,11 @@ async def start_change(req: StartChangeRequest, _: None = Depends(_require_api_k
     try:
         handle = await client.start_workflow(
             ChangeExecutionWorkflow.run,
-            WorkflowInput(change_id=req.change_id, scenario=scenario),
+            WorkflowInput(
+                change_id=req.change_id,
+                scenario=scenario,
+                cv_task_queue=settings.temporal_cv_task_queue,
+            ),
             id=workflow_id,
             task_queue=settings.temporal_task_queue,
         )
@@ -205,6 +223,138 @@ async def approve_change(change_id: str, req: ApproveRequest, _: None = Depends(
     return {"ok": True, "change_id": change_id, "step_id": req.step_id}
 
 
+@app.get("/v1/changes/{change_id}/current-step")
+async def get_current_step(change_id: str, _: None = Depends(_require_read_auth)) -> dict:
+    """Step the workflow is on and the status it is waiting in (e.g. needs_retake, blocked)."""
+    client = await get_temporal_client(get_settings())
+    handle = client.get_workflow_handle(f"change-{change_id}")
+    try:
+        current = await handle.query(ChangeExecutionWorkflow.get_current_step)
+    except TemporalError as e:
+        raise HTTPException(status_code=404, detail="Change not started") from e
+    if not current:
+        raise HTTPException(status_code=404, detail="Change has no active step yet")
+    return current
+
+
+@app.post("/v1/campaigns/start", response_model=StartCampaignResponse)
+async def start_campaign(
+    req: StartCampaignRequest, _: None = Depends(_require_api_key)
+) -> StartCampaignResponse:
+    """Start one CampaignWorkflow that fans out a child workflow per change."""
+    settings = get_settings()
+    change_ids = [item.change_id for item in req.changes]
+    duplicates = sorted({cid for cid in change_ids if change_ids.count(cid) > 1})
+    if duplicates:
+        raise HTTPException(status_code=422, detail=f"Duplicate change_id(s): {', '.join(duplicates)}")
+
+    default_scenario = settings.scenario or "CHG-001_A"
+    client = await get_temporal_client(settings)
+    workflow_id = f"campaign-{req.campaign_id}"
+    try:
+        handle = await client.start_workflow(
+            CampaignWorkflow.run,
+            CampaignInput(
+                campaign_id=req.campaign_id,
+                changes=[
+                    CampaignChange(change_id=item.change_id, scenario=item.scenario or default_scenario)
+                    for item in req.changes
+                ],
+                max_concurrency=req.max_concurrency,
+                cv_task_queue=settings.temporal_cv_task_queue,
+            ),
+            id=workflow_id,
+            task_queue=settings.temporal_task_queue,
+        )
+    except WorkflowAlreadyStartedError as e:
+        raise HTTPException(
+            status_code=409, detail=f"Campaign {req.campaign_id} already started."
+        ) from e
+    return StartCampaignResponse(
+        workflow_id=workflow_id,
+        run_id=handle.result_run_id or "",
+        total_changes=len(req.changes),
+    )
+
+
+@app.get("/v1/campaigns/{campaign_id}")
+async def get_campaign(campaign_id: str, _: None = Depends(_require_read_auth)) -> dict:
+    client = await get_temporal_client(get_settings())
+    handle = client.get_workflow_handle(f"campaign-{campaign_id}")
+    try:
+        progress = await handle.query(CampaignWorkflow.get_progress)
+    except TemporalError as e:
+        raise HTTPException(status_code=404, detail="Campaign not found") from e
+    return {"campaign_id": campaign_id, **progress}
+
+
+@app.post("/v1/campaigns/{campaign_id}/pause")
+async def pause_campaign(campaign_id: str, _: None = Depends(_require_api_key)) -> dict:
+    client = await get_temporal_client(get_settings())
+    handle = client.get_workflow_handle(f"campaign-{campaign_id}")
+    try:
+        await handle.signal(CampaignWorkflow.pause)
+    except TemporalError as e:
+        raise HTTPException(status_code=404, detail="Campaign not found") from e
+    return {"ok": True, "campaign_id": campaign_id, "paused": True}
+
+
+@app.post("/v1/campaigns/{campaign_id}/resume")
+async def resume_campaign(campaign_id: str, _: None = Depends(_require_api_key)) -> dict:
+    client = await get_temporal_client(get_settings())
+    handle = client.get_workflow_handle(f"campaign-{campaign_id}")
+    try:
+        await handle.signal(CampaignWorkflow.resume)
+    except TemporalError as e:
+        raise HTTPException(status_code=404, detail="Campaign not found") from e
+    return {"ok": True, "campaign_id": campaign_id, "paused": False}
+
+
+@app.post("/v1/cmdb/webhook")
+async def netbox_webhook(
+    request: Request,
+    x_hook_signature: str | None = Header(None, alias="X-Hook-Signature"),
+    x_infra_key: str | None = Header(None, alias="X-INFRA-KEY"),
+) -> dict:
+    """NetBox change notification: drop cached lookups and cable paths it touches.
+
+    Applied here and published to the worker and MCP server processes (redis
+    backend only; see services.mcp_netbox.src.invalidation). With
+    NETBOX_WEBHOOK_SECRET set, the body must carry NetBox's HMAC-SHA512
+    X-Hook-Signature; otherwise the usual X-INFRA-KEY write auth applies.
+    """
+    settings = get_settings()
+    body = await request.body()
+    if settings.netbox_webhook_secret:
+        expected = hmac.new(
+            settings.netbox_webhook_secret.encode("utf-8"), body, hashlib.sha512
+        ).hexdigest()
+        if not x_hook_signature or not hmac.compare_digest(expected, x_hook_signature):
+            raise HTTPException(status_code=401, detail="Invalid or missing X-Hook-Signature")
+    else:
+        _require_api_key(x_infra_key)
+    try:
+        payload = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail="Webhook body must be JSON") from e
+    payload = payload if isinstance(payload, dict) else {}
+    result = await apply_invalidation(payload)
+    broadcast = await publish_invalidation(payload)
+    return {"ok": True, **result, "broadcast": broadcast}
+
+
+@app.get("/v1/cmdb/cache")
+async def cmdb_cache_stats(_: None = Depends(_require_read_auth)) -> dict:
+    """Hit, negative-hit, expiry and hit-age counters of this process's CMDB cache."""
+    cache = get_cmdb_cache()
+    return {
+        "backend": cache.backend,
+        "ttl": cache.ttl,
+        "negative_ttl": cache.negative_ttl,
+        **cache.stats.snapshot(),
+    }
+
+
 @app.get("/v1/changes/{change_id}/steps/{step_id}/prompt")
 async def get_step_prompt_endpoint(
     change_id: str, step_id: str, _: None = Depends(_require_read_auth)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from packages.core.models.legacy import EvidenceRef
 
@@ -26,3 +26,20 @@ class UploadEvidenceResponse(BaseModel):
 class ApproveRequest(BaseModel):
     step_id: str
     approver: str
+
+
+class CampaignChangeItem(BaseModel):
+    change_id: str
+    scenario: str | None = None
+
+
+class StartCampaignRequest(BaseModel):
+    campaign_id: str
+    changes: list[CampaignChangeItem] = Field(min_length=1)
+    max_concurrency: int = Field(default=10, ge=1)
+
+
+class StartCampaignResponse(BaseModel):
+    workflow_id: str
+    run_id: str
+    total_changes: int
@@ -0,0 +1 @@
+"""Load generator: simulated technicians against API + Temporal workers."""
@@ -0,0 +1,363 @@
+"""Simulate concurrent technicians against the API and Temporal workers.
+
+Runs the FastAPI app in-process (httpx ASGI transport), the I/O and CV workers with
+the in-process MCP adapters, and Temporal's time-skipping test environment (or an
+existing server via --temporal-address). Reports p50/p95/p99 per API endpoint and
+per activity, plus workflows completed per second.
+
+    python -m apps.loadgen.main --changes 200 --technicians 25 --rate 10 --mix A=0.6,B=0.2,C=0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import httpx
+from temporalio import activity
+from temporalio.client import Client
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import (
+    ActivityInboundInterceptor,
+    ExecuteActivityInput,
+    Interceptor,
+    SharedStateManager,
+    Worker,
+)
+
+from apps.loadgen.scenarios import (
+    BAD_QUALITY_EVIDENCE,
+    TECHNICIAN_SCRIPTS,
+    Approve,
+    Upload,
+    WaitFor,
+    assign_scenarios,
+    parse_mix,
+)
+from packages.core.metrics import LatencyRecorder
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="InfraSentinel load generator.")
+    parser.add_argument("--changes", type=int, default=50, help="Total changes to execute")
+    parser.add_argument("--technicians", type=int, default=10, help="Concurrent technicians")
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="Change arrivals per second (0 = all at once)"
+    )
+    parser.add_argument("--mix", default="A=0.6,B=0.2,C=0.2", help="Scenario weights")
+    parser.add_argument(
+        "--bad-photo-rate",
+        type=float,
+        default=0.1,
+        help="Probability a technician first uploads a blurry photo the API rejects",
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Seconds between polls")
+    parser.add_argument("--step-timeout", type=float, default=60.0, help="Max seconds per wait")
+    parser.add_argument("--cv-executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--cv-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--temporal-address", default=None, help="Use this server instead of time-skipping env"
+    )
+    parser.add_argument("--runtime-dir", default=None, help="Runtime dir (default: temp dir)")
+    parser.add_argument("--run-id", default=None, help="Change ID prefix (default: timestamp)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", default=None, help="Write report JSON here")
+    return parser.parse_args(argv)
+
+
+class ActivityTimingInterceptor(Interceptor):
+    """Record activity execution time (including executor queueing) per activity type."""
+
+    def __init__(self, recorder: LatencyRecorder) -> None:
+        self._recorder = recorder
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _ActivityTimingInbound(next, self._recorder)
+
+
+class _ActivityTimingInbound(ActivityInboundInterceptor):
+    def __init__(self, next: ActivityInboundInterceptor, recorder: LatencyRecorder) -> None:
+        super().__init__(next)
+        self._recorder = recorder
+
+    async def execute_activity(self, input: ExecuteActivityInput) -> Any:
+        with self._recorder.timed(f"activity {activity.info().activity_type}"):
+            return await self.next.execute_activity(input)
+
+
+class Technician:
+    """Drives one change at a time through the API following a scenario script."""
+
+    def __init__(
+        self,
+        api: httpx.AsyncClient,
+        temporal: Client,
+        recorder: LatencyRecorder,
+        args: argparse.Namespace,
+        rng: random.Random,
+    ) -> None:
+        self._api = api
+        self._temporal = temporal
+        self._recorder = recorder
+        self._args = args
+        self._rng = rng
+
+    async def _call(self, method: str, route: str, url: str, **kwargs: Any) -> httpx.Response:
+        start = time.perf_counter()
+        resp = await self._api.request(method, url, **kwargs)
+        self._recorder.record(
+            f"api {method} {route}", time.perf_counter() - start, ok=resp.status_code < 500
+        )
+        return resp
+
+    async def _upload(self, change_id: str, step_id: str, evidence_id: str) -> dict:
+        resp = await self._call(
+            "POST",
+            "/v1/evidence/upload",
+            "/v1/evidence/upload",
+            data={"change_id": change_id, "step_id": step_id, "evidence_id": evidence_id},
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _wait_for(self, change_id: str, step_id: str, status: str) -> None:
+        deadline = time.monotonic() + self._args.step_timeout
+        while time.monotonic() < deadline:
+            resp = await self._call(
+                "GET",
+                "/v1/changes/{change_id}/current-step",
+                f"/v1/changes/{change_id}/current-step",
+            )
+            if resp.status_code == 200:
+                current = resp.json()
+                if current.get("step_id") == step_id and current.get("status") == status:
+                    return
+            await asyncio.sleep(self._args.poll_interval)
+        raise TimeoutError(f"{change_id}: {step_id} never reached {status}")
+
+    async def run_change(self, change_id: str, scenario: str) -> None:
+        started = time.perf_counter()
+        resp = await self._call(
+            "POST",
+            "/v1/changes/start",
+            "/v1/changes/start",
+            json={"change_id": change_id, "scenario": scenario},
+        )
+        resp.raise_for_status()
+
+        for action in TECHNICIAN_SCRIPTS[scenario]:
+            if isinstance(action, Upload):
+                if self._rng.random() < self._args.bad_photo_rate:
+                    out = await self._upload(change_id, action.step_id, BAD_QUALITY_EVIDENCE)
+                    if out.get("status") != "needs_retake":
+                        raise RuntimeError(f"{change_id}: blurry photo was not rejected")
+                await self._upload(change_id, action.step_id, action.evidence_id)
+            elif isinstance(action, WaitFor):
+                await self._wait_for(change_id, action.step_id, action.status)
+            elif isinstance(action, Approve):
+                resp = await self._call(
+                    "POST",
+                    "/v1/changes/{change_id}/approve",
+                    f"/v1/changes/{change_id}/approve",
+                    json={"step_id": action.step_id, "approver": action.approver},
+                )
+                resp.raise_for_status()
+
+        await asyncio.wait_for(
+            self._temporal.get_workflow_handle(f"change-{change_id}").result(),
+            timeout=self._args.step_timeout,
+        )
+        self._recorder.record(f"workflow {scenario}", time.perf_counter() - started)
+        resp = await self._call(
+            "GET",
+            "/v1/changes/{change_id}/proofpack",
+            f"/v1/changes/{change_id}/proofpack",
+        )
+        resp.raise_for_status()
+
+
+def _cv_executor(args: argparse.Namespace) -> tuple[Executor, SharedStateManager | None, Any]:
+    if args.cv_executor == "thread":
+        return ThreadPoolExecutor(max_workers=args.cv_workers), None, None
+    from apps.worker.activities_cv import init_cv_process
+
+    manager = multiprocessing.Manager()
+    executor = ProcessPoolExecutor(max_workers=args.cv_workers, initializer=init_cv_process)
+    return executor, SharedStateManager.create_from_multiprocessing(manager), manager
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    # Runtime JSON and the API/worker modules read env at import / first use.
+    os.environ.setdefault(
+        "INFRASENTINEL_RUNTIME_DIR", args.runtime_dir or tempfile.mkdtemp(prefix="loadgen-")
+    )
+    from apps.api.deps import set_temporal_client
+    from apps.api.main import app
+    from apps.worker.main import CV_ACTIVITIES, IO_ACTIVITIES
+    from apps.worker.workflows.campaign_workflow import CampaignWorkflow
+    from apps.worker.workflows.change_execution_workflow import ChangeExecutionWorkflow
+    from packages.core.config import get_settings
+
+    settings = get_settings()
+    mix = parse_mix(args.mix)
+    scenarios = assign_scenarios(args.changes, mix, args.seed)
+    run_id = args.run_id or f"LOAD-{int(time.time())}"
+    recorder = LatencyRecorder()
+    interceptors = [ActivityTimingInterceptor(recorder)]
+
+    if args.temporal_address:
+        env = WorkflowEnvironment.from_client(
+            await Client.connect(args.temporal_address, namespace=settings.temporal_namespace)
+        )
+    else:
+        env = await WorkflowEnvironment.start_time_skipping()
+
+    executor, shared_state, manager = _cv_executor(args)
+    completed = 0
+    failures: list[str] = []
+    try:
+        async with env:
+            set_temporal_client(env.client)
+            io_worker = Worker(
+                env.client,
+                task_queue=settings.temporal_task_queue,
+                workflows=[ChangeExecutionWorkflow, CampaignWorkflow],
+                activities=IO_ACTIVITIES,
+                interceptors=interceptors,
+                max_concurrent_activities=settings.worker_io_max_concurrent_activities,
+            )
+            cv_worker = Worker(
+                env.client,
+                task_queue=settings.temporal_cv_task_queue,
+                activities=CV_ACTIVITIES,
+                activity_executor=executor,
+                shared_state_manager=shared_state,
+                interceptors=interceptors,
+                max_concurrent_activities=args.cv_workers,
+            )
+            headers = {"X-INFRA-KEY": settings.infra_api_key} if settings.infra_api_key else {}
+            queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue()
+
+            async def arrivals() -> None:
+                for i, scenario in enumerate(scenarios):
+                    await queue.put((f"{run_id}-{i:05d}", scenario))
+                    if args.rate > 0:
+                        await asyncio.sleep(1.0 / args.rate)
+                for _ in range(args.technicians):
+                    await queue.put(None)
+
+            async def technician_loop(tech: Technician) -> None:
+                nonlocal completed
+                while (job := await queue.get()) is not None:
+                    change_id, scenario = job
+                    try:
+                        await tech.run_change(change_id, scenario)
+                        completed += 1
+                    except Exception as exc:
+                        failures.append(f"{change_id} ({scenario}): {exc!r}")
+
+            # Technicians wait on signals, so never let the test server skip past
+            # the workflows' evidence/approval timeouts.
+            with env.auto_time_skipping_disabled():
+                async with (
+                    io_worker,
+                    cv_worker,
+                    httpx.AsyncClient(
+                        transport=httpx.ASGITransport(app=app),
+                        base_url="http://loadgen",
+                        headers=headers,
+                        timeout=args.step_timeout,
+                    ) as api,
+                ):
+                    technicians = [
+                        Technician(api, env.client, recorder, args, random.Random(args.seed + n))
+                        for n in range(args.technicians)
+                    ]
+                    started = time.perf_counter()
+                    await asyncio.gather(arrivals(), *(technician_loop(t) for t in technicians))
+                    wall = time.perf_counter() - started
+    finally:
+        set_temporal_client(None)
+        executor.shutdown(wait=False, cancel_futures=True)
+        if manager is not None:
+            manager.shutdown()
+
+    return build_report(recorder, args, completed, failures, wall)
+
+
+def build_report(
+    recorder: LatencyRecorder,
+    args: argparse.Namespace,
+    completed: int,
+    failures: list[str],
+    wall_seconds: float,
+) -> dict:
+    summary = recorder.summary()
+
+    def section(prefix: str) -> dict:
+        return {k[len(prefix) :]: v for k, v in summary.items() if k.startswith(prefix)}
+
+    return {
+        "config": {
+            "changes": args.changes,
+            "technicians": args.technicians,
+            "rate": args.rate,
+            "mix": args.mix,
+            "cv_executor": args.cv_executor,
+            "cv_workers": args.cv_workers,
+            "temporal": args.temporal_address or "time-skipping",
+        },
+        "wall_seconds": round(wall_seconds, 3),
+        "workflows_completed": completed,
+        "workflows_failed": len(failures),
+        "workflows_per_second": round(completed / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "endpoints": section("api "),
+        "activities": section("activity "),
+        "workflows": section("workflow "),
+        "failures": failures[:20],
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"completed={report['workflows_completed']} failed={report['workflows_failed']} "
+        f"wall={report['wall_seconds']}s throughput={report['workflows_per_second']} wf/s",
+    ]
+    for title in ("endpoints", "activities", "workflows"):
+        rows = report[title]
+        if not rows:
+            continue
+        width = max(len(name) for name in rows)
+        lines.append("")
+        lines.append(f"{title:<{width}}  {'count':>6} {'err':>4} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9}")
+        for name, row in rows.items():
+            lines.append(
+                f"{name:<{width}}  {row['count']:>6} {row['errors']:>4} "
+                f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+            )
+    for failure in report["failures"]:
+        lines.append(f"FAILED {failure}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run_load(args))
+    print(format_report(report))
+    if args.json_out:
+        Path(args.json_out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Technician scripts per scenario fixture (what a technician does, in order)."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Upload:
+    step_id: str
+    evidence_id: str
+
+
+@dataclass(frozen=True)
+class WaitFor:
+    """Poll GET /v1/changes/{id}/current-step until the step reaches status."""
+
+    step_id: str
+    status: str
+
+
+@dataclass(frozen=True)
+class Approve:
+    step_id: str
+    approver: str = "loadgen-supervisor"
+
+
+Action = Upload | WaitFor | Approve
+
+# Blurry fixture rejected by the API quality check before any workflow signal.
+BAD_QUALITY_EVIDENCE = "EVID-002-BADQUALITY"
+
+TECHNICIAN_SCRIPTS: dict[str, list[Action]] = {
+    # Happy path.
+    "CHG-001_A": [
+        Upload("S1", "EVID-001"),
+        WaitFor("S3", "awaiting_evidence"),
+        Upload("S3", "EVID-003"),
+    ],
+    # Wrong port on S1 -> CMDB mismatch -> BLOCKED -> supervisor approval.
+    "CHG-001_B": [
+        Upload("S1", "EVID-002"),
+        WaitFor("S1", "blocked"),
+        Approve("S1"),
+        WaitFor("S3", "awaiting_evidence"),
+        Upload("S3", "EVID-003"),
+    ],
+    # Low CV confidence on S1 -> NEEDS_RETAKE -> retake photo.
+    "CHG-001_C": [
+        Upload("S1", "EVID-002"),
+        WaitFor("S1", "needs_retake"),
+        Upload("S1", "EVID-002-RETAKE"),
+        WaitFor("S3", "awaiting_evidence"),
+        Upload("S3", "EVID-003"),
+    ],
+}
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse 'A=0.6,B=0.2,C=0.2' (or full scenario names) into normalized weights."""
+    weights: dict[str, float] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, raw = part.partition("=")
+        name = name.strip()
+        scenario = name if name in TECHNICIAN_SCRIPTS else f"CHG-001_{name.upper()}"
+        if scenario not in TECHNICIAN_SCRIPTS:
+            raise ValueError(f"Unknown scenario in mix: {name!r}")
+        weights[scenario] = float(raw) if raw else 1.0
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Scenario mix must have a positive total weight")
+    return {k: v / total for k, v in weights.items()}
+
+
+def assign_scenarios(n: int, mix: dict[str, float], seed: int) -> list[str]:
+    """Deterministic scenario per change for a run (same seed, same workload)."""
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    return rng.choices(names, weights=weights, k=n)
@@ -9,6 +9,7 @@ from packages.agents.cmdb_validator import CMDBValidatorAgent
 from packages.agents.mop_compliance import MOPComplianceAgent
 from packages.agents.vision_verifier import VisionVerifierAgent
 from packages.core.audit import make_audit_event
+from packages.core.config import get_settings
 from packages.core.db import persist_audit_event, persist_step_result
 from packages.core.models.legacy import (
     CVCableTagResult,
@@ -20,30 +21,38 @@ from packages.core.models.legacy import (
     StepTypeLegacy,
 )
 from packages.mcp.client import MCPToolRouter
-from services.mcp_camera.handlers import CameraHandlers
-from services.mcp_cv.handlers import CVHandlers
-from services.mcp_netbox.handlers import NetboxHandlers
-from services.mcp_ticketing.handlers import TicketingHandlers
+from packages.mcp.middleware import default_middleware
+from services.registry import get_registry
 
 
 class WorkerDependencies:
     def __init__(self, session_factory: async_sessionmaker):
         self.session_factory = session_factory
-        camera = CameraHandlers()
-        cv = CVHandlers()
-        netbox = NetboxHandlers()
-        ticketing = TicketingHandlers()
-        self.tools = MCPToolRouter(
-            camera_capture_frame=camera.capture_frame,
-            camera_store_evidence=camera.store_evidence,
-            cv_read_port_label=cv.read_port_label,
-            cv_read_cable_tag=cv.read_cable_tag,
-            netbox_get_expected_mapping=netbox.get_expected_mapping,
-            netbox_validate_observed=netbox.validate_observed,
-            ticketing_get_change=ticketing.get_change,
-            ticketing_post_step_result=ticketing.post_step_result,
-            ticketing_request_approval=ticketing.request_approval,
-        )
+        if get_settings().infra_mcp_transport.lower() != "in-process":
+            # Tools on remote MCP servers (stdio child processes or streamable HTTP).
+            self.tools = MCPToolRouter.from_settings()
+        else:
+            registry = get_registry()
+            camera = registry.camera()
+            cv = registry.cv()
+            netbox = registry.netbox()
+            ticketing = registry.ticketing()
+            self.tools = MCPToolRouter(
+                camera_capture_frame=camera.capture_frame,
+                camera_store_evidence=camera.store_evidence,
+                cv_read_port_label=cv.read_port_label,
+                cv_read_cable_tag=cv.read_cable_tag,
+                netbox_get_expected_mapping=netbox.get_expected_mapping,
+                netbox_validate_observed=netbox.validate_observed,
+                ticketing_get_change=ticketing.get_change,
+                ticketing_post_step_result=ticketing.post_step_result,
+                ticketing_request_approval=ticketing.request_approval,
+                netbox_validate_observed_batch=netbox.validate_observed_batch,
+                camera_upload_begin=camera.upload_begin,
+                camera_upload_chunk=camera.upload_chunk,
+                camera_upload_commit=camera.upload_commit,
+                middleware=default_middleware(get_settings()),
+            )
         self.mop_agent = MOPComplianceAgent()
         self.vision_agent = VisionVerifierAgent()
         self.cmdb_agent = CMDBValidatorAgent()
@@ -99,8 +108,7 @@ async def process_step(change_id: str, step: dict, evidence_id: str | None = Non
         if evidence_id is None
         else EvidenceRef(evidence_id=evidence_id, uri=f"local://{evidence_id}", metadata={})
     )
-    port = await deps.tools.read_port_label(evidence_id=evidence.evidence_id)
-    cable = await deps.tools.read_cable_tag(evidence_id=evidence.evidence_id)
+    port, cable = await deps.tools.read_labels(evidence_id=evidence.evidence_id)
     port_core = CVPortLabelResult(
         panel_id=port.panel_id or "UNKNOWN",
         port_label=port.port_label or "UNKNOWN",
@@ -0,0 +1,130 @@
+"""CPU-bound CV activities served from the dedicated CV task queue.
+
+These activities are synchronous so the worker can run them on a process pool
+(see apps/worker/main.py). OCR and OpenCV work then never blocks the event loop
+that serves the I/O activities. Each pool process gets its CV handlers from its
+own handler registry, warmed by the pool initializer, and reuses them for every
+task it executes.
+"""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+from opentelemetry import trace
+from temporalio import activity
+
+from packages.core.config import get_settings
+from packages.core.fixtures.evidence import get_evidence_bytes
+from packages.core.vision.quality import compute_image_quality
+from packages.cv.guidance import retake_guidance
+from services.mcp_cv.handlers import CVHandlers
+from services.registry import get_registry
+
+_tracer = trace.get_tracer(__name__)
+
+
+def init_cv_process() -> None:
+    """ProcessPoolExecutor initializer: configure tracing and warm default handlers."""
+    from packages.core.observability import configure_observability
+
+    settings = get_settings()
+    configure_observability(settings)
+    get_registry().warm(["cv"])
+
+
+def _get_cv_handlers() -> CVHandlers:
+    return get_registry().cv()
+
+
+@activity.defn
+def activity_quality_gate(
+    change_id: str,
+    step_id: str,
+    evidence_id: str,
+) -> dict:
+    """Compute quality metrics. Returns pass, metrics, guidance, tool_call."""
+    settings = get_settings()
+    data = get_evidence_bytes(
+        evidence_id,
+        change_id=change_id,
+        local_evidence_dir=settings.local_evidence_dir,
+    )
+    if not data:
+        return {
+            "pass": False,
+            "metrics": None,
+            "guidance": ["Evidence file not found; please upload again."],
+            "tool_call": {"tool": "quality_gate", "error": "evidence_not_found", "decision": "needs_retake"},
+        }
+    arr = np.frombuffer(data, dtype=np.uint8)
+    img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+    if img is None:
+        return {
+            "pass": False,
+            "metrics": None,
+            "guidance": ["Invalid image; please upload a valid photo."],
+            "tool_call": {"tool": "quality_gate", "error": "decode_failed", "decision": "needs_retake"},
+        }
+
+    with _tracer.start_as_current_span("quality_gate") as span:
+        metrics = compute_image_quality(
+            img,
+            blur_min=settings.blur_min,
+            brightness_min=settings.brightness_min,
+            glare_max=settings.glare_max,
+            min_w=settings.min_width,
+            min_h=settings.min_height,
+        )
+        span.set_attribute("quality.blur_score", metrics.blur_score)
+        span.set_attribute("quality.brightness", metrics.brightness)
+        span.set_attribute("quality.glare_score", metrics.glare_score)
+        span.set_attribute("quality.is_too_blurry", metrics.is_too_blurry)
+        span.set_attribute("quality.is_too_dark", metrics.is_too_dark)
+        span.set_attribute("quality.is_too_glary", metrics.is_too_glary)
+        span.set_attribute("quality.is_low_res", metrics.is_low_res)
+
+        fail = metrics.is_too_blurry or metrics.is_too_dark or metrics.is_too_glary or metrics.is_low_res
+        if fail:
+            # QualityFailedEvent is published by activity_persist_step_and_proofpack on
+            # the I/O queue; pool processes have no Kafka producer.
+            return {
+                "pass": False,
+                "metrics": metrics.model_dump(),
+                "guidance": retake_guidance(metrics),
+                "tool_call": {
+                    "tool": "quality_gate",
+                    "metrics": metrics.model_dump(),
+                    "decision": "needs_retake",
+                },
+            }
+        return {
+            "pass": True,
+            "metrics": metrics.model_dump(),
+            "guidance": [],
+            "tool_call": {"tool": "quality_gate", "metrics": metrics.model_dump(), "decision": "pass"},
+        }
+
+
+@activity.defn
+def activity_cv_extract(
+    change_id: str, step_id: str, evidence_id: str, scenario: str
+) -> tuple[dict, dict]:
+    handlers = _get_cv_handlers()
+
+    with _tracer.start_as_current_span("ocr_extraction") as span:
+        port = handlers.read_port_label_sync(evidence_id, change_id, scenario)
+        tag = handlers.read_cable_tag_sync(evidence_id, change_id, scenario)
+        raw_text = getattr(port, "raw_text", "") or ""
+        span.set_attribute("ocr.raw_text_length", len(raw_text))
+        span.set_attribute("ocr.port_confidence", port.confidence)
+        span.set_attribute("ocr.tag_confidence", tag.confidence)
+
+    return (
+        {
+            "panel_id": port.panel_id,
+            "port_label": port.port_label,
+            "confidence": port.confidence,
+        },
+        {"cable_tag": tag.cable_tag, "confidence": tag.confidence},
+    )
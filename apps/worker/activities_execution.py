@@ -2,21 +2,23 @@
 
 from __future__ import annotations
 
-import cv2
-import numpy as np
+import logging
+from collections.abc import Callable
+
 from opentelemetry import trace
 from temporalio import activity
 
-from packages.a2a.client import A2AClient
+from packages.a2a.cache import advice_version, get_advice_cache
+from packages.a2a.client import A2AClient, get_a2a_client
+from packages.a2a.local import LocalA2AClient
 from packages.agents.cmdb import cmdb_advice
 from packages.agents.mop import mop_advice
 from packages.agents.vision import vision_advice
 from packages.core.config import get_settings
-from packages.core.fixtures.evidence import get_evidence_bytes
 from packages.core.fixtures.loaders import load_change
 from packages.core.logic.proofpack import update_proofpack
 from packages.core.models.proofpack import EvidenceRef, ProofPack
-from packages.core.models.steps import StepDefinition, StepResult
+from packages.core.models.steps import StepDefinition, StepResult, StepStatus
 from packages.core.fixtures.loaders import load_expected_mapping
 from packages.core.runtime import (
     append_step_result_log,
@@ -28,22 +30,22 @@ from packages.core.runtime import (
     set_scenario_config,
     write_approved_mapping,
 )
-from packages.core.vision.quality import compute_image_quality
-from packages.cv.guidance import retake_guidance
-from services.mcp_cv.handlers import CVHandlers
 from services.mcp_netbox.handlers import NetboxHandlers
 from services.mcp_ticketing.handlers import TicketingHandlers
+from services.registry import get_registry
 
-_cv_handlers: CVHandlers | None = None
 _netbox_handlers: NetboxHandlers | None = None
 _ticketing_handlers: TicketingHandlers | None = None
 
+logger = logging.getLogger(__name__)
 _tracer = trace.get_tracer(__name__)
+_local_agents = LocalA2AClient()
+# A2A_MODE values that ask the agents; "off" uses local advice only.
+A2A_MODES = ("http", "in-process")
 
 
-def configure_handlers(cv: CVHandlers, netbox: NetboxHandlers, ticketing: TicketingHandlers) -> None:
-    global _cv_handlers, _netbox_handlers, _ticketing_handlers
-    _cv_handlers = cv
+def configure_handlers(netbox: NetboxHandlers, ticketing: TicketingHandlers) -> None:
+    global _netbox_handlers, _ticketing_handlers
     _netbox_handlers = netbox
     _ticketing_handlers = ticketing
 
@@ -82,85 +84,47 @@ async def activity_set_scenario(change_id: str, scenario: str) -> None:
         pass
 
 
-@activity.defn
-async def activity_quality_gate(
-    change_id: str,
-    step_id: str,
-    evidence_id: str,
-) -> dict:
-    """Compute quality metrics. Returns pass, metrics, guidance, tool_call."""
+def _agent_client(agent: str) -> A2AClient | LocalA2AClient:
+    """In-process handlers (A2A_MODE=in-process) or the shared HTTP client for the agent's URL."""
     settings = get_settings()
-    data = get_evidence_bytes(
-        evidence_id,
-        change_id=change_id,
-        local_evidence_dir=settings.local_evidence_dir,
+    if settings.a2a_mode == "in-process":
+        return _local_agents
+    return get_a2a_client(getattr(settings, f"a2a_{agent}_url"))
+
+
+async def _ask_agent(agent: str, input_data: dict) -> dict | None:
+    """Output of an advisory A2A agent, or None to use local advice.
+
+    Over HTTP this goes through the shared client for the agent's URL, which
+    fails fast while that agent's circuit breaker is open.
+    """
+    try:
+        resp = await _agent_client(agent).send_async(agent, input_data, {})
+        return resp.output or {}
+    except Exception:
+        return None
+
+
+def _local_advice(agent: str, input_data: dict, advise: Callable[[dict], dict]) -> dict:
+    """Local advice for input_data, from the advice cache when the same input was seen."""
+    return get_advice_cache().wrap(agent, advise, advice_version("local"))(input_data)
+
+
+def _local_mop(input_data: dict) -> dict:
+    return mop_advice(StepDefinition.model_validate(input_data["step_def"]))
+
+
+def _local_vision(input_data: dict) -> dict:
+    return vision_advice(
+        StepDefinition.model_validate(input_data["step_def"]),
+        input_data["quality_metrics"],
+        input_data["cv_port_out"],
+        input_data["cv_tag_out"],
     )
-    if not data:
-        return {
-            "pass": False,
-            "metrics": None,
-            "guidance": ["Evidence file not found; please upload again."],
-            "tool_call": {"tool": "quality_gate", "error": "evidence_not_found", "decision": "needs_retake"},
-        }
-    arr = np.frombuffer(data, dtype=np.uint8)
-    img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-    if img is None:
-        return {
-            "pass": False,
-            "metrics": None,
-            "guidance": ["Invalid image; please upload a valid photo."],
-            "tool_call": {"tool": "quality_gate", "error": "decode_failed", "decision": "needs_retake"},
-        }
 
-    with _tracer.start_as_current_span("quality_gate") as span:
-        metrics = compute_image_quality(
-            img,
-            blur_min=settings.blur_min,
-            brightness_min=settings.brightness_min,
-            glare_max=settings.glare_max,
-            min_w=settings.min_width,
-            min_h=settings.min_height,
-        )
-        span.set_attribute("quality.blur_score", metrics.blur_score)
-        span.set_attribute("quality.brightness", metrics.brightness)
-        span.set_attribute("quality.glare_score", metrics.glare_score)
-        span.set_attribute("quality.is_too_blurry", metrics.is_too_blurry)
-        span.set_attribute("quality.is_too_dark", metrics.is_too_dark)
-        span.set_attribute("quality.is_too_glary", metrics.is_too_glary)
-        span.set_attribute("quality.is_low_res", metrics.is_low_res)
-
-        fail = metrics.is_too_blurry or metrics.is_too_dark or metrics.is_too_glary or metrics.is_low_res
-        if fail:
-            guidance = retake_guidance(metrics)
-            try:
-                from packages.core.events import QualityFailedEvent
-
-                ev = QualityFailedEvent(
-                    change_id=change_id,
-                    step_id=step_id,
-                    reason="Image quality below threshold",
-                    metrics=metrics.model_dump(),
-                    correlation_id=change_id,
-                )
-                await _kafka_publish("infrasentinel.quality.failed", ev.model_dump(mode="json"))
-            except Exception:
-                pass
-            return {
-                "pass": False,
-                "metrics": metrics.model_dump(),
-                "guidance": guidance,
-                "tool_call": {
-                    "tool": "quality_gate",
-                    "metrics": metrics.model_dump(),
-                    "decision": "needs_retake",
-                },
-            }
-        return {
-            "pass": True,
-            "metrics": metrics.model_dump(),
-            "guidance": [],
-            "tool_call": {"tool": "quality_gate", "metrics": metrics.model_dump(), "decision": "pass"},
-        }
+
+def _local_cmdb(input_data: dict) -> dict:
+    return cmdb_advice(StepDefinition.model_validate(input_data["step_def"]), input_data["cmdb_out"])
 
 
 @activity.defn
@@ -168,20 +132,43 @@ async def activity_get_mop_prompt(change_id: str, step_id: str, step_def: dict)
     """Get technician prompt from MOP agent (or local). Store in runtime."""
     settings = get_settings()
     step_def_model = StepDefinition.model_validate(step_def)
-    if settings.a2a_mode == "http":
-        try:
-            client = A2AClient(settings.a2a_mop_url)
-            resp = await client.send_async("mop", {"step_def": step_def}, {})
-            out = resp.output or {}
-            tech_prompt = out.get("tech_prompt", step_def_model.description)
-        except Exception:
-            tech_prompt = mop_advice(step_def_model).get("tech_prompt", step_def_model.description)
-    else:
-        tech_prompt = mop_advice(step_def_model).get("tech_prompt", step_def_model.description)
+    input_data = {"step_def": step_def}
+    out = None
+    if settings.a2a_mode in A2A_MODES:
+        out = await _ask_agent("mop", input_data)
+    if out is None:
+        out = _local_advice("mop", input_data, _local_mop)
+    tech_prompt = out.get("tech_prompt", step_def_model.description)
     save_step_prompt(change_id, step_id, tech_prompt)
     return tech_prompt
 
 
+@activity.defn
+async def activity_get_mop_prompts(change_id: str, steps_def: list[dict]) -> dict[str, str]:
+    """Technician prompts for every step of a change: one MOP agent batch (or local).
+
+    Steps the agent could not answer get local advice. Prompts are stored in
+    runtime like activity_get_mop_prompt's.
+    """
+    settings = get_settings()
+    inputs = [{"step_def": step_def} for step_def in steps_def]
+    outputs: list[dict | None] = [None] * len(steps_def)
+    if settings.a2a_mode in A2A_MODES and steps_def:
+        try:
+            responses = await _agent_client("mop").send_batch("mop", inputs)
+            outputs = [r.output if r.status == "ok" else None for r in responses]
+        except Exception as exc:
+            logger.warning("MOP agent batch for %s failed (%s); using local prompts", change_id, exc)
+    prompts: dict[str, str] = {}
+    for input_data, out in zip(inputs, outputs, strict=True):
+        step_def_model = StepDefinition.model_validate(input_data["step_def"])
+        if out is None:
+            out = _local_advice("mop", input_data, _local_mop)
+        prompts[step_def_model.step_id] = out.get("tech_prompt", step_def_model.description)
+        save_step_prompt(change_id, step_def_model.step_id, prompts[step_def_model.step_id])
+    return prompts
+
+
 @activity.defn
 async def activity_vision_advice(
     step_def: dict,
@@ -191,25 +178,17 @@ async def activity_vision_advice(
 ) -> list[str]:
     """Get guidance from Vision agent (or local). Worker keeps decision logic."""
     settings = get_settings()
-    step_def_model = StepDefinition.model_validate(step_def)
-    if settings.a2a_mode == "http":
-        try:
-            client = A2AClient(settings.a2a_vision_url)
-            resp = await client.send_async(
-                "vision",
-                {
-                    "step_def": step_def,
-                    "quality_metrics": quality_metrics,
-                    "cv_port_out": cv_port_out,
-                    "cv_tag_out": cv_tag_out,
-                },
-                {},
-            )
-            out = resp.output or {}
+    input_data = {
+        "step_def": step_def,
+        "quality_metrics": quality_metrics,
+        "cv_port_out": cv_port_out,
+        "cv_tag_out": cv_tag_out,
+    }
+    if settings.a2a_mode in A2A_MODES:
+        out = await _ask_agent("vision", input_data)
+        if out is not None:
             return out.get("guidance", [])
-        except Exception:
-            pass
-    out = vision_advice(step_def_model, quality_metrics, cv_port_out, cv_tag_out)
+    out = _local_advice("vision", input_data, _local_vision)
     return out.get("guidance", [])
 
 
@@ -217,20 +196,12 @@ async def activity_vision_advice(
 async def activity_cmdb_advice(step_def: dict, cmdb_out: dict) -> str | None:
     """Get escalation text from CMDB agent (or local)."""
     settings = get_settings()
-    step_def_model = StepDefinition.model_validate(step_def)
-    if settings.a2a_mode == "http":
-        try:
-            client = A2AClient(settings.a2a_cmdb_url)
-            resp = await client.send_async(
-                "cmdb",
-                {"step_def": step_def, "cmdb_out": cmdb_out},
-                {},
-            )
-            out = resp.output or {}
+    input_data = {"step_def": step_def, "cmdb_out": cmdb_out}
+    if settings.a2a_mode in A2A_MODES:
+        out = await _ask_agent("cmdb", input_data)
+        if out is not None:
             return out.get("escalation_text")
-        except Exception:
-            pass
-    out = cmdb_advice(step_def_model, cmdb_out)
+    out = _local_advice("cmdb", input_data, _local_cmdb)
     return out.get("escalation_text")
 
 
@@ -241,27 +212,28 @@ async def activity_load_change(change_id: str) -> dict:
 
 
 @activity.defn
-async def activity_cv_extract(
-    change_id: str, step_id: str, evidence_id: str, scenario: str
-) -> tuple[dict, dict]:
-    handlers = _cv_handlers or CVHandlers(scenario=scenario)
-
-    with _tracer.start_as_current_span("ocr_extraction") as span:
-        port = await handlers.read_port_label(evidence_id, change_id, scenario)
-        tag = await handlers.read_cable_tag(evidence_id, change_id, scenario)
-        raw_text = getattr(port, "raw_text", "") or ""
-        span.set_attribute("ocr.raw_text_length", len(raw_text))
-        span.set_attribute("ocr.port_confidence", port.confidence)
-        span.set_attribute("ocr.tag_confidence", tag.confidence)
-
-    return (
-        {
-            "panel_id": port.panel_id,
-            "port_label": port.port_label,
-            "confidence": port.confidence,
-        },
-        {"cable_tag": tag.cable_tag, "confidence": tag.confidence},
-    )
+async def activity_proofpack_summary(change_id: str) -> dict:
+    """Return the proofpack summary counts for a change (campaign aggregation)."""
+    proofpack = load_proofpack(change_id)
+    return dict(proofpack.summary) if proofpack else {}
+
+
+@activity.defn
+async def activity_cmdb_prefetch(change_id: str) -> dict:
+    """Bulk-load the change's panels, ports and cables into the worker's topology index."""
+    global _netbox_handlers
+    if _netbox_handlers is None:
+        _netbox_handlers = get_registry().netbox()
+
+    with _tracer.start_as_current_span("cmdb_prefetch") as span:
+        try:
+            out = await _netbox_handlers.prefetch_topology(change_id)
+        except Exception as exc:
+            # Validation falls back to live NetBox lookups; prefetch never fails the change.
+            out = {"prefetched": False, "error": str(exc)}
+        span.set_attribute("cmdb.prefetched", bool(out.get("prefetched")))
+        span.set_attribute("cmdb.ports", int(out.get("ports", 0)))
+    return out
 
 
 @activity.defn
@@ -270,7 +242,7 @@ async def activity_cmdb_validate(
 ) -> dict:
     global _netbox_handlers
     if _netbox_handlers is None:
-        _netbox_handlers = NetboxHandlers()
+        _netbox_handlers = get_registry().netbox()
 
     with _tracer.start_as_current_span("cmdb_validation") as span:
         out = await _netbox_handlers.validate_observed(change_id, panel_id, port_label, cable_tag)
@@ -279,29 +251,64 @@ async def activity_cmdb_validate(
         span.set_attribute("cmdb.confidence", out.confidence)
 
     if not out.match:
-        try:
-            from packages.core.events import CMDBMismatchEvent
-            from packages.core.fixtures.loaders import load_expected_mapping
-
-            mapping = load_expected_mapping(change_id)
-            default = mapping.get("default", mapping)
-            expected_str = (
-                f"{default.get('panel_id', '')}:{default.get('port_label', '')}:"
-                f"{default.get('cable_tag', '')}"
-            )
-            actual_str = f"{panel_id}:{port_label}:{cable_tag}"
-            ev = CMDBMismatchEvent(
-                change_id=change_id,
-                step_id=f"{panel_id}:{port_label}",
-                expected=expected_str,
-                actual=actual_str,
-                correlation_id=change_id,
-            )
-            await _kafka_publish("infrasentinel.cmdb.mismatch", ev.model_dump(mode="json"))
-        except Exception:
-            pass
+        await _publish_cmdb_mismatch(change_id, panel_id, port_label, cable_tag)
+
+    return {
+        "match": out.match,
+        "reason": out.reason,
+        "confidence": out.confidence,
+        "suggestions": out.suggestions,
+    }
+
+
+@activity.defn
+async def activity_cmdb_validate_batch(change_id: str, observations: list[dict]) -> list[dict]:
+    """Validate many {panel_id, port_label, cable_tag} observations in one activity."""
+    global _netbox_handlers
+    if _netbox_handlers is None:
+        _netbox_handlers = get_registry().netbox()
+
+    with _tracer.start_as_current_span("cmdb_validation_batch") as span:
+        results = await _netbox_handlers.validate_observed_batch(change_id, observations)
+        span.set_attribute("cmdb.observations", len(observations))
+        span.set_attribute("cmdb.mismatches", sum(1 for out in results if not out.match))
 
-    return {"match": out.match, "reason": out.reason, "confidence": out.confidence}
+    for obs, out in zip(observations, results, strict=True):
+        if not out.match:
+            await _publish_cmdb_mismatch(change_id, obs["panel_id"], obs["port_label"], obs["cable_tag"])
+
+    return [
+        {
+            "match": out.match,
+            "reason": out.reason,
+            "confidence": out.confidence,
+            "suggestions": out.suggestions,
+        }
+        for out in results
+    ]
+
+
+async def _publish_cmdb_mismatch(change_id: str, panel_id: str, port_label: str, cable_tag: str) -> None:
+    try:
+        from packages.core.events import CMDBMismatchEvent
+        from packages.core.fixtures.mapping_index import get_mapping_index
+
+        expected = get_mapping_index(change_id).expected_for(panel_id, port_label)
+        expected_str = (
+            f"{expected.get('panel_id', '')}:{expected.get('port_label', '')}:"
+            f"{expected.get('cable_tag', '')}"
+        )
+        actual_str = f"{panel_id}:{port_label}:{cable_tag}"
+        ev = CMDBMismatchEvent(
+            change_id=change_id,
+            step_id=f"{panel_id}:{port_label}",
+            expected=expected_str,
+            actual=actual_str,
+            correlation_id=change_id,
+        )
+        await _kafka_publish("infrasentinel.cmdb.mismatch", ev.model_dump(mode="json"))
+    except Exception:
+        pass
 
 
 @activity.defn
@@ -314,7 +321,7 @@ async def activity_request_approval(
 ) -> dict:
     global _ticketing_handlers
     if _ticketing_handlers is None:
-        _ticketing_handlers = TicketingHandlers()
+        _ticketing_handlers = get_registry().ticketing()
     return await _ticketing_handlers.request_approval(
         change_id=change_id,
         step_id=step_id,
@@ -351,6 +358,21 @@ async def activity_persist_step_and_proofpack(
         span.set_attribute("proofpack.step_count", step_count)
         span.set_attribute("proofpack.change_id", change_id)
 
+    if result.quality_fail_reason and result.status == StepStatus.NEEDS_RETAKE:
+        try:
+            from packages.core.events import QualityFailedEvent
+
+            qf_ev = QualityFailedEvent(
+                change_id=change_id,
+                step_id=result.step_id,
+                reason=result.quality_fail_reason,
+                metrics=result.quality or {},
+                correlation_id=change_id,
+            )
+            await _kafka_publish("infrasentinel.quality.failed", qf_ev.model_dump(mode="json"))
+        except Exception:
+            pass
+
     try:
         from packages.core.events import StepCompletedEvent, ProofPackReadyEvent
 
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
 
 from temporalio.client import Client
-from temporalio.worker import Worker
+from temporalio.worker import SharedStateManager, Worker
 
 from apps.worker.activities import (
     WorkerDependencies,
@@ -12,28 +17,93 @@ from apps.worker.activities import (
     finalize_change,
     process_step,
 )
+from apps.worker.activities_cv import activity_cv_extract, activity_quality_gate, init_cv_process
 from apps.worker.activities_execution import (
     configure_handlers,
     activity_cmdb_advice,
+    activity_cmdb_prefetch,
     activity_cmdb_validate,
-    activity_cv_extract,
+    activity_cmdb_validate_batch,
     activity_get_mop_prompt,
+    activity_get_mop_prompts,
     activity_load_change,
     activity_persist_step_and_proofpack,
-    activity_quality_gate,
+    activity_proofpack_summary,
     activity_request_approval,
     activity_set_scenario,
     activity_vision_advice,
 )
+from apps.worker.workflows.campaign_workflow import CampaignWorkflow
 from apps.worker.workflows.change_execution_workflow import ChangeExecutionWorkflow
 from apps.worker.workflows.change_workflow import ChangeWorkflow
-from packages.core.config import get_settings
+from packages.a2a.client import close_a2a_clients
+from packages.agents.llm import close_llm_clients
+from packages.core.config import Settings, get_settings
 from packages.core.db import build_engine, init_db, session_factory
 from packages.core.kafka import KafkaEventBus, set_kafka_bus
 from packages.core.observability import configure_observability
-from services.mcp_cv.handlers import CVHandlers
-from services.mcp_netbox.handlers import NetboxHandlers
-from services.mcp_ticketing.handlers import TicketingHandlers
+from services.mcp_netbox.src.invalidation import (
+    check_invalidation_backend,
+    listen_for_invalidations,
+)
+from services.registry import get_registry
+
+IO_ACTIVITIES: list[Callable[..., Any]] = [
+    fetch_change,
+    process_step,
+    finalize_change,
+    activity_load_change,
+    activity_set_scenario,
+    activity_get_mop_prompt,
+    activity_get_mop_prompts,
+    activity_vision_advice,
+    activity_cmdb_prefetch,
+    activity_cmdb_validate,
+    activity_cmdb_validate_batch,
+    activity_cmdb_advice,
+    activity_request_approval,
+    activity_persist_step_and_proofpack,
+    activity_proofpack_summary,
+]
+
+CV_ACTIVITIES: list[Callable[..., Any]] = [
+    activity_quality_gate,
+    activity_cv_extract,
+]
+
+
+def cv_process_count(settings: Settings) -> int:
+    return settings.worker_cv_processes or os.cpu_count() or 1
+
+
+def build_io_worker(client: Client, settings: Settings) -> Worker:
+    """Async worker for workflows and I/O-light activities."""
+    return Worker(
+        client,
+        task_queue=settings.temporal_task_queue,
+        workflows=[ChangeWorkflow, ChangeExecutionWorkflow, CampaignWorkflow],
+        activities=IO_ACTIVITIES,
+        max_concurrent_activities=settings.worker_io_max_concurrent_activities,
+    )
+
+
+def build_cv_worker(
+    client: Client,
+    settings: Settings,
+    executor: ProcessPoolExecutor,
+    shared_state_manager: SharedStateManager,
+) -> Worker:
+    """Worker for the CV task queue; sync activities run on a process pool."""
+    return Worker(
+        client,
+        task_queue=settings.temporal_cv_task_queue,
+        activities=CV_ACTIVITIES,
+        activity_executor=executor,
+        shared_state_manager=shared_state_manager,
+        max_concurrent_activities=(
+            settings.worker_cv_max_concurrent_activities or cv_process_count(settings)
+        ),
+    )
 
 
 async def run_worker() -> None:
@@ -41,44 +111,61 @@ async def run_worker() -> None:
     settings.local_evidence_dir.mkdir(parents=True, exist_ok=True)
     configure_observability(settings)
 
-    kafka_bus = KafkaEventBus(settings.kafka_bootstrap_servers)
-    await kafka_bus.connect()
-    set_kafka_bus(kafka_bus)
-
-    engine = build_engine(settings.database_url)
-    await init_db(engine)
-    configure_dependencies(WorkerDependencies(session_factory(engine)))
-    configure_handlers(
-        CVHandlers(scenario=settings.scenario),
-        NetboxHandlers(),
-        TicketingHandlers(),
-    )
+    role = settings.worker_role.lower()
+    if role not in ("all", "io", "cv"):
+        raise ValueError(f"Unsupported WORKER_ROLE={role!r}. Use 'all', 'io' or 'cv'.")
 
     client = await Client.connect(settings.temporal_address, namespace=settings.temporal_namespace)
-    worker = Worker(
-        client,
-        task_queue=settings.temporal_task_queue,
-        workflows=[ChangeWorkflow, ChangeExecutionWorkflow],
-        activities=[
-            fetch_change,
-            process_step,
-            finalize_change,
-            activity_load_change,
-            activity_set_scenario,
-            activity_get_mop_prompt,
-            activity_quality_gate,
-            activity_cv_extract,
-            activity_vision_advice,
-            activity_cmdb_validate,
-            activity_cmdb_advice,
-            activity_request_approval,
-            activity_persist_step_and_proofpack,
-        ],
-    )
+    workers: list[Worker] = []
+    kafka_bus: KafkaEventBus | None = None
+    executor: ProcessPoolExecutor | None = None
+    dependencies: WorkerDependencies | None = None
+    listener: asyncio.Task | None = None
+
+    if role in ("all", "io"):
+        check_invalidation_backend(settings)
+        # NetBox webhooks arrive at the API; apply them to this process's CMDB indexes.
+        listener = asyncio.create_task(listen_for_invalidations())
+        kafka_bus = KafkaEventBus(settings.kafka_bootstrap_servers)
+        await kafka_bus.connect()
+        set_kafka_bus(kafka_bus)
+
+        engine = build_engine(settings.database_url)
+        await init_db(engine)
+        dependencies = WorkerDependencies(session_factory(engine))
+        configure_dependencies(dependencies)
+        registry = get_registry()
+        registry.warm(["camera", "netbox", "ticketing"])
+        configure_handlers(registry.netbox(), registry.ticketing())
+        workers.append(build_io_worker(client, settings))
+
+    if role in ("all", "cv"):
+        executor = ProcessPoolExecutor(
+            max_workers=cv_process_count(settings), initializer=init_cv_process
+        )
+        manager = multiprocessing.Manager()
+        workers.append(
+            build_cv_worker(
+                client,
+                settings,
+                executor,
+                SharedStateManager.create_from_multiprocessing(manager),
+            )
+        )
+
     try:
-        await worker.run()
+        await asyncio.gather(*(worker.run() for worker in workers))
     finally:
-        await kafka_bus.disconnect()
+        if listener is not None:
+            listener.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if kafka_bus is not None:
+            await kafka_bus.disconnect()
+        if dependencies is not None:
+            await dependencies.tools.aclose()
+        await close_a2a_clients()
+        await close_llm_clients()
 
 
 if __name__ == "__main__":
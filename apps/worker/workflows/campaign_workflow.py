@@ -0,0 +1,121 @@
+"""Campaign workflow: fan out many changes as child ChangeExecutionWorkflows."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from temporalio import workflow
+from temporalio.exceptions import ActivityError, ChildWorkflowError, WorkflowAlreadyStartedError
+
+with workflow.unsafe.imports_passed_through():
+    from apps.worker.activities_execution import activity_proofpack_summary
+    from apps.worker.workflows.change_execution_workflow import (
+        ChangeExecutionWorkflow,
+        WorkflowInput,
+    )
+
+SUMMARY_KEYS = ("verified_steps", "blocked_steps", "retake_requests", "total_steps")
+
+
+@dataclass
+class CampaignChange:
+    change_id: str
+    scenario: str = "CHG-001_A"
+
+
+@dataclass
+class CampaignInput:
+    campaign_id: str
+    changes: list[CampaignChange] = field(default_factory=list)
+    max_concurrency: int = 10
+    cv_task_queue: str | None = None
+
+
+@workflow.defn
+class CampaignWorkflow:
+    """Start one child ChangeExecutionWorkflow per change with bounded concurrency.
+
+    Children use the same workflow ID as /v1/changes/start (change-{change_id}), so
+    technicians keep uploading evidence and approving through the existing endpoints.
+    Pausing stops new children from starting; running children are not affected.
+    """
+
+    def __init__(self) -> None:
+        self._paused = False
+        self._running = 0
+        self._total = 0
+        self._changes: dict[str, dict] = {}
+        self._summary: dict[str, int] = {key: 0 for key in SUMMARY_KEYS}
+
+    @workflow.signal
+    async def pause(self) -> None:
+        self._paused = True
+
+    @workflow.signal
+    async def resume(self) -> None:
+        self._paused = False
+
+    @workflow.query
+    def get_progress(self) -> dict:
+        statuses = [c["status"] for c in self._changes.values()]
+        return {
+            "paused": self._paused,
+            "total": self._total,
+            "pending": self._total - len(statuses),
+            "running": self._running,
+            "completed": statuses.count("completed"),
+            "failed": statuses.count("failed"),
+            "summary": dict(self._summary),
+            "changes": dict(self._changes),
+        }
+
+    @workflow.run
+    async def run(self, data: CampaignInput) -> dict:
+        self._total = len(data.changes)
+        limit = max(1, data.max_concurrency)
+        tasks: list[asyncio.Task] = []
+        for item in data.changes:
+            await workflow.wait_condition(
+                lambda: not self._paused and self._running < limit
+            )
+            self._running += 1
+            self._changes[item.change_id] = {"status": "running", "summary": None}
+            tasks.append(asyncio.create_task(self._run_change(item, data.cv_task_queue)))
+        await asyncio.gather(*tasks)
+        return {"campaign_id": data.campaign_id, **self.get_progress()}
+
+    async def _run_change(self, item: CampaignChange, cv_task_queue: str | None) -> None:
+        entry = self._changes[item.change_id]
+        try:
+            await workflow.execute_child_workflow(
+                ChangeExecutionWorkflow.run,
+                WorkflowInput(
+                    change_id=item.change_id,
+                    scenario=item.scenario,
+                    cv_task_queue=cv_task_queue,
+                ),
+                id=f"change-{item.change_id}",
+            )
+        except ChildWorkflowError as exc:
+            entry.update(status="failed", error=str(exc.cause or exc))
+            self._running -= 1
+            return
+        except WorkflowAlreadyStartedError:
+            entry.update(status="failed", error="change already started outside this campaign")
+            self._running -= 1
+            return
+
+        try:
+            summary = await workflow.execute_activity(
+                activity_proofpack_summary,
+                item.change_id,
+                start_to_close_timeout=timedelta(seconds=10),
+            )
+        except ActivityError:
+            summary = {}
+        entry.update(status="completed", summary=summary)
+        for key in SUMMARY_KEYS:
+            self._summary[key] += int(summary.get(key, 0) or 0)
+        self._running -= 1
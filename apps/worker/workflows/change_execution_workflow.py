@@ -4,18 +4,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import timedelta
+from types import SimpleNamespace
 
 from temporalio import workflow
 
 with workflow.unsafe.imports_passed_through():
+    from apps.worker.activities_cv import activity_cv_extract, activity_quality_gate
     from apps.worker.activities_execution import (
         activity_cmdb_advice,
+        activity_cmdb_prefetch,
         activity_cmdb_validate,
-        activity_cv_extract,
         activity_get_mop_prompt,
+        activity_get_mop_prompts,
         activity_load_change,
         activity_persist_step_and_proofpack,
-        activity_quality_gate,
         activity_request_approval,
         activity_set_scenario,
         activity_vision_advice,
@@ -36,6 +38,8 @@ with workflow.unsafe.imports_passed_through():
 class WorkflowInput:
     change_id: str
     scenario: str = "CHG-001_A"
+    # Task queue for CPU-bound CV activities; None keeps them on the workflow's queue.
+    cv_task_queue: str | None = None
 
 
 @workflow.defn
@@ -57,13 +61,28 @@ class ChangeExecutionWorkflow:
     def get_current_step(self) -> dict:
         return getattr(self, "_current_step_info", {})
 
+    def _set_current_step(self, step_result: StepResult) -> None:
+        """Expose the status the workflow is waiting in (query only; no history impact)."""
+        self._current_step_info = {
+            "change_id": step_result.change_id,
+            "step_id": step_result.step_id,
+            "status": step_result.status.value,
+        }
+
     @workflow.run
     async def run(self, data: WorkflowInput) -> dict:
+        cv_queue = data.cv_task_queue or workflow.info().task_queue
         await workflow.execute_activity(
             activity_set_scenario,
             args=[data.change_id, data.scenario],
             start_to_close_timeout=timedelta(seconds=5),
         )
+        if workflow.patched("cmdb-prefetch"):
+            await workflow.execute_activity(
+                activity_cmdb_prefetch,
+                data.change_id,
+                start_to_close_timeout=timedelta(seconds=30),
+            )
         change = await workflow.execute_activity(
             activity_load_change,
             data.change_id,
@@ -71,6 +90,15 @@ class ChangeExecutionWorkflow:
         )
         steps_def = change["steps"]
         step_results: list[dict] = []
+        # All prompts in one MOP agent batch; histories from before run one activity per step.
+        prompts_ready = False
+        if workflow.patched("mop-prompt-batch"):
+            await workflow.execute_activity(
+                activity_get_mop_prompts,
+                args=[data.change_id, steps_def],
+                start_to_close_timeout=timedelta(seconds=30),
+            )
+            prompts_ready = True
 
         for step_def in steps_def:
             step_id = step_def["step_id"]
@@ -86,17 +114,14 @@ class ChangeExecutionWorkflow:
                 status=initial_status,
                 evidence_ids=[],
             )
-            self._current_step_info = {
-                "change_id": data.change_id,
-                "step_id": step_id,
-                "status": step_result.status.value,
-            }
+            self._set_current_step(step_result)
 
-            await workflow.execute_activity(
-                activity_get_mop_prompt,
-                args=[data.change_id, step_id, step_def],
-                start_to_close_timeout=timedelta(seconds=10),
-            )
+            if not prompts_ready:
+                await workflow.execute_activity(
+                    activity_get_mop_prompt,
+                    args=[data.change_id, step_id, step_def],
+                    start_to_close_timeout=timedelta(seconds=10),
+                )
 
             if initial_status == StepStatus.AWAITING_EVIDENCE:
                 await workflow.wait_condition(
@@ -111,6 +136,7 @@ class ChangeExecutionWorkflow:
                     activity_quality_gate,
                     args=[data.change_id, step_id, evidence_id],
                     start_to_close_timeout=timedelta(seconds=10),
+                    task_queue=cv_queue,
                 )
                 if not qgate.get("pass"):
                     step_result = StepResult(
@@ -130,6 +156,7 @@ class ChangeExecutionWorkflow:
                     )
                     step_results.append(step_result.model_dump(mode="json"))
                     while True:
+                        self._set_current_step(step_result)
                         await workflow.wait_condition(
                             lambda s=step_id: s in self._evidence_signal,
                             timeout=timedelta(hours=1),
@@ -140,6 +167,7 @@ class ChangeExecutionWorkflow:
                             activity_quality_gate,
                             args=[data.change_id, step_id, evidence_id],
                             start_to_close_timeout=timedelta(seconds=10),
+                            task_queue=cv_queue,
                         )
                         if qgate.get("pass"):
                             break
@@ -166,22 +194,17 @@ class ChangeExecutionWorkflow:
                     activity_cv_extract,
                     args=[data.change_id, step_id, ev_id, data.scenario],
                     start_to_close_timeout=timedelta(seconds=20),
+                    task_queue=cv_queue,
                 )
 
-                class PortOut:
-                    pass
-
-                po = PortOut()
-                po.panel_id = port_out.get("panel_id")
-                po.port_label = port_out.get("port_label")
-                po.confidence = port_out.get("confidence", 0)
-
-                class TagOut:
-                    pass
-
-                to = TagOut()
-                to.cable_tag = tag_out.get("cable_tag")
-                to.confidence = tag_out.get("confidence", 0)
+                po = SimpleNamespace(
+                    panel_id=port_out.get("panel_id"),
+                    port_label=port_out.get("port_label"),
+                    confidence=port_out.get("confidence", 0),
+                )
+                to = SimpleNamespace(
+                    cable_tag=tag_out.get("cable_tag"), confidence=tag_out.get("confidence", 0)
+                )
 
                 step_result = apply_cv_result(step_def_model, step_result, po, to)
                 if step_result.status == StepStatus.NEEDS_RETAKE:
@@ -199,6 +222,7 @@ class ChangeExecutionWorkflow:
                         step_result = step_result.model_copy(update={"guidance": vision_guidance})
 
                 while step_result.status == StepStatus.NEEDS_RETAKE:
+                    self._set_current_step(step_result)
                     await workflow.wait_condition(
                         lambda s=step_id: s in self._evidence_signal,
                         timeout=timedelta(hours=1),
@@ -209,14 +233,16 @@ class ChangeExecutionWorkflow:
                         activity_cv_extract,
                         args=[data.change_id, step_id, evidence_id, data.scenario],
                         start_to_close_timeout=timedelta(seconds=20),
+                        task_queue=cv_queue,
+                    )
+                    po = SimpleNamespace(
+                        panel_id=port_out.get("panel_id"),
+                        port_label=port_out.get("port_label"),
+                        confidence=port_out.get("confidence", 0),
+                    )
+                    to = SimpleNamespace(
+                        cable_tag=tag_out.get("cable_tag"), confidence=tag_out.get("confidence", 0)
                     )
-                    po = PortOut()
-                    po.panel_id = port_out.get("panel_id")
-                    po.port_label = port_out.get("port_label")
-                    po.confidence = port_out.get("confidence", 0)
-                    to = TagOut()
-                    to.cable_tag = tag_out.get("cable_tag")
-                    to.confidence = tag_out.get("confidence", 0)
                     step_result = apply_cv_result(step_def_model, step_result, po, to)
                     if step_result.status == StepStatus.NEEDS_RETAKE:
                         vision_guidance = await workflow.execute_activity(
@@ -244,12 +270,11 @@ class ChangeExecutionWorkflow:
                         start_to_close_timeout=timedelta(seconds=10),
                     )
 
-                    class CmdbOut:
-                        pass
-
-                    co = CmdbOut()
-                    co.match = cmdb_out.get("match", False)
-                    co.reason = cmdb_out.get("reason", "")
+                    co = SimpleNamespace(
+                        match=cmdb_out.get("match", False),
+                        reason=cmdb_out.get("reason", ""),
+                        suggestions=cmdb_out.get("suggestions", []),
+                    )
 
                     step_result = apply_cmdb_validation(step_def_model, step_result, co)
                     if (
@@ -259,7 +284,10 @@ class ChangeExecutionWorkflow:
                     ):
                         escalation_text = await workflow.execute_activity(
                             activity_cmdb_advice,
-                            args=[step_def, {"match": co.match, "reason": co.reason}],
+                            args=[
+                                step_def,
+                                {"match": co.match, "reason": co.reason, "suggestions": co.suggestions},
+                            ],
                             start_to_close_timeout=timedelta(seconds=10),
                         )
                         await workflow.execute_activity(
@@ -273,6 +301,7 @@ class ChangeExecutionWorkflow:
                             ],
                             start_to_close_timeout=timedelta(seconds=5),
                         )
+                        self._set_current_step(step_result)
                         await workflow.wait_condition(
                             lambda s=step_id: s in self._approval_signal,
                             timeout=timedelta(hours=24),
@@ -295,6 +324,7 @@ class ChangeExecutionWorkflow:
                 start_to_close_timeout=timedelta(seconds=10),
             )
             step_results.append(step_result.model_dump(mode="json"))
+            self._set_current_step(step_result)
 
             if step_result.status == StepStatus.BLOCKED and not (approval and approval.get("required")):
                 break
@@ -0,0 +1 @@
+"""Hot-path micro-benchmarks (see benchmarks/run.py)."""
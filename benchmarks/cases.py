@@ -0,0 +1,287 @@
+"""Hot-path benchmark cases with realistic inputs.
+
+Inputs come from data/synth/patchpanel_v1 (labels.jsonl + images) when the dataset
+has been generated (`make synth`); otherwise from samples/images and labels drawn
+with the generator's label styles, so the suite always runs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import tempfile
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATASET_DIR = REPO_ROOT / "data" / "synth" / "patchpanel_v1"
+SAMPLE_IMAGES = ("evid-good.jpg", "evid-blurry.jpg", "evid-dark.jpg", "evid-glare.jpg")
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    # Builds inputs once and returns the zero-arg callable that is timed.
+    setup: Callable[[], Callable[[], object]]
+
+
+@dataclass
+class BenchInputs:
+    ocr_port_texts: list[str]
+    ocr_tag_texts: list[str]
+    images: list[np.ndarray]
+    source: str
+
+
+def _ocr_noise(text: str, rng: random.Random) -> str:
+    """OCR-style confusions the parser normalizes (0/O, 1/I, 5/S) plus stray spacing."""
+    swaps = {"0": "O", "1": "I", "5": "S"}
+    out = "".join(swaps[c] if c in swaps and rng.random() < 0.3 else c for c in text)
+    return f"  {out.lower() if rng.random() < 0.2 else out} "
+
+
+def _fallback_labels(n: int, rng: random.Random) -> list[tuple[str, str | None]]:
+    labels: list[tuple[str, str | None]] = []
+    for _ in range(n):
+        idx = rng.randint(1, 48)
+        style = rng.choice(["numeric", "alpha", "padded"])
+        if style == "numeric":
+            port = str(idx)
+        elif style == "alpha":
+            port = f"{'A' if idx <= 24 else 'B'}{idx if idx <= 24 else idx - 24}"
+        else:
+            port = f"P{idx:02d}"
+        tag = (
+            f"MDF-01-R{rng.randint(1, 20):02d}-P{rng.randint(1, 48):02d}"
+            if rng.random() < 0.8
+            else None
+        )
+        labels.append((port, tag))
+    return labels
+
+
+def load_inputs(
+    dataset_dir: Path = DATASET_DIR, limit: int = 64, seed: int = 1234
+) -> BenchInputs:
+    rng = random.Random(seed)
+    labels: list[tuple[str, str | None]] = []
+    images: list[np.ndarray] = []
+    labels_path = dataset_dir / "labels.jsonl"
+    if labels_path.exists():
+        for line in labels_path.read_text(encoding="utf-8").splitlines():
+            if not line.strip() or len(labels) >= limit:
+                continue
+            entry = json.loads(line)
+            labels.append((entry["port_label"], entry.get("cable_tag")))
+            img = cv2.imread(str(dataset_dir / entry["image"]))
+            if img is not None and len(images) < 8:
+                images.append(img)
+    source = "synth" if labels else "fallback"
+    if not labels:
+        labels = _fallback_labels(limit, rng)
+    if not images:
+        for name in SAMPLE_IMAGES:
+            img = cv2.imread(str(REPO_ROOT / "samples" / "images" / name))
+            if img is not None:
+                images.append(img)
+    if not images:
+        images = [np.random.default_rng(seed).integers(0, 255, (720, 1280, 3), dtype=np.uint8)]
+
+    port_texts = [_ocr_noise(f"PORT {p}" if p.isdigit() else p, rng) for p, _ in labels]
+    tag_texts = [_ocr_noise(t, rng) if t else "N0 TAG VISIBLE" for _, t in labels]
+    return BenchInputs(port_texts, tag_texts, images, source)
+
+
+@contextmanager
+def runtime_sandbox() -> Iterator[Path]:
+    """Point packages.core.runtime at a temp dir so benchmarks never touch runtime/."""
+    previous = os.environ.get("INFRASENTINEL_RUNTIME_DIR")
+    with tempfile.TemporaryDirectory(prefix="bench-runtime-") as tmp:
+        os.environ["INFRASENTINEL_RUNTIME_DIR"] = tmp
+        try:
+            yield Path(tmp)
+        finally:
+            if previous is None:
+                os.environ.pop("INFRASENTINEL_RUNTIME_DIR", None)
+            else:
+                os.environ["INFRASENTINEL_RUNTIME_DIR"] = previous
+
+
+_inputs: BenchInputs | None = None
+
+
+def inputs() -> BenchInputs:
+    global _inputs
+    if _inputs is None:
+        _inputs = load_inputs()
+    return _inputs
+
+
+def _calibration() -> Callable[[], object]:
+    # Fixed pure-Python workload; comparisons are normalized by it so a baseline
+    # recorded on one machine stays meaningful on another.
+    def run() -> int:
+        return sum(i * i for i in range(2000))
+
+    return run
+
+
+def _parse_port_label() -> Callable[[], object]:
+    from packages.cv.parsing import parse_port_label
+
+    texts = inputs().ocr_port_texts
+
+    def run() -> None:
+        for text in texts:
+            parse_port_label(text)
+
+    return run
+
+
+def _parse_cable_tag() -> Callable[[], object]:
+    from packages.cv.parsing import parse_cable_tag
+
+    texts = inputs().ocr_tag_texts
+
+    def run() -> None:
+        for text in texts:
+            parse_cable_tag(text)
+
+    return run
+
+
+def _compute_image_quality() -> Callable[[], object]:
+    from packages.core.vision.quality import compute_image_quality
+
+    img = inputs().images[0]
+    return lambda: compute_image_quality(img)
+
+
+def _step_fixtures() -> tuple:
+    from packages.core.fixtures.loaders import load_change
+    from packages.core.models.steps import StepResult, StepStatus
+
+    step_def = load_change("CHG-001").steps[0]
+    base = StepResult(
+        change_id="CHG-BENCH", step_id=step_def.step_id, status=StepStatus.AWAITING_EVIDENCE
+    )
+    return step_def, base
+
+
+class _Obs:
+    def __init__(self, **kwargs: object) -> None:
+        self.__dict__.update(kwargs)
+
+
+def _state_machine_step() -> Callable[[], object]:
+    from packages.core.logic.state_machine import (
+        apply_cmdb_validation,
+        apply_cv_result,
+        approve_override,
+        on_evidence_uploaded,
+        start_step,
+    )
+
+    step_def, base = _step_fixtures()
+    port = _Obs(panel_id="PANEL-A", port_label="24", confidence=0.95)
+    tag = _Obs(cable_tag="MDF-01-R12-P24", confidence=0.96)
+    mismatch = _Obs(match=False, reason="port mismatch")
+
+    def run() -> object:
+        start_step(step_def)
+        result = on_evidence_uploaded(base, "EVID-001")
+        result = apply_cv_result(step_def, result, port, tag)
+        result = apply_cmdb_validation(step_def, result, mismatch)
+        return approve_override(result, "bench")
+
+    return run
+
+
+def _proofpack_with_steps(n_steps: int) -> tuple:
+    from packages.core.logic.proofpack import update_proofpack
+    from packages.core.models.proofpack import EvidenceRef
+    from packages.core.models.steps import StepResult, StepStatus
+
+    proofpack = None
+    for i in range(n_steps):
+        result = StepResult(
+            change_id="CHG-BENCH",
+            step_id=f"S{i}",
+            status=StepStatus.VERIFIED,
+            evidence_ids=[f"EVID-{i:03d}"],
+            observed_port_label="24",
+            observed_cable_tag="MDF-01-R12-P24",
+            confidence=0.95,
+        )
+        ev = EvidenceRef(evidence_id=f"EVID-{i:03d}", path=f"evidence/EVID-{i:03d}")
+        proofpack = update_proofpack(proofpack, "CHG-BENCH", result, ev)
+    return proofpack, result, ev
+
+
+def _update_proofpack() -> Callable[[], object]:
+    from packages.core.logic.proofpack import update_proofpack
+
+    proofpack, result, ev = _proofpack_with_steps(20)
+    return lambda: update_proofpack(proofpack, "CHG-BENCH", result, ev)
+
+
+def _runtime_proofpack_roundtrip() -> Callable[[], object]:
+    from packages.core.runtime import load_proofpack, save_proofpack
+
+    proofpack, _, _ = _proofpack_with_steps(20)
+
+    def run() -> object:
+        save_proofpack(proofpack)
+        return load_proofpack("CHG-BENCH")
+
+    return run
+
+
+def _runtime_step_log_append() -> Callable[[], object]:
+    from packages.core.runtime import _runtime_dir, append_step_result_log
+
+    _, result, _ = _proofpack_with_steps(1)
+    for _ in range(100):
+        append_step_result_log(result)
+    log_path = _runtime_dir() / "step_results.json"
+    snapshot = log_path.read_text(encoding="utf-8")
+
+    def run() -> None:
+        # Keep the log at 100 entries so every call measures the same file size.
+        log_path.write_text(snapshot, encoding="utf-8")
+        append_step_result_log(result)
+
+    return run
+
+
+def _runtime_step_prompt() -> Callable[[], object]:
+    from packages.core.runtime import get_step_prompt, save_step_prompt
+
+    for i in range(50):
+        save_step_prompt(f"CHG-{i:03d}", "S1", "Photograph the port label and cable tag.")
+
+    def run() -> object:
+        save_step_prompt("CHG-BENCH", "S1", "Photograph the port label and cable tag.")
+        return get_step_prompt("CHG-BENCH", "S1")
+
+    return run
+
+
+CALIBRATION = BenchCase("calibration", _calibration)
+
+CASES: list[BenchCase] = [
+    BenchCase("cv.parse_port_label", _parse_port_label),
+    BenchCase("cv.parse_cable_tag", _parse_cable_tag),
+    BenchCase("vision.compute_image_quality", _compute_image_quality),
+    BenchCase("logic.state_machine_step", _state_machine_step),
+    BenchCase("logic.update_proofpack", _update_proofpack),
+    BenchCase("runtime.proofpack_roundtrip", _runtime_proofpack_roundtrip),
+    BenchCase("runtime.step_log_append", _runtime_step_log_append),
+    BenchCase("runtime.step_prompt", _runtime_step_prompt),
+]
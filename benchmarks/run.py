@@ -0,0 +1,163 @@
+"""Plain-script benchmark runner with baseline comparison.
+
+    python -m benchmarks.run                      # compare against benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline    # record a new baseline
+    python -m benchmarks.run --threshold 0.5 --only cv.
+
+Per-call times are normalized by a fixed pure-Python calibration workload before
+comparing, so a baseline recorded on another machine is still a useful guardrail.
+Exits 1 when any case is slower than baseline by more than --threshold, and 2 when
+the inputs differ from the baseline's (synth vs fallback): generate the dataset with
+`make synth` before comparing, or pass --allow-input-mismatch to compare anyway.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+from benchmarks.cases import CALIBRATION, CASES, BenchCase, inputs, runtime_sandbox
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.30
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run InfraSentinel hot-path benchmarks.")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON path")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown vs baseline (0.30 = 30%%)",
+    )
+    parser.add_argument("--only", default="", help="Run cases whose name starts with this prefix")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per case (min is kept)")
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="Target seconds per repeat (sets loop count)"
+    )
+    parser.add_argument(
+        "--allow-input-mismatch",
+        action="store_true",
+        help="Compare even when inputs (synth/fallback) differ from the baseline's",
+    )
+    parser.add_argument("--json", dest="json_out", default=None, help="Write results JSON here")
+    return parser.parse_args(argv)
+
+
+def measure(case: BenchCase, repeat: int = 5, min_time: float = 0.05) -> float:
+    """Best per-call time in microseconds."""
+    fn = case.setup()
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    # autorange targets 0.2s; scale the loop count to min_time per repeat.
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e6
+
+
+def run_cases(
+    cases: list[BenchCase], repeat: int = 5, min_time: float = 0.05
+) -> dict:
+    with runtime_sandbox():
+        results = {case.name: round(measure(case, repeat, min_time), 3) for case in cases}
+        calibration = round(measure(CALIBRATION, repeat, min_time), 3)
+    return {
+        "calibration_us": calibration,
+        "cases": {name: {"per_call_us": us} for name, us in results.items()},
+        "inputs": inputs().source,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+
+class InputMismatchError(ValueError):
+    """Current and baseline runs used different inputs, so their times are not comparable."""
+
+
+def compare(
+    current: dict, baseline: dict, threshold: float, allow_input_mismatch: bool = False
+) -> list[dict]:
+    """Per-case ratio of normalized current vs baseline time; flags regressions.
+
+    Raises InputMismatchError when both runs record their input source and the
+    sources differ, unless allow_input_mismatch.
+    """
+    cur_inputs, base_inputs = current.get("inputs"), baseline.get("inputs")
+    if cur_inputs and base_inputs and cur_inputs != base_inputs:
+        if not allow_input_mismatch:
+            raise InputMismatchError(
+                f"inputs are {cur_inputs!r} but the baseline was recorded with {base_inputs!r}"
+            )
+        logger.warning("comparing %r inputs against a %r baseline", cur_inputs, base_inputs)
+    rows: list[dict] = []
+    cur_cal = current["calibration_us"] or 1.0
+    base_cal = baseline.get("calibration_us") or 1.0
+    for name, cur in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            rows.append({"name": name, "current_us": cur["per_call_us"], "ratio": None, "regressed": False})
+            continue
+        ratio = (cur["per_call_us"] / cur_cal) / (base["per_call_us"] / base_cal)
+        rows.append(
+            {
+                "name": name,
+                "current_us": cur["per_call_us"],
+                "baseline_us": base["per_call_us"],
+                "ratio": round(ratio, 3),
+                "regressed": ratio > 1.0 + threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    cases = [c for c in CASES if c.name.startswith(args.only)]
+    current = run_cases(cases, args.repeat, args.min_time)
+    baseline_path = Path(args.baseline)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(current, indent=2), encoding="utf-8")
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote baseline {baseline_path} ({len(cases)} cases, inputs={current['inputs']})")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline first.")
+        return 1
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    try:
+        rows = compare(current, baseline, args.threshold, args.allow_input_mismatch)
+    except InputMismatchError as e:
+        print(f"Not comparable: {e}. Run `make synth` first, or pass --allow-input-mismatch.")
+        return 2
+    width = max(len(r["name"]) for r in rows) if rows else 10
+    print(f"{'case':<{width}}  {'current_us':>11} {'baseline_us':>12} {'ratio':>7}")
+    for r in rows:
+        ratio = "new" if r["ratio"] is None else f"{r['ratio']:.2f}"
+        flag = "  REGRESSION" if r["regressed"] else ""
+        print(
+            f"{r['name']:<{width}}  {r['current_us']:>11.2f} {r.get('baseline_us', 0):>12.2f} "
+            f"{ratio:>7}{flag}"
+        )
+    regressed = [r["name"] for r in rows if r["regressed"]]
+    if regressed:
+        print(f"{len(regressed)} case(s) regressed beyond {args.threshold:.0%}: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
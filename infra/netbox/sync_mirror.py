@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Refresh the local CMDB mirror from NetBox (incremental by last_updated; --full prunes deletions)."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+
+from packages.core.config import get_settings
+from services.mcp_netbox.src.mirror import CMDBMirror
+from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--full", action="store_true", help="Refetch everything and prune deleted rows")
+    parser.add_argument(
+        "--interval", type=float, default=0, help="Keep syncing every N seconds (0 = run once)"
+    )
+    parser.add_argument(
+        "--full-every", type=int, default=24, help="With --interval, run a full sync every N passes"
+    )
+    parser.add_argument("--status", action="store_true", help="Print mirror status and exit")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> int:
+    settings = get_settings()
+    mirror = CMDBMirror(settings.cmdb_mirror_url)
+    client = AsyncNetBoxClient(
+        settings.netbox_url,
+        settings.netbox_token,
+        timeout=settings.netbox_timeout,
+        retries=settings.netbox_retries,
+        max_connections=settings.netbox_max_connections,
+    )
+    try:
+        if args.status:
+            print(json.dumps(await mirror.status(), indent=2))
+            return 0
+        passes = 0
+        while True:
+            full = args.full or (args.interval > 0 and passes % max(1, args.full_every) == 0)
+            try:
+                fetched = await mirror.sync(client, full=full)
+                print(f"{'full' if full else 'delta'} sync: {fetched}", file=sys.stderr)
+            except Exception as exc:
+                # Keep serving the previous mirror; retry on the next pass.
+                print(f"sync failed: {exc}", file=sys.stderr)
+                if args.interval <= 0:
+                    return 1
+            passes += 1
+            if args.interval <= 0:
+                return 0
+            await asyncio.sleep(args.interval)
+    finally:
+        await client.aclose()
+        await mirror.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    return asyncio.run(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
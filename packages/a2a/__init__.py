@@ -2,7 +2,18 @@
 
 __version__ = "0.1.0"
 
-from packages.a2a.schema import AgentCard, A2AMessage, A2AResponse
-from packages.a2a.client import A2AClient
+from packages.a2a.schema import A2ABatch, A2ABatchResponse, AgentCard, A2AMessage, A2AResponse
+from packages.a2a.breaker import CircuitBreaker, CircuitOpenError
+from packages.a2a.client import A2AClient, get_a2a_client
 
-__all__ = ["AgentCard", "A2AMessage", "A2AResponse", "A2AClient"]
+__all__ = [
+    "AgentCard",
+    "A2AMessage",
+    "A2AResponse",
+    "A2ABatch",
+    "A2ABatchResponse",
+    "A2AClient",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "get_a2a_client",
+]
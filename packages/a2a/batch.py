@@ -0,0 +1,37 @@
+"""Server side of POST /a2a/message/batch: answer messages concurrently, one status each."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+from packages.a2a.schema import A2AMessage, A2AResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def answer_batch(
+    messages: list[A2AMessage],
+    advise: Callable[[A2AMessage], dict],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[A2AResponse]:
+    """Run advise() for each message in worker threads; responses in message order.
+
+    A message whose advise() raises gets status "error" with the message in
+    notes; the others are unaffected.
+    """
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def answer(msg: A2AMessage) -> A2AResponse:
+        async with limit:
+            try:
+                out = await asyncio.to_thread(advise, msg)
+            except Exception as exc:
+                logger.exception("batch message %s failed", msg.message_id)
+                return A2AResponse(message_id=msg.message_id, status="error", output={}, notes=str(exc))
+        return A2AResponse(message_id=msg.message_id, status="ok", output=out, notes=None)
+
+    return list(await asyncio.gather(*(answer(m) for m in messages)))
@@ -0,0 +1,112 @@
+"""Circuit breaker for advisory A2A agents.
+
+After failure_threshold consecutive failures the breaker opens and calls fail
+fast (CircuitOpenError), so callers go straight to their local fallback. With
+a probe, a background task checks the agent every reset_timeout seconds and
+closes the breaker when it answers; without one, the first call after
+reset_timeout is let through as a trial.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """The breaker is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        probe: Callable[[], Awaitable[bool]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._probe = probe
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._probe_task: asyncio.Task | None = None
+        self.opened = 0  # times the breaker has opened
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self._probe is None and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a call may go ahead now."""
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self._trial:
+            self._trial = True
+            return
+        raise CircuitOpenError(f"A2A agent {self.name} unavailable (circuit open)")
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("A2A agent %s recovered; circuit closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None:
+            # A failed trial re-opens for another reset_timeout.
+            self._opened_at = self._clock()
+            self._trial = False
+            return
+        if self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+            self.opened += 1
+            logger.warning(
+                "A2A agent %s failed %d times; circuit open, using local advice", self.name, self._failures
+            )
+            self._start_probe()
+
+    def _start_probe(self) -> None:
+        if self._probe is None or (self._probe_task is not None and not self._probe_task.done()):
+            return
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+        except RuntimeError:  # no event loop (sync caller): fall back to a trial call
+            self._probe = None
+
+    async def _probe_loop(self) -> None:
+        while self._opened_at is not None:
+            await asyncio.sleep(self.reset_timeout)
+            try:
+                ok = await self._probe()  # type: ignore[misc]
+            except Exception:
+                ok = False
+            if ok:
+                self.record_success()
+
+    async def aclose(self) -> None:
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._probe_task
+            self._probe_task = None
@@ -0,0 +1,167 @@
+"""Content-hash cache for agent advice.
+
+MOP, vision and CMDB advice depend only on the agent, its input and the
+agent/model version, so identical requests (the same MOP template on many
+changes) are answered from cache. Keys are a SHA-256 over canonical JSON of
+(agent, input, version). Entries expire after a TTL, the cache keeps at most
+max_entries (least recently used go first), and with a path entries are also
+written to SQLite and survive restarts. The A2A client, the agent servers and
+the worker's local fallback all use it; hits and misses are counted per agent.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from opentelemetry import metrics
+from pydantic_core import to_jsonable_python
+
+from packages.core.metrics import note_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_lookups = metrics.get_meter("infrasentinel.a2a").create_counter(
+    "a2a.advice.cache.lookups", description="Advice cache lookups by agent and hit"
+)
+
+
+def advice_key(agent: str, input_data: Any, version: str = "") -> str:
+    """Hex SHA-256 of canonical JSON for (agent, input, version)."""
+    canonical = json.dumps(
+        [agent, to_jsonable_python(input_data), version],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AdviceCache:
+    def __init__(self, ttl: float = 3600.0, max_entries: int = 4096, path: Path | None = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (stored_at, JSON text); values are decoded fresh on every hit
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._stats: dict[str, dict[str, int]] = {}
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            self._open(Path(path))
+
+    def _open(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS advice (key TEXT PRIMARY KEY, stored_at REAL, value TEXT)"
+        )
+        self._db.execute("DELETE FROM advice WHERE stored_at < ?", (time.time() - self.ttl,))
+        rows = self._db.execute(
+            "SELECT key, stored_at, value FROM advice ORDER BY stored_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        self._db.commit()
+        for key, stored_at, value in reversed(rows):
+            self._entries[key] = (stored_at, value)
+        logger.info("advice cache loaded %d entries from %s", len(rows), path)
+
+    def _count(self, agent: str, hit: bool) -> None:
+        stats = self._stats.setdefault(agent, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+        note_cache_lookup("advice", hit)
+        _lookups.add(1, {"agent": agent, "hit": hit})
+
+    def get(self, agent: str, key: str) -> dict | None:
+        """Cached output for key, or None (counted as a miss for agent)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            self._count(agent, entry is not None)
+        return None if entry is None else json.loads(entry[1])
+
+    def put(self, key: str, output: dict) -> None:
+        if self.ttl <= 0:
+            return
+        stored_at = time.time()
+        value = json.dumps(to_jsonable_python(output), separators=(",", ":"))
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO advice VALUES (?, ?, ?)", (key, stored_at, value))
+                self._db.executemany("DELETE FROM advice WHERE key = ?", [(k,) for k in evicted])
+                self._db.commit()
+
+    def wrap(self, agent: str, advise: Callable[..., dict], version: str = "") -> Callable[..., dict]:
+        """advise(input_data) answered from cache when the same input was seen before."""
+
+        def cached(input_data: Any) -> dict:
+            key = advice_key(agent, input_data, version)
+            out = self.get(agent, key)
+            if out is None:
+                out = advise(input_data)
+                self.put(key, out)
+            return out
+
+        return cached
+
+    def stats(self) -> dict:
+        """Entries, and hits/misses/hit_rate per agent."""
+        with self._lock:
+            per_agent: dict[str, dict[str, float]] = {
+                agent: dict(counts) for agent, counts in self._stats.items()
+            }
+            entries = len(self._entries)
+        for counts in per_agent.values():
+            lookups = counts["hits"] + counts["misses"]
+            counts["hit_rate"] = round(counts["hits"] / lookups, 4) if lookups else 0.0
+        return {"entries": entries, "agents": per_agent}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM advice")
+                self._db.commit()
+
+
+def advice_version(agent_version: str = "") -> str:
+    """Version part of advice keys: agent version, LLM provider/model and ADVICE_CACHE_VERSION."""
+    from packages.agents.llm import llm_model_tag
+    from packages.core.config import get_settings
+
+    return "|".join([agent_version, llm_model_tag(), get_settings().advice_cache_version])
+
+
+_cache: AdviceCache | None = None
+
+
+def get_advice_cache() -> AdviceCache:
+    """Process-wide advice cache from settings (ADVICE_CACHE_*)."""
+    global _cache
+    if _cache is None:
+        from packages.core.config import get_settings
+
+        settings = get_settings()
+        _cache = AdviceCache(
+            ttl=settings.advice_cache_ttl,
+            max_entries=settings.advice_cache_max_entries,
+            path=settings.advice_cache_path,
+        )
+    return _cache
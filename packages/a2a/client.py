@@ -1,26 +1,94 @@
-"""A2A HTTP client with retries and timeouts."""
+"""A2A HTTP client with retries, timeouts and a circuit breaker."""
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import logging
+import random
+import time
 import uuid
 
 import httpx
 
-from packages.a2a.schema import AgentCard, A2AResponse
+from packages.a2a.breaker import CircuitBreaker
+from packages.a2a.cache import AdviceCache, advice_key, advice_version, get_advice_cache
+from packages.a2a.schema import MAX_BATCH_MESSAGES, AgentCard, A2AResponse
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS = {429, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
 
 
 class A2AClient:
-    """HTTP client for A2A agent services."""
+    """HTTP client for A2A agent services.
+
+    send_async() goes over one keep-alive connection pool (HTTP/2 when the h2
+    package is installed), retries transport errors and 429/502/503/504 with
+    jittered exponential backoff, and gives up after `deadline` seconds in
+    total. Failures feed a circuit breaker: once it opens, send_async() raises
+    CircuitOpenError immediately and a background probe of the agent card
+    closes it again when the agent is back. Advisory callers catch the error
+    and use local advice. With a cache, an input already answered (same agent,
+    input and cache_version) is returned without a request.
+    """
 
     def __init__(
         self,
         base_url: str,
         timeout: float = 30.0,
         max_retries: int = 2,
+        *,
+        backoff: float = 0.2,
+        deadline: float | None = None,
+        max_connections: int = 10,
+        http2: bool = True,
+        breaker: CircuitBreaker | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: AdviceCache | None = None,
+        cache_version: str = "",
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout
         self._max_retries = max_retries
+        self._backoff = backoff
+        self._deadline = deadline
+        self._max_connections = max_connections
+        self._http2 = http2
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self.breaker = breaker or CircuitBreaker(self._base_url, probe=self._probe)
+        self.cache = cache
+        self._cache_version = cache_version
+
+    def _async_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = self._http2 and self._transport is None and _http2_available()
+            if self._http2 and not http2 and self._transport is None:
+                logger.info("h2 not installed; A2A client to %s uses HTTP/1.1 keep-alive", self._base_url)
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                http2=http2,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        try:
+            await self.breaker.aclose()
+        finally:
+            if self._client is not None:
+                client, self._client = self._client, None
+                await client.aclose()
 
     def get_agent_card(self) -> AgentCard:
         """Fetch agent card from GET /a2a/agent-card."""
@@ -30,6 +98,62 @@ class A2AClient:
             data = resp.json()
             return AgentCard.model_validate(data)
 
+    async def _probe(self) -> bool:
+        resp = await self._async_client().get("/a2a/agent-card")
+        return resp.status_code == 200
+
+    def _payload(self, agent: str, input_data: dict, context: dict | None) -> dict:
+        return {
+            "message_id": str(uuid.uuid4()),
+            "agent": agent,
+            "input": input_data,
+            "context": context or {},
+        }
+
+    async def _post(self, path: str, payload: dict) -> httpx.Response:
+        client = self._async_client()
+        for attempt in range(self._max_retries + 1):
+            try:
+                resp = await client.post(path, json=payload)
+            except httpx.TransportError:
+                if attempt >= self._max_retries:
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUS or attempt >= self._max_retries:
+                    return resp
+            await asyncio.sleep(random.uniform(0, self._backoff * (2**attempt)))
+        raise AssertionError("unreachable")
+
+    async def _send(self, path: str, payload: dict) -> dict:
+        """POST payload within the deadline, feeding the breaker; the decoded JSON body."""
+        self.breaker.check()
+        try:
+            async with asyncio.timeout(self._deadline):
+                resp = await self._post(path, payload)
+        except (httpx.HTTPError, TimeoutError):
+            self.breaker.record_failure()
+            raise
+        if resp.status_code >= 500 or resp.status_code in RETRY_STATUS:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        resp.raise_for_status()
+        return resp.json()
+
+    def _cached(self, agent: str, input_data: dict) -> tuple[str | None, A2AResponse | None]:
+        """(cache key, cached response or None); no key without a cache."""
+        if self.cache is None:
+            return None, None
+        key = advice_key(agent, input_data, self._cache_version)
+        out = self.cache.get(agent, key)
+        if out is None:
+            return key, None
+        return key, A2AResponse(message_id=str(uuid.uuid4()), status="ok", output=out)
+
+    def _remember(self, key: str | None, resp: A2AResponse) -> None:
+        if key is not None and self.cache is not None and resp.status == "ok":
+            self.cache.put(key, resp.output)
+
     async def send_async(
         self,
         agent: str,
@@ -37,28 +161,49 @@ class A2AClient:
         context: dict | None = None,
     ) -> A2AResponse:
         """Send message to POST /a2a/message/send (async)."""
-        payload = {
-            "message_id": str(uuid.uuid4()),
-            "agent": agent,
-            "input": input_data,
-            "context": context or {},
-        }
-        last_err: Exception | None = None
-        async with httpx.AsyncClient(timeout=self._timeout) as client:
-            for attempt in range(self._max_retries + 1):
-                try:
-                    resp = await client.post(
-                        f"{self._base_url}/a2a/message/send",
-                        json=payload,
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    return A2AResponse.model_validate(data)
-                except (httpx.HTTPError, httpx.RequestError) as e:
-                    last_err = e
-                    if attempt < self._max_retries:
-                        continue
-        raise last_err or RuntimeError("A2A send failed")
+        key, cached = self._cached(agent, input_data)
+        if cached is not None:
+            return cached
+        data = await self._send("/a2a/message/send", self._payload(agent, input_data, context))
+        resp = A2AResponse.model_validate(data)
+        self._remember(key, resp)
+        return resp
+
+    async def send_batch(
+        self,
+        agent: str,
+        inputs: list[dict],
+        context: dict | None = None,
+    ) -> list[A2AResponse]:
+        """Send one message per input via POST /a2a/message/batch; responses in input order.
+
+        Cached inputs are answered locally. The rest are split into requests
+        of MAX_BATCH_MESSAGES, sent concurrently. A message the agent could
+        not answer comes back with status "error"; a failed request raises
+        like send_async().
+        """
+        looked_up = [self._cached(agent, input_data) for input_data in inputs]
+        pending = [i for i, (_, cached) in enumerate(looked_up) if cached is None]
+        messages = [self._payload(agent, inputs[i], context) for i in pending]
+        chunks = [
+            messages[i : i + MAX_BATCH_MESSAGES] for i in range(0, len(messages), MAX_BATCH_MESSAGES)
+        ]
+        bodies = await asyncio.gather(
+            *(self._send("/a2a/message/batch", {"messages": chunk}) for chunk in chunks)
+        )
+        answered: list[A2AResponse] = []
+        for chunk, body in zip(chunks, bodies, strict=True):
+            if len(body["responses"]) != len(chunk):
+                raise RuntimeError(
+                    f"A2A batch to {agent} returned {len(body['responses'])} responses "
+                    f"for {len(chunk)} messages"
+                )
+            answered.extend(A2AResponse.model_validate(r) for r in body["responses"])
+        responses: list[A2AResponse | None] = [cached for _, cached in looked_up]
+        for i, resp in zip(pending, answered, strict=True):
+            self._remember(looked_up[i][0], resp)
+            responses[i] = resp
+        return [resp for resp in responses if resp is not None]
 
     def send(
         self,
@@ -67,12 +212,7 @@ class A2AClient:
         context: dict | None = None,
     ) -> A2AResponse:
         """Send message to POST /a2a/message/send (sync)."""
-        payload = {
-            "message_id": str(uuid.uuid4()),
-            "agent": agent,
-            "input": input_data,
-            "context": context or {},
-        }
+        payload = self._payload(agent, input_data, context)
         last_err: Exception | None = None
         for attempt in range(self._max_retries + 1):
             try:
@@ -87,5 +227,63 @@ class A2AClient:
             except (httpx.HTTPError, httpx.RequestError) as e:
                 last_err = e
                 if attempt < self._max_retries:
-                    continue
+                    time.sleep(random.uniform(0, self._backoff * (2**attempt)))
         raise last_err or RuntimeError("A2A send failed")
+
+
+_async_clients: dict[str, tuple[asyncio.AbstractEventLoop, A2AClient]] = {}
+_closing: set[asyncio.Future] = set()
+
+
+async def _close_quietly(client: A2AClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as exc:  # its loop is gone; the sockets go with it
+        logger.debug("closing stale A2A client failed: %s", exc)
+
+
+def _retire(loop: asyncio.AbstractEventLoop, client: A2AClient) -> None:
+    """Close a client left by another event loop: on that loop if it still runs, else here."""
+    if loop.is_running():
+        future: asyncio.Future = asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+        )
+    else:
+        future = asyncio.ensure_future(_close_quietly(client))
+    _closing.add(future)
+    future.add_done_callback(_closing.discard)
+
+
+def get_a2a_client(base_url: str) -> A2AClient:
+    """Shared client per agent URL for the running event loop (A2A_* settings)."""
+    from packages.core.config import get_settings
+
+    loop = asyncio.get_running_loop()
+    cached = _async_clients.get(base_url)
+    if cached is not None and cached[0] is loop:
+        return cached[1]
+    if cached is not None:
+        _retire(*cached)
+    settings = get_settings()
+    client = A2AClient(
+        base_url,
+        timeout=settings.a2a_timeout,
+        max_retries=settings.a2a_retries,
+        backoff=settings.a2a_backoff,
+        deadline=settings.a2a_deadline,
+        max_connections=settings.a2a_max_connections,
+        http2=settings.a2a_http2,
+        cache=get_advice_cache() if settings.advice_cache_ttl > 0 else None,
+        cache_version=f"{base_url}|{advice_version()}",
+    )
+    client.breaker.failure_threshold = settings.a2a_breaker_failures
+    client.breaker.reset_timeout = settings.a2a_breaker_reset
+    _async_clients[base_url] = (loop, client)
+    return client
+
+
+async def close_a2a_clients() -> None:
+    clients = [client for _, client in _async_clients.values()]
+    _async_clients.clear()
+    for client in clients:
+        await client.aclose()
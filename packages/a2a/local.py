@@ -0,0 +1,126 @@
+"""The MOP, vision and CMDB agents as in-process handlers.
+
+The per-agent services, the combined agent host and in-process dispatch from
+the worker (A2A_MODE=in-process) all answer messages through these handlers,
+so the advice, cards and caching are the same whichever way an agent is
+reached. LocalA2AClient has A2AClient's send_async/send_batch interface but
+hands the input dict straight to the handler: no HTTP, no JSON round trip.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from packages.a2a.cache import advice_version, get_advice_cache
+from packages.a2a.schema import A2AMessage, A2AResponse, AgentCard
+from packages.agents.cmdb import cmdb_advice
+from packages.agents.mop import mop_advice
+from packages.agents.vision import vision_advice
+from packages.core.models.steps import StepDefinition
+
+AGENT_VERSION = "0.1.0"
+ENDPOINTS = {"send": "/a2a/message/send", "batch": "/a2a/message/batch"}
+
+
+@dataclass(frozen=True)
+class LocalAgent:
+    name: str
+    card: AgentCard
+    advice: Callable[[dict], dict]  # message input -> output, uncached
+
+    def advise(self, msg: A2AMessage) -> dict:
+        """Output for msg, from the advice cache when the same input was answered before."""
+        version = advice_version(self.card.version)
+        return get_advice_cache().wrap(self.name, self.advice, version)(msg.input)
+
+
+def _mop(input_data: dict) -> dict:
+    step_def = StepDefinition.model_validate(input_data.get("step_def", {}))
+    return mop_advice(step_def)
+
+
+def _vision(input_data: dict) -> dict:
+    step_def = StepDefinition.model_validate(input_data.get("step_def", {}))
+    quality_metrics = input_data.get("quality_metrics")
+    cv_port_out = input_data.get("cv_port_out", {})
+    cv_tag_out = input_data.get("cv_tag_out", {})
+    return vision_advice(step_def, quality_metrics, cv_port_out, cv_tag_out)
+
+
+def _cmdb(input_data: dict) -> dict:
+    step_def = StepDefinition.model_validate(input_data.get("step_def", {}))
+    cmdb_out = input_data.get("cmdb_out", {})
+    return cmdb_advice(step_def, cmdb_out)
+
+
+AGENTS: dict[str, LocalAgent] = {
+    "mop": LocalAgent(
+        "mop",
+        AgentCard(
+            name="MOPComplianceAgent",
+            version=AGENT_VERSION,
+            capabilities=["Determine required evidence per MOP step", "Generate technician prompt"],
+            endpoints=ENDPOINTS,
+        ),
+        _mop,
+    ),
+    "vision": LocalAgent(
+        "vision",
+        AgentCard(
+            name="VisionVerifierAgent",
+            version=AGENT_VERSION,
+            capabilities=["Interpret CV outputs", "Request retake on low-confidence", "Quality-based guidance"],
+            endpoints=ENDPOINTS,
+        ),
+        _vision,
+    ),
+    "cmdb": LocalAgent(
+        "cmdb",
+        AgentCard(
+            name="CMDBValidatorAgent",
+            version=AGENT_VERSION,
+            capabilities=["Interpret NetBox validation", "Decide block vs proceed", "Generate escalation text"],
+            endpoints=ENDPOINTS,
+        ),
+        _cmdb,
+    ),
+}
+
+
+def advise_any(msg: A2AMessage) -> dict:
+    """Route msg to the agent it names; KeyError for an unknown agent."""
+    agent = AGENTS.get(msg.agent)
+    if agent is None:
+        raise KeyError(f"unknown agent {msg.agent!r}")
+    return agent.advise(msg)
+
+
+class LocalA2AClient:
+    """A2AClient stand-in that calls the agent handlers in this process.
+
+    Handler errors raise from send_async() (the caller falls back to local
+    advice, as after an HTTP failure) and become status "error" responses in
+    send_batch().
+    """
+
+    async def send_async(self, agent: str, input_data: dict, context: dict | None = None) -> A2AResponse:
+        msg = A2AMessage.model_construct(
+            message_id=str(uuid.uuid4()), agent=agent, input=input_data, context=context or {}
+        )
+        return A2AResponse(message_id=msg.message_id, status="ok", output=advise_any(msg))
+
+    async def send_batch(
+        self, agent: str, inputs: list[dict], context: dict | None = None
+    ) -> list[A2AResponse]:
+        responses = []
+        for input_data in inputs:
+            try:
+                responses.append(await self.send_async(agent, input_data, context))
+            except Exception as exc:
+                responses.append(A2AResponse(status="error", output={}, notes=str(exc)))
+        return responses
+
+    async def aclose(self) -> None:
+        pass
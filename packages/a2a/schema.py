@@ -4,6 +4,9 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+# Messages per POST /a2a/message/batch request.
+MAX_BATCH_MESSAGES = 32
+
 
 class AgentCard(BaseModel):
     """Agent capability card exposed at GET /a2a/agent-card."""
@@ -31,3 +34,15 @@ class A2AResponse(BaseModel):
     status: str = "ok"
     output: dict = Field(default_factory=dict)
     notes: str | None = None
+
+
+class A2ABatch(BaseModel):
+    """Several messages to one agent in a single request."""
+
+    messages: list[A2AMessage] = Field(max_length=MAX_BATCH_MESSAGES)
+
+
+class A2ABatchResponse(BaseModel):
+    """One response per message, in request order; failures have status "error"."""
+
+    responses: list[A2AResponse] = Field(default_factory=list)
@@ -24,6 +24,7 @@ def cmdb_advice(
     needs_approval = approval and approval.required
     escalation_text = (
         f"CMDB mismatch for step {step_def.step_id}: {reason}. "
+        + _nearest_labels_text(cmdb_out.get("suggestions") or [])
         + ("Approval required to override." if needs_approval else "")
     )
     return {
@@ -31,3 +32,13 @@ def cmdb_advice(
         "reason": reason or "CMDB mismatch",
         "escalation_text": escalation_text,
     }
+
+
+def _nearest_labels_text(suggestions: list[dict]) -> str:
+    if not suggestions:
+        return ""
+    nearest = ", ".join(
+        f"'{s.get('candidate')}' ({s.get('distance')} edit{'s' if s.get('distance') != 1 else ''})"
+        for s in suggestions
+    )
+    return f"Nearest CMDB values: {nearest}; verify physically before approving. "
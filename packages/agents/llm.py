@@ -1,5 +1,12 @@
 """LLM client for text generation (Claude/LiteLLM). Mock mode = deterministic.
 
+Calls go through an async LLMClient shared per event loop: one Anthropic or
+HTTP client with keep-alive, at most LLM_MAX_CONCURRENCY requests in flight,
+a token bucket of LLM_RATE_LIMIT requests per second (bursts up to
+LLM_BURST), and backoff with asyncio.sleep, so a slow or rate-limited LLM
+never blocks the event loop. Async code uses acall_llm() and the a*
+generators; the sync functions run the same client on a background loop.
+
 Error classification:
   - AuthenticationError  → fail immediately (bad API key, no retry)
   - RateLimitError       → retry up to 3x with exponential backoff (1s, 2s, 4s)
@@ -9,16 +16,37 @@ Error classification:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+import threading
 import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any, TypeVar
 
-from opentelemetry import trace
+import httpx
+from opentelemetry import metrics, trace
 
+from packages.core.metrics import LatencyRecorder
 from packages.core.models.steps import StepDefinition
 
 logger = logging.getLogger(__name__)
 _tracer = trace.get_tracer(__name__)
+_meter = metrics.get_meter("infrasentinel.llm")
+_duration = _meter.create_histogram(
+    "llm.call.duration", unit="ms", description="LLM call latency including retries"
+)
+_wait = _meter.create_histogram(
+    "llm.call.wait", unit="ms", description="Time spent waiting for the rate limit and a free slot"
+)
+_tokens = _meter.create_counter("llm.tokens", description="LLM tokens by direction (input/output)")
+_retries = _meter.create_counter("llm.retries", description="LLM retries by error kind")
+
+T = TypeVar("T")
+
+# Retries per error kind; any other kind falls back (or raises with LLM_HARD_FAIL) at once.
+MAX_RETRIES = {"rate_limit": 3, "connection": 2}
 
 
 def get_llm_provider() -> str:
@@ -26,6 +54,14 @@ def get_llm_provider() -> str:
     return os.environ.get("LLM_PROVIDER", "mock").lower()
 
 
+def llm_model_tag() -> str:
+    """Provider and model behind generated text ("mock" when it is deterministic)."""
+    provider = get_llm_provider()
+    if provider == "mock":
+        return provider
+    return f"{provider}:{_model(_get_settings())}"
+
+
 def _get_settings():  # type: ignore[return]
     try:
         from packages.core.config import get_settings
@@ -35,231 +71,409 @@ def _get_settings():  # type: ignore[return]
         return None
 
 
-def generate_tech_prompt(step_def: StepDefinition) -> str:
-    """Generate technician-facing prompt. Mock: deterministic. Prod: Claude."""
-    provider = get_llm_provider()
-    if provider == "mock":
-        from packages.agents.mop import mop_advice
+def _model(settings: Any) -> str:
+    return getattr(settings, "anthropic_model", None) or os.environ.get(
+        "ANTHROPIC_MODEL", "claude-3-5-haiku-20241022"
+    )
 
-        out = mop_advice(step_def)
-        return out.get("tech_prompt", step_def.description)
-    if provider in ("anthropic", "litellm"):
-        return _llm_tech_prompt(step_def)
-    return step_def.description
 
+class TokenBucket:
+    """Async rate limiter: `rate` acquisitions per second, bursts up to `burst`; rate 0 disables."""
+
+    def __init__(
+        self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class LLMReply:
+    text: str
+    fallback_used: bool
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class LLMClient:
+    """Async client for one provider/model, shared by the calls on one event loop.
+
+    complete() waits for the token bucket and a semaphore slot, then sends one
+    request. Retryable errors (rate limits, connection errors) release the slot
+    and back off with asyncio.sleep before trying again, so waiting calls never
+    hold capacity. Failures fall back (fallback_used=True) unless hard_fail.
+    """
 
-def generate_escalation_text(step_def: StepDefinition, cmdb_reason: str) -> str:
-    """Generate escalation text for ticketing. Mock: deterministic. Prod: Claude."""
-    provider = get_llm_provider()
-    if provider == "mock":
-        from packages.agents.cmdb import cmdb_advice
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        api_key: str,
+        base_url: str = "",
+        *,
+        timeout: float = 30.0,
+        max_concurrency: int = 4,
+        rate: float = 0.0,
+        burst: int = 1,
+        backoff: float = 1.0,
+        hard_fail: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        recorder: LatencyRecorder | None = None,
+    ) -> None:
+        self.provider = provider
+        self.model = model
+        self._api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._backoff = backoff
+        self._hard_fail = hard_fail
+        self._transport = transport
+        self._recorder = recorder
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._bucket = TokenBucket(rate, burst)
+        self._http: httpx.AsyncClient | None = None
+        self._anthropic: Any = None
+
+    @property
+    def configured(self) -> bool:
+        if self.provider == "anthropic":
+            return bool(self._api_key)
+        if self.provider == "litellm":
+            return bool(self._base_url and self._api_key)
+        return False
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self._base_url, timeout=self._timeout, transport=self._transport
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._anthropic is not None:
+            await self._anthropic.close()
+            self._anthropic = None
+
+    async def complete(self, prompt: str, max_tokens: int = 80) -> LLMReply:
+        """Generate text for prompt; never raises unless hard_fail."""
+        attrs = {"llm.provider": self.provider, "llm.model": self.model}
+        with _tracer.start_as_current_span("llm.call") as span:
+            span.set_attributes(attrs)
+            span.set_attribute("llm.prompt_length", len(prompt))
+            t0 = time.perf_counter()
+            try:
+                reply = await self._complete(prompt, max_tokens, attrs)
+            except BaseException:
+                self._observe(attrs, time.perf_counter() - t0, ok=False)
+                raise
+            elapsed = time.perf_counter() - t0
+            self._observe(attrs, elapsed, ok=not reply.fallback_used)
+            latency_ms = int(elapsed * 1000)
+            span.set_attribute("llm.latency_ms", latency_ms)
+            span.set_attribute("llm.fallback_used", reply.fallback_used)
+            span.set_attribute("llm.success", not reply.fallback_used)
+            span.set_attribute("llm.input_tokens", reply.input_tokens)
+            span.set_attribute("llm.output_tokens", reply.output_tokens)
+            logger.info(
+                "LLM call: provider=%s model=%s prompt_len=%d latency_ms=%d "
+                "success=%s fallback_used=%s input_tokens=%d output_tokens=%d",
+                self.provider,
+                self.model,
+                len(prompt),
+                latency_ms,
+                not reply.fallback_used,
+                reply.fallback_used,
+                reply.input_tokens,
+                reply.output_tokens,
+            )
+        return reply
+
+    def _observe(self, attrs: dict, seconds: float, ok: bool) -> None:
+        _duration.record(seconds * 1000, {**attrs, "llm.success": ok})
+        if self._recorder is not None:
+            self._recorder.record(f"llm.{self.provider}", seconds, ok=ok)
+
+    async def _complete(self, prompt: str, max_tokens: int, attrs: dict) -> LLMReply:
+        if not self.configured:
+            return LLMReply(prompt[:max_tokens], True)
+        attempt = 0
+        while True:
+            waited = time.perf_counter()
+            await self._bucket.acquire()
+            try:
+                async with self._semaphore:
+                    _wait.record((time.perf_counter() - waited) * 1000, attrs)
+                    reply = await self._request(prompt, max_tokens)
+            except Exception as exc:
+                kind = self._classify(exc)
+                if attempt < MAX_RETRIES.get(kind, 0):
+                    wait = self._backoff * 2**attempt
+                    logger.warning(
+                        "LLM %s %s; retrying in %.1fs (attempt %d)",
+                        self.provider,
+                        kind,
+                        wait,
+                        attempt + 1,
+                    )
+                    _retries.add(1, {**attrs, "llm.error": kind})
+                    await asyncio.sleep(wait)
+                    attempt += 1
+                    continue
+                if kind == "auth":
+                    logger.error("LLM %s authentication failed — check the API key", self.provider)
+                else:
+                    logger.warning("LLM %s call failed (%s): %s", self.provider, kind, exc)
+                if self._hard_fail:
+                    raise
+                return LLMReply("", True)
+            _tokens.add(reply.input_tokens, {**attrs, "llm.direction": "input"})
+            _tokens.add(reply.output_tokens, {**attrs, "llm.direction": "output"})
+            return reply
+
+    async def _request(self, prompt: str, max_tokens: int) -> LLMReply:
+        if self.provider == "anthropic":
+            return await self._call_anthropic(prompt, max_tokens)
+        return await self._call_litellm(prompt, max_tokens)
+
+    def _classify(self, exc: Exception) -> str:
+        """auth | rate_limit | connection | other."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            status = exc.response.status_code
+            if status in (401, 403):
+                return "auth"
+            if status == 429:
+                return "rate_limit"
+            return "connection" if status in (502, 503, 504) else "other"
+        if isinstance(exc, httpx.TransportError):
+            return "connection"
+        if self.provider == "anthropic":
+            import anthropic
+
+            if isinstance(exc, anthropic.AuthenticationError):
+                return "auth"
+            if isinstance(exc, anthropic.RateLimitError):
+                return "rate_limit"
+            if isinstance(exc, anthropic.APIConnectionError):
+                return "connection"
+        return "other"
+
+    async def _call_anthropic(self, prompt: str, max_tokens: int) -> LLMReply:
+        if self._anthropic is None:
+            try:
+                import anthropic
+            except ImportError:
+                logger.warning("anthropic package not installed")
+                return LLMReply("", True)
+            # Retries are ours (outside the semaphore); base_url defaults to ANTHROPIC_BASE_URL.
+            kwargs: dict[str, Any] = {}
+            if self._transport is not None:
+                kwargs["http_client"] = httpx.AsyncClient(transport=self._transport)
+            self._anthropic = anthropic.AsyncAnthropic(
+                api_key=self._api_key,
+                base_url=self._base_url or None,
+                timeout=self._timeout,
+                max_retries=0,
+                **kwargs,
+            )
+        msg = await self._anthropic.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        text = msg.content[0].text.strip() if msg.content else ""
+        usage = getattr(msg, "usage", None)
+        return LLMReply(
+            text,
+            False,
+            getattr(usage, "input_tokens", 0) or 0,
+            getattr(usage, "output_tokens", 0) or 0,
+        )
 
-        out = cmdb_advice(step_def, {"match": False, "reason": cmdb_reason})
-        return out.get("escalation_text", f"CMDB mismatch: {cmdb_reason}") or ""
-    if provider in ("anthropic", "litellm"):
-        return _llm_escalation(step_def, cmdb_reason)
-    return f"CMDB mismatch for step {step_def.step_id}: {cmdb_reason}. Approval required."
+    async def _call_litellm(self, prompt: str, max_tokens: int) -> LLMReply:
+        resp = await self._http_client().post(
+            "/v1/chat/completions",
+            headers={"Authorization": f"Bearer {self._api_key}"},
+            json={
+                "model": self.model,
+                "max_tokens": max_tokens,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        choices = data.get("choices", [])
+        if not choices:
+            return LLMReply("", True)
+        usage = data.get("usage") or {}
+        return LLMReply(
+            choices[0].get("message", {}).get("content", "").strip(),
+            False,
+            usage.get("prompt_tokens", 0),
+            usage.get("completion_tokens", 0),
+        )
 
 
-def _llm_tech_prompt(step_def: StepDefinition) -> str:
-    """Call Claude/LiteLLM for tech prompt. Falls back to deterministic on failure."""
-    api_key = os.environ.get("ANTHROPIC_API_KEY") or os.environ.get("LITELLM_API_KEY")
-    if not api_key:
-        from packages.agents.mop import mop_advice
+_async_clients: dict[tuple, tuple[asyncio.AbstractEventLoop, LLMClient]] = {}
 
-        return mop_advice(step_def).get("tech_prompt", step_def.description)
-    prompt = (
-        f"Write a short technician instruction for this MOP step. "
-        f"One sentence only. Step: {step_def.description}"
+
+def get_llm_client() -> LLMClient:
+    """Shared client for the running event loop, from LLM_* settings and provider env."""
+    provider = get_llm_provider()
+    settings = _get_settings()
+    model = _model(settings)
+    api_key = os.environ.get("ANTHROPIC_API_KEY") or os.environ.get("LITELLM_API_KEY", "")
+    base_url = os.environ.get("LITELLM_BASE_URL", "") if provider == "litellm" else ""
+    key = (provider, model, api_key, base_url)
+    loop = asyncio.get_running_loop()
+    cached = _async_clients.get(key)
+    if cached is not None and cached[0] is loop:
+        return cached[1]
+    client = LLMClient(
+        provider,
+        model,
+        api_key,
+        base_url,
+        timeout=getattr(settings, "llm_timeout", 30.0),
+        max_concurrency=getattr(settings, "llm_max_concurrency", 4),
+        rate=getattr(settings, "llm_rate_limit", 0.0),
+        burst=getattr(settings, "llm_burst", 1),
+        backoff=getattr(settings, "llm_backoff", 1.0),
+        hard_fail=getattr(settings, "llm_hard_fail", False),
     )
-    result, fallback_used = _call_llm(prompt, max_tokens=80)
-    if fallback_used:
-        from packages.agents.mop import mop_advice
+    _async_clients[key] = (loop, client)
+    return client
 
-        return mop_advice(step_def).get("tech_prompt", step_def.description)
-    return result
 
+async def close_llm_clients() -> None:
+    clients = [client for _, client in _async_clients.values()]
+    _async_clients.clear()
+    for client in clients:
+        await client.aclose()
 
-def _llm_escalation(step_def: StepDefinition, cmdb_reason: str) -> str:
-    """Call Claude/LiteLLM for escalation text. Falls back to deterministic on failure."""
-    api_key = os.environ.get("ANTHROPIC_API_KEY") or os.environ.get("LITELLM_API_KEY")
-    if not api_key:
-        from packages.agents.cmdb import cmdb_advice
 
-        out = cmdb_advice(step_def, {"match": False, "reason": cmdb_reason})
-        return out.get("escalation_text", f"CMDB mismatch: {cmdb_reason}") or ""
-    prompt = (
-        f"Write a brief escalation note for ticketing. "
-        f"Step {step_def.step_id}, reason: {cmdb_reason}. One sentence."
-    )
-    result, fallback_used = _call_llm(prompt, max_tokens=100)
-    if fallback_used:
-        from packages.agents.cmdb import cmdb_advice
+async def acall_llm(prompt: str, max_tokens: int = 80) -> tuple[str, bool]:
+    """Call Anthropic or LiteLLM without blocking the loop.  Returns (text, fallback_used).
+
+    Never raises unless LLM_HARD_FAIL=true (in which case AuthenticationError
+    and exhausted-retry errors propagate immediately).
+    """
+    reply = await get_llm_client().complete(prompt, max_tokens)
+    return reply.text, reply.fallback_used
 
-        out = cmdb_advice(step_def, {"match": False, "reason": cmdb_reason})
-        return out.get("escalation_text", f"CMDB mismatch: {cmdb_reason}") or ""
-    return result
+
+_sync_loop: asyncio.AbstractEventLoop | None = None
+_sync_lock = threading.Lock()
+
+
+def _run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coro on a background event loop and wait, so sync callers share one client and its limits."""
+    global _sync_loop
+    with _sync_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="llm-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
 
 
 def _call_llm(prompt: str, max_tokens: int = 80) -> tuple[str, bool]:
-    """Call Anthropic or LiteLLM.  Returns (text, fallback_used).
+    """Blocking acall_llm() for sync callers; async code should await acall_llm()."""
+    return _run_sync(acall_llm(prompt, max_tokens))
 
-    Never raises unless LLM_HARD_FAIL=true (in which case AuthenticationError
-    and exhausted-retry errors propagate immediately).
-    """
-    provider = get_llm_provider()
-    base_url = os.environ.get("LITELLM_BASE_URL", "")
-    api_key = os.environ.get("ANTHROPIC_API_KEY") or os.environ.get("LITELLM_API_KEY", "")
-    settings = _get_settings()
-    hard_fail: bool = getattr(settings, "llm_hard_fail", False) if settings else False
-    model = (
-        getattr(settings, "anthropic_model", None) or os.environ.get("ANTHROPIC_MODEL", "claude-3-5-haiku-20241022")
-    )
 
-    with _tracer.start_as_current_span("llm.call") as span:
-        span.set_attribute("llm.provider", provider)
-        span.set_attribute("llm.model", model)
-        span.set_attribute("llm.prompt_length", len(prompt))
+def _llm_enabled() -> bool:
+    return get_llm_provider() in ("anthropic", "litellm")
 
-        t0 = time.monotonic()
-        result, fallback_used = _dispatch_llm(
-            provider, api_key, base_url, model, prompt, max_tokens, hard_fail
-        )
-        latency_ms = int((time.monotonic() - t0) * 1000)
-
-        span.set_attribute("llm.latency_ms", latency_ms)
-        span.set_attribute("llm.fallback_used", fallback_used)
-        span.set_attribute("llm.success", not fallback_used)
-
-        logger.info(
-            "LLM call: provider=%s model=%s prompt_len=%d latency_ms=%d "
-            "success=%s fallback_used=%s",
-            provider,
-            model,
-            len(prompt),
-            latency_ms,
-            not fallback_used,
-            fallback_used,
-        )
 
-    return result, fallback_used
+def _has_api_key() -> bool:
+    return bool(os.environ.get("ANTHROPIC_API_KEY") or os.environ.get("LITELLM_API_KEY"))
 
 
-def _dispatch_llm(
-    provider: str,
-    api_key: str,
-    base_url: str,
-    model: str,
-    prompt: str,
-    max_tokens: int,
-    hard_fail: bool,
-) -> tuple[str, bool]:
-    if provider == "anthropic" and api_key:
-        return _call_anthropic(api_key, model, prompt, max_tokens, hard_fail)
+def _mock_tech_prompt(step_def: StepDefinition) -> str:
+    from packages.agents.mop import mop_advice
 
-    if provider == "litellm" and base_url and api_key:
-        return _call_litellm(base_url, api_key, model, prompt, max_tokens, hard_fail)
+    return mop_advice(step_def).get("tech_prompt", step_def.description)
 
-    return prompt[:max_tokens], True
 
+def _mock_escalation(step_def: StepDefinition, cmdb_reason: str) -> str:
+    from packages.agents.cmdb import cmdb_advice
 
-def _call_anthropic(
-    api_key: str,
-    model: str,
-    prompt: str,
-    max_tokens: int,
-    hard_fail: bool,
-) -> tuple[str, bool]:
-    try:
-        import anthropic
-    except ImportError:
-        logger.warning("anthropic package not installed")
-        return "", True
-
-    backoff_schedule = [1, 2, 4]
-    client = anthropic.Anthropic(api_key=api_key)
-
-    attempt = 0
-    while True:
-        try:
-            msg = client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            text = msg.content[0].text.strip() if msg.content else ""
-            return text, False
+    out = cmdb_advice(step_def, {"match": False, "reason": cmdb_reason})
+    return out.get("escalation_text", f"CMDB mismatch: {cmdb_reason}") or ""
 
-        except anthropic.AuthenticationError as exc:
-            logger.error("Anthropic authentication failed — check ANTHROPIC_API_KEY")
-            if hard_fail:
-                raise
-            return "", True
-
-        except anthropic.RateLimitError as exc:
-            if attempt < len(backoff_schedule):
-                wait = backoff_schedule[attempt]
-                logger.warning("Anthropic rate limit; retrying in %ds (attempt %d)", wait, attempt + 1)
-                time.sleep(wait)
-                attempt += 1
-                continue
-            logger.warning("Anthropic rate limit exhausted after retries")
-            if hard_fail:
-                raise
-            return "", True
-
-        except anthropic.APIConnectionError as exc:
-            if attempt < 2:
-                wait = backoff_schedule[attempt]
-                logger.warning("Anthropic connection error; retrying in %ds (attempt %d)", wait, attempt + 1)
-                time.sleep(wait)
-                attempt += 1
-                continue
-            logger.warning("Anthropic connection failed after retries: %s", exc)
-            if hard_fail:
-                raise
-            return "", True
 
-        except Exception as exc:
-            logger.warning("Anthropic call failed: %s", exc)
-            if hard_fail:
-                raise
-            return "", True
+def generate_tech_prompt(step_def: StepDefinition) -> str:
+    """Generate technician-facing prompt. Mock: deterministic. Prod: Claude."""
+    if _llm_enabled():
+        return _run_sync(agenerate_tech_prompt(step_def))
+    if get_llm_provider() == "mock":
+        return _mock_tech_prompt(step_def)
+    return step_def.description
 
 
-def _call_litellm(
-    base_url: str,
-    api_key: str,
-    model: str,
-    prompt: str,
-    max_tokens: int,
-    hard_fail: bool,
-) -> tuple[str, bool]:
-    try:
-        import httpx
-    except ImportError:
-        logger.warning("httpx not installed")
-        return "", True
+def generate_escalation_text(step_def: StepDefinition, cmdb_reason: str) -> str:
+    """Generate escalation text for ticketing. Mock: deterministic. Prod: Claude."""
+    if _llm_enabled():
+        return _run_sync(agenerate_escalation_text(step_def, cmdb_reason))
+    if get_llm_provider() == "mock":
+        return _mock_escalation(step_def, cmdb_reason)
+    return f"CMDB mismatch for step {step_def.step_id}: {cmdb_reason}. Approval required."
 
-    try:
-        resp = httpx.post(
-            f"{base_url.rstrip('/')}/v1/chat/completions",
-            headers={"Authorization": f"Bearer {api_key}"},
-            json={
-                "model": model,
-                "max_tokens": max_tokens,
-                "messages": [{"role": "user", "content": prompt}],
-            },
-            timeout=30,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        choices = data.get("choices", [])
-        if choices:
-            return choices[0].get("message", {}).get("content", "").strip(), False
-        return "", True
-    except Exception as exc:
-        logger.warning("LiteLLM call failed: %s", exc)
-        if hard_fail:
-            raise
-        return "", True
+
+async def agenerate_tech_prompt(step_def: StepDefinition) -> str:
+    """generate_tech_prompt() for async callers."""
+    if not _llm_enabled():
+        return generate_tech_prompt(step_def)
+    return await _llm_tech_prompt(step_def)
+
+
+async def agenerate_escalation_text(step_def: StepDefinition, cmdb_reason: str) -> str:
+    """generate_escalation_text() for async callers."""
+    if not _llm_enabled():
+        return generate_escalation_text(step_def, cmdb_reason)
+    return await _llm_escalation(step_def, cmdb_reason)
+
+
+async def _llm_tech_prompt(step_def: StepDefinition) -> str:
+    """Call Claude/LiteLLM for tech prompt. Falls back to deterministic on failure."""
+    if not _has_api_key():
+        return _mock_tech_prompt(step_def)
+    prompt = (
+        f"Write a short technician instruction for this MOP step. "
+        f"One sentence only. Step: {step_def.description}"
+    )
+    result, fallback_used = await acall_llm(prompt, max_tokens=80)
+    if fallback_used:
+        return _mock_tech_prompt(step_def)
+    return result
+
+
+async def _llm_escalation(step_def: StepDefinition, cmdb_reason: str) -> str:
+    """Call Claude/LiteLLM for escalation text. Falls back to deterministic on failure."""
+    if not _has_api_key():
+        return _mock_escalation(step_def, cmdb_reason)
+    prompt = (
+        f"Write a brief escalation note for ticketing. "
+        f"Step {step_def.step_id}, reason: {cmdb_reason}. One sentence."
+    )
+    result, fallback_used = await acall_llm(prompt, max_tokens=100)
+    if fallback_used:
+        return _mock_escalation(step_def, cmdb_reason)
+    return result
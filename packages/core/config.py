@@ -17,6 +17,21 @@ class Settings(BaseSettings):
     temporal_address: str = Field(default="localhost:7233", alias="TEMPORAL_ADDRESS")
     temporal_namespace: str = Field(default="default", alias="TEMPORAL_NAMESPACE")
     temporal_task_queue: str = Field(default="infrasentinel-task-queue", alias="TEMPORAL_TASK_QUEUE")
+    temporal_cv_task_queue: str = Field(
+        default="infrasentinel-cv-task-queue", alias="TEMPORAL_CV_TASK_QUEUE"
+    )
+
+    # Worker role: all (I/O + CV workers in one process) | io | cv
+    worker_role: str = Field(default="all", alias="WORKER_ROLE")
+    worker_io_max_concurrent_activities: int = Field(
+        default=100, alias="WORKER_IO_MAX_CONCURRENT_ACTIVITIES"
+    )
+    # 0 = match WORKER_CV_PROCESSES so tasks never wait inside the pool holding a slot.
+    worker_cv_max_concurrent_activities: int = Field(
+        default=0, alias="WORKER_CV_MAX_CONCURRENT_ACTIVITIES"
+    )
+    # 0 = os.cpu_count()
+    worker_cv_processes: int = Field(default=0, alias="WORKER_CV_PROCESSES")
 
     database_url: str = Field(
         default="sqlite+aiosqlite:///./.data/infrasentinel.db", alias="DATABASE_URL"
@@ -24,6 +39,8 @@ class Settings(BaseSettings):
 
     evidence_backend: str = Field(default="local", alias="EVIDENCE_BACKEND")
     local_evidence_dir: Path = Field(default=Path("./.data/evidence"), alias="LOCAL_EVIDENCE_DIR")
+    # Content-addressed spool shared by camera and CV; defaults to <LOCAL_EVIDENCE_DIR>/spool.
+    evidence_spool_dir: Path | None = Field(default=None, alias="EVIDENCE_SPOOL_DIR")
 
     minio_endpoint: str = Field(default="localhost:9000", alias="MINIO_ENDPOINT")
     minio_access_key: str = Field(default="minio", alias="MINIO_ACCESS_KEY")
@@ -33,6 +50,19 @@ class Settings(BaseSettings):
     netbox_url: str = Field(default="http://localhost:8001", alias="NETBOX_URL")
     netbox_token: str = Field(default="", alias="NETBOX_TOKEN")
     netbox_mode: str = Field(default="mock", alias="NETBOX_MODE")
+    netbox_timeout: float = Field(default=10.0, alias="NETBOX_TIMEOUT")
+    netbox_retries: int = Field(default=2, alias="NETBOX_RETRIES")
+    netbox_max_connections: int = Field(default=20, alias="NETBOX_MAX_CONNECTIONS")
+    netbox_lookup: str = Field(default="rest", alias="NETBOX_LOOKUP")
+    netbox_webhook_secret: str | None = Field(default=None, alias="NETBOX_WEBHOOK_SECRET")
+    cmdb_cache_backend: str = Field(default="memory", alias="CMDB_CACHE_BACKEND")
+    cmdb_cache_ttl: float = Field(default=300.0, alias="CMDB_CACHE_TTL")
+    cmdb_cache_negative_ttl: float = Field(default=30.0, alias="CMDB_CACHE_NEGATIVE_TTL")
+    cmdb_cache_redis_url: str = Field(default="redis://localhost:6379/0", alias="CMDB_CACHE_REDIS_URL")
+    cmdb_source: str = Field(default="live", alias="CMDB_SOURCE")
+    cmdb_mirror_url: str = Field(
+        default="sqlite+aiosqlite:///./.data/cmdb_mirror.db", alias="CMDB_MIRROR_URL"
+    )
 
     infra_api_key: str | None = Field(default=None, alias="INFRA_API_KEY")
     auth_reads: bool = Field(default=False, alias="AUTH_READS")
@@ -46,10 +76,25 @@ class Settings(BaseSettings):
     min_width: int = Field(default=800, alias="QUALITY_MIN_W")
     min_height: int = Field(default=600, alias="QUALITY_MIN_H")
 
+    # off (local advice), http (agent services) or in-process (agent handlers in the worker)
     a2a_mode: str = Field(default="off", alias="A2A_MODE")
     a2a_mop_url: str = Field(default="http://localhost:8091", alias="A2A_MOP_URL")
     a2a_vision_url: str = Field(default="http://localhost:8092", alias="A2A_VISION_URL")
     a2a_cmdb_url: str = Field(default="http://localhost:8093", alias="A2A_CMDB_URL")
+    a2a_timeout: float = Field(default=5.0, alias="A2A_TIMEOUT")
+    a2a_retries: int = Field(default=1, alias="A2A_RETRIES")
+    a2a_backoff: float = Field(default=0.2, alias="A2A_BACKOFF")
+    # Total budget for one advisory call, retries included.
+    a2a_deadline: float = Field(default=8.0, alias="A2A_DEADLINE")
+    a2a_max_connections: int = Field(default=10, alias="A2A_MAX_CONNECTIONS")
+    a2a_http2: bool = Field(default=True, alias="A2A_HTTP2")
+    a2a_breaker_failures: int = Field(default=3, alias="A2A_BREAKER_FAILURES")
+    a2a_breaker_reset: float = Field(default=30.0, alias="A2A_BREAKER_RESET")
+    # Content-hash cache of agent advice; TTL 0 disables, a path persists it (SQLite).
+    advice_cache_ttl: float = Field(default=3600.0, alias="ADVICE_CACHE_TTL")
+    advice_cache_max_entries: int = Field(default=4096, alias="ADVICE_CACHE_MAX_ENTRIES")
+    advice_cache_path: Path | None = Field(default=None, alias="ADVICE_CACHE_PATH")
+    advice_cache_version: str = Field(default="1", alias="ADVICE_CACHE_VERSION")
 
     anthropic_api_key: str | None = Field(default=None, alias="ANTHROPIC_API_KEY")
     anthropic_model: str = Field(default="claude-3-5-haiku-20241022", alias="ANTHROPIC_MODEL")
@@ -65,8 +110,22 @@ class Settings(BaseSettings):
     kafka_bootstrap_servers: str = Field(default="localhost:9092", alias="KAFKA_BOOTSTRAP_SERVERS")
 
     llm_hard_fail: bool = Field(default=False, alias="LLM_HARD_FAIL")
+    # Shared async LLM client: requests in flight, token bucket (req/s, 0 = off), backoff base.
+    llm_max_concurrency: int = Field(default=4, alias="LLM_MAX_CONCURRENCY")
+    llm_rate_limit: float = Field(default=0.0, alias="LLM_RATE_LIMIT")
+    llm_burst: int = Field(default=4, alias="LLM_BURST")
+    llm_timeout: float = Field(default=30.0, alias="LLM_TIMEOUT")
+    llm_backoff: float = Field(default=1.0, alias="LLM_BACKOFF")
 
     infra_mcp_transport: str = Field(default="in-process", alias="INFRA_MCP_TRANSPORT")
+    mcp_pool_size: int = Field(default=2, alias="MCP_POOL_SIZE")
+    mcp_call_timeout: float = Field(default=30.0, alias="MCP_CALL_TIMEOUT")
+    mcp_slow_call_ms: float = Field(default=1000.0, alias="MCP_SLOW_CALL_MS")
+    mcp_slow_call_sample_rate: float = Field(default=1.0, alias="MCP_SLOW_CALL_SAMPLE_RATE")
+    mcp_camera_url: str = Field(default="http://localhost:8101/mcp", alias="MCP_CAMERA_URL")
+    mcp_cv_url: str = Field(default="http://localhost:8102/mcp", alias="MCP_CV_URL")
+    mcp_netbox_url: str = Field(default="http://localhost:8103/mcp", alias="MCP_NETBOX_URL")
+    mcp_ticketing_url: str = Field(default="http://localhost:8104/mcp", alias="MCP_TICKETING_URL")
 
 
 @lru_cache
@@ -5,6 +5,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from packages.core.fixtures.loaders import resolve_evidence as _resolve_path
+from packages.core.spool import SpoolError, get_evidence_spool, parse_handle
 
 
 def _repo_root() -> Path:
@@ -16,7 +17,12 @@ def get_evidence_bytes(
     change_id: str = "",
     local_evidence_dir: Path | None = None,
 ) -> bytes | None:
-    """Resolve evidence_id to bytes. Fixture path first, then local storage."""
+    """Resolve evidence_id to bytes. Spool handle, then fixture path, then local storage."""
+    if parse_handle(evidence_id):
+        try:
+            return get_evidence_spool().read(evidence_id)
+        except SpoolError:
+            return None
     path = _resolve_path(evidence_id, change_id)
     if path and path.exists():
         return path.read_bytes()
@@ -68,14 +68,17 @@ def _parse_change_request(data: dict) -> ChangeRequest:
     )
 
 
+def expected_mapping_path(change_id: str) -> Path:
+    """Scenario netbox_expected_mapping.json, falling back to CHG-001."""
+    path = _repo_root() / "samples" / "scenarios" / change_id / "netbox_expected_mapping.json"
+    if not path.exists():
+        path = _repo_root() / "samples" / "scenarios" / "CHG-001" / "netbox_expected_mapping.json"
+    return path
+
+
 def load_expected_mapping(change_id: str) -> dict:
     """Load netbox expected mapping; supports allowed_endpoints list."""
-    base = _repo_root() / "samples" / "scenarios" / change_id
-    path = base / "netbox_expected_mapping.json"
-    if not path.exists():
-        base = _repo_root() / "samples" / "scenarios" / "CHG-001"
-        path = base / "netbox_expected_mapping.json"
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json.loads(expected_mapping_path(change_id).read_text(encoding="utf-8"))
 
 
 def load_cv_outputs(scenario: str) -> dict:
@@ -0,0 +1,89 @@
+"""Compiled, mtime-cached index over a scenario's netbox_expected_mapping.json.
+
+Mock-mode validation, the NetBox adapter and CMDB mismatch events all ask the
+same questions of the expected mapping; the index answers them with dict
+lookups instead of re-reading the JSON and scanning allowed_endpoints.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from packages.core.fixtures.loaders import expected_mapping_path
+
+MAX_INDEXES = 256
+
+
+def normalize_port(port_label: str) -> str:
+    """Port label as compared against the mapping (whitespace and case insensitive)."""
+    return port_label.strip().upper()
+
+
+@dataclass(eq=False)
+class MappingIndex:
+    """Lookups over one expected mapping.
+
+    endpoints holds (panel, normalized port, cable tag) for every allowed
+    endpoint, once under port_label and once under port_label_alt.
+    """
+
+    mapping: dict
+    default: dict | None = None
+    endpoints: set[tuple[str, str, str]] = field(default_factory=set)
+    # (panel, normalized port) -> first allowed endpoint declaring that port.
+    ports: dict[tuple[str, str], dict] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, mapping: dict) -> MappingIndex:
+        index = cls(mapping=mapping)
+        allowed = mapping.get("allowed_endpoints", [])
+        default = mapping.get("default", mapping)
+        if not allowed and isinstance(default, dict) and "panel_id" in default:
+            index.default = default
+        for ep in allowed:
+            panel, tag = ep.get("panel_id"), ep.get("cable_tag")
+            for label in (ep.get("port_label"), ep.get("port_label_alt")):
+                if not label:
+                    continue
+                port = normalize_port(label)
+                index.endpoints.add((panel, port, tag))
+                index.ports.setdefault((panel, port), ep)
+        return index
+
+    def allows(self, panel_id: str, port_label: str, cable_tag: str) -> bool:
+        return (panel_id, normalize_port(port_label), cable_tag) in self.endpoints
+
+    def endpoint_for(self, panel_id: str, port_label: str) -> dict | None:
+        return self.ports.get((panel_id, normalize_port(port_label)))
+
+    def expected_for(self, panel_id: str, port_label: str) -> dict:
+        """What the mapping expects at this port: its endpoint, else the default."""
+        return self.endpoint_for(panel_id, port_label) or self.default or {}
+
+
+_indexes: OrderedDict[Path, tuple[tuple[int, int], MappingIndex]] = OrderedDict()
+
+
+def get_mapping_index(change_id: str) -> MappingIndex:
+    """Compiled index for the change's expected mapping, rebuilt when the file changes."""
+    path = expected_mapping_path(change_id)
+    st = os.stat(path)
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _indexes.get(path)
+    if cached is not None and cached[0] == version:
+        _indexes.move_to_end(path)
+        return cached[1]
+    index = MappingIndex.build(json.loads(path.read_text(encoding="utf-8")))
+    _indexes[path] = (version, index)
+    _indexes.move_to_end(path)
+    while len(_indexes) > MAX_INDEXES:
+        _indexes.popitem(last=False)
+    return index
+
+
+def clear_mapping_indexes() -> None:
+    _indexes.clear()
@@ -17,6 +17,22 @@ def retake_guidance_from_quality(quality: object | None = None) -> list[str]:
     return list(DEFAULT_RETAKE_GUIDANCE)
 
 
+def cmdb_suggestion_guidance(suggestions: list[dict]) -> list[str]:
+    """Retake hints from near-miss CMDB labels. Advisory: the step stays blocked."""
+    fields = {"cable_tag": "cable tag", "port_label": "port label", "panel_id": "panel"}
+    hints = []
+    for s in suggestions:
+        what = fields.get(s.get("field", ""), "label")
+        if s.get("distance") == 0:
+            hints.append(f"{what.capitalize()} '{s.get('candidate')}' is known in the CMDB on another port")
+        else:
+            hints.append(
+                f"Read {what} '{s.get('observed')}' is {s.get('distance')} character(s) from "
+                f"'{s.get('candidate')}'; retake a close-up of the {what} to confirm"
+            )
+    return hints
+
+
 def must_block_on_low_confidence(confidence: float, min_conf: float = DEFAULT_MIN_CONF) -> bool:
     """NEVER GREEN under low confidence."""
     return confidence < min_conf
@@ -22,7 +22,7 @@ def update_proofpack(
     steps = list(existing.steps) if existing else []
     evidence_index = list(existing.evidence_index) if existing else []
     started_at = existing.started_at if existing else utc_now()
-    completed_at = existing.completed_at
+    completed_at = existing.completed_at if existing else None
 
     # Replace or append step result
     found = False
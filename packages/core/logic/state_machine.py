@@ -4,7 +4,11 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from packages.core.logic.policy import DEFAULT_MIN_CONF, retake_guidance_from_quality
+from packages.core.logic.policy import (
+    DEFAULT_MIN_CONF,
+    cmdb_suggestion_guidance,
+    retake_guidance_from_quality,
+)
 from packages.core.models.steps import (
     StepDefinition,
     StepResult,
@@ -128,6 +132,7 @@ def apply_cmdb_validation(
     """Apply CMDB validation; VERIFIED if match, else BLOCKED."""
     match = getattr(cmdb_out, "match", False)
     reason = getattr(cmdb_out, "reason", "")
+    suggestions = getattr(cmdb_out, "suggestions", None) or []
 
     if match:
         return StepResult(
@@ -161,7 +166,7 @@ def apply_cmdb_validation(
         confidence=step_result.confidence,
         cmdb_match=False,
         cmdb_reason=reason,
-        guidance=step_result.guidance,
+        guidance=step_result.guidance + cmdb_suggestion_guidance(suggestions),
         notes=f"CMDB mismatch: {reason}" + (" (approval required)" if approval.required else ""),
         tool_calls=step_result.tool_calls,
         approver=step_result.approver,
@@ -0,0 +1,113 @@
+"""In-process latency recording with percentile summaries (load tests, benchmarks)."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of values (q in 0..100). Returns 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyRecorder:
+    """Thread-safe collection of latency samples (seconds) keyed by name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: dict[str, list[float]] = defaultdict(list)
+        self._errors: dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            self._samples[name].append(seconds)
+            if not ok:
+                self._errors[name] += 1
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Record the duration of the block under name; exceptions count as errors."""
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(name, time.perf_counter() - start, ok=ok)
+
+    def samples(self, name: str) -> list[float]:
+        with self._lock:
+            return list(self._samples.get(name, []))
+
+    def summary(self) -> dict[str, dict]:
+        """Per-name count, errors and p50/p95/p99/max in milliseconds."""
+        with self._lock:
+            snapshot = {name: list(vals) for name, vals in self._samples.items()}
+            errors = dict(self._errors)
+        out: dict[str, dict] = {}
+        for name in sorted(snapshot):
+            vals = snapshot[name]
+            out[name] = {
+                "count": len(vals),
+                "errors": errors.get(name, 0),
+                "p50_ms": round(percentile(vals, 50) * 1000, 3),
+                "p95_ms": round(percentile(vals, 95) * 1000, 3),
+                "p99_ms": round(percentile(vals, 99) * 1000, 3),
+                "max_ms": round(max(vals) * 1000, 3) if vals else 0.0,
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._errors.clear()
+
+
+# Millisecond bucket upper bounds for latency histograms (last bucket is open-ended).
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def histogram(values_ms: list[float], edges: tuple[float, ...] = DEFAULT_BUCKETS_MS) -> dict[str, int]:
+    """Count values per bucket, keyed 'le_<edge>' plus 'gt_<last edge>'."""
+    counts = {f"le_{edge:g}": 0 for edge in edges}
+    counts[f"gt_{edges[-1]:g}"] = 0
+    for value in values_ms:
+        for edge in edges:
+            if value <= edge:
+                counts[f"le_{edge:g}"] += 1
+                break
+        else:
+            counts[f"gt_{edges[-1]:g}"] += 1
+    return counts
+
+
+# Cache lookups made while serving the current tool call: cache name -> [hits, misses].
+_cache_lookups: ContextVar[dict[str, list[int]] | None] = ContextVar("cache_lookups", default=None)
+
+
+def note_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a lookup against the enclosing track_cache_lookups() block, if any."""
+    lookups = _cache_lookups.get()
+    if lookups is not None:
+        lookups.setdefault(cache, [0, 0])[0 if hit else 1] += 1
+
+
+@contextmanager
+def track_cache_lookups() -> Iterator[dict[str, list[int]]]:
+    """Collect note_cache_lookup() calls made in this context (including to_thread work)."""
+    lookups: dict[str, list[int]] = {}
+    token = _cache_lookups.set(lookups)
+    try:
+        yield lookups
+    finally:
+        _cache_lookups.reset(token)
@@ -61,6 +61,8 @@ class ValidationResult(BaseModel):
     match: bool
     reason: str
     confidence: float
+    # Nearest known CMDB values on a mismatch ({field, observed, candidate, distance}); advisory only.
+    suggestions: list[dict[str, Any]] = Field(default_factory=list)
 
 
 class StepResultLegacy(BaseModel):
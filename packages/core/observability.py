@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 
-from opentelemetry import trace
+from opentelemetry import metrics, trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import MetricReader, PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
@@ -17,14 +19,24 @@ def configure_observability(settings: Settings) -> None:
     tracer_provider = TracerProvider(resource=resource)
     trace.set_tracer_provider(tracer_provider)
 
+    metric_readers: list[MetricReader] = []
     if settings.otel_exporter_otlp_endpoint:
         try:
+            from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (  # type: ignore[import-untyped]
+                OTLPMetricExporter,
+            )
             from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (  # type: ignore[import-untyped]
                 OTLPSpanExporter,
             )
 
             exporter = OTLPSpanExporter(endpoint=settings.otel_exporter_otlp_endpoint)
             tracer_provider.add_span_processor(BatchSpanProcessor(exporter))
+            # Per-tool MCP latency, payload and error metrics (packages.mcp.middleware).
+            metric_readers.append(
+                PeriodicExportingMetricReader(
+                    OTLPMetricExporter(endpoint=settings.otel_exporter_otlp_endpoint)
+                )
+            )
             logger.info("OTLP exporter configured: %s", settings.otel_exporter_otlp_endpoint)
         except ImportError:
             logger.warning(
@@ -33,6 +45,7 @@ def configure_observability(settings: Settings) -> None:
             )
         except Exception as exc:
             logger.warning("Failed to configure OTLP exporter: %s", exc)
+    metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=metric_readers))
 
     if settings.langfuse_public_key and settings.langfuse_secret_key:
         try:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 from packages.core.models.proofpack import ProofPack, render_proofpack_json
@@ -10,6 +11,9 @@ from packages.core.models.steps import StepResult
 
 
 def _runtime_dir() -> Path:
+    override = os.environ.get("INFRASENTINEL_RUNTIME_DIR")
+    if override:
+        return Path(override)
     root = Path(__file__).resolve().parents[2]
     return root / "runtime"
 
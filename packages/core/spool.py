@@ -0,0 +1,177 @@
+"""Content-addressed evidence spool shared by the camera and CV services.
+
+Evidence bytes are written once, under their SHA-256, and then passed between
+tools as a handle ("sha256:<hex>") instead of as base64 in every tool call.
+Large frames can be uploaded in chunks: begin an upload, append chunks at
+increasing offsets, then commit, which checks the hash and size and moves the
+bytes into place. Services on separate hosts share the spool directory
+(EVIDENCE_SPOOL_DIR, e.g. a shared volume).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from uuid import uuid4
+
+HANDLE_PREFIX = "sha256:"
+CHUNK_SIZE = 256 * 1024
+MAX_UPLOAD_BYTES = 64 * 1024 * 1024
+UPLOAD_TTL = 3600.0  # seconds before an uncommitted upload is swept
+
+
+class SpoolError(ValueError):
+    """Unknown handle or upload, or an upload that does not add up."""
+
+
+def parse_handle(value: str | None) -> str | None:
+    """Hex digest of a "sha256:<hex>" handle, or None if value is not a handle."""
+    if not value or not value.startswith(HANDLE_PREFIX):
+        return None
+    digest = value[len(HANDLE_PREFIX) :].lower()
+    if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+        return None
+    return digest
+
+
+def make_handle(digest: str) -> str:
+    return f"{HANDLE_PREFIX}{digest}"
+
+
+class EvidenceSpool:
+    def __init__(self, base_dir: Path) -> None:
+        self.base_dir = Path(base_dir)
+        self._uploads = self.base_dir / "uploads"
+        self._uploads.mkdir(parents=True, exist_ok=True)
+
+    # --- content ---
+
+    def path_for(self, handle: str) -> Path:
+        digest = parse_handle(handle)
+        if digest is None:
+            raise SpoolError(f"not an evidence handle: {handle!r}")
+        return self.base_dir / digest[:2] / digest
+
+    def exists(self, handle: str) -> bool:
+        return parse_handle(handle) is not None and self.path_for(handle).is_file()
+
+    def resolve(self, handle: str) -> Path:
+        """Path of the bytes behind handle; SpoolError if they are not in the spool."""
+        path = self.path_for(handle)
+        if not path.is_file():
+            raise SpoolError(f"evidence {handle} not in spool")
+        return path
+
+    def read(self, handle: str) -> bytes:
+        return self.resolve(handle).read_bytes()
+
+    def put(self, data: bytes) -> str:
+        """Store data (once per content) and return its handle."""
+        handle = make_handle(hashlib.sha256(data).hexdigest())
+        target = self.path_for(handle)
+        if not target.is_file():
+            partial = self._uploads / f"put-{uuid4().hex}"
+            partial.write_bytes(data)
+            self._install(partial, target)
+        return handle
+
+    def put_file(self, source: Path) -> str:
+        """Store a file's bytes, hashing and copying it in chunks."""
+        digest = hashlib.sha256()
+        partial = self._uploads / f"put-{uuid4().hex}"
+        with open(source, "rb") as src, open(partial, "wb") as dst:
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+                dst.write(chunk)
+        handle = make_handle(digest.hexdigest())
+        self._install(partial, self.path_for(handle))
+        return handle
+
+    def _install(self, partial: Path, target: Path) -> None:
+        if target.is_file():
+            partial.unlink(missing_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(partial, target)  # atomic: readers never see a half-written file
+
+    # --- chunked uploads ---
+
+    def begin_upload(self) -> str:
+        self._sweep()
+        upload_id = uuid4().hex
+        (self._uploads / upload_id).touch()
+        return upload_id
+
+    def _upload_path(self, upload_id: str) -> Path:
+        path = self._uploads / upload_id
+        if not upload_id.isalnum() or not path.is_file():
+            raise SpoolError(f"unknown upload {upload_id!r}")
+        return path
+
+    def append_chunk(self, upload_id: str, offset: int, data: bytes) -> int:
+        """Append data at offset and return the bytes received so far.
+
+        A chunk resent after a lost reply (same offset, already written) is
+        accepted without writing it twice; any other gap or overlap is an error.
+        """
+        path = self._upload_path(upload_id)
+        size = path.stat().st_size
+        if offset + len(data) <= size:
+            return size
+        if offset != size:
+            raise SpoolError(f"upload {upload_id} is at byte {size}, chunk starts at {offset}")
+        if size + len(data) > MAX_UPLOAD_BYTES:
+            raise SpoolError(f"upload {upload_id} exceeds {MAX_UPLOAD_BYTES} bytes")
+        with open(path, "ab") as f:
+            f.write(data)
+        return size + len(data)
+
+    def commit_upload(self, upload_id: str, sha256: str | None = None, size: int | None = None) -> str:
+        """Finish an upload and return its handle, checking the expected hash and size if given."""
+        path = self._upload_path(upload_id)
+        actual_size = path.stat().st_size
+        if size is not None and size != actual_size:
+            raise SpoolError(f"upload {upload_id} has {actual_size} bytes, expected {size}")
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        if sha256 is not None and digest.hexdigest() != (parse_handle(sha256) or sha256.lower()):
+            path.unlink(missing_ok=True)
+            raise SpoolError(f"upload {upload_id} does not match sha256 {sha256}")
+        handle = make_handle(digest.hexdigest())
+        self._install(path, self.path_for(handle))
+        return handle
+
+    def abort_upload(self, upload_id: str) -> None:
+        if upload_id.isalnum():
+            (self._uploads / upload_id).unlink(missing_ok=True)
+
+    def _sweep(self) -> None:
+        cutoff = time.time() - UPLOAD_TTL
+        for path in self._uploads.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+_spools: dict[Path, EvidenceSpool] = {}
+
+
+def get_evidence_spool(base_dir: Path | None = None) -> EvidenceSpool:
+    """Shared spool for EVIDENCE_SPOOL_DIR (default: <LOCAL_EVIDENCE_DIR>/spool)."""
+    if base_dir is None:
+        from packages.core.config import get_settings
+
+        settings = get_settings()
+        base_dir = settings.evidence_spool_dir or settings.local_evidence_dir / "spool"
+    key = Path(base_dir).resolve()
+    spool = _spools.get(key)
+    if spool is None:
+        spool = EvidenceSpool(key)
+        _spools[key] = spool
+    return spool
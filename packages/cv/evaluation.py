@@ -0,0 +1,334 @@
+"""Accuracy and throughput evaluation of the CV pipeline over labelled datasets.
+
+Streams labels.jsonl (data/synth/patchpanel_v1, data/real_eval) through
+read_port_label / read_cable_tag with a given OCR backend and pipeline config,
+optionally across a process pool, and summarizes exact-match accuracy,
+false-green rate, confidence calibration, retake rate, images/sec and per-stage
+latency.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import cv2
+
+from packages.core.metrics import histogram, percentile
+from packages.cv.ocr_backends import MockOCRBackend, OCRBackend, TesseractOCRBackend
+from packages.cv.parsing import normalize_text, parse_port_label
+from packages.cv.pipeline import PORT_ACCEPT_CONF, TAG_ACCEPT_CONF, read_cable_tag, read_port_label
+
+OCR_BACKENDS: dict[str, type[OCRBackend]] = {
+    "mock": MockOCRBackend,
+    "tesseract": TesseractOCRBackend,
+}
+
+QUALITY_FLAGS = ("blurred", "dark", "glare")
+CALIBRATION_BINS = 10
+
+
+@dataclass(frozen=True)
+class EvalConfig:
+    """One pipeline configuration to evaluate."""
+
+    name: str
+    backend: str = "mock"
+    # Crop to the labelled bbox: upper bound for a future label detector.
+    use_bbox: bool = False
+    port_accept: float = PORT_ACCEPT_CONF
+    tag_accept: float = TAG_ACCEPT_CONF
+
+    @classmethod
+    def parse(cls, spec: str) -> EvalConfig:
+        """Parse 'name:backend[:bbox=1,port_accept=0.8,tag_accept=0.8]'.
+
+        backend is a key of OCR_BACKENDS or 'package.module:ClassName'.
+        """
+        name, _, rest = spec.partition(":")
+        if not rest:
+            return cls(name=name, backend=name)
+        backend, opts = rest, ""
+        # A dotted backend path contains its own ':'; options follow the last one.
+        head, sep, tail = rest.rpartition(":")
+        if sep and "=" in tail:
+            backend, opts = head, tail
+        kwargs: dict = {}
+        for opt in filter(None, (o.strip() for o in opts.split(","))):
+            key, _, value = opt.partition("=")
+            if key == "bbox":
+                kwargs["use_bbox"] = value.lower() in ("1", "true", "yes")
+            elif key in ("port_accept", "tag_accept"):
+                kwargs[key] = float(value)
+            else:
+                raise ValueError(f"Unknown eval config option: {key!r}")
+        return cls(name=name, backend=backend, **kwargs)
+
+
+def build_backend(spec: str) -> OCRBackend:
+    if spec in OCR_BACKENDS:
+        return OCR_BACKENDS[spec]()
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown OCR backend {spec!r}; use {sorted(OCR_BACKENDS)} or module:Class")
+    backend_cls = getattr(importlib.import_module(module_name), class_name)
+    return backend_cls()
+
+
+def iter_samples(dataset_dir: Path, limit: int | None = None) -> Iterator[dict]:
+    """Stream labels.jsonl entries without loading the whole file."""
+    labels_path = Path(dataset_dir) / "labels.jsonl"
+    if not labels_path.exists():
+        return
+    count = 0
+    with labels_path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if limit is not None and count >= limit:
+                return
+            count += 1
+            yield json.loads(line)
+
+
+def canonical_port(label: str | None) -> str | None:
+    if not label:
+        return None
+    parsed, _ = parse_port_label(label)
+    return parsed or normalize_text(label)
+
+
+def canonical_tag(tag: str | None) -> str | None:
+    return normalize_text(tag) if tag else None
+
+
+def _crop_hint(bbox: list | None) -> tuple[int, int, int, int] | None:
+    if not bbox or len(bbox) != 4:
+        return None
+    x, y, w, h = (int(v) for v in bbox)
+    return x, y, w, h
+
+
+def evaluate_sample(
+    sample: dict, dataset_dir: Path, config: EvalConfig, backend: OCRBackend
+) -> dict:
+    """Run one labelled image through the pipeline and score it."""
+    started = time.perf_counter()
+    image = cv2.imread(str(Path(dataset_dir) / sample["image"]))
+    load_s = time.perf_counter() - started
+    if image is None:
+        return {"image": sample["image"], "missing": True}
+
+    port_timings: dict[str, float] = {}
+    tag_timings: dict[str, float] = {}
+    port = read_port_label(
+        image,
+        backend,
+        crop_hint=_crop_hint(sample.get("bbox_label")) if config.use_bbox else None,
+        timings=port_timings,
+    )
+    tag = read_cable_tag(
+        image,
+        backend,
+        crop_hint=_crop_hint(sample.get("bbox_tag")) if config.use_bbox else None,
+        timings=tag_timings,
+    )
+
+    port_expected = canonical_port(sample.get("port_label"))
+    tag_expected = canonical_tag(sample.get("cable_tag"))
+    port_accepted = bool(port.port_label) and port.confidence >= config.port_accept
+    tag_accepted = bool(tag.cable_tag) and tag.confidence >= config.tag_accept
+    stages = {"load": load_s}
+    stages.update({f"port.{k}": v for k, v in port_timings.items()})
+    stages.update({f"tag.{k}": v for k, v in tag_timings.items()})
+    return {
+        "image": sample["image"],
+        "missing": False,
+        "port_expected": port_expected,
+        "port_pred": canonical_port(port.port_label),
+        "port_conf": port.confidence,
+        "port_correct": canonical_port(port.port_label) == port_expected,
+        "port_accepted": port_accepted,
+        "tag_expected": tag_expected,
+        "tag_pred": canonical_tag(tag.cable_tag),
+        "tag_conf": tag.confidence,
+        "tag_correct": canonical_tag(tag.cable_tag) == tag_expected,
+        "tag_accepted": tag_accepted,
+        # Untagged samples (no tag in the photo) only need the port label.
+        "retake": not port_accepted or (tag_expected is not None and not tag_accepted),
+        "flags": [flag for flag in QUALITY_FLAGS if (sample.get("quality_flags") or {}).get(flag)],
+        "stages": stages,
+        "total_s": time.perf_counter() - started,
+    }
+
+
+_worker_backend: OCRBackend | None = None
+
+
+def _init_worker(backend_spec: str) -> None:
+    global _worker_backend
+    _worker_backend = build_backend(backend_spec)
+
+
+def _evaluate_in_worker(sample: dict, dataset_dir: str, config: EvalConfig) -> dict:
+    assert _worker_backend is not None
+    return evaluate_sample(sample, Path(dataset_dir), config, _worker_backend)
+
+
+def run_evaluation(
+    samples: Iterable[dict],
+    dataset_dir: Path,
+    config: EvalConfig,
+    workers: int = 1,
+) -> Iterator[dict]:
+    """Yield per-sample records; workers > 1 uses a process pool with bounded in-flight work."""
+    if workers <= 1:
+        backend = build_backend(config.backend)
+        for sample in samples:
+            yield evaluate_sample(sample, dataset_dir, config, backend)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(config.backend,)
+    ) as executor:
+        pending: deque[Future] = deque()
+        for sample in samples:
+            pending.append(executor.submit(_evaluate_in_worker, sample, str(dataset_dir), config))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def calibration(confidences: list[float], correct: list[bool], bins: int = CALIBRATION_BINS) -> dict:
+    """Expected calibration error plus per-bin reliability (avg confidence vs accuracy)."""
+    total = len(confidences)
+    table: list[dict] = []
+    ece = 0.0
+    for i in range(bins):
+        lo, hi = i / bins, (i + 1) / bins
+        idx = [
+            j
+            for j, conf in enumerate(confidences)
+            if lo <= conf < hi or (i == bins - 1 and conf == 1.0)
+        ]
+        if not idx:
+            continue
+        avg_conf = sum(confidences[j] for j in idx) / len(idx)
+        accuracy = sum(1 for j in idx if correct[j]) / len(idx)
+        ece += abs(accuracy - avg_conf) * len(idx) / total
+        table.append(
+            {
+                "lo": lo,
+                "hi": hi,
+                "count": len(idx),
+                "avg_conf": round(avg_conf, 4),
+                "accuracy": round(accuracy, 4),
+            }
+        )
+    return {"ece": round(ece, 4), "bins": table}
+
+
+def _rate(numerator: int, denominator: int) -> float:
+    return round(numerator / denominator, 4) if denominator else 0.0
+
+
+def summarize(records: list[dict], wall_seconds: float) -> dict:
+    scored = [r for r in records if not r["missing"]]
+    n = len(scored)
+    port_accepted = [r for r in scored if r["port_accepted"]]
+    tag_accepted = [r for r in scored if r["tag_accepted"]]
+
+    stage_values: dict[str, list[float]] = {}
+    for r in scored:
+        for stage, seconds in r["stages"].items():
+            stage_values.setdefault(stage, []).append(seconds * 1000)
+        stage_values.setdefault("total", []).append(r["total_s"] * 1000)
+
+    by_flag: dict[str, float] = {}
+    for flag in (*QUALITY_FLAGS, "clean"):
+        group = [r for r in scored if (flag in r["flags"]) or (flag == "clean" and not r["flags"])]
+        if group:
+            by_flag[flag] = _rate(sum(1 for r in group if r["retake"]), len(group))
+
+    return {
+        "samples": n,
+        "missing_images": len(records) - n,
+        "port_accuracy": _rate(sum(1 for r in scored if r["port_correct"]), n),
+        "tag_accuracy": _rate(sum(1 for r in scored if r["tag_correct"]), n),
+        "both_correct": _rate(sum(1 for r in scored if r["port_correct"] and r["tag_correct"]), n),
+        # Accepted without retake but wrong: the safety metric.
+        "port_false_green_rate": _rate(
+            sum(1 for r in port_accepted if not r["port_correct"]), len(port_accepted)
+        ),
+        "tag_false_green_rate": _rate(
+            sum(1 for r in tag_accepted if not r["tag_correct"]), len(tag_accepted)
+        ),
+        "retake_rate": _rate(sum(1 for r in scored if r["retake"]), n),
+        "retake_rate_by_flag": by_flag,
+        "port_calibration": calibration(
+            [r["port_conf"] for r in scored], [r["port_correct"] for r in scored]
+        ),
+        "tag_calibration": calibration(
+            [r["tag_conf"] for r in scored], [r["tag_correct"] for r in scored]
+        ),
+        "images_per_second": round(n / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "wall_seconds": round(wall_seconds, 3),
+        "latency_ms": {
+            stage: {
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+                "p99": round(percentile(values, 99), 3),
+                "histogram": histogram(values),
+            }
+            for stage, values in sorted(stage_values.items())
+        },
+    }
+
+
+def evaluate_dataset(
+    dataset_dir: Path,
+    config: EvalConfig,
+    workers: int = 1,
+    limit: int | None = None,
+) -> dict:
+    started = time.perf_counter()
+    records = list(run_evaluation(iter_samples(dataset_dir, limit), dataset_dir, config, workers))
+    summary = summarize(records, time.perf_counter() - started)
+    return {"dataset": str(dataset_dir), "config": asdict(config), **summary}
+
+
+COMPARE_KEYS = (
+    "samples",
+    "port_accuracy",
+    "tag_accuracy",
+    "both_correct",
+    "port_false_green_rate",
+    "tag_false_green_rate",
+    "retake_rate",
+    "images_per_second",
+)
+
+
+def comparison_table(results: dict[str, dict]) -> list[dict]:
+    """Rows of metric -> value per config name, plus calibration ECE and p95 total latency."""
+    rows = [{"metric": key, **{name: r[key] for name, r in results.items()}} for key in COMPARE_KEYS]
+    rows.append(
+        {"metric": "port_ece", **{name: r["port_calibration"]["ece"] for name, r in results.items()}}
+    )
+    rows.append(
+        {"metric": "tag_ece", **{name: r["tag_calibration"]["ece"] for name, r in results.items()}}
+    )
+    rows.append(
+        {
+            "metric": "p95_total_ms",
+            **{name: r["latency_ms"].get("total", {}).get("p95", 0.0) for name, r in results.items()},
+        }
+    )
+    return rows
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
 
 import cv2
@@ -28,6 +29,14 @@ def _load_image(image_path_or_bytes: str | bytes | bytearray | np.ndarray) -> np
     return img
 
 
+def _lap(timings: dict[str, float] | None, stage: str, start: float) -> float:
+    """Add elapsed seconds since start to timings[stage]; returns the new start."""
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + (now - start)
+    return now
+
+
 def _join_spans(spans: list) -> tuple[str, float]:
     if not spans:
         return "", 0.0
@@ -41,14 +50,22 @@ def read_port_label(
     ocr_backend: OCRBackend,
     evidence_id: str | None = None,
     crop_hint: tuple[int, int, int, int] | None = None,
+    timings: dict[str, float] | None = None,
 ) -> PortLabelResult:
+    """Read the port label. Pass timings to collect per-stage seconds (load/quality/crop/ocr/parse)."""
+    start = time.perf_counter()
     image = _load_image(image_path_or_bytes)
+    start = _lap(timings, "load", start)
     quality = compute_quality_metrics(image)
+    start = _lap(timings, "quality", start)
     cropped = crop_region(image, crop_hint=crop_hint)
+    start = _lap(timings, "crop", start)
     spans = ocr_backend.read_text(cropped, evidence_id=evidence_id)
+    start = _lap(timings, "ocr", start)
     raw_text, ocr_conf = _join_spans(spans)
     port_label, parse_conf = parse_port_label(raw_text)
     final_conf = max(0.0, min(1.0, ocr_conf * parse_conf * quality_penalty(quality)))
+    _lap(timings, "parse", start)
     guidance = []
     if not port_label or final_conf < PORT_ACCEPT_CONF:
         guidance = retake_guidance(quality)
@@ -68,14 +85,22 @@ def read_cable_tag(
     ocr_backend: OCRBackend,
     evidence_id: str | None = None,
     crop_hint: tuple[int, int, int, int] | None = None,
+    timings: dict[str, float] | None = None,
 ) -> CableTagResult:
+    """Read the cable tag. Pass timings to collect per-stage seconds (load/quality/crop/ocr/parse)."""
+    start = time.perf_counter()
     image = _load_image(image_path_or_bytes)
+    start = _lap(timings, "load", start)
     quality = compute_quality_metrics(image)
+    start = _lap(timings, "quality", start)
     cropped = crop_region(image, crop_hint=crop_hint)
+    start = _lap(timings, "crop", start)
     spans = ocr_backend.read_text(cropped, evidence_id=evidence_id)
+    start = _lap(timings, "ocr", start)
     raw_text, ocr_conf = _join_spans(spans)
     cable_tag, parse_conf = parse_cable_tag(raw_text)
     final_conf = max(0.0, min(1.0, ocr_conf * parse_conf * quality_penalty(quality)))
+    _lap(timings, "parse", start)
     guidance = []
     if not cable_tag or final_conf < TAG_ACCEPT_CONF:
         guidance = retake_guidance(quality)
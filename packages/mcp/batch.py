@@ -0,0 +1,141 @@
+"""Batched tool calls: several invocations, optionally chained, in one request.
+
+A call is {"id": "port", "tool": "cv.read_port_label", "arguments": {...}}.
+An argument value {"$ref": "port"} or {"$ref": "port.panel_id"} is replaced
+by an earlier call's result (or a field of it) before the call runs. Calls
+whose references are resolved run concurrently; results come back in input
+order as {"id", "ok": true, "result"} or {"id", "ok": false, "error"}. A call
+whose dependency failed is not run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from pydantic_core import to_jsonable_python
+
+MAX_BATCH = 64
+DEFAULT_CONCURRENCY = 8
+
+ToolFn = Callable[..., Awaitable[Any]]
+ResultHook = Callable[[dict], Awaitable[None]]
+
+
+class BatchCallError(RuntimeError):
+    """A call in a batch failed (raised by helpers that need every result)."""
+
+
+def call_ids(calls: list[dict]) -> list[str]:
+    """Ids of calls (index when absent), checked for duplicates, bad refs and cycles."""
+    if len(calls) > MAX_BATCH:
+        raise ValueError(f"batch of {len(calls)} calls exceeds {MAX_BATCH}")
+    ids = [str(call.get("id") or i) for i, call in enumerate(calls)]
+    if len(set(ids)) != len(ids):
+        raise ValueError("duplicate call ids in batch")
+    if any("." in cid for cid in ids):
+        raise ValueError("call ids must not contain '.'")
+    graph = {cid: dependencies(call.get("arguments") or {}) for cid, call in zip(ids, calls, strict=True)}
+    for cid, deps in graph.items():
+        missing = deps - graph.keys()
+        if missing:
+            raise ValueError(f"call {cid!r} references unknown call(s) {sorted(missing)}")
+    # Kahn's algorithm: anything left over is on a cycle.
+    remaining = {cid: set(deps) for cid, deps in graph.items()}
+    while True:
+        ready = [cid for cid, deps in remaining.items() if not deps]
+        if not ready:
+            break
+        for cid in ready:
+            del remaining[cid]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    if remaining:
+        raise ValueError(f"dependency cycle between calls {sorted(remaining)}")
+    return ids
+
+
+def dependencies(value: Any) -> set[str]:
+    """Ids of calls referenced anywhere in value."""
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            return {str(value["$ref"]).split(".", 1)[0]}
+        return set().union(*(dependencies(v) for v in value.values()))
+    if isinstance(value, list):
+        return set().union(*(dependencies(v) for v in value))
+    return set()
+
+
+def resolve_refs(value: Any, results: Mapping[str, Any]) -> Any:
+    """value with references to calls in results replaced; other references are kept."""
+    if isinstance(value, dict):
+        if set(value) == {"$ref"}:
+            cid, _, path = str(value["$ref"]).partition(".")
+            if cid not in results:
+                return value
+            out = results[cid]
+            for part in path.split(".") if path else []:
+                out = out[int(part)] if isinstance(out, list) else out[part]
+            return out
+        return {k: resolve_refs(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_refs(v, results) for v in value]
+    return value
+
+
+def failure(cid: str, error: str) -> dict:
+    return {"id": cid, "ok": False, "error": error}
+
+
+async def run_batch(
+    calls: list[dict],
+    tools: Mapping[str, ToolFn],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_result: ResultHook | None = None,
+) -> list[dict]:
+    """Run calls against tools (name -> async callable) and return ordered outcomes.
+
+    on_result is awaited as each call finishes, in completion order.
+    """
+    ids = call_ids(calls)
+    limit = asyncio.Semaphore(concurrency)
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run(cid: str, call: dict) -> dict:
+        arguments = call.get("arguments") or {}
+        deps = sorted(dependencies(arguments))
+        upstream = {dep: await tasks[dep] for dep in deps}
+        failed = [dep for dep, outcome in upstream.items() if not outcome["ok"]]
+        fn = tools.get(call.get("tool", ""))
+        if failed:
+            outcome = failure(cid, f"dependency failed: {', '.join(failed)}")
+        elif fn is None:
+            outcome = failure(cid, f"unknown tool {call.get('tool')!r}")
+        else:
+            try:
+                args = resolve_refs(arguments, {dep: o["result"] for dep, o in upstream.items()})
+            except (KeyError, IndexError, TypeError, ValueError) as exc:
+                outcome = failure(cid, f"unresolved reference: {exc}")
+            else:
+                async with limit:
+                    try:
+                        result = await fn(**args)
+                        outcome = {"id": cid, "ok": True, "result": to_jsonable_python(result)}
+                    except Exception as exc:
+                        outcome = failure(cid, f"{type(exc).__name__}: {exc}")
+        if on_result is not None:
+            await on_result(outcome)
+        return outcome
+
+    for cid, call in zip(ids, calls, strict=True):
+        tasks[cid] = asyncio.create_task(run(cid, call))
+    return list(await asyncio.gather(*tasks.values()))
+
+
+def batch_result(outcome: dict) -> Any:
+    """The result of one outcome; raises BatchCallError if that call failed."""
+    if not outcome.get("ok"):
+        raise BatchCallError(f"{outcome.get('id')}: {outcome.get('error')}")
+    return outcome["result"]
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import base64
+import hashlib
+from dataclasses import dataclass, field, fields
 from typing import Any, Callable, Awaitable
 
 from packages.cv.schema import CableTagResult, PortLabelResult
+from packages.mcp.batch import batch_result, call_ids, dependencies, failure, resolve_refs, run_batch
+from packages.mcp.middleware import Middleware, default_middleware, wrap_tool
 from packages.core.models.change import ChangeRequest
 from packages.core.models.legacy import EvidenceRef, ExpectedMapping, ValidationResult
+from packages.core.spool import CHUNK_SIZE
 
 
 ToolFn = Callable[..., Awaitable[Any]]
@@ -16,11 +22,15 @@ class MCPToolRouter:
     """Minimal MCP client wrapper abstraction.
 
     In mock/in-process mode we inject direct async callables from service handlers
-    or adapter instances.  Remote MCP transport (stdio/HTTP) can evolve behind this
-    contract without changing callers.
+    or adapter instances.  Remote mode (stdio/HTTP) injects callables that go
+    through pooled MCP sessions and decode results into the same models.
 
     Use MCPToolRouter.from_settings() to build from app settings.
     Use MCPToolRouter.from_adapters(...) to build from explicit adapter instances.
+    Use MCPToolRouter.from_pools(...) to build from remote session pools.
+
+    Every tool call goes through the middleware chain (packages.mcp.middleware);
+    from_settings() installs the default telemetry and slow-call log.
     """
 
     camera_capture_frame: ToolFn
@@ -32,6 +42,34 @@ class MCPToolRouter:
     ticketing_get_change: ToolFn
     ticketing_post_step_result: ToolFn
     ticketing_request_approval: ToolFn
+    # Optional: routers without a batch tool fan out netbox_validate_observed.
+    netbox_validate_observed_batch: ToolFn | None = None
+    # Optional chunked upload; without it upload_evidence sends one inline store_evidence.
+    camera_upload_begin: ToolFn | None = None
+    camera_upload_chunk: ToolFn | None = None
+    camera_upload_commit: ToolFn | None = None
+    # Remote session pools by service name; closed by aclose().
+    pools: dict[str, Any] = field(default_factory=dict)
+    # Wraps every tool call, first entry outermost.
+    middleware: list[Middleware] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._wrap_tools()
+
+    def _tool_names(self) -> list[str]:
+        return [f.name for f in fields(self) if f.name not in ("pools", "middleware")]
+
+    def _wrap_tools(self) -> None:
+        for name in self._tool_names():
+            fn = getattr(self, name)
+            if fn is not None:
+                setattr(self, name, wrap_tool(name.replace("_", ".", 1), fn, self.middleware))
+
+    def use(self, *middleware: Middleware) -> MCPToolRouter:
+        """Append middleware to the chain and rewrap the tools; returns the router."""
+        self.middleware.extend(middleware)
+        self._wrap_tools()
+        return self
 
     # --- convenience passthrough methods ---
 
@@ -39,10 +77,45 @@ class MCPToolRouter:
         return await self.camera_capture_frame(source=source)
 
     async def store_evidence(
-        self, path: str | None = None, data_b64: str | None = None, metadata: dict | None = None
+        self,
+        path: str | None = None,
+        data_b64: str | None = None,
+        metadata: dict | None = None,
+        handle: str | None = None,
     ) -> EvidenceRef:
+        if handle is not None:
+            return await self.camera_store_evidence(handle=handle, metadata=metadata or {})
         return await self.camera_store_evidence(path=path, data_b64=data_b64, metadata=metadata or {})
 
+    async def upload_evidence(
+        self, data: bytes, filename: str = "upload.bin", metadata: dict | None = None
+    ) -> EvidenceRef:
+        """Upload bytes once, in chunks, and return a ref whose evidence_id is the content handle.
+
+        Pass that evidence_id to the CV tools and store_evidence(handle=...) so
+        the bytes are not sent again.
+        """
+        if self.camera_upload_begin is None or self.camera_upload_chunk is None or self.camera_upload_commit is None:
+            return await self.store_evidence(
+                data_b64=base64.b64encode(data).decode("ascii"), metadata=metadata
+            )
+        upload = await self.camera_upload_begin()
+        chunk_size = int(upload.get("chunk_size") or CHUNK_SIZE)
+        for offset in range(0, len(data), chunk_size):
+            chunk = data[offset : offset + chunk_size]
+            # MCP messages are JSON, so chunks go base64 over a remote transport; in-process, raw.
+            payload = (
+                {"data_b64": base64.b64encode(chunk).decode("ascii")} if self.pools else {"data": chunk}
+            )
+            await self.camera_upload_chunk(upload_id=upload["upload_id"], offset=offset, **payload)
+        return await self.camera_upload_commit(
+            upload_id=upload["upload_id"],
+            sha256=hashlib.sha256(data).hexdigest(),
+            size=len(data),
+            filename=filename,
+            metadata=metadata or {},
+        )
+
     async def read_port_label(
         self, evidence_id: str, change_id: str = "", scenario: str | None = None
     ) -> PortLabelResult:
@@ -70,6 +143,123 @@ class MCPToolRouter:
             cable_tag=cable_tag,
         )
 
+    async def validate_observed_batch(
+        self, change_id: str, observations: list[dict]
+    ) -> list[ValidationResult]:
+        """Validate many {panel_id, port_label, cable_tag} observations; results in input order."""
+        if self.netbox_validate_observed_batch is not None:
+            return await self.netbox_validate_observed_batch(
+                change_id=change_id, observations=observations
+            )
+        return list(
+            await asyncio.gather(
+                *(
+                    self.validate_observed(
+                        change_id, o["panel_id"], o["port_label"], o["cable_tag"]
+                    )
+                    for o in observations
+                )
+            )
+        )
+
+    async def read_labels(
+        self, evidence_id: str, change_id: str = "", scenario: str | None = None
+    ) -> tuple[PortLabelResult, CableTagResult]:
+        """Port label and cable tag for one photo, as a single batch."""
+        args = {"evidence_id": evidence_id, "change_id": change_id, "scenario": scenario}
+        port, cable = await self.call_batch(
+            [
+                {"id": "port", "tool": "cv.read_port_label", "arguments": args},
+                {"id": "cable", "tool": "cv.read_cable_tag", "arguments": args},
+            ]
+        )
+        return (
+            PortLabelResult.model_validate(batch_result(port)),
+            CableTagResult.model_validate(batch_result(cable)),
+        )
+
+    async def call_batch(self, calls: list[dict]) -> list[dict]:
+        """Run several tool calls, chained with {"$ref": "<id>.<field>"}; ordered outcomes.
+
+        See packages.mcp.batch for the call and outcome format. In-process all
+        calls run here; over a remote transport each server gets one
+        "<service>.batch" request per round, and calls that depend on another
+        server's results go in a later round.
+        """
+        if self.pools:
+            return await self._call_batch_remote(calls)
+        tools = {
+            name.replace("_", ".", 1): getattr(self, name)
+            for name in self._tool_names()
+            if getattr(self, name) is not None
+        }
+        return await run_batch(calls, tools)
+
+    async def _call_batch_remote(self, calls: list[dict]) -> list[dict]:
+        ids = call_ids(calls)
+        by_id = dict(zip(ids, calls, strict=True))
+        outcomes: dict[str, dict] = {}
+        while len(outcomes) < len(ids):
+            # Per server, every pending call whose references are finished or in the same request.
+            rounds: dict[str, list[str]] = {}
+            placed: set[str] = set()
+            progress = True
+            while progress:
+                progress = False
+                for cid in ids:
+                    if cid in outcomes or cid in placed:
+                        continue
+                    service = str(by_id[cid].get("tool", "")).split(".", 1)[0]
+                    local = rounds.get(service, [])
+                    deps = dependencies(by_id[cid].get("arguments") or {})
+                    if all(d in outcomes or d in local for d in deps):
+                        rounds.setdefault(service, []).append(cid)
+                        placed.add(cid)
+                        progress = True
+            await asyncio.gather(
+                *(self._send_round(service, cids, by_id, outcomes) for service, cids in rounds.items())
+            )
+        return [outcomes[cid] for cid in ids]
+
+    async def _send_round(
+        self, service: str, cids: list[str], by_id: dict[str, dict], outcomes: dict[str, dict]
+    ) -> None:
+        pool = self.pools.get(service)
+        finished = {cid: o["result"] for cid, o in outcomes.items() if o["ok"]}
+        failed: dict[str, dict] = {}
+        send: list[dict] = []
+        for cid in cids:  # in dependency order
+            deps = dependencies(by_id[cid].get("arguments") or {})
+            bad = sorted(d for d in deps if d in failed or (d in outcomes and not outcomes[d]["ok"]))
+            if pool is None:
+                failed[cid] = failure(cid, f"no MCP server for {by_id[cid].get('tool')!r}")
+            elif bad:
+                failed[cid] = failure(cid, f"dependency failed: {', '.join(bad)}")
+            else:
+                arguments = resolve_refs(by_id[cid].get("arguments") or {}, finished)
+                send.append({"id": cid, "tool": by_id[cid]["tool"], "arguments": arguments})
+        outcomes.update(failed)
+        if not send:
+            return
+        run = wrap_tool(f"{service}.batch", self._batch_fn(pool, service), self.middleware)
+        try:
+            results = await run(calls=send)
+        except Exception as exc:
+            outcomes.update({c["id"]: failure(c["id"], f"{type(exc).__name__}: {exc}") for c in send})
+            return
+        # A one-call batch may come back as the bare outcome.
+        for outcome in results if isinstance(results, list) else [results]:
+            outcomes[outcome["id"]] = outcome
+        for call in send:
+            outcomes.setdefault(call["id"], failure(call["id"], "no result in batch response"))
+
+    @staticmethod
+    def _batch_fn(pool: Any, service: str) -> ToolFn:
+        async def batch(calls: list[dict]) -> Any:
+            return await pool.call(f"{service}.batch", {"calls": calls})
+
+        return batch
+
     async def get_change(self, change_id: str) -> ChangeRequest:
         return await self.ticketing_get_change(change_id=change_id)
 
@@ -103,6 +293,10 @@ class MCPToolRouter:
             evidence_ids=evidence_ids,
         )
 
+    async def aclose(self) -> None:
+        """Close remote MCP sessions (no-op for in-process routers)."""
+        await asyncio.gather(*(pool.aclose() for pool in self.pools.values()))
+
     # --- factories ---
 
     @classmethod
@@ -112,7 +306,7 @@ class MCPToolRouter:
         cv_adapter: Any,
         netbox_adapter: Any,
         ticketing_adapter: Any,
-    ) -> "MCPToolRouter":
+    ) -> MCPToolRouter:
         """Build a router from adapter instances.
 
         Each adapter exposes MCPToolRouter-compatible async methods that delegate
@@ -128,14 +322,64 @@ class MCPToolRouter:
             ticketing_get_change=ticketing_adapter.get_change,
             ticketing_post_step_result=ticketing_adapter.post_step_result,
             ticketing_request_approval=ticketing_adapter.request_approval,
+            netbox_validate_observed_batch=netbox_adapter.validate_observed_batch,
+            camera_upload_begin=camera_adapter.upload_begin,
+            camera_upload_chunk=camera_adapter.upload_chunk,
+            camera_upload_commit=camera_adapter.upload_commit,
         )
 
     @classmethod
-    def from_settings(cls) -> "MCPToolRouter":
+    def from_pools(cls, pools: dict[str, Any]) -> MCPToolRouter:
+        """Build a router over remote MCP servers, one MCPSessionPool per service.
+
+        Tool results are JSON; they are validated back into the models the
+        in-process handlers return.
+        """
+
+        def tool(service: str, name: str, model: Any = None, many: bool = False) -> ToolFn:
+            pool = pools[service]
+
+            async def call(**kwargs: Any) -> Any:
+                payload = await pool.call(name, kwargs)
+                if model is None:
+                    return payload
+                if many:
+                    # Some SDK releases send a list result as one content item per element.
+                    items = payload if isinstance(payload, list) else [payload]
+                    return [model.model_validate(item) for item in items]
+                return model.model_validate(payload)
+
+            return call
+
+        return cls(
+            camera_capture_frame=tool("camera", "camera.capture_frame", EvidenceRef),
+            camera_store_evidence=tool("camera", "camera.store_evidence", EvidenceRef),
+            cv_read_port_label=tool("cv", "cv.read_port_label", PortLabelResult),
+            cv_read_cable_tag=tool("cv", "cv.read_cable_tag", CableTagResult),
+            netbox_get_expected_mapping=tool("netbox", "netbox.get_expected_mapping"),
+            netbox_validate_observed=tool("netbox", "netbox.validate_observed", ValidationResult),
+            ticketing_get_change=tool("ticketing", "ticketing.get_change", ChangeRequest),
+            ticketing_post_step_result=tool("ticketing", "ticketing.post_step_result"),
+            ticketing_request_approval=tool("ticketing", "ticketing.request_approval"),
+            netbox_validate_observed_batch=tool(
+                "netbox", "netbox.validate_observed_batch", ValidationResult, many=True
+            ),
+            camera_upload_begin=tool("camera", "camera.upload_begin"),
+            camera_upload_chunk=tool("camera", "camera.upload_chunk"),
+            camera_upload_commit=tool("camera", "camera.upload_commit", EvidenceRef),
+            pools=pools,
+        )
+
+    @classmethod
+    def from_settings(cls) -> MCPToolRouter:
         """Build a router from application settings.
 
         INFRA_MCP_TRANSPORT=in-process (default) → adapters called directly in-process.
-        Remote transports (stdio/HTTP) are future work.
+        INFRA_MCP_TRANSPORT=stdio → each MCP server runs as a child process.
+        INFRA_MCP_TRANSPORT=http → MCP servers at MCP_<SERVICE>_URL (streamable HTTP).
+        Remote sessions are opened on first use and kept; MCP_POOL_SIZE bounds
+        sessions per server. Calls are traced and measured per tool, and calls
+        over MCP_SLOW_CALL_MS are logged (a MCP_SLOW_CALL_SAMPLE_RATE share).
         """
         from packages.core.config import get_settings
         from services.mcp_camera.adapter import CameraAdapter
@@ -152,9 +396,14 @@ class MCPToolRouter:
                 cv_adapter=CVAdapter(cv_mode=settings.cv_mode, scenario=settings.scenario),
                 netbox_adapter=NetBoxAdapter(netbox_mode=settings.netbox_mode),
                 ticketing_adapter=TicketingAdapter(),
-            )
+            ).use(*default_middleware(settings))
+
+        if transport in ("stdio", "http"):
+            from packages.mcp.remote import build_pools
+
+            return cls.from_pools(build_pools(settings, transport)).use(*default_middleware(settings))
 
         raise ValueError(
             f"Unsupported INFRA_MCP_TRANSPORT={transport!r}. "
-            "Only 'in-process' is currently supported."
+            "Use 'in-process', 'stdio' or 'http'."
         )
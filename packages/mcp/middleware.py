@@ -0,0 +1,228 @@
+"""Middleware around MCPToolRouter tool calls: telemetry and a sampled slow-call log.
+
+Every tool function on the router is wrapped in the middleware chain, so the
+passthrough methods, batches and remote calls are all measured in one place.
+A middleware is an async callable (call, call_next) -> result. It may look at
+call.arguments, await call_next(call), and then read call.duration,
+call.error and call.cache, which the innermost step fills in.
+
+call.cache holds the lookups downstream caches reported while serving the
+call (packages.core.metrics.note_cache_lookup). Over a remote transport those
+caches live in the server process, so only in-process calls carry them.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from opentelemetry import metrics, trace
+from pydantic_core import to_json
+
+from packages.core.metrics import LatencyRecorder, track_cache_lookups
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTATION = "infrasentinel.mcp"
+
+
+@dataclass
+class ToolCall:
+    tool: str
+    arguments: dict[str, Any]
+    duration: float = 0.0  # seconds, set once the tool returns or raises
+    error: BaseException | None = None
+    # cache name -> [hits, misses] reported while the tool ran
+    cache: dict[str, list[int]] = field(default_factory=dict)
+
+    @property
+    def cache_hit(self) -> bool | None:
+        """True if every cache lookup hit, False if any missed, None if there were none."""
+        if not self.cache:
+            return None
+        return all(misses == 0 for _, misses in self.cache.values())
+
+
+Next = Callable[[ToolCall], Awaitable[Any]]
+Middleware = Callable[[ToolCall, Next], Awaitable[Any]]
+
+
+def wrap_tool(
+    tool: str, fn: Callable[..., Awaitable[Any]], middleware: list[Middleware]
+) -> Callable[..., Awaitable[Any]]:
+    """fn behind the middleware chain (first middleware outermost); fn itself if there is none."""
+    fn = unwrap_tool(fn)
+    if not middleware:
+        return fn
+
+    async def invoke(call: ToolCall) -> Any:
+        start = time.perf_counter()
+        try:
+            with track_cache_lookups() as lookups:
+                call.cache = lookups
+                return await fn(**call.arguments)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            call.duration = time.perf_counter() - start
+
+    def bind(mw: Middleware, call_next: Next) -> Next:
+        async def step(call: ToolCall) -> Any:
+            return await mw(call, call_next)
+
+        return step
+
+    handler: Next = invoke
+    for mw in reversed(middleware):
+        handler = bind(mw, handler)
+
+    async def wrapped(**kwargs: Any) -> Any:
+        return await handler(ToolCall(tool, kwargs))
+
+    wrapped._tool_fn = fn  # type: ignore[attr-defined]
+    return wrapped
+
+
+def unwrap_tool(fn: Any) -> Any:
+    """The tool function behind a wrap_tool() wrapper."""
+    return getattr(fn, "_tool_fn", fn)
+
+
+def payload_size(value: Any) -> int:
+    """Size of value encoded as JSON (bytes as base64, as they travel over MCP); 0 if unencodable."""
+    try:
+        return len(to_json(value, bytes_mode="base64", fallback=str))
+    except Exception:
+        return 0
+
+
+def _error_type(call: ToolCall) -> str | None:
+    return type(call.error).__name__ if call.error is not None else None
+
+
+class TelemetryMiddleware:
+    """OpenTelemetry span and metrics per tool call.
+
+    Span "mcp.tool <tool>" with the tool name, payload sizes, error class and
+    cache lookups. Metrics: mcp.tool.duration (ms), mcp.tool.request.size and
+    mcp.tool.response.size (bytes, JSON-encoded), mcp.tool.errors by error
+    class and mcp.tool.cache.lookups by cache and hit. Durations also go to
+    recorder, if given, under the tool name.
+    """
+
+    def __init__(
+        self,
+        tracer: trace.Tracer | None = None,
+        meter: metrics.Meter | None = None,
+        recorder: LatencyRecorder | None = None,
+    ) -> None:
+        self.tracer = tracer or trace.get_tracer(INSTRUMENTATION)
+        meter = meter or metrics.get_meter(INSTRUMENTATION)
+        self.recorder = recorder
+        self.duration = meter.create_histogram(
+            "mcp.tool.duration", unit="ms", description="MCP tool call latency"
+        )
+        self.request_size = meter.create_histogram(
+            "mcp.tool.request.size", unit="By", description="JSON-encoded tool arguments"
+        )
+        self.response_size = meter.create_histogram(
+            "mcp.tool.response.size", unit="By", description="JSON-encoded tool results"
+        )
+        self.errors = meter.create_counter("mcp.tool.errors", description="Failed MCP tool calls")
+        self.cache_lookups = meter.create_counter(
+            "mcp.tool.cache.lookups", description="Cache lookups made while serving tool calls"
+        )
+
+    async def __call__(self, call: ToolCall, call_next: Next) -> Any:
+        bytes_in = payload_size(call.arguments)
+        with self.tracer.start_as_current_span(
+            f"mcp.tool {call.tool}",
+            attributes={"mcp.tool": call.tool, "mcp.request.bytes": bytes_in},
+        ) as span:
+            result = None
+            try:
+                result = await call_next(call)
+                return result
+            finally:
+                self._record(call, span, bytes_in, None if call.error else payload_size(result))
+
+    def _record(self, call: ToolCall, span: trace.Span, bytes_in: int, bytes_out: int | None) -> None:
+        error_type = _error_type(call)
+        cache_hit = call.cache_hit
+        attributes: dict[str, Any] = {"mcp.tool": call.tool, "outcome": "error" if error_type else "ok"}
+        if cache_hit is not None:
+            attributes["cache_hit"] = cache_hit
+        if error_type:
+            span.set_attribute("error.type", error_type)
+            self.errors.add(1, {"mcp.tool": call.tool, "error.type": error_type})
+        if bytes_out is not None:
+            span.set_attribute("mcp.response.bytes", bytes_out)
+            self.response_size.record(bytes_out, {"mcp.tool": call.tool})
+        if cache_hit is not None:
+            span.set_attribute("mcp.cache_hit", cache_hit)
+        for cache, (hits, misses) in call.cache.items():
+            span.set_attribute(f"mcp.cache.{cache}.hits", hits)
+            span.set_attribute(f"mcp.cache.{cache}.misses", misses)
+            if hits:
+                self.cache_lookups.add(hits, {"mcp.tool": call.tool, "cache": cache, "hit": True})
+            if misses:
+                self.cache_lookups.add(misses, {"mcp.tool": call.tool, "cache": cache, "hit": False})
+        self.request_size.record(bytes_in, {"mcp.tool": call.tool})
+        self.duration.record(call.duration * 1000, attributes)
+        if self.recorder is not None:
+            self.recorder.record(call.tool, call.duration, ok=error_type is None)
+
+
+class SlowCallLog:
+    """Log calls slower than threshold_ms, with their arguments, for a sample_rate share of them."""
+
+    def __init__(
+        self,
+        threshold_ms: float = 1000.0,
+        sample_rate: float = 1.0,
+        max_argument_chars: int = 512,
+        rng: Callable[[], float] = random.random,
+        log: logging.Logger = logger,
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.max_argument_chars = max_argument_chars
+        self.rng = rng
+        self.log = log
+
+    async def __call__(self, call: ToolCall, call_next: Next) -> Any:
+        try:
+            return await call_next(call)
+        finally:
+            elapsed_ms = call.duration * 1000
+            if elapsed_ms >= self.threshold_ms and self.rng() < self.sample_rate:
+                self.log.warning(
+                    "slow tool call %s: %.1f ms (%s) cache=%s args=%s",
+                    call.tool,
+                    elapsed_ms,
+                    _error_type(call) or "ok",
+                    call.cache or "-",
+                    self._arguments(call.arguments),
+                )
+
+    def _arguments(self, arguments: dict[str, Any]) -> str:
+        try:
+            text = to_json(arguments, bytes_mode="base64", fallback=str).decode("utf-8")
+        except Exception:
+            text = repr(arguments)
+        if len(text) > self.max_argument_chars:
+            return f"{text[: self.max_argument_chars]}... ({len(text)} chars)"
+        return text
+
+
+def default_middleware(settings: Any) -> list[Middleware]:
+    """Telemetry on every call, plus the slow-call log unless MCP_SLOW_CALL_MS is 0."""
+    chain: list[Middleware] = [TelemetryMiddleware()]
+    if settings.mcp_slow_call_ms > 0:
+        chain.append(SlowCallLog(settings.mcp_slow_call_ms, settings.mcp_slow_call_sample_rate))
+    return chain
@@ -0,0 +1,325 @@
+"""Remote MCP transport: pooled, long-lived client sessions over stdio or streamable HTTP.
+
+Each MCP server gets an MCPSessionPool. A pool keeps up to `size` initialized
+ClientSessions open for the life of the process; a session multiplexes
+concurrent tool calls (JSON-RPC request ids), and further sessions are only
+opened while every open one is busy. A call that fails because the session or
+its transport died reconnects that slot and is retried once, provided the
+request was never sent or the tool is in IDEMPOTENT_TOOLS; a write that may
+have reached the server is not repeated. Per-tool call latency goes to a
+LatencyRecorder (MCP_LATENCY by default).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager, suppress
+from pathlib import Path
+from typing import Any
+
+import anyio
+import httpx
+from pydantic_core import to_jsonable_python
+
+from packages.core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+MCP_LATENCY = LatencyRecorder()
+
+# JSON-RPC error code the MCP client raises for requests pending when the transport closes.
+CONNECTION_CLOSED = -32000
+CLOSE_TIMEOUT = 5.0
+
+# Tools that are safe to run twice: lookups, and chunk writes addressed by offset.
+# Anything else (ticket updates, approvals, upload commits, mixed batches) is only
+# retried when the connection failed before the request went out.
+IDEMPOTENT_TOOLS = frozenset(
+    {
+        "camera.capture_frame",
+        "camera.upload_chunk",
+        "cv.read_port_label",
+        "cv.read_cable_tag",
+        "cv.batch",
+        "netbox.get_expected_mapping",
+        "netbox.validate_observed",
+        "netbox.validate_observed_batch",
+        "netbox.validate_path",
+        "netbox.batch",
+        "ticketing.get_change",
+    }
+)
+
+# (read_stream, write_stream, ...) for one MCP connection.
+Connector = Callable[[], AbstractAsyncContextManager[tuple]]
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+class MCPToolError(RuntimeError):
+    """The server ran the tool and reported an error (not retried)."""
+
+
+def stdio_connector(module: str) -> Connector:
+    """Spawn `python -m module` (one of services/mcp_*/server.py) and talk MCP over its stdio."""
+
+    def connect() -> AbstractAsyncContextManager[tuple]:
+        from mcp import StdioServerParameters
+        from mcp.client.stdio import stdio_client
+
+        # The server reads the same settings (NETBOX_MODE, CV_MODE, ...) as this process.
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=["-m", module],
+            env={**os.environ, "MCP_SERVER_TRANSPORT": "stdio"},
+            cwd=str(_REPO_ROOT),
+        )
+        return stdio_client(params)
+
+    return connect
+
+
+def http_connector(url: str, headers: dict[str, str] | None = None, timeout: float = 30.0) -> Connector:
+    """Connect to a server started with MCP_SERVER_TRANSPORT=streamable-http."""
+
+    @asynccontextmanager
+    async def connect() -> AsyncIterator[tuple]:
+        from mcp.client.streamable_http import streamablehttp_client
+
+        async with streamablehttp_client(url, headers=headers, timeout=timeout) as streams:
+            yield streams
+
+    return connect
+
+
+def _client_session(read: Any, write: Any) -> AbstractAsyncContextManager[Any]:
+    from mcp import ClientSession
+
+    return ClientSession(read, write)
+
+
+def _attr(obj: Any, *names: str) -> Any:
+    # Result and tool models use camelCase field names in some SDK releases, snake_case in others.
+    for name in names:
+        value = getattr(obj, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def _is_connection_error(exc: BaseException) -> bool:
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        return False  # a slow tool, not a dead session
+    if isinstance(
+        exc,
+        (
+            OSError,
+            EOFError,
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+            httpx.TransportError,
+        ),
+    ):
+        return True
+    error = getattr(exc, "error", exc)
+    return getattr(error, "code", None) == CONNECTION_CLOSED
+
+
+def tool_result_payload(result: Any) -> Any:
+    """Decode a CallToolResult into the JSON value the tool returned."""
+    content = _attr(result, "content") or []
+    texts = [item.text for item in content if getattr(item, "type", None) == "text"]
+    if _attr(result, "isError", "is_error"):
+        raise MCPToolError("; ".join(texts) or "tool call failed")
+    structured = _attr(result, "structuredContent", "structured_content")
+    if structured is not None:
+        # Non-object return values are wrapped as {"result": value}.
+        return structured["result"] if set(structured) == {"result"} else structured
+    values = []
+    for text in texts:
+        try:
+            values.append(json.loads(text))
+        except json.JSONDecodeError:
+            values.append(text)
+    return values[0] if len(values) == 1 else values
+
+
+class _Slot:
+    """One ClientSession, held open by a background task until closed.
+
+    The transport and session context managers are entered and exited in the
+    same task, as anyio cancel scopes require.
+    """
+
+    def __init__(self, connect: Connector, session_factory: Callable[..., Any]) -> None:
+        self._connect = connect
+        self._session_factory = session_factory
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self.session: Any = None
+        self.in_flight = 0
+        self.connects = 0
+        # tool name -> argument names from its input schema
+        self.tools: dict[str, set[str]] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def ensure(self) -> Any:
+        if self.connected:
+            return self.session
+        async with self._lock:
+            if self.connected:
+                return self.session
+            await self.close()
+            ready: asyncio.Future = asyncio.get_running_loop().create_future()
+            self._stop = asyncio.Event()
+            self._task = asyncio.create_task(self._run(ready))
+            return await ready
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                streams = await stack.enter_async_context(self._connect())
+                session = await stack.enter_async_context(self._session_factory(streams[0], streams[1]))
+                await session.initialize()
+                listed = await session.list_tools()
+                self.tools = {
+                    tool.name: set((_attr(tool, "inputSchema", "input_schema") or {}).get("properties", {}))
+                    for tool in listed.tools
+                }
+                self.connects += 1
+                self.session = session
+                ready.set_result(session)
+                await self._stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except BaseException as exc:
+            if not ready.done():
+                ready.set_exception(exc)
+            else:
+                logger.warning("MCP session closed: %s", exc)
+        finally:
+            self.session = None
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        self.session = None
+        if task is None:
+            return
+        self._stop.set()
+        await asyncio.wait({task}, timeout=CLOSE_TIMEOUT)
+        if not task.done():
+            task.cancel()
+        with suppress(BaseException):
+            await task
+
+
+class MCPSessionPool:
+    """Long-lived sessions to one MCP server, shared by concurrent tool calls."""
+
+    def __init__(
+        self,
+        name: str,
+        connect: Connector,
+        *,
+        size: int = 2,
+        call_timeout: float = 30.0,
+        recorder: LatencyRecorder | None = None,
+        session_factory: Callable[..., Any] = _client_session,
+    ) -> None:
+        self.name = name
+        self.call_timeout = call_timeout
+        self._recorder = recorder or MCP_LATENCY
+        self._slots = [_Slot(connect, session_factory) for _ in range(max(1, size))]
+
+    def _pick(self) -> _Slot:
+        # Prefer an idle open session, then opening an unused slot, then the least busy one.
+        idle = [s for s in self._slots if s.in_flight == 0]
+        if idle:
+            return min(idle, key=lambda s: not s.connected)
+        return min(self._slots, key=lambda s: s.in_flight)
+
+    async def call(self, tool: str, arguments: dict[str, Any]) -> Any:
+        """Call tool and return its decoded JSON result.
+
+        Arguments the tool's input schema does not declare are dropped, so
+        router calls can pass context (change_id, scenario) a server ignores.
+        """
+        start = time.perf_counter()
+        ok = False
+        try:
+            for attempt in range(2):
+                slot = self._pick()
+                slot.in_flight += 1
+                sent = False
+                try:
+                    session = await slot.ensure()
+                    declared = slot.tools.get(tool)
+                    args = {k: v for k, v in arguments.items() if declared is None or k in declared}
+                    sent = True
+                    result = await asyncio.wait_for(
+                        session.call_tool(tool, to_jsonable_python(args)), self.call_timeout
+                    )
+                except Exception as exc:
+                    if not _is_connection_error(exc) or attempt:
+                        raise
+                    if sent and tool not in IDEMPOTENT_TOOLS:
+                        await slot.close()
+                        raise
+                    logger.warning("MCP %s: reconnecting after %s", self.name, exc)
+                    await slot.close()
+                    continue
+                finally:
+                    slot.in_flight -= 1
+                payload = tool_result_payload(result)
+                ok = True
+                return payload
+            raise AssertionError("unreachable")
+        finally:
+            self._recorder.record(tool, time.perf_counter() - start, ok=ok)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sessions": sum(1 for s in self._slots if s.connected),
+            "in_flight": sum(s.in_flight for s in self._slots),
+            "connects": sum(s.connects for s in self._slots),
+        }
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(slot.close() for slot in self._slots))
+
+
+SERVICES = ("camera", "cv", "netbox", "ticketing")
+
+
+def build_pools(settings: Any, transport: str) -> dict[str, MCPSessionPool]:
+    """One pool per MCP server for INFRA_MCP_TRANSPORT=stdio or http."""
+    urls = {
+        "camera": settings.mcp_camera_url,
+        "cv": settings.mcp_cv_url,
+        "netbox": settings.mcp_netbox_url,
+        "ticketing": settings.mcp_ticketing_url,
+    }
+    headers = {"Authorization": f"Bearer {settings.mcp_api_key}"} if settings.mcp_api_key else None
+    pools: dict[str, MCPSessionPool] = {}
+    for name in SERVICES:
+        if transport == "stdio":
+            connect = stdio_connector(f"services.mcp_{name}.server")
+        else:
+            connect = http_connector(urls[name], headers=headers, timeout=settings.mcp_call_timeout)
+        pools[name] = MCPSessionPool(
+            name, connect, size=settings.mcp_pool_size, call_timeout=settings.mcp_call_timeout
+        )
+    return pools
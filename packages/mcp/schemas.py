@@ -34,6 +34,17 @@ class NetboxValidateObservedInput(BaseModel):
     cable_tag: str
 
 
+class NetboxObservation(BaseModel):
+    panel_id: str
+    port_label: str
+    cable_tag: str
+
+
+class NetboxValidateObservedBatchInput(BaseModel):
+    change_id: str
+    observations: list[NetboxObservation]
+
+
 class TicketingGetChangeInput(BaseModel):
     change_id: str
 
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+from packages.cv.evaluation import EvalConfig, comparison_table, evaluate_dataset
+
+DEFAULT_DATASETS = ["data/synth/patchpanel_v1", "data/real_eval"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Evaluate CV accuracy and throughput over labelled datasets."
+    )
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        default=None,
+        help="Dataset dir with labels.jsonl (repeatable; default: synth + real_eval)",
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        default=None,
+        help="name:backend[:bbox=1,port_accept=0.8,tag_accept=0.8] (repeatable; default: mock:mock)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size")
+    parser.add_argument("--limit", type=int, default=None, help="Max samples per dataset")
+    parser.add_argument("--out", default="runtime/cv_eval/report.json", help="Report JSON path")
+    return parser.parse_args()
+
+
+def _print_table(dataset: str, rows: list[dict], names: list[str]) -> None:
+    width = max(len(r["metric"]) for r in rows)
+    print(f"\n{dataset}")
+    print(f"{'metric':<{width}}  " + "  ".join(f"{n:>12}" for n in names))
+    for row in rows:
+        print(f"{row['metric']:<{width}}  " + "  ".join(f"{row[n]:>12}" for n in names))
+
+
+def main() -> None:
+    args = parse_args()
+    configs = [EvalConfig.parse(spec) for spec in (args.config or ["mock:mock"])]
+    names = [c.name for c in configs]
+    if len(set(names)) != len(names):
+        raise SystemExit("Config names must be unique")
+
+    report: dict = {"workers": args.workers, "datasets": {}}
+    for dataset in args.dataset or DEFAULT_DATASETS:
+        dataset_dir = Path(dataset)
+        results = {
+            config.name: evaluate_dataset(dataset_dir, config, args.workers, args.limit)
+            for config in configs
+        }
+        if not any(r["samples"] for r in results.values()):
+            print(f"\n{dataset}: no labelled images found (run `make synth` for synthetic data)")
+        else:
+            _print_table(dataset, comparison_table(results), names)
+        report["datasets"][dataset] = {
+            "results": results,
+            "comparison": comparison_table(results),
+        }
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nWrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,51 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+# Bump when rendering changes so stale shards are not mixed into a resumed run.
+GENERATOR_VERSION = 2
 
-def parse_args() -> argparse.Namespace:
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate synthetic patch-panel dataset.")
     parser.add_argument("--out", default="data/synth/patchpanel_v1", help="Output dataset directory")
     parser.add_argument("--n", type=int, default=200, help="Number of samples")
-    parser.add_argument("--ports", type=int, choices=[24, 48], default=24, help="Port count")
+    parser.add_argument(
+        "--ports",
+        choices=["24", "48", "mixed"],
+        default="24",
+        help="Port count per panel; 'mixed' picks 24 or 48 per sample",
+    )
+    parser.add_argument(
+        "--max-tags",
+        type=int,
+        choices=[1, 2, 3],
+        default=1,
+        help="Cable tags per panel (>1 renders several tagged cables; label is the chosen port's)",
+    )
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
-    return parser.parse_args()
+    parser.add_argument("--shard-size", type=int, default=1000, help="Samples per shard")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument(
+        "--force", action="store_true", help="Discard existing shards that used different options"
+    )
+    return parser.parse_args(argv)
+
+
+def sample_rng(seed: int, index: int) -> random.Random:
+    """Per-sample RNG so output is identical for any worker count or shard size."""
+    digest = hashlib.sha256(f"{seed}:{index}".encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
 
 
 def _port_label_for(style: str, idx: int) -> str:
@@ -29,116 +58,208 @@ def _port_label_for(style: str, idx: int) -> str:
     return f"P{idx:02d}"
 
 
-def _random_cable_tag() -> str:
-    return f"MDF-01-R{random.randint(1,20):02d}-P{random.randint(1,48):02d}"
+def _random_cable_tag(rng: random.Random) -> str:
+    return f"MDF-01-R{rng.randint(1,20):02d}-P{rng.randint(1,48):02d}"
 
 
-def _apply_transforms(image: np.ndarray) -> tuple[np.ndarray, dict[str, bool]]:
+def _apply_transforms(
+    image: np.ndarray, rng: random.Random
+) -> tuple[np.ndarray, dict[str, bool]]:
     h, w = image.shape[:2]
     flags = {"blurred": False, "dark": False, "glare": False}
 
-    angle = random.uniform(-4.0, 4.0)
+    angle = rng.uniform(-4.0, 4.0)
     m = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
     warped = cv2.warpAffine(image, m, (w, h), borderMode=cv2.BORDER_REPLICATE)
 
-    if random.random() < 0.35:
+    if rng.random() < 0.35:
         warped = cv2.GaussianBlur(warped, (5, 5), sigmaX=1.1)
         flags["blurred"] = True
-    if random.random() < 0.35:
+    if rng.random() < 0.35:
         warped = cv2.convertScaleAbs(warped, alpha=0.8, beta=-35)
         flags["dark"] = True
-    if random.random() < 0.25:
+    if rng.random() < 0.25:
         overlay = warped.copy()
-        cx, cy = random.randint(60, w - 60), random.randint(40, h - 40)
+        cx, cy = rng.randint(60, w - 60), rng.randint(40, h - 40)
         cv2.circle(overlay, (cx, cy), 28, (255, 255, 255), -1)
         warped = cv2.addWeighted(overlay, 0.2, warped, 0.8, 0)
         flags["glare"] = True
     return warped, flags
 
 
-def main() -> None:
-    args = parse_args()
-    random.seed(args.seed)
-    np.random.seed(args.seed)
+def render_sample(index: int, seed: int, ports_opt: str, max_tags: int) -> tuple[np.ndarray, dict]:
+    """Render one panel image and its label entry (without the image path)."""
+    rng = sample_rng(seed, index)
+    font = ImageFont.load_default()
+    width, height = 1280, 360
+    canvas = Image.new("RGB", (width, height), color=(34, 34, 34))
+    draw = ImageDraw.Draw(canvas)
+    panel_rect = (60, 80, width - 60, height - 80)
+    draw.rounded_rectangle(panel_rect, radius=10, fill=(56, 56, 56), outline=(120, 120, 120), width=3)
 
-    out_dir = Path(args.out)
-    img_dir = out_dir / "images"
-    img_dir.mkdir(parents=True, exist_ok=True)
-    labels_path = out_dir / "labels.jsonl"
-    meta_path = out_dir / "meta.json"
+    ports = int(ports_opt) if ports_opt != "mixed" else rng.choice([24, 48])
+    per_row = 24 if ports == 48 else ports
+    style = rng.choice(["numeric", "alpha", "padded"])
+    chosen_port = rng.randint(1, ports)
+    port_text = _port_label_for(style, chosen_port)
+    has_tag = rng.random() < 0.8
 
-    font = ImageFont.load_default()
-    entries: list[dict] = []
-    styles = ["numeric", "alpha", "padded"]
-
-    for i in range(args.n):
-        width, height = 1280, 360
-        canvas = Image.new("RGB", (width, height), color=(34, 34, 34))
-        draw = ImageDraw.Draw(canvas)
-        panel_rect = (60, 80, width - 60, height - 80)
-        draw.rounded_rectangle(panel_rect, radius=10, fill=(56, 56, 56), outline=(120, 120, 120), width=3)
-
-        ports = args.ports
-        per_row = 24 if ports == 48 else ports
-        rows = 2 if ports == 48 else 1
-        style = random.choice(styles)
-        chosen_port = random.randint(1, ports)
-        port_text = _port_label_for(style, chosen_port)
-        cable_tag = _random_cable_tag() if random.random() < 0.8 else None
-
-        x0, y0 = 120, 135
-        x_gap = 42 if per_row == 24 else 24
-        y_gap = 64
-        label_bbox = None
-
-        for p in range(1, ports + 1):
-            row = 0 if p <= per_row else 1
-            col = (p - 1) if row == 0 else (p - 1 - per_row)
-            x = x0 + col * x_gap
-            y = y0 + row * y_gap
-            draw.rectangle((x, y, x + 20, y + 20), fill=(180, 180, 190), outline=(20, 20, 20), width=1)
-            label = _port_label_for(style, p)
-            draw.text((x - 1, y + 26), label, fill=(220, 220, 220), font=font)
-            if p == chosen_port:
-                label_bbox = [x - 2, y + 24, 30, 14]
-
-        tag_bbox = None
-        if cable_tag:
-            tx, ty = random.randint(180, width - 380), random.randint(38, 72)
-            draw.rounded_rectangle((tx - 6, ty - 3, tx + 230, ty + 15), radius=3, fill=(228, 228, 228))
-            draw.text((tx, ty), cable_tag, fill=(32, 32, 32), font=font)
-            tag_bbox = [tx - 6, ty - 3, 236, 20]
-
-        arr = cv2.cvtColor(np.array(canvas), cv2.COLOR_RGB2BGR)
-        arr, quality_flags = _apply_transforms(arr)
-
-        filename = f"panel_{i:05d}.png"
+    x0, y0 = 120, 135
+    x_gap = 42 if per_row == 24 else 24
+    y_gap = 64
+    label_bbox = None
+
+    for p in range(1, ports + 1):
+        row = 0 if p <= per_row else 1
+        col = (p - 1) if row == 0 else (p - 1 - per_row)
+        x = x0 + col * x_gap
+        y = y0 + row * y_gap
+        draw.rectangle((x, y, x + 20, y + 20), fill=(180, 180, 190), outline=(20, 20, 20), width=1)
+        label = _port_label_for(style, p)
+        draw.text((x - 1, y + 26), label, fill=(220, 220, 220), font=font)
+        if p == chosen_port:
+            label_bbox = [x - 2, y + 24, 30, 14]
+
+    # Tag strip above the panel; with several tags, slots are spread so they never overlap.
+    tags: list[dict] = []
+    n_tags = (rng.randint(1, max_tags) if max_tags > 1 else 1) if has_tag else 0
+    slot_w = (width - 560) // max(1, n_tags)
+    for t in range(n_tags):
+        text = _random_cable_tag(rng)
+        tx = 180 + t * slot_w + rng.randint(0, max(0, slot_w - 250))
+        ty = rng.randint(38, 72)
+        draw.rounded_rectangle((tx - 6, ty - 3, tx + 230, ty + 15), radius=3, fill=(228, 228, 228))
+        draw.text((tx, ty), text, fill=(32, 32, 32), font=font)
+        tags.append({"cable_tag": text, "bbox": [tx - 6, ty - 3, 236, 20]})
+    primary = tags[rng.randrange(len(tags))] if tags else None
+
+    arr = cv2.cvtColor(np.array(canvas), cv2.COLOR_RGB2BGR)
+    arr, quality_flags = _apply_transforms(arr, rng)
+    entry = {
+        "sample_id": index,
+        "port_label": port_text,
+        "cable_tag": primary["cable_tag"] if primary else None,
+        "bbox_label": label_bbox,
+        "bbox_tag": primary["bbox"] if primary else None,
+        "quality_flags": quality_flags,
+        "ports": ports,
+        "style": style,
+    }
+    if max_tags > 1:
+        entry["cable_tags"] = tags
+    return arr, entry
+
+
+def _shard_name(shard: int) -> str:
+    return f"{shard:04d}"
+
+
+def generate_shard(
+    out_dir: str, shard: int, start: int, stop: int, seed: int, ports: str, max_tags: int
+) -> int:
+    """Render samples [start, stop) into images/shard-XXXX and labels-XXXX.jsonl.
+
+    The labels file is written last via rename, so its presence marks the shard complete.
+    """
+    out = Path(out_dir)
+    name = _shard_name(shard)
+    img_dir = out / "images" / f"shard-{name}"
+    img_dir.mkdir(parents=True, exist_ok=True)
+    lines: list[str] = []
+    for index in range(start, stop):
+        arr, entry = render_sample(index, seed, ports, max_tags)
+        filename = f"panel_{index:06d}.png"
         cv2.imwrite(str(img_dir / filename), arr)
-        entries.append(
-            {
-                "image": f"images/{filename}",
-                "port_label": port_text,
-                "cable_tag": cable_tag,
-                "bbox_label": label_bbox,
-                "bbox_tag": tag_bbox,
-                "quality_flags": quality_flags,
-                "ports": ports,
-                "style": style,
-            }
+        entry = {"image": f"images/shard-{name}/{filename}", **entry}
+        lines.append(json.dumps(entry))
+    tmp = out / f"labels-{name}.jsonl.tmp"
+    tmp.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    tmp.replace(out / f"labels-{name}.jsonl")
+    return stop - start
+
+
+def _check_resume(out_dir: Path, config: dict, force: bool) -> None:
+    manifest_path = out_dir / "manifest.json"
+    if not manifest_path.exists():
+        return
+    previous = json.loads(manifest_path.read_text(encoding="utf-8")).get("config", {})
+    if previous == config:
+        return
+    if not force:
+        raise SystemExit(
+            f"{out_dir} holds shards generated with {previous}; rerun with --force to replace them."
         )
+    for path in out_dir.glob("labels-*.jsonl"):
+        path.unlink()
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    config = {
+        "n": args.n,
+        "seed": args.seed,
+        "ports": args.ports,
+        "max_tags": args.max_tags,
+        "shard_size": args.shard_size,
+        "generator_version": GENERATOR_VERSION,
+    }
+    _check_resume(out_dir, config, args.force)
+    (out_dir / "manifest.json").write_text(
+        json.dumps({"config": config, "complete": False}, indent=2), encoding="utf-8"
+    )
+
+    shards = [
+        (shard, start, min(start + args.shard_size, args.n))
+        for shard, start in enumerate(range(0, args.n, args.shard_size))
+    ]
+    todo = [s for s in shards if not (out_dir / f"labels-{_shard_name(s[0])}.jsonl").exists()]
+    if len(todo) < len(shards):
+        print(f"Resuming: {len(shards) - len(todo)} of {len(shards)} shards already complete")
+
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [
+            executor.submit(
+                generate_shard, str(out_dir), shard, start, stop, args.seed, args.ports, args.max_tags
+            )
+            for shard, start, stop in todo
+        ]
+        for done, future in enumerate(futures, start=1):
+            future.result()
+            print(f"shard {done}/{len(todo)} done")
 
-    with labels_path.open("w", encoding="utf-8") as f:
-        for item in entries:
-            f.write(json.dumps(item) + "\n")
+    # Merged labels.jsonl in sample order for consumers that read a single file.
+    shard_entries = []
+    with (out_dir / "labels.jsonl").open("w", encoding="utf-8") as merged:
+        for shard, start, stop in shards:
+            labels_file = f"labels-{_shard_name(shard)}.jsonl"
+            text = (out_dir / labels_file).read_text(encoding="utf-8")
+            merged.write(text)
+            shard_entries.append(
+                {
+                    "shard": shard,
+                    "labels": labels_file,
+                    "images": f"images/shard-{_shard_name(shard)}",
+                    "count": stop - start,
+                    "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                }
+            )
 
+    (out_dir / "manifest.json").write_text(
+        json.dumps({"config": config, "complete": True, "shards": shard_entries}, indent=2),
+        encoding="utf-8",
+    )
     meta = {
-        "name": "patchpanel_v1",
-        "count": len(entries),
+        "name": out_dir.name,
+        "count": args.n,
         "ports": args.ports,
+        "max_tags": args.max_tags,
         "seed": args.seed,
+        "shards": len(shards),
     }
-    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
-    print(f"Generated {len(entries)} samples at {out_dir}")
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    print(f"Generated {args.n} samples in {len(shards)} shards at {out_dir}")
 
 
 if __name__ == "__main__":
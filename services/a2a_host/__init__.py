@@ -0,0 +1 @@
+"""Combined A2A agent host (MOP, Vision, CMDB in one process)."""
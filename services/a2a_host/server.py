@@ -0,0 +1,95 @@
+"""A2A agent host: the MOP, Vision and CMDB agents in one process.
+
+Each agent keeps its own HTTP contract under a prefix (/mop, /vision, /cmdb),
+and the root endpoints route by the message's `agent` field, so one URL can
+serve all three (A2A_MOP_URL = A2A_VISION_URL = A2A_CMDB_URL).
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from packages.a2a.batch import answer_batch
+from packages.a2a.cache import get_advice_cache
+from packages.a2a.local import AGENT_VERSION, AGENTS, ENDPOINTS, advise_any
+from packages.a2a.schema import A2ABatch, A2ABatchResponse, A2AMessage, A2AResponse, AgentCard
+from services.a2a_cmdb_agent.server import app as cmdb_app
+from services.a2a_mop_agent.server import app as mop_app
+from services.a2a_vision_agent.server import app as vision_app
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='{"timestamp":"%(asctime)s","level":"%(levelname)s","logger":"%(name)s","message":"%(message)s"}',
+    stream=sys.stderr,
+)
+logger = logging.getLogger("a2a_host")
+
+CARD = AgentCard(
+    name="InfraSentinelAgentHost",
+    version=AGENT_VERSION,
+    capabilities=[c for agent in AGENTS.values() for c in agent.card.capabilities],
+    endpoints={**ENDPOINTS, "agents": "/a2a/agents"},
+)
+
+app = FastAPI(title="A2A Agent Host")
+
+
+@app.get("/a2a/agent-card")
+async def get_agent_card() -> dict:
+    return CARD.model_dump(mode="json")
+
+
+@app.get("/a2a/agents")
+async def list_agents() -> dict:
+    """Card per hosted agent, with endpoints under its prefix."""
+    return {
+        name: agent.card.model_copy(
+            update={"endpoints": {k: f"/{name}{path}" for k, path in agent.card.endpoints.items()}}
+        ).model_dump(mode="json")
+        for name, agent in AGENTS.items()
+    }
+
+
+@app.post("/a2a/message/send")
+async def send_message(msg: A2AMessage) -> JSONResponse:
+    logger.info("message received for %s", msg.agent)
+    if msg.agent not in AGENTS:
+        resp = A2AResponse(
+            message_id=msg.message_id, status="error", output={}, notes=f"unknown agent {msg.agent!r}"
+        )
+        return JSONResponse(status_code=400, content=resp.model_dump(mode="json"))
+    try:
+        out = AGENTS[msg.agent].advise(msg)
+        resp = A2AResponse(message_id=msg.message_id, status="ok", output=out, notes=None)
+        return JSONResponse(content=resp.model_dump(mode="json"))
+    except Exception as e:
+        logger.exception("%s advice failed", msg.agent)
+        resp = A2AResponse(message_id=msg.message_id, status="error", output={}, notes=str(e))
+        return JSONResponse(status_code=500, content=resp.model_dump(mode="json"))
+
+
+@app.post("/a2a/message/batch")
+async def send_batch(batch: A2ABatch) -> JSONResponse:
+    """Messages for any mix of agents; unknown agents get status "error"."""
+    logger.info("batch received (%d messages)", len(batch.messages))
+    responses = await answer_batch(batch.messages, advise_any)
+    return JSONResponse(content=A2ABatchResponse(responses=responses).model_dump(mode="json"))
+
+
+@app.get("/a2a/cache/stats")
+async def cache_stats() -> dict:
+    return get_advice_cache().stats()
+
+
+app.mount("/mop", mop_app)
+app.mount("/vision", vision_app)
+app.mount("/cmdb", cmdb_app)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8090)
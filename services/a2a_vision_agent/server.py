@@ -8,9 +8,10 @@ import sys
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
-from packages.a2a.schema import A2AMessage, A2AResponse
-from packages.agents.vision import vision_advice
-from packages.core.models.steps import StepDefinition
+from packages.a2a.batch import answer_batch
+from packages.a2a.cache import get_advice_cache
+from packages.a2a.local import AGENTS
+from packages.a2a.schema import A2ABatch, A2ABatchResponse, A2AMessage, A2AResponse
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,30 +20,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger("a2a_vision_agent")
 
+AGENT = AGENTS["vision"]
+
 app = FastAPI(title="Vision Verifier Agent")
 
 
 @app.get("/a2a/agent-card")
 async def get_agent_card() -> dict:
-    from packages.a2a.schema import AgentCard
-    card = AgentCard(
-        name="VisionVerifierAgent",
-        version="0.1.0",
-        capabilities=["Interpret CV outputs", "Request retake on low-confidence", "Quality-based guidance"],
-        endpoints={"send": "/a2a/message/send"},
-    )
-    return card.model_dump(mode="json")
+    return AGENT.card.model_dump(mode="json")
 
 
 @app.post("/a2a/message/send")
 async def send_message(msg: A2AMessage) -> JSONResponse:
     logger.info("message received")
     try:
-        step_def = StepDefinition.model_validate(msg.input.get("step_def", {}))
-        quality_metrics = msg.input.get("quality_metrics")
-        cv_port_out = msg.input.get("cv_port_out", {})
-        cv_tag_out = msg.input.get("cv_tag_out", {})
-        out = vision_advice(step_def, quality_metrics, cv_port_out, cv_tag_out)
+        out = AGENT.advise(msg)
         resp = A2AResponse(
             message_id=msg.message_id,
             status="ok",
@@ -61,6 +53,18 @@ async def send_message(msg: A2AMessage) -> JSONResponse:
         return JSONResponse(status_code=500, content=resp.model_dump(mode="json"))
 
 
+@app.post("/a2a/message/batch")
+async def send_batch(batch: A2ABatch) -> JSONResponse:
+    logger.info("batch received (%d messages)", len(batch.messages))
+    responses = await answer_batch(batch.messages, AGENT.advise)
+    return JSONResponse(content=A2ABatchResponse(responses=responses).model_dump(mode="json"))
+
+
+@app.get("/a2a/cache/stats")
+async def cache_stats() -> dict:
+    return get_advice_cache().stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8092)
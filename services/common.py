@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import inspect
 import json
 import logging
+import os
 import sys
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
@@ -17,6 +20,51 @@ def setup_stderr_logging(name: str) -> logging.Logger:
     return logger
 
 
+def server_transport() -> str:
+    """FastMCP transport for a server process: "stdio" (default) or "streamable-http".
+
+    Over HTTP, FastMCP takes its bind address from FASTMCP_HOST / FASTMCP_PORT.
+    """
+    return os.getenv("MCP_SERVER_TRANSPORT", "stdio")
+
+
+def add_batch_tool(server: Any, name: str, tools: dict[str, Callable[..., Awaitable[Any]]]) -> None:
+    """Register tool `name` (e.g. "cv.batch") running several of this server's tools in one request.
+
+    Calls follow packages.mcp.batch (ids, {"$ref": ...} arguments, ordered
+    outcomes). Arguments a tool does not take are dropped, as for single
+    calls over the remote router. Progress is reported as each call finishes.
+    """
+    from mcp.server.fastmcp import Context
+
+    from packages.mcp.batch import run_batch
+
+    def accepting(fn: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        params = set(inspect.signature(fn).parameters)
+
+        async def call(**kwargs: Any) -> Any:
+            return await fn(**{k: v for k, v in kwargs.items() if k in params})
+
+        return call
+
+    table = {tool: accepting(fn) for tool, fn in tools.items()}
+
+    async def batch(calls: list[dict], ctx: Context) -> list[dict]:
+        done = 0
+
+        async def progress(_outcome: dict) -> None:
+            nonlocal done
+            done += 1
+            await ctx.report_progress(done, len(calls))
+
+        return await run_batch(calls, table, on_result=progress)
+
+    # FastMCP evaluates the (postponed) annotations in this module's globals, where the
+    # locally imported Context is not visible; without it the tool fails to register.
+    batch.__annotations__["ctx"] = Context
+    server.tool(name=name)(batch)
+
+
 def load_sample_json(filename: str) -> dict[str, Any]:
     root = Path(__file__).resolve().parents[1]
     path = root / "samples" / filename
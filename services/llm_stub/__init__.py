@@ -0,0 +1 @@
+"""Local stand-in for the Anthropic and LiteLLM APIs (latency and rate-limit testing)."""
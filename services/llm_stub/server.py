@@ -0,0 +1,119 @@
+"""Stub LLM server: Anthropic Messages and OpenAI-style chat completions.
+
+Point the worker at it with LLM_PROVIDER=litellm and LITELLM_BASE_URL, or
+LLM_PROVIDER=anthropic and ANTHROPIC_BASE_URL (any non-empty API key). Every
+reply is deterministic and delayed by LLM_STUB_LATENCY_MS. Requests beyond
+LLM_STUB_MAX_CONCURRENCY in flight get a 429, like a provider's rate limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+from collections.abc import Callable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='{"timestamp":"%(asctime)s","level":"%(levelname)s","logger":"%(name)s","message":"%(message)s"}',
+    stream=sys.stderr,
+)
+logger = logging.getLogger("llm_stub")
+
+
+def _reply(prompt: str, max_tokens: int) -> tuple[str, int, int]:
+    """(text, input tokens, output tokens); tokens are whitespace-separated words."""
+    words = prompt.split()
+    text = " ".join(["Stub:", *words[: max(0, max_tokens - 1)]])
+    return text, len(words), len(text.split())
+
+
+def create_app(latency_ms: float = 200.0, max_concurrency: int = 0) -> FastAPI:
+    """Stub app; max_concurrency 0 means no 429s."""
+    app = FastAPI(title="LLM Stub")
+    app.state.in_flight = 0
+    app.state.peak = 0
+    app.state.requests = 0
+
+    async def answer(
+        request: Request, respond: Callable[[dict, str, int, int], dict]
+    ) -> JSONResponse:
+        body = await request.json()
+        app.state.requests += 1
+        if max_concurrency and app.state.in_flight >= max_concurrency:
+            logger.info("rate limited (%d in flight)", app.state.in_flight)
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": "1"},
+                content={"type": "error", "error": {"type": "rate_limit_error", "message": "busy"}},
+            )
+        app.state.in_flight += 1
+        app.state.peak = max(app.state.peak, app.state.in_flight)
+        try:
+            await asyncio.sleep(latency_ms / 1000)
+            prompt = " ".join(
+                m["content"] for m in body.get("messages", []) if isinstance(m.get("content"), str)
+            )
+            return JSONResponse(content=respond(body, *_reply(prompt, body.get("max_tokens", 80))))
+        finally:
+            app.state.in_flight -= 1
+
+    @app.post("/v1/messages")
+    async def messages(request: Request) -> JSONResponse:
+        return await answer(
+            request,
+            lambda body, text, inp, out: {
+                "id": f"msg_stub_{app.state.requests}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", "stub"),
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": inp, "output_tokens": out},
+            },
+        )
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> JSONResponse:
+        return await answer(
+            request,
+            lambda body, text, inp, out: {
+                "id": f"chatcmpl-stub-{app.state.requests}",
+                "object": "chat.completion",
+                "model": body.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": inp, "completion_tokens": out, "total_tokens": inp + out},
+            },
+        )
+
+    @app.get("/stats")
+    async def stats() -> dict:
+        return {
+            "requests": app.state.requests,
+            "in_flight": app.state.in_flight,
+            "peak_in_flight": app.state.peak,
+        }
+
+    return app
+
+
+app = create_app(
+    latency_ms=float(os.environ.get("LLM_STUB_LATENCY_MS", "200")),
+    max_concurrency=int(os.environ.get("LLM_STUB_MAX_CONCURRENCY", "0")),
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8099)
@@ -44,9 +44,9 @@ class CameraAdapter:
     # --- MCPToolRouter-compatible async methods ---
 
     async def capture_frame(self, source: str) -> object:
-        from services.mcp_camera.handlers import CameraHandlers
+        from services.registry import get_registry
 
-        handlers = CameraHandlers()
+        handlers = get_registry().camera()
         return await handlers.capture_frame(source)
 
     async def store_evidence(
@@ -54,11 +54,40 @@ class CameraAdapter:
         path: str | None = None,
         data_b64: str | None = None,
         metadata: dict | None = None,
+        handle: str | None = None,
     ) -> object:
-        from services.mcp_camera.handlers import CameraHandlers
+        from services.registry import get_registry
 
-        handlers = CameraHandlers()
-        return await handlers.store_evidence(path=path, data_b64=data_b64, metadata=metadata)
+        handlers = get_registry().camera()
+        return await handlers.store_evidence(
+            path=path, data_b64=data_b64, metadata=metadata, handle=handle
+        )
+
+    async def upload_begin(self) -> dict:
+        from services.registry import get_registry
+
+        return await get_registry().camera().upload_begin()
+
+    async def upload_chunk(
+        self, upload_id: str, offset: int, data_b64: str | None = None, data: bytes | None = None
+    ) -> dict:
+        from services.registry import get_registry
+
+        return await get_registry().camera().upload_chunk(upload_id, offset, data_b64=data_b64, data=data)
+
+    async def upload_commit(
+        self,
+        upload_id: str,
+        sha256: str | None = None,
+        size: int | None = None,
+        filename: str = "upload.bin",
+        metadata: dict | None = None,
+    ) -> object:
+        from services.registry import get_registry
+
+        return await get_registry().camera().upload_commit(
+            upload_id, sha256=sha256, size=size, filename=filename, metadata=metadata
+        )
 
 
 def _default_sample_path() -> Path:
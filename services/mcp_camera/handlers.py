@@ -4,32 +4,73 @@ import base64
 from pathlib import Path
 
 from packages.core.models import EvidenceRef
-from packages.core.storage import LocalEvidenceStore
+from packages.core.spool import CHUNK_SIZE, EvidenceSpool, parse_handle
 
 
 class CameraHandlers:
-    def __init__(self, evidence_dir: Path = Path("./.data/evidence")):
-        self.store = LocalEvidenceStore(evidence_dir)
+    """Evidence lands in a content-addressed spool; tools exchange "sha256:<hex>" handles.
+
+    The returned EvidenceRef's evidence_id is the handle, which the CV tools
+    accept directly, so image bytes cross a tool boundary at most once.
+    """
+
+    def __init__(self, evidence_dir: Path = Path("./.data/evidence"), spool: EvidenceSpool | None = None):
+        self.spool = spool or EvidenceSpool(evidence_dir / "spool")
+
+    def _ref(self, handle: str, filename: str, metadata: dict[str, str] | None) -> EvidenceRef:
+        path = self.spool.resolve(handle)
+        return EvidenceRef(
+            evidence_id=handle,
+            uri=str(path),
+            metadata={
+                "backend": "spool",
+                "sha256": parse_handle(handle),
+                "handle": handle,
+                "filename": filename,
+                "size": path.stat().st_size,
+                **(metadata or {}),
+            },
+        )
 
     async def capture_frame(self, source: str) -> EvidenceRef:
         path = Path(source)
-        data = path.read_bytes() if path.exists() else b"mock-frame"
-        return await self.store.put_bytes(data=data, filename=path.name or "capture.bin", metadata={})
+        handle = self.spool.put_file(path) if path.is_file() else self.spool.put(b"mock-frame")
+        return self._ref(handle, path.name or "capture.bin", {})
 
     async def store_evidence(
         self,
         path: str | None = None,
         data_b64: str | None = None,
         metadata: dict[str, str] | None = None,
+        handle: str | None = None,
     ) -> EvidenceRef:
+        """Record evidence by handle (already spooled), file path, or inline base64 for small payloads."""
+        if handle:
+            return self._ref(handle, (metadata or {}).get("filename", "evidence.bin"), metadata)
         if path:
             p = Path(path)
-            data = p.read_bytes()
-            filename = p.name
-        elif data_b64:
-            data = base64.b64decode(data_b64.encode("utf-8"))
-            filename = "uploaded.bin"
-        else:
-            data = b"mock-evidence"
-            filename = "mock.bin"
-        return await self.store.put_bytes(data=data, filename=filename, metadata=metadata or {})
+            return self._ref(self.spool.put_file(p), p.name, metadata)
+        if data_b64:
+            return self._ref(self.spool.put(base64.b64decode(data_b64.encode("utf-8"))), "uploaded.bin", metadata)
+        return self._ref(self.spool.put(b"mock-evidence"), "mock.bin", metadata)
+
+    async def upload_begin(self) -> dict:
+        return {"upload_id": self.spool.begin_upload(), "chunk_size": CHUNK_SIZE}
+
+    async def upload_chunk(
+        self, upload_id: str, offset: int, data_b64: str | None = None, data: bytes | None = None
+    ) -> dict:
+        """Append one chunk (raw bytes in-process, base64 over MCP)."""
+        chunk = data if data is not None else base64.b64decode((data_b64 or "").encode("utf-8"))
+        return {"upload_id": upload_id, "received": self.spool.append_chunk(upload_id, offset, chunk)}
+
+    async def upload_commit(
+        self,
+        upload_id: str,
+        sha256: str | None = None,
+        size: int | None = None,
+        filename: str = "upload.bin",
+        metadata: dict[str, str] | None = None,
+    ) -> EvidenceRef:
+        handle = self.spool.commit_upload(upload_id, sha256=sha256, size=size)
+        return self._ref(handle, filename, metadata)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from services.common import setup_stderr_logging
-from services.mcp_camera.handlers import CameraHandlers
+from services.common import add_batch_tool, server_transport, setup_stderr_logging
+from services.registry import get_registry
 
 logger = setup_stderr_logging("mcp_camera")
-handlers = CameraHandlers()
+handlers = get_registry().camera()
 
 
 def build_server():
@@ -18,14 +18,58 @@ def build_server():
         return (await handlers.capture_frame(source=source)).model_dump(mode="json")
 
     @server.tool(name="camera.store_evidence")
-    async def store_evidence(path: str | None = None, data_b64: str | None = None, metadata: dict | None = None):
+    async def store_evidence(
+        path: str | None = None,
+        data_b64: str | None = None,
+        metadata: dict | None = None,
+        handle: str | None = None,
+    ):
         logger.info("camera.store_evidence called")
         return (
-            await handlers.store_evidence(path=path, data_b64=data_b64, metadata=metadata or {})
+            await handlers.store_evidence(
+                path=path, data_b64=data_b64, metadata=metadata or {}, handle=handle
+            )
         ).model_dump(mode="json")
 
+    @server.tool(name="camera.upload_begin")
+    async def upload_begin():
+        logger.info("camera.upload_begin called")
+        return await handlers.upload_begin()
+
+    @server.tool(name="camera.upload_chunk")
+    async def upload_chunk(upload_id: str, offset: int, data_b64: str):
+        return await handlers.upload_chunk(upload_id=upload_id, offset=offset, data_b64=data_b64)
+
+    @server.tool(name="camera.upload_commit")
+    async def upload_commit(
+        upload_id: str,
+        sha256: str | None = None,
+        size: int | None = None,
+        filename: str = "upload.bin",
+        metadata: dict | None = None,
+    ):
+        logger.info("camera.upload_commit called")
+        return (
+            await handlers.upload_commit(
+                upload_id=upload_id, sha256=sha256, size=size, filename=filename, metadata=metadata
+            )
+        ).model_dump(mode="json")
+
+    add_batch_tool(
+        server,
+        "camera.batch",
+        {
+            "camera.capture_frame": capture_frame,
+            "camera.store_evidence": store_evidence,
+            "camera.upload_begin": upload_begin,
+            "camera.upload_chunk": upload_chunk,
+            "camera.upload_commit": upload_commit,
+        },
+    )
+
     return server
 
 
 if __name__ == "__main__":
-    build_server().run()
+    get_registry().warm(["camera"])
+    build_server().run(transport=server_transport())
@@ -106,17 +106,17 @@ class CVAdapter:
     async def read_port_label(
         self, evidence_id: str, change_id: str = "", scenario: str | None = None
     ) -> object:
-        from services.mcp_cv.handlers import CVHandlers
+        from services.registry import get_registry
 
-        return await CVHandlers(cv_mode=self.cv_mode, scenario=self.scenario).read_port_label(
-            evidence_id, change_id, scenario
+        return await get_registry().cv(self.cv_mode).read_port_label(
+            evidence_id, change_id, scenario or self.scenario
         )
 
     async def read_cable_tag(
         self, evidence_id: str, change_id: str = "", scenario: str | None = None
     ) -> object:
-        from services.mcp_cv.handlers import CVHandlers
+        from services.registry import get_registry
 
-        return await CVHandlers(cv_mode=self.cv_mode, scenario=self.scenario).read_cable_tag(
-            evidence_id, change_id, scenario
+        return await get_registry().cv(self.cv_mode).read_cable_tag(
+            evidence_id, change_id, scenario or self.scenario
         )
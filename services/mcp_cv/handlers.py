@@ -10,13 +10,32 @@ from packages.cv.ocr_backends import MockOCRBackend, TesseractOCRBackend, resolv
 from packages.cv.pipeline import read_cable_tag, read_port_label
 from packages.cv.schema import CableTagResult, PortLabelResult, QualityMetrics
 from packages.core.fixtures.loaders import load_cv_outputs, resolve_evidence
+from packages.core.spool import get_evidence_spool, parse_handle
 
 
 class CVHandlers:
     def __init__(self, cv_mode: str | None = None, scenario: str | None = None):
-        self.cv_mode = (cv_mode or os.getenv("CV_MODE", "mock")).lower()
-        self.scenario = scenario or os.getenv("SCENARIO", "CHG-001_A")
+        self.cv_mode: str = (cv_mode or os.getenv("CV_MODE") or "mock").lower()
+        self.scenario: str = scenario or os.getenv("SCENARIO") or "CHG-001_A"
         self.ocr_backend = self._build_backend()
+        # scenario -> parsed cv_outputs.json; dropped by reload().
+        self._cv_outputs: dict[str, dict] = {}
+
+    def reload(self) -> None:
+        """Rebuild the OCR backend and forget cached fixture outputs."""
+        self.ocr_backend = self._build_backend()
+        self._cv_outputs.clear()
+
+    def warm(self) -> None:
+        """Load the default scenario's fixture outputs ahead of the first call."""
+        self._get_fixture_outputs("default")
+
+    def _load_cv_outputs(self, scenario: str) -> dict:
+        data = self._cv_outputs.get(scenario)
+        if data is None:
+            data = load_cv_outputs(scenario)
+            self._cv_outputs[scenario] = data
+        return data
 
     def _build_backend(self) -> OCRBackend:
         if self.cv_mode == "tesseract":
@@ -24,6 +43,9 @@ class CVHandlers:
         return MockOCRBackend()
 
     def _resolve_image(self, evidence_id: str, change_id: str = "") -> str | bytes:
+        if parse_handle(evidence_id):
+            # Camera handle: read the spooled bytes in place, no transfer.
+            return str(get_evidence_spool().resolve(evidence_id))
         path = resolve_evidence(evidence_id, change_id)
         if path:
             return str(path)
@@ -37,7 +59,7 @@ class CVHandlers:
         """In mock mode with scenario, return fixture data for evidence_id."""
         scenario = scenario_override or self.scenario
         try:
-            data = load_cv_outputs(scenario)
+            data = self._load_cv_outputs(scenario)
             return data.get(evidence_id, data.get("default"))
         except Exception:
             return None
@@ -45,6 +67,17 @@ class CVHandlers:
     async def read_port_label(
         self, evidence_id: str, change_id: str = "", scenario: str | None = None
     ) -> PortLabelResult:
+        return self.read_port_label_sync(evidence_id, change_id, scenario)
+
+    async def read_cable_tag(
+        self, evidence_id: str, change_id: str = "", scenario: str | None = None
+    ) -> CableTagResult:
+        return self.read_cable_tag_sync(evidence_id, change_id, scenario)
+
+    def read_port_label_sync(
+        self, evidence_id: str, change_id: str = "", scenario: str | None = None
+    ) -> PortLabelResult:
+        """Blocking variant for sync activities running on a process pool."""
         fixture = self._get_fixture_outputs(evidence_id, scenario)
         if fixture is not None:
             quality = QualityMetrics(
@@ -69,9 +102,10 @@ class CVHandlers:
         image = self._resolve_image(evidence_id, change_id)
         return read_port_label(image, ocr_backend=self.ocr_backend, evidence_id=evidence_id)
 
-    async def read_cable_tag(
+    def read_cable_tag_sync(
         self, evidence_id: str, change_id: str = "", scenario: str | None = None
     ) -> CableTagResult:
+        """Blocking variant for sync activities running on a process pool."""
         fixture = self._get_fixture_outputs(evidence_id, scenario)
         if fixture is not None:
             quality = QualityMetrics(
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from services.common import setup_stderr_logging
-from services.mcp_cv.handlers import CVHandlers
+from services.common import add_batch_tool, server_transport, setup_stderr_logging
+from services.registry import get_registry
 
 logger = setup_stderr_logging("mcp_cv")
-handlers = CVHandlers()
+handlers = get_registry().cv()
 
 
 def build_server():
@@ -22,8 +22,18 @@ def build_server():
         logger.info("cv.read_cable_tag called")
         return (await handlers.read_cable_tag(evidence_id=evidence_id)).model_dump(mode="json")
 
+    add_batch_tool(
+        server,
+        "cv.batch",
+        {
+            "cv.read_port_label": read_port_label,
+            "cv.read_cable_tag": read_cable_tag,
+        },
+    )
+
     return server
 
 
 if __name__ == "__main__":
-    build_server().run()
+    get_registry().warm(["cv"])
+    build_server().run(transport=server_transport())
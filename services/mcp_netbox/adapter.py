@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from dataclasses import dataclass
 
@@ -20,6 +21,7 @@ class NetBoxAdapter:
 
     NETBOX_MODE=mock  → returns fixture data via NetboxHandlers
     NETBOX_MODE=netbox → calls real NetBox REST via netbox_client
+                         (or the local mirror with CMDB_SOURCE=mirror)
     """
 
     def __init__(self, netbox_mode: str | None = None) -> None:
@@ -35,15 +37,16 @@ class NetBoxAdapter:
 
         if self.netbox_mode == "netbox":
             from packages.core.config import get_settings
-            from services.mcp_netbox.src.netbox_client import _get_device_id, _get_front_port_cable
+            from services.mcp_netbox.src.netbox_client import get_async_netbox_client
 
             settings = get_settings()
-            device_id = _get_device_id(settings.netbox_url, settings.netbox_token, panel_id)
-            if device_id is None:
-                return PortInfo(port_id=port_id, device=panel_id, port_label=port_label)
-            cable_data = _get_front_port_cable(
-                settings.netbox_url, settings.netbox_token, device_id, port_label
-            )
+            if settings.cmdb_source == "mirror":
+                from services.mcp_netbox.src.mirror import get_cmdb_mirror
+
+                _, cable_data = await get_cmdb_mirror().lookup_port_cable(panel_id, port_label)
+            else:
+                client = get_async_netbox_client(settings.netbox_url, settings.netbox_token)
+                cable_data = await client.get_front_port_cable(panel_id, port_label)
             cable_label = cable_data.get("label") if cable_data else None
             cable_id = str(cable_data.get("id")) if cable_data else None
             return PortInfo(
@@ -55,25 +58,35 @@ class NetBoxAdapter:
             )
 
         # mock mode — pull from fixture
-        from packages.core.fixtures.loaders import load_expected_mapping
+        from packages.core.fixtures.mapping_index import get_mapping_index
 
         change_id = panel_id
-        mapping = load_expected_mapping(change_id)
-        endpoints = mapping.get("allowed_endpoints", [])
-        for ep in endpoints:
-            if ep.get("panel_id") == panel_id and ep.get("port_label") == port_label:
-                return PortInfo(
-                    port_id=port_id,
-                    device=panel_id,
-                    port_label=port_label,
-                    cable_label=ep.get("cable_tag"),
-                )
+        ep = get_mapping_index(change_id).endpoint_for(panel_id, port_label)
+        if ep is not None:
+            return PortInfo(
+                port_id=port_id,
+                device=panel_id,
+                port_label=port_label,
+                cable_label=ep.get("cable_tag"),
+            )
         return PortInfo(port_id=port_id, device=panel_id, port_label=port_label)
 
     async def validate_cable(self, port_a: str, port_b: str) -> bool:
-        """Return True if port_a and port_b belong to the same cable (by label)."""
-        info_a = await self.get_port_info(port_a)
-        info_b = await self.get_port_info(port_b)
+        """Return True if port_a and port_b are on the same cable path.
+
+        With NetBox this is a cable-graph lookup over the full path (front
+        port, rear ports, trunks, switch interface); in mock mode the two
+        ports must carry the same cable label.
+        """
+        if self.netbox_mode == "netbox":
+            from services.mcp_netbox.src.cable_graph import path_reaches
+            from services.registry import get_registry
+
+            panel_a, _, label_a = port_a.partition(":")
+            panel_b, _, label_b = port_b.partition(":")
+            found = await get_registry().netbox().cable_path(panel_a, label_a)
+            return found is not None and path_reaches(found[0], found[1], panel_b, label_b)
+        info_a, info_b = await asyncio.gather(self.get_port_info(port_a), self.get_port_info(port_b))
         if not info_a.cable_label or not info_b.cable_label:
             return False
         return info_a.cable_label == info_b.cable_label
@@ -81,13 +94,27 @@ class NetBoxAdapter:
     # --- MCPToolRouter-compatible async methods ---
 
     async def get_expected_mapping(self, change_id: str) -> dict:
-        from services.mcp_netbox.handlers import NetboxHandlers
+        from services.registry import get_registry
 
-        return await NetboxHandlers().get_expected_mapping(change_id)
+        return await get_registry().netbox().get_expected_mapping(change_id)
 
     async def validate_observed(
         self, change_id: str, panel_id: str, port_label: str, cable_tag: str
     ) -> object:
-        from services.mcp_netbox.handlers import NetboxHandlers
+        from services.registry import get_registry
+
+        return await get_registry().netbox().validate_observed(change_id, panel_id, port_label, cable_tag)
+
+    async def validate_observed_batch(self, change_id: str, observations: list[dict]) -> list:
+        from services.registry import get_registry
+
+        return await get_registry().netbox().validate_observed_batch(change_id, observations)
+
+    async def validate_path(
+        self, change_id: str, panel_id: str, port_label: str, expected_device: str, expected_port: str
+    ) -> object:
+        from services.registry import get_registry
 
-        return await NetboxHandlers().validate_observed(change_id, panel_id, port_label, cable_tag)
+        return await get_registry().netbox().validate_path(
+            change_id, panel_id, port_label, expected_device, expected_port
+        )
@@ -2,14 +2,33 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+
+import httpx
+
 from packages.core.config import get_settings
 from packages.core.fixtures.loaders import load_expected_mapping
+from packages.core.fixtures.mapping_index import MappingIndex, get_mapping_index
 from packages.core.models.legacy import ValidationResult
 
 from services.mcp_netbox.src.netbox_client import (
+    get_async_netbox_client,
     get_expected_mapping_netbox,
-    validate_observed_netbox,
 )
+from services.mcp_netbox.src.cable_graph import CableGraph, NodeKey, path_reaches
+from services.mcp_netbox.src.labels import LabelIndex, labels_from_mapping, labels_from_topology
+from services.mcp_netbox.src.mirror import get_cmdb_mirror
+from services.mcp_netbox.src.topology import drop_index, get_index, lookup_result, put_index
+
+
+def mapping_panel_ids(mapping: dict) -> list[str]:
+    """Panels referenced by an expected/approved mapping."""
+    endpoints = list(mapping.get("allowed_endpoints", []))
+    default = mapping.get("default", mapping)
+    if isinstance(default, dict):
+        endpoints.append(default)
+    return sorted({ep["panel_id"] for ep in endpoints if ep.get("panel_id")})
 
 
 class NetboxHandlers:
@@ -21,45 +40,188 @@ class NetboxHandlers:
             )
         return load_expected_mapping(change_id)
 
+    async def prefetch_topology(self, change_id: str) -> dict:
+        """Load the change's panels from NetBox into the in-process topology index."""
+        settings = get_settings()
+        if settings.netbox_mode != "netbox":
+            return {"prefetched": False}
+        mapping = await self.get_expected_mapping(change_id)
+        client = get_async_netbox_client(settings.netbox_url, settings.netbox_token)
+        index = await client.prefetch_topology(mapping_panel_ids(mapping))
+        put_index(change_id, index)
+        return {"prefetched": True, **index.stats()}
+
+    async def _validate_from_index(
+        self, change_id: str, panel_id: str, port_label: str, cable_tag: str
+    ) -> ValidationResult | None:
+        index = get_index(change_id)
+        if index is None:
+            return None
+        result = index.validate(panel_id, port_label, cable_tag)
+        if result is None or not result.match:
+            return result
+        # Freshness check before a VERIFIED outcome: the same cable, with that label,
+        # must still end on this front port.
+        port_id = index.port_id_for(panel_id, port_label)
+        if port_id is None:
+            return None
+        settings = get_settings()
+        client = get_async_netbox_client(settings.netbox_url, settings.netbox_token)
+        _, cable = index.cable_for(panel_id, port_label)
+        try:
+            current = await client.confirm_port_cable(port_id)
+        except httpx.HTTPError:
+            # NetBox unreachable: let the mirror or live path decide.
+            return None
+        if (
+            current is None
+            or current["id"] != (cable or {}).get("id")
+            or (current.get("label") or "") != cable_tag
+        ):
+            # NetBox changed since prefetch: stop trusting the index for this change.
+            drop_index(change_id)
+            return None
+        return result
+
     async def validate_observed(
         self, change_id: str, panel_id: str, port_label: str, cable_tag: str
     ) -> ValidationResult:
+        observation = {"panel_id": panel_id, "port_label": port_label, "cable_tag": cable_tag}
+        return (await self.validate_observed_batch(change_id, [observation]))[0]
+
+    async def validate_observed_batch(
+        self, change_id: str, observations: list[dict]
+    ) -> list[ValidationResult]:
+        """Validate many {panel_id, port_label, cable_tag} observations; results in input order.
+
+        In NetBox mode every observation the topology index cannot answer goes
+        into one lookup_many call (mirror or live), so shared panels are
+        resolved once and ports are fetched per panel rather than per item.
+        """
+        items = [(o["panel_id"], o["port_label"], o["cable_tag"]) for o in observations]
         settings = get_settings()
-        if settings.netbox_mode == "netbox":
-            return validate_observed_netbox(
-                change_id,
-                panel_id,
-                port_label,
-                cable_tag,
-                settings.netbox_url,
-                settings.netbox_token,
-            )
-        data = load_expected_mapping(change_id)
-        allowed = data.get("allowed_endpoints", [])
-        if not allowed:
-            exp = data.get("default", data)
-            if isinstance(exp, dict) and "panel_id" in exp:
-                match = (
-                    exp.get("panel_id") == panel_id
-                    and exp.get("port_label") == port_label
-                    and exp.get("cable_tag") == cable_tag
-                )
-                if match:
-                    return ValidationResult(match=True, reason="Observed matches expected.", confidence=0.99)
+        if settings.netbox_mode != "netbox":
+            index = get_mapping_index(change_id)
+            mocked = [_validate_against_mapping(index, *item) for item in items]
+            return self._with_suggestions(labels_from_mapping(index), items, mocked)
+
+        indexed: list[ValidationResult | None] = list(
+            await asyncio.gather(*(self._validate_from_index(change_id, *item) for item in items))
+        )
+        pending = [i for i, result in enumerate(indexed) if result is None]
+        if pending:
+            pairs = [(items[i][0], items[i][1]) for i in pending]
+            client = get_async_netbox_client(settings.netbox_url, settings.netbox_token)
+            if settings.cmdb_source == "mirror":
+                looked_up = await get_cmdb_mirror().lookup_many(pairs)
+                unknown = [pair for pair in pairs if not looked_up[pair][0]]
+                if unknown:
+                    # Devices may postdate the last sync; ask NetBox if it is reachable.
+                    with contextlib.suppress(httpx.HTTPError):
+                        looked_up.update(await client.lookup_many(unknown))
+            else:
+                looked_up = await client.lookup_many(pairs)
+            for i in pending:
+                panel_id, port_label, cable_tag = items[i]
+                found, cable = looked_up[(panel_id, port_label)]
+                indexed[i] = lookup_result(panel_id, port_label, cable_tag, found, cable)
+        results = [result for result in indexed if result is not None]
+        if all(result.match for result in results):
+            return results
+        return self._with_suggestions(await self._cmdb_labels(change_id), items, results)
+
+    async def cable_path(self, panel_id: str, port_label: str) -> tuple[CableGraph, list[NodeKey]] | None:
+        """End-to-end cable path through a front port, from the mirror graph or traced live."""
+        settings = get_settings()
+        if settings.cmdb_source == "mirror":
+            graph = await get_cmdb_mirror().cable_graph()
+            start = graph.find_port(panel_id, port_label)
+            return (graph, graph.path(start)) if start is not None else None
+        client = get_async_netbox_client(settings.netbox_url, settings.netbox_token)
+        path = await client.cable_path(panel_id, port_label)
+        return (client.graph, path) if path is not None else None
+
+    async def validate_path(
+        self, change_id: str, panel_id: str, port_label: str, expected_device: str, expected_port: str
+    ) -> ValidationResult:
+        """Check that the observed front port sits on the cable path to expected_device/expected_port."""
+        target = f"{expected_device} {expected_port}"
+        if get_settings().netbox_mode != "netbox":
+            ep = get_mapping_index(change_id).endpoint_for(panel_id, port_label) or {}
+            end = ep.get("path_end") or {}
+            if not end:
                 return ValidationResult(
-                    match=False,
-                    reason=f"Expected ({exp.get('panel_id')}, {exp.get('port_label')}, {exp.get('cable_tag')}) "
-                    f"but got ({panel_id}, {port_label}, {cable_tag})",
-                    confidence=0.99,
+                    match=False, reason=f"No cable path known for {panel_id} {port_label}", confidence=0.0
                 )
-        for ep in allowed:
-            ep_panel = ep.get("panel_id")
-            ep_port = ep.get("port_label") or ep.get("port_label_alt")
-            ep_tag = ep.get("cable_tag")
-            if ep_panel == panel_id and ep_port == port_label and ep_tag == cable_tag:
-                return ValidationResult(match=True, reason="Observed matches allowed endpoint.", confidence=0.99)
+            match = (end.get("device"), end.get("name")) == (expected_device, expected_port)
+            return ValidationResult(
+                match=match,
+                reason=f"Observed port is on the path to {target}."
+                if match
+                else f"Path from {panel_id} {port_label} ends at {end.get('device')} {end.get('name')}, not {target}",
+                confidence=0.99,
+            )
+        found = await self.cable_path(panel_id, port_label)
+        if found is None:
+            return ValidationResult(
+                match=False, reason=f"Port '{port_label}' on {panel_id} not found in NetBox", confidence=0.0
+            )
+        graph, path = found
+        if path_reaches(graph, path, expected_device, expected_port):
+            return ValidationResult(match=True, reason=f"Observed port is on the path to {target}.", confidence=0.99)
+        hops = [hop for hop in graph.describe(path) if hop["kind"] != "cable"]
+        ends = " / ".join(f"{hop['device']} {hop['name']}" for hop in (hops[0], hops[-1]))
+        return ValidationResult(
+            match=False,
+            reason=f"Path through {panel_id} {port_label} runs {ends}, not to {target}",
+            confidence=0.99,
+        )
+
+    async def _cmdb_labels(self, change_id: str) -> LabelIndex | None:
+        """Known NetBox labels for suggestions: the mirror, else the change's prefetched topology."""
+        if get_settings().cmdb_source == "mirror":
+            return await get_cmdb_mirror().label_index()
+        index = get_index(change_id)
+        return labels_from_topology(index) if index else None
+
+    @staticmethod
+    def _with_suggestions(
+        labels: LabelIndex | None, items: list[tuple[str, str, str]], results: list[ValidationResult]
+    ) -> list[ValidationResult]:
+        """Attach nearest known labels to mismatches. Never turns a mismatch into a match."""
+        if labels is None:
+            return results
+        return [
+            result
+            if result.match
+            else result.model_copy(update={"suggestions": labels.suggest(*item)})
+            for item, result in zip(items, results, strict=True)
+        ]
+
+
+def _validate_against_mapping(
+    index: MappingIndex, panel_id: str, port_label: str, cable_tag: str
+) -> ValidationResult:
+    """Mock-mode validation against the fixture's expected mapping / allowed endpoints."""
+    exp = index.default
+    if exp is not None:
+        match = (
+            exp.get("panel_id") == panel_id
+            and exp.get("port_label") == port_label
+            and exp.get("cable_tag") == cable_tag
+        )
+        if match:
+            return ValidationResult(match=True, reason="Observed matches expected.", confidence=0.99)
         return ValidationResult(
             match=False,
-            reason=f"No allowed endpoint matches ({panel_id}, {port_label}, {cable_tag})",
+            reason=f"Expected ({exp.get('panel_id')}, {exp.get('port_label')}, {exp.get('cable_tag')}) "
+            f"but got ({panel_id}, {port_label}, {cable_tag})",
             confidence=0.99,
         )
+    if index.allows(panel_id, port_label, cable_tag):
+        return ValidationResult(match=True, reason="Observed matches allowed endpoint.", confidence=0.99)
+    return ValidationResult(
+        match=False,
+        reason=f"No allowed endpoint matches ({panel_id}, {port_label}, {cable_tag})",
+        confidence=0.99,
+    )
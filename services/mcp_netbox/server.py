@@ -1,21 +1,42 @@
 from __future__ import annotations
 
-from services.common import setup_stderr_logging
-from services.mcp_netbox.handlers import NetboxHandlers
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from packages.core.config import get_settings
+from services.common import add_batch_tool, server_transport, setup_stderr_logging
+from services.mcp_netbox.src.invalidation import (
+    check_invalidation_backend,
+    listen_for_invalidations,
+)
+from services.registry import get_registry
 
 logger = setup_stderr_logging("mcp_netbox")
-handlers = NetboxHandlers()
+handlers = get_registry().netbox()
+
+
+@asynccontextmanager
+async def _lifespan(server: Any) -> AsyncIterator[None]:
+    """Apply NetBox webhooks published by the API for as long as the server runs."""
+    check_invalidation_backend(get_settings())
+    listener = asyncio.create_task(listen_for_invalidations())
+    try:
+        yield
+    finally:
+        listener.cancel()
 
 
 def build_server():
     from mcp.server.fastmcp import FastMCP
 
-    server = FastMCP("netbox")
+    server = FastMCP("netbox", lifespan=_lifespan)
 
     @server.tool(name="netbox.get_expected_mapping")
     async def get_expected_mapping(change_id: str):
         logger.info("netbox.get_expected_mapping called")
-        return (await handlers.get_expected_mapping(change_id=change_id)).model_dump(mode="json")
+        return await handlers.get_expected_mapping(change_id=change_id)
 
     @server.tool(name="netbox.validate_observed")
     async def validate_observed(change_id: str, panel_id: str, port_label: str, cable_tag: str):
@@ -29,8 +50,43 @@ def build_server():
             )
         ).model_dump(mode="json")
 
+    @server.tool(name="netbox.validate_observed_batch")
+    async def validate_observed_batch(change_id: str, observations: list[dict]):
+        logger.info("netbox.validate_observed_batch called (%d observations)", len(observations))
+        results = await handlers.validate_observed_batch(
+            change_id=change_id, observations=observations
+        )
+        return [result.model_dump(mode="json") for result in results]
+
+    @server.tool(name="netbox.validate_path")
+    async def validate_path(
+        change_id: str, panel_id: str, port_label: str, expected_device: str, expected_port: str
+    ):
+        logger.info("netbox.validate_path called")
+        return (
+            await handlers.validate_path(
+                change_id=change_id,
+                panel_id=panel_id,
+                port_label=port_label,
+                expected_device=expected_device,
+                expected_port=expected_port,
+            )
+        ).model_dump(mode="json")
+
+    add_batch_tool(
+        server,
+        "netbox.batch",
+        {
+            "netbox.get_expected_mapping": get_expected_mapping,
+            "netbox.validate_observed": validate_observed,
+            "netbox.validate_observed_batch": validate_observed_batch,
+            "netbox.validate_path": validate_path,
+        },
+    )
+
     return server
 
 
 if __name__ == "__main__":
-    build_server().run()
+    get_registry().warm(["netbox"])
+    build_server().run(transport=server_transport())
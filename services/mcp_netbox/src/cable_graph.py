@@ -0,0 +1,295 @@
+"""In-memory cable graph: front/rear ports, interfaces and the cables between them.
+
+A cable path runs panel front port -> (patch cable) -> switch interface on one
+side and front port -> rear port -> (trunk) -> far rear port -> far front port
+-> ... on the other. The graph is fed either from the local mirror (structural
+rows, refreshed incrementally) or from NetBox's per-port path data, and answers
+"is this port on the path to that interface" without REST round trips. Paths
+are cached per starting port and dropped when a cable or port on them changes.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from services.mcp_netbox.src.topology import port_name_candidates
+
+# ("frontport" | "rearport" | "interface" | ..., NetBox id); cables appear in paths as ("cable", id).
+NodeKey = tuple[str, int]
+
+
+def kind_from_object_type(object_type: str) -> str:
+    """"dcim.frontport" -> "frontport"."""
+    return object_type.rsplit(".", 1)[-1]
+
+
+def kind_from_url(url: str) -> str:
+    """".../api/dcim/front-ports/12/" -> "frontport"."""
+    parts = [p for p in url.split("/") if p]
+    collection = parts[-2] if parts and parts[-1].isdigit() else (parts[-1] if parts else "")
+    return collection.replace("-", "").removesuffix("s")
+
+
+@dataclass(frozen=True)
+class GraphNode:
+    kind: str
+    id: int
+    device: str
+    name: str
+
+
+class CableGraph:
+    """Ports and cables with cached end-to-end paths.
+
+    ttl applies to paths stored from NetBox path data (store_path); paths
+    computed from mirror rows stay valid until something on them changes.
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        self.ttl = ttl
+        self.nodes: dict[NodeKey, GraphNode] = {}
+        self.cables: dict[int, dict] = {}  # id -> {"label", "a": set[NodeKey], "b": set[NodeKey]}
+        self._by_name: dict[tuple[str, str, str], NodeKey] = {}
+        self._cable_of: dict[NodeKey, int] = {}
+        self._rear_of: dict[NodeKey, tuple[NodeKey, int]] = {}  # front -> (rear, position)
+        self._fronts_of: dict[NodeKey, dict[int, NodeKey]] = {}  # rear -> {position: front}
+        self._paths: dict[NodeKey, tuple[float, list[NodeKey]]] = {}
+        self._members: dict[NodeKey, set[NodeKey]] = {}  # node or cable -> cached path starts
+        self.path_hits = 0
+        self.path_misses = 0
+
+    # --- updates ---
+
+    def set_node(self, kind: str, node_id: int, device: str, name: str) -> NodeKey:
+        key = (kind, node_id)
+        old = self.nodes.get(key)
+        if old is not None and (old.device, old.name) == (device, name):
+            return key
+        if old is not None:
+            self._by_name.pop((kind, old.device, old.name), None)
+        self.nodes[key] = GraphNode(kind, node_id, device, name)
+        self._by_name[(kind, device, name)] = key
+        self.invalidate(key)
+        return key
+
+    def set_front_port(
+        self,
+        port_id: int,
+        device: str,
+        name: str,
+        rear_port_id: int | None,
+        position: int | None = None,
+        cable_id: int | None = None,
+    ) -> NodeKey:
+        key = self.set_node("frontport", port_id, device, name)
+        previous = self._rear_of.pop(key, None)
+        if previous is not None:
+            self._fronts_of.get(previous[0], {}).pop(previous[1], None)
+        if rear_port_id is not None:
+            rear = ("rearport", rear_port_id)
+            self._rear_of[key] = (rear, position or 1)
+            self._fronts_of.setdefault(rear, {})[position or 1] = key
+            self.invalidate(rear)
+        if previous != self._rear_of.get(key):
+            self.invalidate(key)
+        self._sync_cable(key, cable_id)
+        return key
+
+    def set_port(self, kind: str, port_id: int, device: str, name: str, cable_id: int | None = None) -> NodeKey:
+        key = self.set_node(kind, port_id, device, name)
+        self._sync_cable(key, cable_id)
+        return key
+
+    def _sync_cable(self, key: NodeKey, cable_id: int | None) -> None:
+        # Ports report their cable; a port that lost it must leave the old cable's ends.
+        current = self._cable_of.get(key)
+        if current is not None and current != cable_id:
+            cable = self.cables.get(current)
+            if cable is not None:
+                cable["a"].discard(key)
+                cable["b"].discard(key)
+            del self._cable_of[key]
+            self.invalidate(key)
+            self.invalidate(("cable", current))
+
+    def set_cable(self, cable_id: int, label: str | None, a: Iterable[NodeKey], b: Iterable[NodeKey]) -> None:
+        a, b = set(a), set(b)
+        old = self.cables.get(cable_id)
+        if old is not None and (old["label"], old["a"], old["b"]) == (label, a, b):
+            return
+        self.remove_cable(cable_id)
+        self.cables[cable_id] = {"label": label, "a": a, "b": b}
+        for key in a | b:
+            self._cable_of[key] = cable_id
+            self.invalidate(key)
+
+    def remove_cable(self, cable_id: int) -> None:
+        old = self.cables.pop(cable_id, None)
+        self.invalidate(("cable", cable_id))
+        if old is None:
+            return
+        for key in old["a"] | old["b"]:
+            if self._cable_of.get(key) == cable_id:
+                del self._cable_of[key]
+            self.invalidate(key)
+
+    def invalidate(self, key: NodeKey) -> None:
+        """Drop cached paths that run through a node or cable."""
+        for start in self._members.pop(key, set()):
+            entry = self._paths.pop(start, None)
+            if entry is None:
+                continue
+            for member in entry[1]:
+                starts = self._members.get(member)
+                if starts is not None:
+                    starts.discard(start)
+
+    # --- queries ---
+
+    def find_port(self, device: str, port_label: str, kind: str = "frontport") -> NodeKey | None:
+        for name in port_name_candidates(port_label):
+            key = self._by_name.get((kind, device, name))
+            if key is not None:
+                return key
+        return None
+
+    def cached_path(self, start: NodeKey) -> list[NodeKey] | None:
+        entry = self._paths.get(start)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+            self.invalidate(start)
+            return None
+        return entry[1]
+
+    def store_path(self, start: NodeKey, path: list[NodeKey]) -> None:
+        self.invalidate(start)
+        self._paths[start] = (time.monotonic(), path)
+        for member in path:
+            self._members.setdefault(member, set()).add(start)
+
+    def path(self, start: NodeKey) -> list[NodeKey]:
+        """Full path through start, end to end (nodes and ("cable", id) hops)."""
+        cached = self.cached_path(start)
+        if cached is not None:
+            self.path_hits += 1
+            return cached
+        self.path_misses += 1
+        path = list(reversed(self._walk(start, via_cable=False))) + [start] + self._walk(start, via_cable=True)
+        self.store_path(start, path)
+        return path
+
+    def _walk(self, start: NodeKey, via_cable: bool) -> list[NodeKey]:
+        hops: list[NodeKey] = []
+        current, position, seen = start, None, {start}
+        while True:
+            if via_cable:
+                cable_id = self._cable_of.get(current)
+                cable = self.cables.get(cable_id) if cable_id is not None else None
+                if cable_id is None or not cable:
+                    break
+                far = cable["b"] if current in cable["a"] else cable["a"]
+                if not far:
+                    break
+                nxt = min(far)
+                hops += [("cable", cable_id), nxt]
+            else:
+                step = self._pass_through(current, position)
+                if step is None:
+                    break
+                nxt, position = step
+                hops.append(nxt)
+            if nxt in seen:
+                break
+            seen.add(nxt)
+            current = nxt
+            via_cable = not via_cable
+        return hops
+
+    def _pass_through(self, key: NodeKey, position: int | None) -> tuple[NodeKey, int | None] | None:
+        if key in self._rear_of:
+            return self._rear_of[key]
+        fronts = self._fronts_of.get(key)
+        if not fronts:
+            return None
+        if position in fronts:
+            return fronts[position], None
+        if len(fronts) == 1:
+            return next(iter(fronts.values())), None
+        return None  # multi-position rear port entered without a known position
+
+    def describe(self, path: list[NodeKey]) -> list[dict]:
+        """Path hops as JSON-friendly dicts."""
+        out = []
+        for kind, ident in path:
+            if kind == "cable":
+                out.append({"kind": "cable", "id": ident, "label": self.cables.get(ident, {}).get("label")})
+            else:
+                node = self.nodes.get((kind, ident))
+                out.append(
+                    {"kind": kind, "id": ident, "device": node.device if node else "", "name": node.name if node else ""}
+                )
+        return out
+
+    def add_netbox_paths(self, start: NodeKey, paths: list[dict]) -> list[NodeKey]:
+        """Store NetBox CablePath data (front-ports/{id}/paths/) and return the path through start.
+
+        Each path's "path" is a list of steps; a step is a list of terminations
+        or a list holding one cable.
+        """
+        chosen: list[NodeKey] = []
+        for cable_path in paths:
+            ordered: list[NodeKey] = []
+            previous: list[NodeKey] | None = None
+            cable: dict | None = None
+            for step in cable_path.get("path") or []:
+                objects = [o for o in (step if isinstance(step, list) else [step]) if isinstance(o, dict)]
+                if not objects:
+                    continue
+                if kind_from_url(objects[0].get("url", "")) == "cable":
+                    cable = objects[0]
+                    continue
+                keys = [self._node_from_object(o) for o in objects]
+                if cable is not None and previous is not None:
+                    self.set_cable(cable["id"], cable.get("label"), previous, keys)
+                    ordered.append(("cable", cable["id"]))
+                ordered.append(keys[0])
+                previous, cable = keys, None
+            if start in ordered and not chosen:
+                chosen = ordered
+        if not chosen:
+            chosen = [start]
+        self.store_path(start, chosen)
+        return chosen
+
+    def _node_from_object(self, obj: dict) -> NodeKey:
+        device = obj.get("device")
+        return self.set_node(
+            kind_from_url(obj.get("url", "")),
+            obj["id"],
+            device.get("name", "") if isinstance(device, dict) else "",
+            obj.get("name") or "",
+        )
+
+    def stats(self) -> dict:
+        return {
+            "nodes": len(self.nodes),
+            "cables": len(self.cables),
+            "cached_paths": len(self._paths),
+            "path_hits": self.path_hits,
+            "path_misses": self.path_misses,
+        }
+
+
+def path_reaches(
+    graph: CableGraph, path: list[NodeKey], device: str, port_label: str
+) -> bool:
+    """True if a port named port_label (or its P/p alias) on device is on path."""
+    names = set(port_name_candidates(port_label))
+    return any(
+        (node := graph.nodes.get(hop)) is not None and node.device == device and node.name in names
+        for hop in path
+        if hop[0] != "cable"
+    )
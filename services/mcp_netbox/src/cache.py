@@ -0,0 +1,272 @@
+"""TTL cache for NetBox lookups with negative caching and webhook invalidation.
+
+Entries are keyed per panel ("device:PANEL-A:", "port:PANEL-A:24") so a NetBox
+change notification for a device, front port or cable can drop exactly the
+panels it touches. MemoryCMDBCache is per process; RedisCMDBCache shares
+entries (and invalidations) across API and worker processes. redis is an
+optional dependency; without it the memory backend is used.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from packages.core.metrics import note_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = 10_000
+
+
+def device_key(panel_id: str) -> str:
+    return f"device:{panel_id}:"
+
+
+def port_key(panel_id: str, port_label: str) -> str:
+    return f"port:{panel_id}:{port_label}"
+
+
+def panel_prefixes(panel_id: str) -> list[str]:
+    """Key prefixes covering everything cached for one panel."""
+    return [device_key(panel_id), f"port:{panel_id}:"]
+
+
+class CacheStats:
+    """Hit/miss/staleness counters (per process, also for the shared backend)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+        self._age_sum = 0.0
+        self._age_max = 0.0
+
+    def hit(self, age: float, negative: bool) -> None:
+        note_cache_lookup("cmdb", True)
+        with self._lock:
+            self.hits += 1
+            self.negative_hits += int(negative)
+            self._age_sum += age
+            self._age_max = max(self._age_max, age)
+
+    def miss(self, expired: bool = False) -> None:
+        note_cache_lookup("cmdb", False)
+        with self._lock:
+            self.misses += 1
+            self.expired += int(expired)
+
+    def invalidated(self, count: int) -> None:
+        with self._lock:
+            self.invalidations += count
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "hit_age_mean_s": round(self._age_sum / self.hits, 3) if self.hits else 0.0,
+                "hit_age_max_s": round(self._age_max, 3),
+            }
+
+
+class MemoryCMDBCache:
+    """Bounded in-process TTL cache; negative (not found) entries get negative_ttl."""
+
+    backend = "memory"
+
+    def __init__(self, ttl: float, negative_ttl: float, max_entries: int = MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (stored_at, expires_at, value, negative)
+        self._entries: OrderedDict[str, tuple[float, float, Any, bool]] = OrderedDict()
+
+    def lookup(self, key: str) -> tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+        if entry is None or entry[1] <= now:
+            self.stats.miss(expired=entry is not None)
+            return False, None
+        self.stats.hit(now - entry[0], negative=entry[3])
+        return True, entry[2]
+
+    def store(self, key: str, value: Any, negative: bool | None = None) -> None:
+        negative = value is None if negative is None else negative
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (now, now + ttl, value, negative)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def drop_prefixes(self, prefixes: list[str] | None) -> int:
+        with self._lock:
+            if prefixes is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                doomed = [k for k in self._entries if any(k.startswith(p) for p in prefixes)]
+                for k in doomed:
+                    del self._entries[k]
+                dropped = len(doomed)
+        self.stats.invalidated(dropped)
+        return dropped
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        return self.lookup(key)
+
+    async def set(self, key: str, value: Any, negative: bool | None = None) -> None:
+        """Store value; negative entries (default: value is None) use negative_ttl."""
+        self.store(key, value, negative)
+
+    async def invalidate(self, prefixes: list[str] | None) -> int:
+        """Drop entries under the given key prefixes; None drops everything."""
+        return self.drop_prefixes(prefixes)
+
+
+class RedisCMDBCache:
+    """Shared cache in Redis (SET EX per entry); invalidations reach every process."""
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl: float, negative_ttl: float, namespace: str = "cmdb:") -> None:
+        import redis.asyncio as redis  # type: ignore[import-untyped]
+
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+        self._ns = namespace
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        try:
+            raw = await self._redis.get(self._ns + key)
+        except Exception as exc:
+            logger.warning("CMDB cache read failed (%s); treating as miss", exc)
+            raw = None
+        if raw is None:
+            self.stats.miss()
+            return False, None
+        entry = json.loads(raw)
+        self.stats.hit(time.time() - entry["stored_at"], negative=entry["negative"])
+        return True, entry["value"]
+
+    async def set(self, key: str, value: Any, negative: bool | None = None) -> None:
+        negative = value is None if negative is None else negative
+        ttl = self.negative_ttl if negative else self.ttl
+        if ttl <= 0:
+            return
+        payload = json.dumps({"stored_at": time.time(), "value": value, "negative": negative})
+        try:
+            await self._redis.set(self._ns + key, payload, ex=max(1, int(ttl)))
+        except Exception as exc:
+            logger.warning("CMDB cache write failed (%s)", exc)
+
+    async def invalidate(self, prefixes: list[str] | None) -> int:
+        patterns = [self._ns + "*"] if prefixes is None else [self._ns + p + "*" for p in prefixes]
+        dropped = 0
+        for pattern in patterns:
+            keys = [k async for k in self._redis.scan_iter(match=pattern)]
+            if keys:
+                dropped += await self._redis.delete(*keys)
+        self.stats.invalidated(dropped)
+        return dropped
+
+
+CMDBCache = MemoryCMDBCache | RedisCMDBCache
+
+_cache: CMDBCache | None = None
+
+
+def get_cmdb_cache() -> CMDBCache:
+    """Process-wide cache built from settings (CMDB_CACHE_*)."""
+    global _cache
+    if _cache is None:
+        from packages.core.config import get_settings
+
+        settings = get_settings()
+        if settings.cmdb_cache_backend == "redis":
+            try:
+                _cache = RedisCMDBCache(
+                    settings.cmdb_cache_redis_url,
+                    settings.cmdb_cache_ttl,
+                    settings.cmdb_cache_negative_ttl,
+                )
+            except ImportError:
+                logger.warning("redis not installed; using in-process CMDB cache")
+        if _cache is None:
+            _cache = MemoryCMDBCache(settings.cmdb_cache_ttl, settings.cmdb_cache_negative_ttl)
+    return _cache
+
+
+def set_cmdb_cache(cache: CMDBCache | None) -> None:
+    global _cache
+    _cache = cache
+
+
+def _termination_panels(terminations: Any) -> set[str]:
+    panels: set[str] = set()
+    for term in terminations or []:
+        obj = term.get("object", term) if isinstance(term, dict) else {}
+        device = obj.get("device") if isinstance(obj, dict) else None
+        if isinstance(device, dict) and device.get("name"):
+            panels.add(device["name"])
+    return panels
+
+
+def invalidated_panels(payload: dict) -> set[str] | None:
+    """Panels a NetBox webhook event touches; None means it could be anything.
+
+    Handles device, front-port and cable events. Cable events cover both the
+    current and pre-change terminations so the old end of a re-cabled port is
+    included too. Anything unrecognised returns None rather than risk stale data.
+    """
+    model = payload.get("model")
+    data = payload.get("data") or {}
+    panels: set[str] = set()
+    if model == "device" and data.get("name"):
+        panels.add(data["name"])
+    elif model in ("frontport", "rearport"):
+        device = data.get("device") or {}
+        if isinstance(device, dict) and device.get("name"):
+            panels.add(device["name"])
+    elif model == "cable":
+        prechange = (payload.get("snapshots") or {}).get("prechange") or {}
+        before: set[str] = set()
+        for side in ("a_terminations", "b_terminations"):
+            panels |= _termination_panels(data.get(side))
+            before |= _termination_panels(prechange.get(side))
+        if payload.get("event") == "updated" and not before:
+            # Cannot tell where the cable was before the edit.
+            return None
+        panels |= before
+    return panels or None
+
+
+def invalidation_prefixes(payload: dict) -> list[str] | None:
+    """Key prefixes a NetBox webhook event invalidates; None means flush everything."""
+    panels = invalidated_panels(payload)
+    if panels is None:
+        return None
+    return [prefix for panel in sorted(panels) for prefix in panel_prefixes(panel)]
@@ -0,0 +1,112 @@
+"""NetBox change notifications across API, worker and MCP server processes.
+
+The API receives NetBox webhooks, but validations are served by the worker
+and MCP server processes, from their CMDB lookup cache (shared only with the
+redis backend), their traced cable paths and their per-change topology
+indexes. The API applies a webhook locally and publishes it on a Redis
+channel. Every other process runs listen_for_invalidations() and drops its
+own entries. Webhook invalidation therefore needs CMDB_CACHE_BACKEND=redis;
+check_invalidation_backend() fails startup when NETBOX_WEBHOOK_SECRET is set
+without it. With the memory backend and no secret, a webhook only reaches the
+API process and the other processes rely on CMDB_CACHE_TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+from services.mcp_netbox.src.cache import get_cmdb_cache, invalidated_panels, invalidation_prefixes
+from services.mcp_netbox.src.netbox_client import invalidate_cable_paths, invalidate_cmdb_cache
+from services.mcp_netbox.src.topology import drop_indexes_for
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "infrasentinel:cmdb:invalidate"
+
+_redis: Any = None
+
+
+def _client() -> Any:
+    global _redis
+    if _redis is None:
+        import redis.asyncio as redis  # type: ignore[import-untyped]
+
+        from packages.core.config import get_settings
+
+        _redis = redis.from_url(get_settings().cmdb_cache_redis_url)
+    return _redis
+
+
+def check_invalidation_backend(settings: Any) -> None:
+    """Fail fast when NetBox webhooks are configured but cannot reach the validating processes."""
+    if settings.netbox_mode != "netbox" or not settings.netbox_webhook_secret:
+        return
+    if get_cmdb_cache().backend != "redis":
+        raise RuntimeError(
+            "NETBOX_WEBHOOK_SECRET is set but the CMDB cache is per process "
+            "(CMDB_CACHE_BACKEND=memory, or redis is not installed): webhooks would only "
+            "invalidate the API. Set CMDB_CACHE_BACKEND=redis and install the cache extra."
+        )
+
+
+async def apply_invalidation(payload: dict, shared: bool = True) -> dict:
+    """Drop this process's cached lookups, cable paths and topology indexes a NetBox event touches.
+
+    shared=False skips the shared (redis) cache, which the publisher already invalidated.
+    """
+    prefixes = invalidation_prefixes(payload)
+    dropped = await invalidate_cmdb_cache(prefixes, shared=shared)
+    graphs = invalidate_cable_paths(payload)
+    indexes = drop_indexes_for(invalidated_panels(payload))
+    return {
+        "flushed": prefixes is None,
+        "prefixes": prefixes or [],
+        "dropped": dropped,
+        "graphs": graphs,
+        "indexes": indexes,
+    }
+
+
+async def publish_invalidation(payload: dict) -> int:
+    """Send a NetBox event to the other processes; returns how many received it."""
+    if get_cmdb_cache().backend != "redis":
+        return 0
+    try:
+        return int(await _client().publish(CHANNEL, json.dumps(payload)))
+    except Exception as exc:
+        logger.warning("CMDB invalidation publish failed (%s); other processes rely on the TTL", exc)
+        return 0
+
+
+async def listen_for_invalidations(retry_delay: float = 5.0) -> None:
+    """Apply published NetBox events until cancelled; returns at once without the redis backend.
+
+    Events published while not subscribed are lost, so every (re)subscription
+    starts by dropping all local indexes.
+    """
+    if get_cmdb_cache().backend != "redis":
+        return
+    while True:
+        pubsub = _client().pubsub()
+        try:
+            await pubsub.subscribe(CHANNEL)
+            await apply_invalidation({}, shared=False)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    logger.warning("ignoring malformed CMDB invalidation message")
+                    continue
+                await apply_invalidation(payload if isinstance(payload, dict) else {}, shared=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("CMDB invalidation listener failed (%s); resubscribing", exc)
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,182 @@
+"""Edit-distance (symmetric-delete) index over known cable labels, port names and devices.
+
+On a CMDB mismatch the nearest known labels often reveal a one-character OCR
+misread (MDF-01-R12-P2A vs MDF-01-R12-P24). Suggestions are advisory only:
+they feed retake guidance and escalation text and never change a match.
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from packages.core.fixtures.mapping_index import MappingIndex
+from services.mcp_netbox.src.topology import TopologyIndex, port_name_candidates
+
+MAX_DISTANCE = 2
+MAX_SUGGESTIONS = 3
+
+
+def edit_distance(a: str, b: str, limit: int | None = None) -> int:
+    """Levenshtein distance; returns limit + 1 as soon as it must exceed limit."""
+    while a and b and a[0] == b[0]:
+        a, b = a[1:], b[1:]
+    while a and b and a[-1] == b[-1]:
+        a, b = a[:-1], b[:-1]
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _deletes(word: str, depth: int) -> dict[str, int]:
+    """Strings reachable from word by up to depth single-character deletions -> fewest deletions."""
+    out = {word: 0}
+    frontier = {word}
+    for d in range(1, depth + 1):
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))} - out.keys()
+        out.update(dict.fromkeys(frontier, d))
+    return out
+
+
+class DeleteIndex:
+    """Symmetric-delete index: candidates share a deletion variant with the query.
+
+    If two strings are within k edits, deleting at most k characters from
+    each yields a common string, so a query only probes its own deletion
+    variants and verifies the words found there. Lookups stay fast on label
+    sets where most strings are a few edits apart, which defeats metric trees;
+    the cost is memory (about len^2/2 variants per word for k=2).
+    """
+
+    def __init__(self, words: Iterable[str] = (), max_distance: int = MAX_DISTANCE) -> None:
+        self.max_distance = max_distance
+        self._words: set[str] = set()
+        # variant -> {word: deletions from word to variant}
+        self._variants: dict[str, dict[str, int]] = {}
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def add(self, word: str) -> None:
+        if not word or word in self._words:
+            return
+        self._words.add(word)
+        for variant, depth in _deletes(word, self.max_distance).items():
+            self._variants.setdefault(variant, {})[word] = depth
+
+    def search(
+        self, query: str, max_distance: int | None = None, limit: int | None = None
+    ) -> list[tuple[int, str]]:
+        """(distance, word) within max_distance, nearest first.
+
+        With limit, widens one edit at a time and stops once limit words are
+        found, so dense label sets only verify the closest candidates.
+        """
+        k_max = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        variants = _deletes(query, k_max)
+        found: dict[str, int] = {}
+        checked: set[str] = set()
+        for k in range(k_max + 1):
+            for variant, dq in variants.items():
+                if dq > k:
+                    continue
+                for word, dw in self._variants.get(variant, {}).items():
+                    if dw > k or word in checked:
+                        continue
+                    checked.add(word)
+                    d = edit_distance(query, word, k_max)
+                    if d <= k_max:
+                        found[word] = d
+            within = sum(1 for d in found.values() if d <= k)
+            if limit is not None and within >= limit:
+                break
+        return sorted((d, word) for word, d in found.items())[:limit]
+
+
+@dataclass(eq=False)
+class LabelIndex:
+    cables: DeleteIndex = field(default_factory=DeleteIndex)
+    devices: DeleteIndex = field(default_factory=DeleteIndex)
+    ports: dict[str, DeleteIndex] = field(default_factory=dict)
+
+    def add(self, panel_id: str | None, port_name: str | None, cable_label: str | None) -> None:
+        if panel_id:
+            self.devices.add(panel_id)
+            if port_name:
+                self.ports.setdefault(panel_id, DeleteIndex()).add(port_name)
+        if cable_label:
+            self.cables.add(cable_label)
+
+    def nearest(self, kind: str, observed: str, panel_id: str | None = None) -> list[dict]:
+        """Closest known values of kind (cable_tag | port_label | panel_id) to observed."""
+        tree = {"cable_tag": self.cables, "panel_id": self.devices}.get(kind)
+        if kind == "port_label":
+            tree = self.ports.get(panel_id or "")
+        if tree is None or not observed:
+            return []
+        return [
+            {"field": kind, "observed": observed, "candidate": word, "distance": d}
+            for d, word in tree.search(observed, limit=MAX_SUGGESTIONS)
+        ]
+
+    def suggest(self, panel_id: str, port_label: str, cable_tag: str) -> list[dict]:
+        """Suggestions for a failed validation, for the first observed part that is unknown.
+
+        A cable-tag candidate at distance 0 means the tag exists, on another port.
+        """
+        if panel_id not in self.devices:
+            return self.nearest("panel_id", panel_id)
+        ports = self.ports.get(panel_id) or DeleteIndex()
+        if not any(name in ports for name in port_name_candidates(port_label)):
+            return self.nearest("port_label", port_label, panel_id)
+        return self.nearest("cable_tag", cable_tag)
+
+
+_mapping_labels: weakref.WeakKeyDictionary[MappingIndex, LabelIndex] = weakref.WeakKeyDictionary()
+
+
+def labels_from_mapping(index: MappingIndex) -> LabelIndex:
+    """Label index over an expected mapping's endpoints; cached per compiled mapping."""
+    labels = _mapping_labels.get(index)
+    if labels is None:
+        labels = LabelIndex()
+        endpoints = list(index.mapping.get("allowed_endpoints", []))
+        if index.default:
+            endpoints.append(index.default)
+        for ep in endpoints:
+            for port in (ep.get("port_label"), ep.get("port_label_alt")):
+                labels.add(ep.get("panel_id"), port, ep.get("cable_tag"))
+        _mapping_labels[index] = labels
+    return labels
+
+
+_topology_labels: weakref.WeakKeyDictionary[TopologyIndex, LabelIndex] = weakref.WeakKeyDictionary()
+
+
+def labels_from_topology(index: TopologyIndex) -> LabelIndex:
+    """Label index over a change's prefetched panels; cached per topology index."""
+    labels = _topology_labels.get(index)
+    if labels is None:
+        labels = LabelIndex()
+        for panel_id in index.devices:
+            labels.add(panel_id, None, None)
+        for (panel_id, name), cable in index.ports.items():
+            labels.add(panel_id, name, (cable or {}).get("label"))
+        _topology_labels[index] = labels
+    return labels
@@ -0,0 +1,466 @@
+"""Local mirror of the NetBox DCIM data validation needs (SQLite or Postgres).
+
+Devices, front and rear ports, cables and cable terminations are copied into
+indexed tables and refreshed incrementally: each resource keeps a cursor (the
+newest last_updated seen) and the next sync only fetches rows with
+last_updated__gte that cursor, in bulk pages. NetBox does not report deletions
+in those deltas, so a periodic full sync (full=True) prunes rows that are gone.
+
+Lookups never touch NetBox, so validation keeps its speed while NetBox is slow
+or in maintenance; a failed sync leaves the previous mirror in place.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import (
+    Connection,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    delete,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.sql import Select
+
+from packages.core.models.legacy import ValidationResult
+from services.mcp_netbox.src.cable_graph import CableGraph, kind_from_object_type
+from services.mcp_netbox.src.labels import LabelIndex
+from services.mcp_netbox.src.topology import lookup_result, port_name_candidates
+
+if TYPE_CHECKING:
+    from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient
+
+
+class MirrorBase(DeclarativeBase):
+    pass
+
+
+class MirrorDevice(MirrorBase):
+    __tablename__ = "cmdb_devices"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(255), index=True)
+    last_updated: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+class MirrorFrontPort(MirrorBase):
+    __tablename__ = "cmdb_front_ports"
+    __table_args__ = (Index("ix_cmdb_front_ports_device_name", "device_name", "name"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    device_name: Mapped[str] = mapped_column(String(255))
+    name: Mapped[str] = mapped_column(String(255))
+    rear_port_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rear_port_position: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cable_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    last_updated: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+class MirrorRearPort(MirrorBase):
+    __tablename__ = "cmdb_rear_ports"
+    __table_args__ = (Index("ix_cmdb_rear_ports_device_name", "device_name", "name"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    device_name: Mapped[str] = mapped_column(String(255))
+    name: Mapped[str] = mapped_column(String(255))
+    cable_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    last_updated: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+class MirrorInterface(MirrorBase):
+    """Cabled interfaces only: the far ends of cable paths."""
+
+    __tablename__ = "cmdb_interfaces"
+    __table_args__ = (Index("ix_cmdb_interfaces_device_name", "device_name", "name"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    device_name: Mapped[str] = mapped_column(String(255))
+    name: Mapped[str] = mapped_column(String(255))
+    cable_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    last_updated: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+class MirrorCable(MirrorBase):
+    __tablename__ = "cmdb_cables"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    label: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
+    last_updated: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+
+class MirrorCableTermination(MirrorBase):
+    __tablename__ = "cmdb_cable_terminations"
+    __table_args__ = (Index("ix_cmdb_cable_terminations_object", "object_type", "object_id"),)
+
+    cable_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    side: Mapped[str] = mapped_column(String(1), primary_key=True)
+    object_type: Mapped[str] = mapped_column(String(64), primary_key=True)
+    object_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+class MirrorSyncState(MirrorBase):
+    __tablename__ = "cmdb_sync_state"
+
+    resource: Mapped[str] = mapped_column(String(64), primary_key=True)
+    cursor: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    full_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+def _nested_id(value: object) -> int | None:
+    if isinstance(value, dict):
+        return value.get("id")
+    return value if isinstance(value, int) else None
+
+
+def _nested_name(value: object) -> str | None:
+    return value.get("name") if isinstance(value, dict) else None
+
+
+def _device_row(obj: dict) -> dict:
+    return {"id": obj["id"], "name": obj.get("name") or "", "last_updated": obj.get("last_updated")}
+
+
+def _front_port_row(obj: dict) -> dict:
+    return {
+        "id": obj["id"],
+        "device_name": _nested_name(obj.get("device")) or "",
+        "name": obj.get("name") or "",
+        "rear_port_id": _nested_id(obj.get("rear_port")),
+        "rear_port_position": obj.get("rear_port_position"),
+        "cable_id": _nested_id(obj.get("cable")),
+        "last_updated": obj.get("last_updated"),
+    }
+
+
+def _port_row(obj: dict) -> dict:
+    return {
+        "id": obj["id"],
+        "device_name": _nested_name(obj.get("device")) or "",
+        "name": obj.get("name") or "",
+        "cable_id": _nested_id(obj.get("cable")),
+        "last_updated": obj.get("last_updated"),
+    }
+
+
+def _cable_row(obj: dict) -> dict:
+    return {"id": obj["id"], "label": obj.get("label") or None, "last_updated": obj.get("last_updated")}
+
+
+# Sync order matters: cables land before the ports that reference them.
+RESOURCES: list[tuple[str, str, type[MirrorBase], Callable[[dict], dict]]] = [
+    ("devices", "dcim/devices/", MirrorDevice, _device_row),
+    ("cables", "dcim/cables/", MirrorCable, _cable_row),
+    ("front_ports", "dcim/front-ports/", MirrorFrontPort, _front_port_row),
+    ("rear_ports", "dcim/rear-ports/", MirrorRearPort, _port_row),
+    ("interfaces", "dcim/interfaces/", MirrorInterface, _port_row),
+]
+
+# Extra list filters per resource (switches have many uncabled interfaces).
+RESOURCE_FILTERS: dict[str, list[tuple[str, str]]] = {"interfaces": [("cabled", "true")]}
+
+
+def _termination_rows(cable: dict) -> list[dict]:
+    rows = []
+    for side in ("a", "b"):
+        for term in cable.get(f"{side}_terminations") or []:
+            object_id = term.get("object_id") or _nested_id(term.get("object"))
+            if term.get("object_type") and object_id:
+                rows.append(
+                    {
+                        "cable_id": cable["id"],
+                        "side": side.upper(),
+                        "object_type": term["object_type"],
+                        "object_id": object_id,
+                    }
+                )
+    return rows
+
+
+def _add_missing_columns(sync_conn: Connection) -> None:
+    """Add nullable columns introduced after a mirror was created (filled by the next full sync)."""
+    inspector = inspect(sync_conn)
+    for table in MirrorBase.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                sync_conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                        f"{column.type.compile(sync_conn.dialect)}"
+                    )
+                )
+
+
+class CMDBMirror:
+    """Indexed local copy of NetBox DCIM data with incremental sync."""
+
+    def __init__(self, database_url: str) -> None:
+        if database_url.startswith("sqlite") and ":///" in database_url:
+            path = database_url.split(":///", 1)[1]
+            if path and path != ":memory:":
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.engine: AsyncEngine = create_async_engine(database_url, future=True, echo=False)
+        self._sessions = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        self._ready = False
+        # (last sync time, index): rebuilt when any process syncs the mirror.
+        self._labels: tuple[datetime | None, LabelIndex] | None = None
+        # Cable graph plus the full-sync time and per-resource cursors it reflects.
+        self._graph: CableGraph | None = None
+        self._graph_full: datetime | None = None
+        self._graph_cursors: dict[str, str | None] = {}
+
+    async def init(self) -> None:
+        if not self._ready:
+            async with self.engine.begin() as conn:
+                await conn.run_sync(MirrorBase.metadata.create_all)
+                await conn.run_sync(_add_missing_columns)
+            self._ready = True
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    async def _upsert(self, session: AsyncSession, model: type[MirrorBase], rows: list[dict]) -> None:
+        if not rows:
+            return
+        table = MirrorBase.metadata.tables[model.__tablename__]
+        dialect = self.engine.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            keys = [c.name for c in table.primary_key.columns]
+            for start in range(0, len(rows), 500):
+                stmt = insert(table).values(rows[start : start + 500])
+                updates = {c.name: stmt.excluded[c.name] for c in table.columns if c.name not in keys}
+                if updates:
+                    stmt = stmt.on_conflict_do_update(index_elements=keys, set_=updates)
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+                await session.execute(stmt)
+        else:
+            for row in rows:
+                await session.merge(model(**row))
+
+    async def sync(self, client: AsyncNetBoxClient, full: bool = False) -> dict:
+        """Pull changes from NetBox (AsyncNetBoxClient); returns rows fetched per resource.
+
+        Each resource commits on its own, so a NetBox failure mid-sync keeps
+        whatever was already mirrored and retries from the old cursor next time.
+        """
+        await self.init()
+        fetched: dict[str, int] = {}
+        for resource, endpoint, model, to_row in RESOURCES:
+            async with self._sessions() as session:
+                state = await session.get(MirrorSyncState, resource) or MirrorSyncState(resource=resource)
+                params = list(RESOURCE_FILTERS.get(resource, []))
+                if state.cursor and not full:
+                    params.append(("last_updated__gte", state.cursor))
+                objects = await client.list_all(endpoint, params)
+                rows = [to_row(obj) for obj in objects]
+                await self._upsert(session, model, rows)
+                if resource == "cables":
+                    ids = [row["id"] for row in rows]
+                    for start in range(0, len(ids), 500):
+                        await session.execute(
+                            delete(MirrorCableTermination).where(
+                                MirrorCableTermination.cable_id.in_(ids[start : start + 500])
+                            )
+                        )
+                    terms = [t for obj in objects for t in _termination_rows(obj)]
+                    await self._upsert(session, MirrorCableTermination, terms)
+                if full:
+                    await self._prune(session, model, {row["id"] for row in rows})
+                stamps = [row["last_updated"] for row in rows if row.get("last_updated")]
+                if stamps:
+                    state.cursor = max([*stamps, state.cursor or ""])
+                now = datetime.now(UTC)
+                state.synced_at = now
+                if full:
+                    state.full_synced_at = now
+                session.add(state)
+                await session.commit()
+            fetched[resource] = len(rows)
+        return fetched
+
+    async def _prune(self, session: AsyncSession, model: type[MirrorBase], keep: set[int]) -> None:
+        ids = model.__table__.c.id
+        existing = set((await session.execute(select(ids))).scalars())
+        gone = sorted(existing - keep)
+        for start in range(0, len(gone), 500):
+            chunk = gone[start : start + 500]
+            await session.execute(delete(model).where(ids.in_(chunk)))
+            if model is MirrorCable:
+                await session.execute(
+                    delete(MirrorCableTermination).where(MirrorCableTermination.cable_id.in_(chunk))
+                )
+
+    async def lookup_port_cable(self, panel_id: str, port_label: str) -> tuple[bool, dict | None]:
+        """(device exists, cable {id, label} or None) from the mirror; same shape as the live client."""
+        found = await self.lookup_many([(panel_id, port_label)])
+        return found[(panel_id, port_label)]
+
+    async def lookup_many(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], tuple[bool, dict | None]]:
+        """lookup_port_cable for several pairs: one front-port query per panel."""
+        await self.init()
+        by_panel: dict[str, list[str]] = {}
+        for panel, port in dict.fromkeys(pairs):
+            by_panel.setdefault(panel, []).append(port)
+        out: dict[tuple[str, str], tuple[bool, dict | None]] = {}
+        async with self._sessions() as session:
+            for panel_id, labels in by_panel.items():
+                names = list(dict.fromkeys(n for label in labels for n in port_name_candidates(label)))
+                rows = (
+                    await session.execute(
+                        select(MirrorFrontPort.name, MirrorFrontPort.cable_id, MirrorCable.label)
+                        .outerjoin(MirrorCable, MirrorCable.id == MirrorFrontPort.cable_id)
+                        .where(MirrorFrontPort.device_name == panel_id, MirrorFrontPort.name.in_(names))
+                    )
+                ).all()
+                found = bool(rows) or (
+                    await session.execute(select(MirrorDevice.id).where(MirrorDevice.name == panel_id).limit(1))
+                ).first() is not None
+                by_name = {row.name: row for row in rows}
+                for label in labels:
+                    row = next(
+                        (by_name[name] for name in port_name_candidates(label) if name in by_name), None
+                    )
+                    cable = (
+                        {"id": row.cable_id, "label": row.label}
+                        if row is not None and row.cable_id is not None
+                        else None
+                    )
+                    out[(panel_id, label)] = (found, cable)
+        return out
+
+    async def validate_observed(
+        self, change_id: str, panel_id: str, port_label: str, cable_tag: str
+    ) -> ValidationResult:
+        found, cable = await self.lookup_port_cable(panel_id, port_label)
+        return lookup_result(panel_id, port_label, cable_tag, found, cable)
+
+    async def label_index(self) -> LabelIndex:
+        """Edit-distance index over mirrored devices, front-port names and cable labels."""
+        await self.init()
+        async with self._sessions() as session:
+            version = (await session.execute(select(func.max(MirrorSyncState.synced_at)))).scalar_one()
+            if self._labels is not None and self._labels[0] == version:
+                return self._labels[1]
+            labels = LabelIndex()
+            for (name,) in await session.execute(select(MirrorDevice.name)):
+                labels.add(name, None, None)
+            for device_name, name in await session.execute(
+                select(MirrorFrontPort.device_name, MirrorFrontPort.name)
+            ):
+                labels.add(device_name, name, None)
+            for (label,) in await session.execute(select(MirrorCable.label).where(MirrorCable.label.is_not(None))):
+                labels.add(None, None, label)
+        self._labels = (version, labels)
+        return labels
+
+    async def cable_graph(self) -> CableGraph:
+        """Cable graph over the mirror, refreshed from rows changed since it was built.
+
+        A newer full sync (which may have pruned rows) rebuilds it from scratch.
+        """
+        await self.init()
+        async with self._sessions() as session:
+            states = {s.resource: s for s in (await session.execute(select(MirrorSyncState))).scalars()}
+            cursors = {resource: state.cursor for resource, state in states.items()}
+            full = max((s.full_synced_at for s in states.values() if s.full_synced_at), default=None)
+            graph = self._graph
+            if graph is not None and full == self._graph_full:
+                if cursors == self._graph_cursors:
+                    return graph
+                since: dict[str, str | None] | None = self._graph_cursors
+            else:
+                graph, since = CableGraph(), None
+            await self._load_graph(session, graph, since)
+        self._graph, self._graph_full, self._graph_cursors = graph, full, cursors
+        return graph
+
+    async def _load_graph(
+        self, session: AsyncSession, graph: CableGraph, since: dict[str, str | None] | None
+    ) -> None:
+        def changed(model: Any, resource: str) -> Select[Any]:
+            stmt = select(model)
+            cursor = (since or {}).get(resource)
+            if cursor:
+                stmt = stmt.where(model.last_updated >= cursor)
+            return stmt
+
+        for port in (await session.execute(changed(MirrorFrontPort, "front_ports"))).scalars():
+            graph.set_front_port(
+                port.id, port.device_name, port.name, port.rear_port_id, port.rear_port_position, port.cable_id
+            )
+        for kind, model, resource in (
+            ("rearport", MirrorRearPort, "rear_ports"),
+            ("interface", MirrorInterface, "interfaces"),
+        ):
+            for port in (await session.execute(changed(model, resource))).scalars():
+                graph.set_port(kind, port.id, port.device_name, port.name, port.cable_id)
+        cables = {c.id: c.label for c in (await session.execute(changed(MirrorCable, "cables"))).scalars()}
+        ids = sorted(cables)
+        ends: dict[int, dict[str, list]] = {cable_id: {"A": [], "B": []} for cable_id in ids}
+        for start in range(0, len(ids), 500):
+            rows = await session.execute(
+                select(MirrorCableTermination).where(MirrorCableTermination.cable_id.in_(ids[start : start + 500]))
+            )
+            for term in rows.scalars():
+                ends[term.cable_id][term.side].append((kind_from_object_type(term.object_type), term.object_id))
+        for cable_id in ids:
+            graph.set_cable(cable_id, cables[cable_id], ends[cable_id]["A"], ends[cable_id]["B"])
+
+    async def status(self) -> dict:
+        """Row counts and per-resource cursor / last sync time (mirror lag)."""
+        await self.init()
+        out: dict = {"resources": {}}
+        async with self._sessions() as session:
+            for resource, _, model, _ in RESOURCES:
+                count = (await session.execute(select(func.count()).select_from(model))).scalar_one()
+                state = await session.get(MirrorSyncState, resource)
+                out["resources"][resource] = {
+                    "rows": count,
+                    "cursor": state.cursor if state else None,
+                    "synced_at": state.synced_at.isoformat() if state and state.synced_at else None,
+                    "full_synced_at": (
+                        state.full_synced_at.isoformat() if state and state.full_synced_at else None
+                    ),
+                }
+        return out
+
+
+_mirrors: dict[str, tuple[asyncio.AbstractEventLoop, CMDBMirror]] = {}
+
+
+def get_cmdb_mirror(database_url: str | None = None) -> CMDBMirror:
+    """Shared mirror for CMDB_MIRROR_URL (or database_url) on the running event loop."""
+    if database_url is None:
+        from packages.core.config import get_settings
+
+        database_url = get_settings().cmdb_mirror_url
+    loop = asyncio.get_running_loop()
+    cached = _mirrors.get(database_url)
+    if cached is not None and cached[0] is loop:
+        return cached[1]
+    mirror = CMDBMirror(database_url)
+    _mirrors[database_url] = (loop, mirror)
+    return mirror
@@ -2,22 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from functools import lru_cache
+import logging
+import random
+import time
 from pathlib import Path
+from typing import Any
 
 import httpx
 
+from packages.core.metrics import LatencyRecorder, note_cache_lookup
 from packages.core.models.legacy import ValidationResult
+from services.mcp_netbox.src.cable_graph import CableGraph, NodeKey, kind_from_object_type
+from services.mcp_netbox.src.cache import CMDBCache, MemoryCMDBCache, device_key, port_key
+from services.mcp_netbox.src.topology import TopologyIndex, lookup_result, port_name_candidates
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS = frozenset({429, 502, 503, 504})
+PAGE_SIZE = 1000
+# Ports per front-ports query when resolving many ports on one panel (3 name aliases each).
+PORTS_PER_QUERY = 50
+
+# Per-endpoint request latency for the async client (e.g. "GET dcim/front-ports").
+NETBOX_LATENCY = LatencyRecorder()
+
+
+class GraphQLQueryRejected(ValueError):
+    """NetBox refused the lookup query itself (unknown field, filter or argument)."""
+
+
+# TTL cache for the blocking helpers. Keys start with the shared cache's device_key /
+# port_key, so a webhook drops the same panels from both.
+_blocking_cache = MemoryCMDBCache(ttl=300.0, negative_ttl=30.0)
 
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[3]
 
 
-@lru_cache(maxsize=256)
 def _get_device_id(base_url: str, token: str, panel_id: str) -> int | None:
     """Cache device lookup by name."""
+    key = f"{device_key(panel_id)}{base_url}"
+    hit, cached = _blocking_cache.lookup(key)
+    if hit:
+        return cached
     headers = {"Authorization": f"Token {token}"} if token else {}
     r = httpx.get(
         f"{base_url.rstrip('/')}/api/dcim/devices/",
@@ -28,12 +58,25 @@ def _get_device_id(base_url: str, token: str, panel_id: str) -> int | None:
     r.raise_for_status()
     data = r.json()
     results = data.get("results", [])
-    return results[0]["id"] if results else None
+    device_id = results[0]["id"] if results else None
+    _blocking_cache.store(key, device_id)
+    return device_id
 
 
-@lru_cache(maxsize=512)
-def _get_front_port_cable(base_url: str, token: str, device_id: int, port_label: str) -> dict | None:
+def _get_front_port_cable(
+    base_url: str, token: str, panel_id: str, device_id: int, port_label: str
+) -> dict | None:
     """Cache front port + cable lookup."""
+    key = f"{port_key(panel_id, port_label)}|{base_url}"
+    hit, cached = _blocking_cache.lookup(key)
+    if hit:
+        return cached
+    cable = _fetch_front_port_cable(base_url, token, device_id, port_label)
+    _blocking_cache.store(key, cable)
+    return cable
+
+
+def _fetch_front_port_cable(base_url: str, token: str, device_id: int, port_label: str) -> dict | None:
     headers = {"Authorization": f"Token {token}"} if token else {}
     r = httpx.get(
         f"{base_url.rstrip('/')}/api/dcim/front-ports/",
@@ -89,6 +132,18 @@ def get_expected_mapping_netbox(change_id: str, base_url: str, token: str) -> di
     return {"allowed_endpoints": [], "default": {}}
 
 
+async def _validate_in_mirror(
+    mirror_url: str, change_id: str, panel_id: str, port_label: str, cable_tag: str
+) -> ValidationResult:
+    from services.mcp_netbox.src.mirror import CMDBMirror
+
+    mirror = CMDBMirror(mirror_url)
+    try:
+        return await mirror.validate_observed(change_id, panel_id, port_label, cable_tag)
+    finally:
+        await mirror.close()
+
+
 def validate_observed_netbox(
     change_id: str,
     panel_id: str,
@@ -96,8 +151,15 @@ def validate_observed_netbox(
     cable_tag: str,
     base_url: str,
     token: str,
+    mirror_url: str | None = None,
 ) -> ValidationResult:
-    """Validate observed against NetBox: device -> front port -> cable label."""
+    """Validate observed against NetBox: device -> front port -> cable label.
+
+    Blocking variant kept for scripts; services use AsyncNetBoxClient. With
+    mirror_url the lookup runs against the local CMDB mirror instead of NetBox.
+    """
+    if mirror_url:
+        return asyncio.run(_validate_in_mirror(mirror_url, change_id, panel_id, port_label, cable_tag))
     device_id = _get_device_id(base_url, token, panel_id)
     if not device_id:
         return ValidationResult(
@@ -105,7 +167,7 @@ def validate_observed_netbox(
             reason=f"Device '{panel_id}' not found in NetBox",
             confidence=0.0,
         )
-    cable_data = _get_front_port_cable(base_url, token, device_id, port_label)
+    cable_data = _get_front_port_cable(base_url, token, panel_id, device_id, port_label)
     if not cable_data:
         return ValidationResult(
             match=False,
@@ -120,3 +182,451 @@ def validate_observed_netbox(
         reason=f"Expected cable label '{nb_label}' but observed '{cable_tag}'",
         confidence=0.99,
     )
+
+
+class AsyncNetBoxClient:
+    """Non-blocking NetBox client with a shared keep-alive connection pool.
+
+    A validation is normally one request: front ports are filtered by device name
+    with all alternate port names in a single multi-value query, and the cable label
+    is read from the nested cable object when NetBox includes it. Device and cable
+    lookups only happen on the miss / older-API paths. With lookup="graphql" the
+    whole chain, for any number of ports, is one GraphQL query. Transport errors
+    and 429/502/503/504 responses are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str = "",
+        *,
+        timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.2,
+        max_connections: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+        recorder: LatencyRecorder | None = None,
+        cache: CMDBCache | None = None,
+        lookup: str = "rest",
+        path_ttl: float | None = 300.0,
+    ) -> None:
+        headers = {"Authorization": f"Token {token}"} if token else {}
+        headers["Accept"] = "application/json"
+        self._client = httpx.AsyncClient(
+            base_url=f"{base_url.rstrip('/')}/api/",
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+        )
+        self._retries = retries
+        self._backoff = backoff
+        self._recorder = recorder or NETBOX_LATENCY
+        # None disables caching (every lookup goes to NetBox).
+        self._cache = cache
+        # "graphql" resolves device -> front port -> cable in one POST, falling back to REST.
+        self._lookup = lookup
+        self._graphql_url = f"{base_url.rstrip('/')}/graphql/"
+        # Cable paths traced so far; webhooks invalidate them, path_ttl bounds staleness.
+        self.graph = CableGraph(ttl=path_ttl)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, url: str, metric: str, **kwargs: Any) -> httpx.Response:
+        for attempt in range(self._retries + 1):
+            start = time.perf_counter()
+            try:
+                resp = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self._recorder.record(metric, time.perf_counter() - start, ok=False)
+                if attempt >= self._retries:
+                    raise
+            else:
+                retryable = resp.status_code in RETRY_STATUS
+                self._recorder.record(metric, time.perf_counter() - start, ok=not retryable)
+                if not retryable or attempt >= self._retries:
+                    return resp
+            await asyncio.sleep(random.uniform(0, self._backoff * (2**attempt)))
+        raise AssertionError("unreachable")
+
+    async def _get(self, endpoint: str, params: dict | list | None = None) -> httpx.Response:
+        # Metric key is the collection ("GET dcim/cables"), not the per-object URL.
+        metric = "GET " + "/".join(endpoint.strip("/").split("/")[:2])
+        return await self._request("GET", endpoint, metric, params=params)
+
+    async def list_all(self, endpoint: str, params: list[tuple[str, str]]) -> list[dict]:
+        """All results of a list endpoint, paging with limit/offset."""
+        results: list[dict] = []
+        while True:
+            page = params + [("limit", str(PAGE_SIZE)), ("offset", str(len(results)))]
+            r = await self._get(endpoint, params=page)
+            r.raise_for_status()
+            data = r.json()
+            batch = data.get("results", [])
+            results.extend(batch)
+            if not data.get("next") or not batch:
+                return results
+
+    async def get_device_id(self, panel_id: str) -> int | None:
+        if self._cache is not None:
+            hit, cached = await self._cache.get(device_key(panel_id))
+            if hit:
+                return cached
+        r = await self._get("dcim/devices/", params={"name": panel_id})
+        r.raise_for_status()
+        results = r.json().get("results", [])
+        device_id = results[0]["id"] if results else None
+        if self._cache is not None:
+            await self._cache.set(device_key(panel_id), device_id)
+        return device_id
+
+    async def get_front_port(self, panel_id: str, port_label: str) -> dict | None:
+        """Front port on device panel_id matching port_label or its P/p-prefixed alias."""
+        candidates = port_name_candidates(port_label)
+        params = [("device", panel_id)] + [("name", name) for name in candidates]
+        r = await self._get("dcim/front-ports/", params=params)
+        r.raise_for_status()
+        by_name = {port.get("name"): port for port in r.json().get("results", [])}
+        return _pick_port(by_name, port_label)
+
+    async def get_cable(self, port: dict) -> dict | None:
+        cable = port.get("cable")
+        if not cable:
+            return None
+        if isinstance(cable, dict):
+            if "label" in cable:
+                return cable
+            cable = cable.get("id")
+        r = await self._get(f"dcim/cables/{cable}/")
+        if r.status_code != 200:
+            return None
+        return r.json()
+
+    async def lookup_port_cable(self, panel_id: str, port_label: str) -> tuple[bool, dict | None]:
+        """(device exists, cable {id, label} or None), cached per panel/port.
+
+        Results without a cable are cached with the negative TTL.
+        """
+        found = await self.lookup_many([(panel_id, port_label)])
+        return found[(panel_id, port_label)]
+
+    async def lookup_many(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], tuple[bool, dict | None]]:
+        """lookup_port_cable for several (panel, port) pairs.
+
+        Cache misses share one GraphQL query, or with REST one front-ports query
+        per panel (panels resolved concurrently).
+        """
+        out: dict[tuple[str, str], tuple[bool, dict | None]] = {}
+        misses: list[tuple[str, str]] = []
+        for pair in dict.fromkeys(pairs):
+            if self._cache is not None:
+                hit, cached = await self._cache.get(port_key(*pair))
+                if hit:
+                    out[pair] = (cached["device"], cached["cable"])
+                    continue
+            misses.append(pair)
+        if not misses:
+            return out
+
+        resolved: dict[tuple[str, str], tuple[bool, dict | None]] | None = None
+        if self._lookup == "graphql":
+            try:
+                resolved = await self._graphql_lookup(misses)
+            except GraphQLQueryRejected as exc:
+                # Schema mismatch (e.g. older NetBox filter syntax) will not fix itself.
+                logger.warning("NetBox GraphQL query rejected (%s); using REST from now on", exc)
+                self._lookup = "rest"
+            except (httpx.HTTPError, ValueError, KeyError, TypeError) as exc:
+                logger.warning("NetBox GraphQL lookup failed (%s); using REST for this call", exc)
+        if resolved is None:
+            by_panel: dict[str, list[str]] = {}
+            for panel, port in misses:
+                by_panel.setdefault(panel, []).append(port)
+            panels = await asyncio.gather(
+                *(self._rest_lookup_panel(panel, ports) for panel, ports in by_panel.items())
+            )
+            resolved = {
+                (panel, port): result
+                for panel, per_port in zip(by_panel, panels, strict=True)
+                for port, result in per_port.items()
+            }
+
+        for pair, (found, cable) in resolved.items():
+            if self._cache is not None:
+                await self._cache.set(
+                    port_key(*pair), {"device": found, "cable": cable}, negative=cable is None
+                )
+            out[pair] = (found, cable)
+        return out
+
+    async def _rest_lookup_panel(
+        self, panel_id: str, port_labels: list[str]
+    ) -> dict[str, tuple[bool, dict | None]]:
+        """Resolve many ports on one panel: the device is looked up at most once."""
+        by_name: dict[str, dict] = {}
+        for start in range(0, len(port_labels), PORTS_PER_QUERY):
+            chunk = port_labels[start : start + PORTS_PER_QUERY]
+            names = dict.fromkeys(name for label in chunk for name in port_name_candidates(label))
+            rows = await self.list_all(
+                "dcim/front-ports/", [("device", panel_id)] + [("name", n) for n in names]
+            )
+            by_name.update((row["name"], row) for row in rows if row.get("name"))
+        ports = {label: port for label in port_labels if (port := _pick_port(by_name, label))}
+        found = bool(ports) or await self.get_device_id(panel_id) is not None
+        cables = await asyncio.gather(*(self.get_cable(port) for port in ports.values()))
+        by_label = dict(zip(ports, cables, strict=True))
+        out: dict[str, tuple[bool, dict | None]] = {}
+        for label in port_labels:
+            cable = by_label.get(label)
+            out[label] = (found, {"id": cable.get("id"), "label": cable.get("label")} if cable else None)
+        return out
+
+    async def _graphql_lookup(
+        self, pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], tuple[bool, dict | None]]:
+        """Resolve every pair in one GraphQL request (aliases per panel and per port)."""
+        panels = sorted({panel for panel, _ in pairs})
+        variables: dict[str, object] = {}
+        declarations: list[str] = []
+        fields: list[str] = []
+        for i, panel in enumerate(panels):
+            variables[f"d{i}"] = panel
+            declarations.append(f"$d{i}: String!")
+            fields.append(f"d{i}: device_list(filters: {{name: {{exact: $d{i}}}}}) {{ id }}")
+        for j, (panel, port_label) in enumerate(pairs):
+            i = panels.index(panel)
+            variables[f"n{j}"] = port_name_candidates(port_label)
+            declarations.append(f"$n{j}: [String!]!")
+            fields.append(
+                f"p{j}: front_port_list(filters: {{device: {{name: {{exact: $d{i}}}}}, "
+                f"name: {{in_list: $n{j}}}}}) {{ name cable {{ id label }} }}"
+            )
+        query = f"query({', '.join(declarations)}) {{ {' '.join(fields)} }}"
+        r = await self._request(
+            "POST", self._graphql_url, "POST graphql", json={"query": query, "variables": variables}
+        )
+        if r.status_code != 400:
+            r.raise_for_status()
+        body = r.json()
+        errors = body.get("errors") if isinstance(body, dict) else None
+        if errors:
+            message = errors[0].get("message", "GraphQL error")
+            # Validation errors come without data or a field path; execution errors
+            # (permissions, timeouts, a bad row) carry one and may not recur.
+            if body.get("data") is None and not any(e.get("path") for e in errors):
+                raise GraphQLQueryRejected(message)
+            raise ValueError(message)
+        r.raise_for_status()
+        data = body["data"]
+
+        out: dict[tuple[str, str], tuple[bool, dict | None]] = {}
+        for j, (panel, port_label) in enumerate(pairs):
+            found = bool(data[f"d{panels.index(panel)}"])
+            by_name = {port["name"]: port for port in data[f"p{j}"]}
+            port = next((by_name[n] for n in port_name_candidates(port_label) if n in by_name), None)
+            cable = port.get("cable") if port else None
+            out[(panel, port_label)] = (
+                found,
+                {"id": int(cable["id"]), "label": cable.get("label")} if cable else None,
+            )
+        return out
+
+    async def get_front_port_cable(self, panel_id: str, port_label: str) -> dict | None:
+        _, cable = await self.lookup_port_cable(panel_id, port_label)
+        return cable
+
+    async def prefetch_topology(self, panel_ids: list[str]) -> TopologyIndex:
+        """Bulk-load devices, front ports and cable labels for the given panels.
+
+        One devices query and one (paged) front-ports query; cables are only
+        fetched, again in one query, for ports whose nested cable lacks a label.
+        """
+        index = TopologyIndex()
+        panels = sorted(set(filter(None, panel_ids)))
+        if not panels:
+            return index
+        devices = await self.list_all("dcim/devices/", [("name", p) for p in panels])
+        index.devices.update(d["name"] for d in devices if d.get("name"))
+        ports = await self.list_all("dcim/front-ports/", [("device", p) for p in index.devices])
+
+        missing_labels = {
+            (port["cable"] if isinstance(port["cable"], int) else port["cable"]["id"])
+            for port in ports
+            if port.get("cable")
+            and not (isinstance(port["cable"], dict) and "label" in port["cable"])
+        }
+        cables: dict[int, dict] = {}
+        if missing_labels:
+            rows = await self.list_all("dcim/cables/", [("id", str(c)) for c in sorted(missing_labels)])
+            cables = {row["id"]: row for row in rows}
+
+        for port in ports:
+            device = port.get("device") or {}
+            panel = device.get("name") if isinstance(device, dict) else None
+            if not panel or not port.get("name"):
+                continue
+            cable = port.get("cable")
+            if isinstance(cable, int):
+                cable = cables.get(cable, {"id": cable})
+            elif cable and "label" not in cable:
+                cable = cables.get(cable["id"], cable)
+            index.add_port(
+                panel,
+                port["name"],
+                {"id": cable.get("id"), "label": cable.get("label")} if cable else None,
+                port.get("id"),
+            )
+        return index
+
+    async def cable_path(self, panel_id: str, port_label: str) -> list[NodeKey] | None:
+        """End-to-end cable path through a front port (None if the port is unknown).
+
+        Served from the graph when cached; otherwise a front-ports/{id}/paths/
+        request (plus a front-port lookup for ports not seen before), whose hops
+        are added to the graph.
+        """
+        start = self.graph.find_port(panel_id, port_label)
+        if start is not None:
+            cached = self.graph.cached_path(start)
+            if cached is not None:
+                self.graph.path_hits += 1
+                note_cache_lookup("cable_path", True)
+                return cached
+        else:
+            port = await self.get_front_port(panel_id, port_label)
+            if port is None:
+                return None
+            start = self.graph.set_node("frontport", port["id"], panel_id, port.get("name") or port_label)
+        self.graph.path_misses += 1
+        note_cache_lookup("cable_path", False)
+        r = await self._get(f"dcim/front-ports/{start[1]}/paths/")
+        r.raise_for_status()
+        data = r.json()
+        return self.graph.add_netbox_paths(start, data if isinstance(data, list) else data.get("results", []))
+
+    async def confirm_port_cable(self, port_id: int) -> dict | None:
+        """Cable {id, label} on a front port now (freshness check), None if the port or cable is gone.
+
+        Re-reading the port rather than the cable also catches a cable moved to
+        another port and a different cable patched into this one.
+        """
+        r = await self._get(f"dcim/front-ports/{port_id}/")
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        cable = await self.get_cable(r.json())
+        return {"id": cable.get("id"), "label": cable.get("label")} if cable else None
+
+    async def validate_observed(
+        self, change_id: str, panel_id: str, port_label: str, cable_tag: str
+    ) -> ValidationResult:
+        """Validate observed against NetBox: front port on device -> cable label."""
+        found, cable_data = await self.lookup_port_cable(panel_id, port_label)
+        return lookup_result(panel_id, port_label, cable_tag, found, cable_data)
+
+
+def _pick_port(by_name: dict[str, dict], port_label: str) -> dict | None:
+    """First front port (exact name, then P/p alias) present in by_name."""
+    for name in port_name_candidates(port_label):
+        if name in by_name:
+            return by_name[name]
+    return None
+
+
+_async_clients: dict[tuple[str, str], tuple[asyncio.AbstractEventLoop, AsyncNetBoxClient]] = {}
+_closing: set[asyncio.Future] = set()
+
+
+async def _close_quietly(client: AsyncNetBoxClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as exc:  # its loop is gone; the sockets go with it
+        logger.debug("closing stale NetBox client failed: %s", exc)
+
+
+def _retire(loop: asyncio.AbstractEventLoop, client: AsyncNetBoxClient) -> None:
+    """Close a client left by another event loop: on that loop if it still runs, else here."""
+    if loop.is_running():
+        future: asyncio.Future = asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+        )
+    else:
+        future = asyncio.ensure_future(_close_quietly(client))
+    _closing.add(future)
+    future.add_done_callback(_closing.discard)
+
+
+def get_async_netbox_client(base_url: str, token: str) -> AsyncNetBoxClient:
+    """Shared client per NetBox URL/token for the running event loop."""
+    from packages.core.config import get_settings
+    from services.mcp_netbox.src.cache import get_cmdb_cache
+
+    loop = asyncio.get_running_loop()
+    key = (base_url, token)
+    cached = _async_clients.get(key)
+    if cached is not None and cached[0] is loop:
+        return cached[1]
+    if cached is not None:
+        _retire(*cached)
+    settings = get_settings()
+    client = AsyncNetBoxClient(
+        base_url,
+        token,
+        timeout=settings.netbox_timeout,
+        retries=settings.netbox_retries,
+        max_connections=settings.netbox_max_connections,
+        cache=get_cmdb_cache(),
+        lookup=settings.netbox_lookup,
+        path_ttl=settings.cmdb_cache_ttl,
+    )
+    _async_clients[key] = (loop, client)
+    return client
+
+
+async def invalidate_cmdb_cache(prefixes: list[str] | None, shared: bool = True) -> int:
+    """Apply a NetBox change notification to the lookup and blocking caches.
+
+    shared=False leaves a shared (redis) cache alone: the process that received
+    the webhook has already invalidated it for everyone.
+    """
+    from services.mcp_netbox.src.cache import get_cmdb_cache
+
+    _blocking_cache.drop_prefixes(prefixes)
+    cache = get_cmdb_cache()
+    if not shared and cache.backend != "memory":
+        return 0
+    return await cache.invalidate(prefixes)
+
+
+def invalidate_cable_paths(payload: dict) -> int:
+    """Drop traced cable paths a NetBox webhook touches; returns the number of graphs updated."""
+    model = payload.get("model")
+    data = payload.get("data") or {}
+    graphs = [client.graph for _, client in _async_clients.values()]
+    for graph in graphs:
+        if model == "cable" and data.get("id") is not None:
+            graph.invalidate(("cable", data["id"]))
+            snapshot = (payload.get("snapshots") or {}).get("prechange") or {}
+            for source in (data, snapshot):
+                for side in ("a_terminations", "b_terminations"):
+                    for term in source.get(side) or []:
+                        if term.get("object_type") and term.get("object_id") is not None:
+                            graph.invalidate((kind_from_object_type(term["object_type"]), term["object_id"]))
+        elif model in ("frontport", "rearport", "interface") and data.get("id") is not None:
+            graph.invalidate((model, data["id"]))
+        else:
+            for start in list(graph.nodes):
+                graph.invalidate(start)
+    return len(graphs)
+
+
+async def close_async_netbox_clients() -> None:
+    clients = [client for _, client in _async_clients.values()]
+    _async_clients.clear()
+    for client in clients:
+        await client.aclose()
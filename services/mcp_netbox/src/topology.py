@@ -0,0 +1,128 @@
+"""Change-scoped in-memory index of NetBox panels, front ports and cable labels.
+
+Built once per change by the prefetch activity so that validate_observed can be
+answered without a NetBox round trip. The index lives in the worker process; a
+validation that lands on another worker (or after eviction) falls back to the
+live client.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from packages.core.models.legacy import ValidationResult
+
+MAX_INDEXES = 128
+
+
+def port_name_candidates(port_label: str) -> list[str]:
+    """Front-port names to try, in priority order (exact, then P24 / p24 styles)."""
+    return list(dict.fromkeys([port_label, "P" + port_label, "p" + port_label]))
+
+
+def lookup_result(
+    panel_id: str, port_label: str, cable_tag: str, device_found: bool, cable: dict | None
+) -> ValidationResult:
+    """ValidationResult for an observed cable tag given what NetBox (or a copy of it) holds."""
+    if not device_found:
+        return ValidationResult(
+            match=False,
+            reason=f"Device '{panel_id}' not found in NetBox",
+            confidence=0.0,
+        )
+    if not cable:
+        return ValidationResult(
+            match=False,
+            reason=f"Port '{port_label}' on {panel_id} not found or has no cable",
+            confidence=0.0,
+        )
+    nb_label = cable.get("label") or ""
+    if nb_label == cable_tag:
+        return ValidationResult(match=True, reason="Cable label matches NetBox.", confidence=0.99)
+    return ValidationResult(
+        match=False,
+        reason=f"Expected cable label '{nb_label}' but observed '{cable_tag}'",
+        confidence=0.99,
+    )
+
+
+@dataclass(eq=False)
+class TopologyIndex:
+    """Devices and front ports (panel, port name) -> cable {id, label} for one change."""
+
+    devices: set[str] = field(default_factory=set)
+    # None marks a port that exists but has no cable.
+    ports: dict[tuple[str, str], dict | None] = field(default_factory=dict)
+    # NetBox front-port ids, for re-reading a port before trusting its cable.
+    port_ids: dict[tuple[str, str], int] = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+
+    def add_port(
+        self, panel_id: str, name: str, cable: dict | None, port_id: int | None = None
+    ) -> None:
+        self.devices.add(panel_id)
+        self.ports[(panel_id, name)] = cable
+        if port_id is not None:
+            self.port_ids[(panel_id, name)] = port_id
+
+    def _port_key(self, panel_id: str, port_label: str) -> tuple[str, str] | None:
+        for name in port_name_candidates(port_label):
+            if (panel_id, name) in self.ports:
+                return (panel_id, name)
+        return None
+
+    def cable_for(self, panel_id: str, port_label: str) -> tuple[bool, dict | None]:
+        """(port found, cable) for the first matching candidate port name."""
+        key = self._port_key(panel_id, port_label)
+        return (True, self.ports[key]) if key else (False, None)
+
+    def port_id_for(self, panel_id: str, port_label: str) -> int | None:
+        """NetBox id of the front port cable_for() answers from, if known."""
+        key = self._port_key(panel_id, port_label)
+        return self.port_ids.get(key) if key else None
+
+    def validate(self, panel_id: str, port_label: str, cable_tag: str) -> ValidationResult | None:
+        """Answer locally, or None when the panel was not prefetched."""
+        if panel_id not in self.devices:
+            return None
+        _, cable = self.cable_for(panel_id, port_label)
+        return lookup_result(panel_id, port_label, cable_tag, True, cable)
+
+    def stats(self) -> dict:
+        return {
+            "devices": len(self.devices),
+            "ports": len(self.ports),
+            "cabled_ports": sum(1 for cable in self.ports.values() if cable),
+        }
+
+
+_indexes: OrderedDict[str, TopologyIndex] = OrderedDict()
+
+
+def put_index(change_id: str, index: TopologyIndex) -> None:
+    _indexes[change_id] = index
+    _indexes.move_to_end(change_id)
+    while len(_indexes) > MAX_INDEXES:
+        _indexes.popitem(last=False)
+
+
+def get_index(change_id: str) -> TopologyIndex | None:
+    return _indexes.get(change_id)
+
+
+def drop_index(change_id: str) -> None:
+    _indexes.pop(change_id, None)
+
+
+def drop_indexes_for(panels: set[str] | None) -> int:
+    """Drop the indexes holding any of panels (all of them for None); returns how many."""
+    doomed = [
+        change_id
+        for change_id, index in _indexes.items()
+        if panels is None or index.devices & panels
+    ]
+    for change_id in doomed:
+        del _indexes[change_id]
+    return len(doomed)
@@ -24,9 +24,9 @@ class TicketingAdapter:
             # Example: POST /api/now/table/incident with change_id + summary
             raise NotImplementedError("Real ticketing backend not yet wired.")
 
-        from services.mcp_ticketing.handlers import TicketingHandlers
+        from services.registry import get_registry
 
-        handlers = TicketingHandlers()
+        handlers = get_registry().ticketing()
         result = await handlers.post_step_result(
             change_id=change_id,
             step_id="ticket",
@@ -42,9 +42,9 @@ class TicketingAdapter:
             # Example: PATCH /api/now/table/incident/{ticket_id}
             raise NotImplementedError("Real ticketing backend not yet wired.")
 
-        from services.mcp_ticketing.handlers import TicketingHandlers
+        from services.registry import get_registry
 
-        handlers = TicketingHandlers()
+        handlers = get_registry().ticketing()
         change_id = ticket_id.removeprefix("TKT-") if ticket_id.startswith("TKT-") else ticket_id
         await handlers.post_step_result(
             change_id=change_id,
@@ -57,9 +57,9 @@ class TicketingAdapter:
     # --- MCPToolRouter-compatible async methods ---
 
     async def get_change(self, change_id: str) -> object:
-        from services.mcp_ticketing.handlers import TicketingHandlers
+        from services.registry import get_registry
 
-        return await TicketingHandlers().get_change(change_id)
+        return await get_registry().ticketing().get_change(change_id)
 
     async def post_step_result(
         self,
@@ -69,9 +69,9 @@ class TicketingAdapter:
         evidence_refs: list[dict] | None = None,
         notes: str | None = None,
     ) -> dict:
-        from services.mcp_ticketing.handlers import TicketingHandlers
+        from services.registry import get_registry
 
-        return await TicketingHandlers().post_step_result(
+        return await get_registry().ticketing().post_step_result(
             change_id=change_id,
             step_id=step_id,
             status=status,
@@ -87,9 +87,9 @@ class TicketingAdapter:
         evidence_ids: list[str] | None = None,
         escalation_text: str | None = None,
     ) -> dict:
-        from services.mcp_ticketing.handlers import TicketingHandlers
+        from services.registry import get_registry
 
-        return await TicketingHandlers().request_approval(
+        return await get_registry().ticketing().request_approval(
             change_id=change_id,
             step_id=step_id,
             reason=reason,
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from services.common import setup_stderr_logging
-from services.mcp_ticketing.handlers import TicketingHandlers
+from services.common import add_batch_tool, server_transport, setup_stderr_logging
+from services.registry import get_registry
 
 logger = setup_stderr_logging("mcp_ticketing")
-handlers = TicketingHandlers()
+handlers = get_registry().ticketing()
 
 
 def build_server():
@@ -49,8 +49,19 @@ def build_server():
             evidence_ids=evidence_ids,
         )
 
+    add_batch_tool(
+        server,
+        "ticketing.batch",
+        {
+            "ticketing.get_change": get_change,
+            "ticketing.post_step_result": post_step_result,
+            "ticketing.request_approval": request_approval,
+        },
+    )
+
     return server
 
 
 if __name__ == "__main__":
-    build_server().run()
+    get_registry().warm(["ticketing"])
+    build_server().run(transport=server_transport())
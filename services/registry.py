@@ -0,0 +1,133 @@
+"""Process-wide registry of MCP service handlers.
+
+Handlers own state that is costly to rebuild per call: the CV handlers' OCR
+backend and fixture outputs, and the caches behind the NetBox handlers. The
+registry builds each handler once per configuration and hands the same
+instance to adapters, the tool router, worker activities and MCP servers.
+warm() builds the defaults at startup; reload() drops them so the next call
+rebuilds from current settings and fixtures.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from services.mcp_camera.handlers import CameraHandlers
+from services.mcp_cv.handlers import CVHandlers
+from services.mcp_netbox.handlers import NetboxHandlers
+from services.mcp_ticketing.handlers import TicketingHandlers
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("camera", "cv", "netbox", "ticketing")
+
+
+class HandlerRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._handlers: dict[tuple, Any] = {}
+        self.builds: dict[str, int] = dict.fromkeys(KINDS, 0)
+
+    def _get(self, key: tuple, factory: Callable[[], Any]) -> Any:
+        handler = self._handlers.get(key)
+        if handler is not None:
+            return handler
+        with self._lock:
+            handler = self._handlers.get(key)
+            if handler is None:
+                handler = factory()
+                self._handlers[key] = handler
+                self.builds[key[0]] += 1
+        return handler
+
+    def cv(self, cv_mode: str | None = None) -> CVHandlers:
+        """CV handlers for a mode (CV_MODE by default), shared by every scenario.
+
+        Callers pass the scenario per call; the handler's default is SCENARIO.
+        """
+        from packages.core.config import get_settings
+
+        settings = get_settings()
+        mode = (cv_mode or settings.cv_mode).lower()
+        return self._get(("cv", mode), lambda: CVHandlers(cv_mode=mode, scenario=settings.scenario))
+
+    def netbox(self) -> NetboxHandlers:
+        return self._get(("netbox",), NetboxHandlers)
+
+    def ticketing(self) -> TicketingHandlers:
+        return self._get(("ticketing",), TicketingHandlers)
+
+    def camera(self) -> CameraHandlers:
+        from packages.core.config import get_settings
+        from packages.core.spool import get_evidence_spool
+
+        # Shares the spool the CV handlers resolve evidence handles against.
+        return self._get(
+            ("camera",),
+            lambda: CameraHandlers(get_settings().local_evidence_dir, spool=get_evidence_spool()),
+        )
+
+    def warm(self, kinds: Iterable[str] = KINDS) -> dict[str, int]:
+        """Build the default handlers and their backends now rather than on first call.
+
+        For CV that is the OCR backend and the scenario's fixture outputs; for
+        NetBox the CMDB cache (NETBOX_MODE=netbox) or the expected-mapping
+        indexes (mock). Returns builds per kind so far.
+        """
+        from packages.core.config import get_settings
+
+        settings = get_settings()
+        kinds = set(kinds)
+        if "cv" in kinds:
+            self.cv().warm()
+        if "netbox" in kinds:
+            self.netbox()
+            if settings.netbox_mode == "netbox":
+                from services.mcp_netbox.src.cache import get_cmdb_cache
+
+                get_cmdb_cache()
+            else:
+                _warm_mapping_indexes()
+        if "ticketing" in kinds:
+            self.ticketing()
+        if "camera" in kinds:
+            self.camera()
+        return dict(self.builds)
+
+    def reload(self, kind: str | None = None) -> None:
+        """Drop handlers (all, or one kind); they are rebuilt on next use.
+
+        Also forgets compiled expected-mapping indexes when NetBox handlers
+        are reloaded, so edited fixtures are re-read.
+        """
+        with self._lock:
+            for key in [k for k in self._handlers if kind is None or k[0] == kind]:
+                del self._handlers[key]
+        if kind in (None, "netbox"):
+            from packages.core.fixtures.mapping_index import clear_mapping_indexes
+
+            clear_mapping_indexes()
+        logger.info("handler registry reloaded (%s)", kind or "all")
+
+
+def _warm_mapping_indexes() -> None:
+    from packages.core.fixtures.mapping_index import get_mapping_index
+
+    scenarios = Path(__file__).resolve().parents[1] / "samples" / "scenarios"
+    for path in sorted(scenarios.glob("*/netbox_expected_mapping.json")):
+        get_mapping_index(path.parent.name)
+
+
+_registry: HandlerRegistry | None = None
+
+
+def get_registry() -> HandlerRegistry:
+    """The process-wide handler registry."""
+    global _registry
+    if _registry is None:
+        _registry = HandlerRegistry()
+    return _registry
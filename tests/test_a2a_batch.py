@@ -0,0 +1,107 @@
+"""A2A batch endpoint: per-message status, size limit, client chunking and MOP prompt batches."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from apps.worker import activities_execution
+from packages.a2a import cache as cache_mod
+from packages.a2a import client as client_mod
+from packages.a2a.client import A2AClient, get_a2a_client
+from packages.a2a.schema import MAX_BATCH_MESSAGES
+from packages.core.config import get_settings
+from packages.core.runtime import get_step_prompt
+from services.a2a_mop_agent.server import app as mop_app
+from services.a2a_vision_agent.server import app as vision_app
+
+
+def _step(step_id: str) -> dict:
+    return {
+        "step_id": step_id,
+        "description": f"Verify port {step_id}",
+        "step_type": "port_verify",
+        "evidence": {"kind": "photo", "count": 1},
+        "verify": {"requires_port_label": True, "requires_cable_tag": True, "min_confidence": 0.75},
+        "approval": None,
+    }
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, app: FastAPI) -> None:
+        self._inner = httpx.ASGITransport(app=app)
+        self.paths: list[str] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        return await self._inner.handle_async_request(request)
+
+
+def test_batch_reports_status_per_message() -> None:
+    client = TestClient(vision_app)
+    good = {"message_id": "m1", "agent": "vision", "input": {"step_def": _step("S1")}}
+    bad = {"message_id": "m2", "agent": "vision", "input": {"step_def": {"step_id": "S2"}}}
+    resp = client.post("/a2a/message/batch", json={"messages": [good, bad]})
+    assert resp.status_code == 200
+    first, second = resp.json()["responses"]
+    assert (first["message_id"], first["status"]) == ("m1", "ok")
+    assert (second["message_id"], second["status"]) == ("m2", "error")
+    assert second["notes"]
+
+    card = client.get("/a2a/agent-card").json()
+    assert card["endpoints"]["batch"] == "/a2a/message/batch"
+
+
+def test_batch_rejects_too_many_messages() -> None:
+    messages = [{"agent": "mop", "input": {"step_def": _step("S1")}}] * (MAX_BATCH_MESSAGES + 1)
+    resp = TestClient(mop_app).post("/a2a/message/batch", json={"messages": messages})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_send_batch_splits_into_requests_in_order() -> None:
+    transport = CountingTransport(mop_app)
+    client = A2AClient("http://mop", transport=transport)
+    steps = [_step(f"S{i}") for i in range(MAX_BATCH_MESSAGES + 3)]
+    responses = await client.send_batch("mop", [{"step_def": s} for s in steps])
+    assert transport.paths == ["/a2a/message/batch"] * 2
+    assert [r.output["tech_prompt"].split(".")[0] for r in responses] == [s["description"] for s in steps]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_send_batch_rejects_a_short_reply() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"responses": [{"message_id": "m1", "status": "ok"}]})
+
+    client = A2AClient("http://mop", transport=httpx.MockTransport(handler))
+    with pytest.raises(RuntimeError, match="1 responses for 2 messages"):
+        await client.send_batch("mop", [{"step_def": _step("S1")}, {"step_def": _step("S2")}])
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_mop_prompts_for_a_change_take_one_request(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("INFRASENTINEL_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("A2A_MODE", "http")
+    monkeypatch.setenv("A2A_MOP_URL", "http://mop")
+    monkeypatch.setattr(client_mod, "_async_clients", {})
+    monkeypatch.setattr(cache_mod, "_cache", cache_mod.AdviceCache())
+    get_settings.cache_clear()
+    try:
+        transport = CountingTransport(mop_app)
+        get_a2a_client("http://mop")._transport = transport
+        steps = [_step("S1"), _step("S2"), _step("S3")]
+        prompts = await activities_execution.activity_get_mop_prompts("CHG-009", steps)
+        assert transport.paths == ["/a2a/message/batch"]
+        assert list(prompts) == ["S1", "S2", "S3"]
+        assert get_step_prompt("CHG-009", "S2") == prompts["S2"]
+        await client_mod.close_a2a_clients()
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,177 @@
+"""Pooled A2A client: backoff retries, deadline, circuit breaker and local fallback."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from apps.worker import activities_execution
+from packages.a2a import cache as cache_mod
+from packages.a2a import client as client_mod
+from packages.a2a.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from packages.a2a.client import A2AClient, get_a2a_client
+from packages.core.config import get_settings
+
+STEP = {
+    "step_id": "S1",
+    "description": "Verify",
+    "step_type": "port_verify",
+    "evidence": {"kind": "photo", "count": 1},
+    "verify": {"requires_port_label": True, "requires_cable_tag": True, "min_confidence": 0.75},
+    "approval": None,
+}
+
+
+class Agent:
+    """MockTransport handler: fails while `down`, otherwise answers every request."""
+
+    def __init__(self, statuses: list[int] | None = None) -> None:
+        self.statuses = list(statuses or [])
+        self.down = False
+        self.requests: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        if self.down:
+            raise httpx.ConnectError("refused", request=request)
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = {"message_id": "m", "status": "ok", "output": {"guidance": ["remote"]}}
+        return httpx.Response(status, json=body if status == 200 else {"error": "busy"})
+
+
+def _client(agent: Agent, **kwargs: Any) -> A2AClient:
+    kwargs.setdefault("backoff", 0.0)
+    return A2AClient("http://vision", transport=httpx.MockTransport(agent), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_reuses_one_pool_and_retries_busy_responses() -> None:
+    agent = Agent(statuses=[503, 200, 200])
+    client = _client(agent, max_retries=1)
+    first = await client.send_async("vision", {})
+    pool = client._client
+    await client.send_async("vision", {})
+    assert first.output == {"guidance": ["remote"]}
+    assert client._client is pool
+    assert agent.requests == ["/a2a/message/send"] * 3
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_a_hanging_agent() -> None:
+    async def hang(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(5)
+        return httpx.Response(200)
+
+    client = A2AClient("http://vision", deadline=0.05, transport=httpx.MockTransport(hang))
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        await client.send_async("vision", {})
+    assert time.perf_counter() - start < 1.0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_probe_closes_it() -> None:
+    agent = Agent()
+    client = _client(agent, max_retries=0)
+    client.breaker.failure_threshold = 2
+    client.breaker.reset_timeout = 0.01
+    agent.down = True
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await client.send_async("vision", {})
+    assert client.breaker.state == OPEN
+    sent = len(agent.requests)
+    with pytest.raises(CircuitOpenError):
+        await client.send_async("vision", {})
+    await asyncio.sleep(0.03)
+    assert agent.requests[sent:] and set(agent.requests[sent:]) == {"/a2a/agent-card"}
+
+    agent.down = False
+    for _ in range(50):
+        if client.breaker.state == CLOSED:
+            break
+        await asyncio.sleep(0.01)
+    assert client.breaker.state == CLOSED
+    assert (await client.send_async("vision", {})).status == "ok"
+    await client.aclose()
+
+
+def test_breaker_without_probe_lets_one_trial_through() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker("cmdb", failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    now[0] = 10.0
+    assert breaker.state == HALF_OPEN
+    breaker.check()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()  # only one trial at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    now[0] = 20.0
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_vision_advice_uses_local_advice_while_breaker_open(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("A2A_MODE", "http")
+    monkeypatch.setenv("A2A_VISION_URL", "http://vision")
+    monkeypatch.setattr(client_mod, "_async_clients", {})
+    monkeypatch.setattr(cache_mod, "_cache", cache_mod.AdviceCache())
+    get_settings.cache_clear()
+    try:
+        agent = Agent()
+        shared = get_a2a_client("http://vision")
+        assert get_a2a_client("http://vision") is shared
+        shared._transport = httpx.MockTransport(agent)
+        shared.breaker.record_failure()
+        shared.breaker.record_failure()
+        shared.breaker.record_failure()
+        port = {"panel_id": "P1", "port_label": "24", "confidence": 0.9}
+        args = (STEP, None, port, {"cable_tag": "T1", "confidence": 0.9})
+        guidance = await activities_execution.activity_vision_advice(*args)
+        assert guidance != ["remote"]
+        assert "/a2a/message/send" not in agent.requests
+
+        shared.breaker.record_success()
+        assert await activities_execution.activity_vision_advice(*args) == ["remote"]
+        await client_mod.close_a2a_clients()
+    finally:
+        get_settings.cache_clear()
+
+
+def test_client_from_a_finished_loop_is_closed_when_replaced(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(client_mod, "_async_clients", {})
+    get_settings.cache_clear()
+
+    async def shared() -> A2AClient:
+        client = get_a2a_client("http://mop")
+        client._async_client()
+        return client
+
+    async def replace() -> tuple[A2AClient, A2AClient]:
+        client = get_a2a_client("http://mop")
+        await asyncio.gather(*client_mod._closing)
+        return client, get_a2a_client("http://mop")
+
+    try:
+        old = asyncio.run(shared())
+        new, again = asyncio.run(replace())
+        assert new is not old and again is new
+        assert old._client is None
+        asyncio.run(client_mod.close_a2a_clients())
+    finally:
+        get_settings.cache_clear()
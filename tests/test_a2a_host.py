@@ -0,0 +1,89 @@
+"""Combined agent host and in-process dispatch."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.worker import activities_execution
+from packages.a2a import cache as cache_mod
+from packages.a2a.local import AGENTS, LocalA2AClient
+from packages.core.config import get_settings
+from services.a2a_host.server import app as host_app
+
+STEP = {
+    "step_id": "S1",
+    "description": "Verify panel port",
+    "step_type": "port_verify",
+    "evidence": {"kind": "photo", "count": 1},
+    "verify": {"requires_port_label": True, "requires_cable_tag": True, "min_confidence": 0.75},
+    "approval": None,
+}
+CMDB_OUT = {"match": False, "reason": "cable tag mismatch"}
+
+
+def test_host_serves_every_agent_under_one_url() -> None:
+    client = TestClient(host_app)
+    agents = client.get("/a2a/agents").json()
+    assert set(agents) == {"mop", "vision", "cmdb"}
+    assert agents["cmdb"]["endpoints"]["send"] == "/cmdb/a2a/message/send"
+    assert client.get("/a2a/agent-card").json()["name"] == "InfraSentinelAgentHost"
+
+    routed = client.post("/a2a/message/send", json={"agent": "mop", "input": {"step_def": STEP}})
+    prefixed = client.post("/mop/a2a/message/send", json={"agent": "mop", "input": {"step_def": STEP}})
+    assert routed.json()["output"] == prefixed.json()["output"]
+    assert client.get("/vision/a2a/agent-card").json()["name"] == "VisionVerifierAgent"
+
+    unknown = client.post("/a2a/message/send", json={"agent": "nope", "input": {}})
+    assert unknown.status_code == 400
+
+
+def test_host_batch_mixes_agents() -> None:
+    messages = [
+        {"message_id": "1", "agent": "mop", "input": {"step_def": STEP}},
+        {"message_id": "2", "agent": "cmdb", "input": {"step_def": STEP, "cmdb_out": CMDB_OUT}},
+        {"message_id": "3", "agent": "nope", "input": {}},
+    ]
+    resp = TestClient(host_app).post("/a2a/message/batch", json={"messages": messages})
+    statuses = [(r["message_id"], r["status"]) for r in resp.json()["responses"]]
+    assert statuses == [("1", "ok"), ("2", "ok"), ("3", "error")]
+
+
+@pytest.mark.asyncio
+async def test_local_client_matches_http_contract() -> None:
+    client = LocalA2AClient()
+    local = await client.send_async("cmdb", {"step_def": STEP, "cmdb_out": CMDB_OUT})
+    msg = {"agent": "cmdb", "input": {"step_def": STEP, "cmdb_out": CMDB_OUT}}
+    remote = TestClient(host_app).post("/cmdb/a2a/message/send", json=msg)
+    assert local.status == "ok" and local.output == remote.json()["output"]
+    with pytest.raises(KeyError):
+        await client.send_async("nope", {})
+    batch = await client.send_batch("mop", [{"step_def": STEP}, {"step_def": {"step_id": "S2"}}])
+    assert [r.status for r in batch] == ["ok", "error"]
+
+
+@pytest.mark.asyncio
+async def test_in_process_mode_dispatches_without_http(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("INFRASENTINEL_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setenv("A2A_MODE", "in-process")
+    monkeypatch.setenv("A2A_CMDB_URL", "http://127.0.0.1:9")  # unreachable: must not be used
+    monkeypatch.setattr(cache_mod, "_cache", cache_mod.AdviceCache())
+    calls: list[dict] = []
+    agent = AGENTS["cmdb"]
+
+    def advice(input_data: dict) -> dict:
+        calls.append(input_data)
+        return {"escalation_text": "escalate"}
+
+    monkeypatch.setitem(AGENTS, "cmdb", type(agent)(agent.name, agent.card, advice))
+    get_settings.cache_clear()
+    try:
+        text = await activities_execution.activity_cmdb_advice(STEP, CMDB_OUT)
+        assert text == "escalate"
+        assert calls[0]["cmdb_out"] is CMDB_OUT  # handed over as is
+    finally:
+        get_settings.cache_clear()
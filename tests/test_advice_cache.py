@@ -0,0 +1,103 @@
+"""Advice cache: canonical keys, TTL and size bounds, persistence, client and server hits."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from packages.a2a import cache as cache_mod
+from packages.a2a import client as client_mod
+from packages.a2a.cache import AdviceCache, advice_key
+from packages.a2a.client import A2AClient
+from packages.core.config import get_settings
+from services.a2a_mop_agent.server import app as mop_app
+
+STEP = {
+    "step_id": "S1",
+    "description": "Verify panel port",
+    "step_type": "port_verify",
+    "evidence": {"kind": "photo", "count": 1},
+    "verify": {"requires_port_label": True, "requires_cable_tag": True, "min_confidence": 0.75},
+    "approval": None,
+}
+
+
+def test_keys_are_canonical_and_versioned() -> None:
+    assert advice_key("mop", {"a": 1, "b": [1, 2]}) == advice_key("mop", {"b": [1, 2], "a": 1})
+    assert advice_key("mop", {"a": 1}, "v1") != advice_key("mop", {"a": 1}, "v2")
+    assert advice_key("mop", {"a": 1}) != advice_key("cmdb", {"a": 1})
+
+
+def test_ttl_size_bound_and_hit_rate(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+    cache = AdviceCache(ttl=60, max_entries=2)
+    cache.put("k1", {"tech_prompt": "one"})
+    cache.put("k2", {"tech_prompt": "two"})
+    assert cache.get("mop", "k1") == {"tech_prompt": "one"}
+    cache.put("k3", {"tech_prompt": "three"})  # k2 is least recently used
+    assert cache.get("mop", "k2") is None
+    now[0] += 61
+    assert cache.get("mop", "k1") is None
+    assert cache.stats() == {
+        "entries": 1,
+        "agents": {"mop": {"hits": 1, "misses": 2, "hit_rate": 0.3333}},
+    }
+
+
+def test_entries_survive_restart(tmp_path: Path) -> None:
+    path = tmp_path / "advice.db"
+    AdviceCache(path=path).put("k1", {"guidance": ["retake"]})
+    assert AdviceCache(path=path).get("vision", "k1") == {"guidance": ["retake"]}
+    assert AdviceCache(ttl=0.0, path=path).get("vision", "k1") is None  # expired on load
+
+
+@pytest.mark.asyncio
+async def test_client_answers_repeated_inputs_from_cache() -> None:
+    paths: list[str] = []
+    inner = httpx.ASGITransport(app=mop_app)
+
+    class Counting(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return await inner.handle_async_request(request)
+
+    client = A2AClient("http://mop", transport=Counting(), cache=AdviceCache(), cache_version="v1")
+    first = await client.send_async("mop", {"step_def": STEP})
+    again = await client.send_async("mop", {"step_def": STEP})
+    assert again.output == first.output and again.status == "ok"
+    assert paths == ["/a2a/message/send"]
+
+    other = dict(STEP, step_id="S2", description="Verify cable")
+    batch = await client.send_batch("mop", [{"step_def": STEP}, {"step_def": other}])
+    assert batch[0].output == first.output
+    assert batch[1].output["tech_prompt"].startswith("Verify cable")
+    assert paths == ["/a2a/message/send", "/a2a/message/batch"]
+    assert client.cache.stats()["agents"]["mop"] == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+    await client.aclose()
+
+
+def test_agent_server_caches_advice(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cache_mod, "_cache", AdviceCache())
+    client = TestClient(mop_app)
+    msg = {"agent": "mop", "input": {"step_def": STEP}}
+    first = client.post("/a2a/message/send", json=msg).json()
+    second = client.post("/a2a/message/send", json=msg).json()
+    assert first["output"] == second["output"]
+    assert client.get("/a2a/cache/stats").json()["agents"]["mop"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_client_keys_include_the_llm_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(client_mod, "_async_clients", {})
+    monkeypatch.setattr("packages.agents.llm.llm_model_tag", lambda: "anthropic:model-a")
+    get_settings.cache_clear()
+    try:
+        version = client_mod.get_a2a_client("http://mop")._cache_version
+        assert version.startswith("http://mop|") and "anthropic:model-a" in version
+        await client_mod.close_a2a_clients()
+    finally:
+        get_settings.cache_clear()
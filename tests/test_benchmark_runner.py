@@ -0,0 +1,41 @@
+"""Benchmark runner: cases execute and regressions are detected against a baseline."""
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.cases import CASES, load_inputs, runtime_sandbox
+from benchmarks.run import InputMismatchError, compare
+
+
+def test_every_case_runs_once_in_sandbox(tmp_path: Path) -> None:
+    with runtime_sandbox() as runtime_dir:
+        for case in CASES:
+            case.setup()()
+    assert not runtime_dir.exists()
+
+
+def test_fallback_inputs_when_dataset_missing(tmp_path: Path) -> None:
+    inputs = load_inputs(dataset_dir=tmp_path, limit=16)
+    assert inputs.source == "fallback"
+    assert len(inputs.ocr_port_texts) == 16
+    assert inputs.images
+
+
+def test_compare_normalizes_by_calibration() -> None:
+    baseline = {"calibration_us": 100.0, "cases": {"a": {"per_call_us": 10.0}, "b": {"per_call_us": 10.0}}}
+    # Machine twice as slow overall: a scales with it, b regressed 50% beyond that.
+    current = {"calibration_us": 200.0, "cases": {"a": {"per_call_us": 20.0}, "b": {"per_call_us": 30.0}, "c": {"per_call_us": 1.0}}}
+    rows = {r["name"]: r for r in compare(current, baseline, threshold=0.3)}
+    assert rows["a"]["ratio"] == 1.0 and not rows["a"]["regressed"]
+    assert rows["b"]["ratio"] == 1.5 and rows["b"]["regressed"]
+    assert rows["c"]["ratio"] is None and not rows["c"]["regressed"]
+
+
+def test_compare_refuses_runs_on_different_inputs() -> None:
+    baseline = {"calibration_us": 100.0, "cases": {"a": {"per_call_us": 10.0}}, "inputs": "synth"}
+    current = {"calibration_us": 100.0, "cases": {"a": {"per_call_us": 10.0}}, "inputs": "fallback"}
+    with pytest.raises(InputMismatchError):
+        compare(current, baseline, threshold=0.3)
+    rows = compare(current, baseline, threshold=0.3, allow_input_mismatch=True)
+    assert rows[0]["ratio"] == 1.0
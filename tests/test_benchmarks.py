@@ -0,0 +1,19 @@
+"""pytest-benchmark entry point for the hot-path cases in benchmarks/cases.py.
+
+    pytest tests/test_benchmarks.py --benchmark-only --benchmark-autosave
+    pytest tests/test_benchmarks.py --benchmark-only --benchmark-compare --benchmark-compare-fail=min:30%
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from pytest_benchmark.fixture import BenchmarkFixture  # noqa: E402
+
+from benchmarks.cases import CASES, BenchCase, runtime_sandbox  # noqa: E402
+
+
+@pytest.mark.parametrize("case", CASES, ids=[c.name for c in CASES])
+def test_hot_path(benchmark: BenchmarkFixture, case: BenchCase) -> None:
+    with runtime_sandbox():
+        benchmark(case.setup())
@@ -0,0 +1,207 @@
+"""Cable-path graph: structural walks, positions, live tracing and mirror refresh."""
+
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from packages.core.config import get_settings
+from packages.core.metrics import LatencyRecorder
+from services.mcp_netbox import handlers as handlers_mod
+from services.mcp_netbox.handlers import NetboxHandlers
+from services.mcp_netbox.src import netbox_client
+from services.mcp_netbox.src.cable_graph import CableGraph, path_reaches
+from services.mcp_netbox.src.mirror import CMDBMirror
+from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient, invalidate_cable_paths
+
+
+def _two_panel_graph() -> CableGraph:
+    """SW-01 Eth1/24 -(patch)- PANEL-A 24 | rear R1 -(trunk)- PANEL-B rear R1 | 24 -(patch)- SRV-9 eth0."""
+    g = CableGraph()
+    g.set_port("interface", 100, "SW-01", "Ethernet1/24")
+    g.set_port("rearport", 11, "PANEL-A", "R1")
+    g.set_front_port(10, "PANEL-A", "24", rear_port_id=11, position=1)
+    g.set_port("rearport", 21, "PANEL-B", "R1")
+    g.set_front_port(20, "PANEL-B", "24", rear_port_id=21, position=1)
+    g.set_port("interface", 200, "SRV-9", "eth0")
+    g.set_cable(1, "MDF-01-R12-P24", [("frontport", 10)], [("interface", 100)])
+    g.set_cable(2, "TRUNK-AB", [("rearport", 11)], [("rearport", 21)])
+    g.set_cable(3, "SRV-9-ETH0", [("frontport", 20)], [("interface", 200)])
+    return g
+
+
+def test_path_runs_through_rear_ports_to_both_ends() -> None:
+    g = _two_panel_graph()
+    start = g.find_port("PANEL-A", "24")
+    path = g.path(start)
+    names = [(h["device"], h["name"]) for h in g.describe(path) if h["kind"] != "cable"]
+    assert names == [
+        ("SRV-9", "eth0"),
+        ("PANEL-B", "24"),
+        ("PANEL-B", "R1"),
+        ("PANEL-A", "R1"),
+        ("PANEL-A", "24"),
+        ("SW-01", "Ethernet1/24"),
+    ]
+    assert g.path(start) is path and g.path_hits == 1
+    assert path_reaches(g, path, "SRV-9", "eth0")
+
+
+def test_cable_change_invalidates_only_affected_paths() -> None:
+    g = _two_panel_graph()
+    a, b = g.find_port("PANEL-A", "24"), g.find_port("PANEL-B", "24")
+    g.path(a)
+    g.set_port("interface", 101, "SW-01", "Ethernet1/25")
+    g.set_cable(1, "MDF-01-R12-P24", [("frontport", 10)], [("interface", 101)])
+    assert path_reaches(g, g.path(a), "SW-01", "Ethernet1/25")
+    assert not path_reaches(g, g.path(b), "SW-01", "Ethernet1/24")
+    g.remove_cable(2)
+    assert not path_reaches(g, g.path(a), "SRV-9", "eth0")
+
+
+def test_multi_position_rear_port_keeps_position() -> None:
+    g = CableGraph()
+    for panel, rear in (("PANEL-A", 11), ("PANEL-B", 21)):
+        g.set_port("rearport", rear, panel, "MPO1")
+        for pos in (1, 2):
+            g.set_front_port(rear * 10 + pos, panel, str(pos), rear_port_id=rear, position=pos)
+    g.set_cable(2, "TRUNK", [("rearport", 11)], [("rearport", 21)])
+    path = g.path(g.find_port("PANEL-A", "2"))
+    assert path_reaches(g, path, "PANEL-B", "2")
+    assert not path_reaches(g, path, "PANEL-B", "1")
+
+
+def _nb(
+    obj_id: int, collection: str, device: str | None = None, name: str = "", **extra: Any
+) -> dict:
+    obj = {"id": obj_id, "url": f"http://nb/api/dcim/{collection}/{obj_id}/", "name": name, **extra}
+    if device:
+        obj["device"] = {"name": device}
+    return obj
+
+
+def _live_netbox(calls: list[httpx.Request]) -> httpx.MockTransport:
+    path = [
+        [_nb(200, "interfaces", "SRV-9", "eth0")],
+        [_nb(3, "cables", label="SRV-9-ETH0")],
+        [_nb(20, "front-ports", "PANEL-B", "24")],
+        [_nb(21, "rear-ports", "PANEL-B", "R1")],
+        [_nb(2, "cables", label="TRUNK-AB")],
+        [_nb(11, "rear-ports", "PANEL-A", "R1")],
+        [_nb(10, "front-ports", "PANEL-A", "24")],
+        [_nb(1, "cables", label="MDF-01-R12-P24")],
+        [_nb(100, "interfaces", "SW-01", "Ethernet1/24")],
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path == "/api/dcim/front-ports/":
+            return httpx.Response(200, json={"results": [{"id": 10, "name": "24", "cable": {"id": 1}}]})
+        if request.url.path == "/api/dcim/front-ports/10/paths/":
+            return httpx.Response(200, json=[{"id": 5, "path": path, "is_complete": True}])
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_live_path_traced_once_and_invalidated_by_webhook(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[httpx.Request] = []
+    client = AsyncNetBoxClient("http://nb", transport=_live_netbox(calls), recorder=LatencyRecorder())
+    monkeypatch.setenv("NETBOX_MODE", "netbox")
+    get_settings.cache_clear()
+    monkeypatch.setattr(handlers_mod, "get_async_netbox_client", lambda url, token: client)
+    monkeypatch.setitem(netbox_client._async_clients, ("http://nb", ""), (None, client))
+    try:
+        handlers = NetboxHandlers()
+        ok = await handlers.validate_path("CHG-001", "PANEL-A", "24", "SRV-9", "eth0")
+        assert ok.match is True
+        assert len(calls) == 2
+        bad = await handlers.validate_path("CHG-001", "PANEL-A", "24", "SW-02", "Ethernet1/1")
+        assert bad.match is False and "SRV-9 eth0" in bad.reason
+        assert len(calls) == 2  # graph lookup, no REST
+
+        invalidate_cable_paths({"model": "cable", "event": "updated", "data": {"id": 2}})
+        await handlers.validate_path("CHG-001", "PANEL-A", "24", "SRV-9", "eth0")
+        assert len(calls) == 3  # front port known; only the paths request is repeated
+    finally:
+        get_settings.cache_clear()
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_mock_mode_uses_mapping_path_end() -> None:
+    handlers = NetboxHandlers()
+    assert (await handlers.validate_path("CHG-001", "PANEL-A", "24", "SW-01", "Ethernet1/24")).match is True
+    wrong = await handlers.validate_path("CHG-001", "PANEL-A", "24", "SW-01", "Ethernet1/1")
+    assert wrong.match is False and "ends at SW-01 Ethernet1/24" in wrong.reason
+
+
+class MirrorNetBox:
+    def __init__(self) -> None:
+        stamp = "2024-01-01T00:00:00Z"
+        self.data: dict[str, list[dict]] = {
+            "devices": [],
+            "cables": [
+                {
+                    "id": 1,
+                    "label": "MDF-01-R12-P24",
+                    "last_updated": stamp,
+                    "a_terminations": [{"object_type": "dcim.frontport", "object_id": 10}],
+                    "b_terminations": [{"object_type": "dcim.interface", "object_id": 100}],
+                }
+            ],
+            "front-ports": [
+                {
+                    "id": 10,
+                    "name": "24",
+                    "device": {"name": "PANEL-A"},
+                    "rear_port": {"id": 11},
+                    "rear_port_position": 1,
+                    "cable": {"id": 1},
+                    "last_updated": stamp,
+                }
+            ],
+            "rear-ports": [{"id": 11, "name": "R1", "device": {"name": "PANEL-A"}, "last_updated": stamp}],
+            "interfaces": [
+                {"id": 100, "name": "Ethernet1/24", "device": {"name": "SW-01"}, "cable": {"id": 1}, "last_updated": stamp},
+                {"id": 101, "name": "Ethernet1/25", "device": {"name": "SW-01"}, "cable": None, "last_updated": stamp},
+            ],
+        }
+
+    def transport(self) -> httpx.MockTransport:
+        def handler(request: httpx.Request) -> httpx.Response:
+            rows = self.data.get(request.url.path.removeprefix("/api/dcim/").strip("/"), [])
+            since = request.url.params.get("last_updated__gte")
+            if since:
+                rows = [r for r in rows if r.get("last_updated", "") >= since]
+            return httpx.Response(200, json={"results": rows, "next": None})
+
+        return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_mirror_graph_refreshes_incrementally(tmp_path: Path) -> None:
+    netbox = MirrorNetBox()
+    client = AsyncNetBoxClient("http://nb", transport=netbox.transport(), recorder=LatencyRecorder())
+    mirror = CMDBMirror(f"sqlite+aiosqlite:///{tmp_path / 'mirror.db'}")
+    await mirror.sync(client)
+    graph = await mirror.cable_graph()
+    start = graph.find_port("PANEL-A", "24")
+    assert path_reaches(graph, graph.path(start), "SW-01", "Ethernet1/24")
+    assert await mirror.cable_graph() is graph
+
+    netbox.data["cables"][0] = {
+        **netbox.data["cables"][0],
+        "b_terminations": [{"object_type": "dcim.interface", "object_id": 101}],
+        "last_updated": "2024-02-01T00:00:00Z",
+    }
+    await mirror.sync(client)
+    refreshed = await mirror.cable_graph()
+    assert refreshed is graph  # updated in place, not rebuilt
+    assert path_reaches(graph, graph.path(start), "SW-01", "Ethernet1/25")
+    await mirror.close()
+    await client.aclose()
@@ -0,0 +1,101 @@
+"""Campaign API: bulk start, progress query, pause/resume signals."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+pytest.importorskip("temporalio")
+from fastapi.testclient import TestClient
+from temporalio.exceptions import WorkflowAlreadyStartedError
+from temporalio.service import RPCError, RPCStatusCode
+
+from apps.api.main import app
+from apps.worker.workflows.campaign_workflow import CampaignInput, CampaignWorkflow
+
+
+def _mock_client() -> MagicMock:
+    client = MagicMock()
+    handle = MagicMock()
+    handle.result_run_id = "run-1"
+    handle.query = AsyncMock(return_value={"paused": False, "total": 2, "completed": 1})
+    handle.signal = AsyncMock()
+    client.start_workflow = AsyncMock(return_value=handle)
+    client.get_workflow_handle = MagicMock(return_value=handle)
+    return client
+
+
+def test_start_campaign_fans_out_changes() -> None:
+    client = _mock_client()
+    with patch("apps.api.main.get_temporal_client", AsyncMock(return_value=client)):
+        resp = TestClient(app).post(
+            "/v1/campaigns/start",
+            json={
+                "campaign_id": "Q3-RACK12",
+                "changes": [{"change_id": "CHG-001"}, {"change_id": "CHG-002", "scenario": "CHG-001_B"}],
+                "max_concurrency": 5,
+            },
+        )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["workflow_id"] == "campaign-Q3-RACK12"
+    assert body["total_changes"] == 2
+
+    args, kwargs = client.start_workflow.call_args
+    assert args[0] == CampaignWorkflow.run
+    data: CampaignInput = args[1]
+    assert [c.change_id for c in data.changes] == ["CHG-001", "CHG-002"]
+    assert data.changes[1].scenario == "CHG-001_B"
+    assert data.max_concurrency == 5
+    assert kwargs["id"] == "campaign-Q3-RACK12"
+
+
+def test_start_campaign_rejects_duplicates_and_empty() -> None:
+    client = _mock_client()
+    with patch("apps.api.main.get_temporal_client", AsyncMock(return_value=client)):
+        tc = TestClient(app)
+        dup = tc.post(
+            "/v1/campaigns/start",
+            json={"campaign_id": "C1", "changes": [{"change_id": "CHG-001"}, {"change_id": "CHG-001"}]},
+        )
+        empty = tc.post("/v1/campaigns/start", json={"campaign_id": "C1", "changes": []})
+    assert dup.status_code == 422
+    assert empty.status_code == 422
+    client.start_workflow.assert_not_called()
+
+
+def test_start_campaign_conflict() -> None:
+    client = _mock_client()
+    client.start_workflow = AsyncMock(side_effect=WorkflowAlreadyStartedError("campaign-C1", "CampaignWorkflow"))
+    with patch("apps.api.main.get_temporal_client", AsyncMock(return_value=client)):
+        resp = TestClient(app).post(
+            "/v1/campaigns/start",
+            json={"campaign_id": "C1", "changes": [{"change_id": "CHG-001"}]},
+        )
+    assert resp.status_code == 409
+
+
+def test_campaign_progress_pause_resume() -> None:
+    client = _mock_client()
+    with patch("apps.api.main.get_temporal_client", AsyncMock(return_value=client)):
+        tc = TestClient(app)
+        progress = tc.get("/v1/campaigns/C1")
+        paused = tc.post("/v1/campaigns/C1/pause")
+        resumed = tc.post("/v1/campaigns/C1/resume")
+    assert progress.json()["completed"] == 1
+    assert paused.json()["paused"] is True
+    assert resumed.json()["paused"] is False
+    signals = [c.args[0] for c in client.get_workflow_handle.return_value.signal.call_args_list]
+    assert signals == [CampaignWorkflow.pause, CampaignWorkflow.resume]
+    client.get_workflow_handle.assert_called_with("campaign-C1")
+
+
+def test_signalling_an_unknown_campaign_is_404() -> None:
+    client = _mock_client()
+    client.get_workflow_handle.return_value.signal = AsyncMock(
+        side_effect=RPCError("workflow not found", RPCStatusCode.NOT_FOUND, b"")
+    )
+    with patch("apps.api.main.get_temporal_client", AsyncMock(return_value=client)):
+        tc = TestClient(app)
+        paused = tc.post("/v1/campaigns/NOPE/pause")
+        resumed = tc.post("/v1/campaigns/NOPE/resume")
+    assert (paused.status_code, resumed.status_code) == (404, 404)
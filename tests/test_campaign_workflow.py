@@ -0,0 +1,90 @@
+"""CampaignWorkflow on a time-skipping server: bounded concurrency and pause/resume."""
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("temporalio")
+from temporalio import activity, workflow
+from temporalio.client import Client, WorkflowHandle
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from apps.worker.workflows.campaign_workflow import CampaignChange, CampaignInput, CampaignWorkflow
+from apps.worker.workflows.change_execution_workflow import WorkflowInput
+
+
+@workflow.defn(name="ChangeExecutionWorkflow")
+class FakeChangeWorkflow:
+    """Stands in for a change: runs until signalled to finish."""
+
+    def __init__(self) -> None:
+        self._done = False
+
+    @workflow.signal
+    def finish(self) -> None:
+        self._done = True
+
+    @workflow.run
+    async def run(self, data: WorkflowInput) -> dict:
+        await workflow.wait_condition(lambda: self._done)
+        return {"change_id": data.change_id}
+
+
+@activity.defn(name="activity_proofpack_summary")
+async def fake_summary(change_id: str) -> dict:
+    return {"verified_steps": 2, "total_steps": 2}
+
+
+async def _wait_for(handle: WorkflowHandle, predicate: Callable[[dict], bool]) -> dict:
+    for _ in range(100):
+        progress = await handle.query(CampaignWorkflow.get_progress)
+        if predicate(progress):
+            return progress
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"campaign never reached the expected state: {progress}")
+
+
+async def _finish(client: Client, *change_ids: str) -> None:
+    for change_id in change_ids:
+        await client.get_workflow_handle(f"change-{change_id}").signal(FakeChangeWorkflow.finish)
+
+
+@pytest.mark.asyncio
+async def test_campaign_bounds_concurrency_and_pauses() -> None:
+    async with await WorkflowEnvironment.start_time_skipping() as env:
+        client: Client = env.client
+        async with Worker(
+            client,
+            task_queue="campaign-queue",
+            workflows=[CampaignWorkflow, FakeChangeWorkflow],
+            activities=[fake_summary],
+        ):
+            handle = await client.start_workflow(
+                CampaignWorkflow.run,
+                CampaignInput(
+                    campaign_id="C1",
+                    changes=[CampaignChange(change_id=f"CHG-{i}") for i in range(1, 5)],
+                    max_concurrency=2,
+                ),
+                id="campaign-C1",
+                task_queue="campaign-queue",
+                execution_timeout=timedelta(seconds=60),
+            )
+            progress = await _wait_for(handle, lambda p: p["running"] == 2)
+            assert progress["pending"] == 2
+
+            await handle.signal(CampaignWorkflow.pause)
+            await _finish(client, "CHG-1", "CHG-2")
+            progress = await _wait_for(handle, lambda p: p["completed"] == 2)
+            assert (progress["paused"], progress["running"], progress["pending"]) == (True, 0, 2)
+
+            await handle.signal(CampaignWorkflow.resume)
+            await _wait_for(handle, lambda p: p["running"] == 2)
+            await _finish(client, "CHG-3", "CHG-4")
+            result = await handle.result()
+
+    assert result["completed"] == 4 and result["failed"] == 0
+    assert result["summary"]["verified_steps"] == 8
@@ -0,0 +1,125 @@
+"""CMDB cache: TTL and negative caching, webhook invalidation and stats."""
+
+import hashlib
+import hmac
+import json
+import time
+from collections.abc import Iterator
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+from packages.core.config import get_settings
+from packages.core.metrics import LatencyRecorder
+from services.mcp_netbox.src.cache import (
+    MemoryCMDBCache,
+    invalidation_prefixes,
+    port_key,
+    set_cmdb_cache,
+)
+from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient
+
+
+def test_ttl_negative_ttl_and_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = MemoryCMDBCache(ttl=60, negative_ttl=5)
+    cache.store("port:A:1", {"label": "T"})
+    cache.store("port:A:2", None)
+    assert cache.lookup("port:A:1") == (True, {"label": "T"})
+    assert cache.lookup("port:A:2") == (True, None)
+    assert cache.lookup("port:A:3") == (False, None)
+
+    later = time.time() + 10
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.lookup("port:A:2") == (False, None)  # negative entry expired
+    assert cache.lookup("port:A:1")[0] is True
+
+    stats = cache.stats.snapshot()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"], stats["expired"]) == (3, 1, 2, 1)
+    assert stats["hit_age_max_s"] >= 10
+
+
+def test_invalidation_prefixes_from_netbox_events() -> None:
+    cable = {
+        "event": "updated",
+        "model": "cable",
+        "data": {"a_terminations": [{"object": {"name": "24", "device": {"name": "PANEL-A"}}}]},
+        "snapshots": {
+            "prechange": {"a_terminations": [{"object": {"name": "23", "device": {"name": "PANEL-B"}}}]}
+        },
+    }
+    assert invalidation_prefixes(cable) == [
+        "device:PANEL-A:",
+        "port:PANEL-A:",
+        "device:PANEL-B:",
+        "port:PANEL-B:",
+    ]
+    port = {"event": "updated", "model": "frontport", "data": {"name": "24", "device": {"name": "PANEL-C"}}}
+    assert invalidation_prefixes(port) == ["device:PANEL-C:", "port:PANEL-C:"]
+    # A cable edit without a usable pre-change snapshot, or an unknown model, flushes everything.
+    assert invalidation_prefixes({**cable, "snapshots": {}}) is None
+    assert invalidation_prefixes({"model": "site", "data": {"name": "DC1"}}) is None
+
+
+@pytest.mark.asyncio
+async def test_client_caches_and_invalidation_forces_refetch() -> None:
+    calls: list[httpx.Request] = []
+    label = {"value": "OLD"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path == "/api/dcim/front-ports/":
+            if request.url.params["device"] == "PANEL-A":
+                port = {"name": "24", "cable": {"id": 7, "label": label["value"]}}
+                return httpx.Response(200, json={"results": [port]})
+            return httpx.Response(200, json={"results": []})
+        return httpx.Response(200, json={"results": []})  # unknown device
+
+    cache = MemoryCMDBCache(ttl=300, negative_ttl=30)
+    client = AsyncNetBoxClient(
+        "http://nb", transport=httpx.MockTransport(handler), recorder=LatencyRecorder(), cache=cache
+    )
+    assert (await client.validate_observed("C", "PANEL-A", "24", "OLD")).match is True
+    assert (await client.validate_observed("C", "PANEL-A", "24", "OLD")).match is True
+    missing = [await client.validate_observed("C", "PANEL-Z", "24", "X") for _ in range(2)]
+    assert all("not found" in r.reason for r in missing)
+    assert len(calls) == 3  # one port lookup for PANEL-A; port + device lookup for PANEL-Z
+
+    label["value"] = "NEW"  # re-cabled in NetBox
+    await cache.invalidate(invalidation_prefixes({"model": "device", "data": {"name": "PANEL-A"}}))
+    out = await client.validate_observed("C", "PANEL-A", "24", "OLD")
+    await client.aclose()
+    assert out.match is False
+    assert "'NEW'" in out.reason
+    assert cache.stats.snapshot()["negative_hits"] == 1
+
+
+@pytest.fixture
+def api_cache(monkeypatch: pytest.MonkeyPatch) -> Iterator[MemoryCMDBCache]:
+    cache = MemoryCMDBCache(ttl=300, negative_ttl=30)
+    set_cmdb_cache(cache)
+    monkeypatch.setenv("NETBOX_WEBHOOK_SECRET", "s3cret")
+    get_settings.cache_clear()
+    yield cache
+    set_cmdb_cache(None)
+    get_settings.cache_clear()
+
+
+def test_webhook_requires_signature_and_invalidates(api_cache: MemoryCMDBCache) -> None:
+    api_cache.store(port_key("PANEL-A", "24"), {"device": True, "cable": None})
+    api_cache.store(port_key("PANEL-B", "1"), {"device": True, "cable": None})
+    body = json.dumps({"event": "updated", "model": "frontport", "data": {"device": {"name": "PANEL-A"}}})
+    client = TestClient(app)
+
+    assert client.post("/v1/cmdb/webhook", content=body).status_code == 401
+    signature = hmac.new(b"s3cret", body.encode(), hashlib.sha512).hexdigest()
+    resp = client.post("/v1/cmdb/webhook", content=body, headers={"X-Hook-Signature": signature})
+    assert resp.status_code == 200
+    assert resp.json()["dropped"] == 1
+    assert api_cache.lookup(port_key("PANEL-A", "24"))[0] is False
+    assert api_cache.lookup(port_key("PANEL-B", "1"))[0] is True
+
+    stats = client.get("/v1/cmdb/cache").json()
+    assert stats["backend"] == "memory"
+    assert stats["invalidations"] == 1
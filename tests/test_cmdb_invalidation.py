@@ -0,0 +1,186 @@
+"""NetBox webhook invalidation across processes: startup check, local apply, publish and listen."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from apps.api.main import app
+from packages.core.config import get_settings
+from services.mcp_netbox.src import invalidation, netbox_client
+from services.mcp_netbox.src.cable_graph import CableGraph
+from services.mcp_netbox.src.cache import MemoryCMDBCache, port_key, set_cmdb_cache
+from services.mcp_netbox.src.topology import TopologyIndex, drop_index, get_index, put_index
+
+CABLE_EVENT = {"event": "updated", "model": "cable", "data": {"id": 1}}
+FRONTPORT_EVENT = {"event": "updated", "model": "frontport", "data": {"device": {"name": "PANEL-A"}}}
+
+
+class SharedCache(MemoryCMDBCache):
+    """Stands in for RedisCMDBCache: shared by every process in the test."""
+
+    backend = "redis"
+
+
+class GraphOnly:
+    """An AsyncNetBoxClient as far as invalidate_cable_paths is concerned."""
+
+    def __init__(self) -> None:
+        self.graph = CableGraph()
+        self.graph.set_port("frontport", 10, "PANEL-A", "24")
+        self.graph.set_port("interface", 100, "SW-01", "Ethernet1/24")
+        self.graph.set_cable(1, "MDF-01-R12-P24", [("frontport", 10)], [("interface", 100)])
+        self.graph.path(("frontport", 10))
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, str]] = []
+        self.messages: asyncio.Queue = asyncio.Queue()
+
+    async def publish(self, channel: str, data: str) -> int:
+        self.published.append((channel, data))
+        await self.messages.put(data)
+        return 1
+
+    def pubsub(self) -> "FakePubSub":
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+
+    async def subscribe(self, channel: str) -> None:
+        assert channel == invalidation.CHANNEL
+
+    async def listen(self) -> AsyncIterator[dict]:
+        yield {"type": "subscribe", "data": 1}
+        while True:
+            yield {"type": "message", "data": await self._redis.messages.get()}
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _index(*panels: str) -> TopologyIndex:
+    index = TopologyIndex()
+    for panel in panels:
+        index.add_port(panel, "24", {"id": 7, "label": "T"}, port_id=124)
+    return index
+
+
+@pytest.fixture
+def shared(monkeypatch: pytest.MonkeyPatch) -> Iterator[SharedCache]:
+    cache = SharedCache(ttl=300, negative_ttl=30)
+    set_cmdb_cache(cache)
+    monkeypatch.setattr(invalidation, "_redis", FakeRedis())
+    yield cache
+    set_cmdb_cache(None)
+    for change_id in ("CHG-A", "CHG-B"):
+        drop_index(change_id)
+
+
+def test_webhook_secret_requires_shared_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NETBOX_MODE", "netbox")
+    monkeypatch.setenv("NETBOX_WEBHOOK_SECRET", "s3cret")
+    get_settings.cache_clear()
+    try:
+        set_cmdb_cache(MemoryCMDBCache(ttl=300, negative_ttl=30))
+        with pytest.raises(RuntimeError, match="CMDB_CACHE_BACKEND=redis"):
+            invalidation.check_invalidation_backend(get_settings())
+        set_cmdb_cache(SharedCache(ttl=300, negative_ttl=30))
+        invalidation.check_invalidation_backend(get_settings())
+    finally:
+        set_cmdb_cache(None)
+        get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_apply_drops_indexes_for_touched_panels_only() -> None:
+    set_cmdb_cache(MemoryCMDBCache(ttl=300, negative_ttl=30))
+    try:
+        put_index("CHG-A", _index("PANEL-A"))
+        put_index("CHG-B", _index("PANEL-B"))
+        result = await invalidation.apply_invalidation(FRONTPORT_EVENT, shared=False)
+        assert result["indexes"] == 1
+        assert get_index("CHG-A") is None and get_index("CHG-B") is not None
+    finally:
+        set_cmdb_cache(None)
+        drop_index("CHG-B")
+
+
+def test_webhook_publishes_to_other_processes(shared: SharedCache) -> None:
+    shared.store(port_key("PANEL-A", "24"), {"device": True, "cable": None})
+    resp = TestClient(app).post("/v1/cmdb/webhook", content=json.dumps(FRONTPORT_EVENT))
+    assert resp.status_code == 200
+    assert resp.json()["broadcast"] == 1 and resp.json()["dropped"] == 1
+    [(channel, data)] = invalidation._redis.published
+    assert channel == invalidation.CHANNEL and json.loads(data) == FRONTPORT_EVENT
+
+
+@pytest.mark.asyncio
+async def test_listener_applies_published_events(shared: SharedCache) -> None:
+    listener = asyncio.create_task(invalidation.listen_for_invalidations())
+    for _ in range(5):
+        await asyncio.sleep(0)  # subscribed; the resubscribe flush has run
+    put_index("CHG-A", _index("PANEL-A"))
+    put_index("CHG-B", _index("PANEL-B"))
+    shared.store(port_key("PANEL-B", "1"), {"device": True, "cable": None})
+
+    assert await invalidation.publish_invalidation(FRONTPORT_EVENT) == 1
+    for _ in range(10):
+        await asyncio.sleep(0)
+    listener.cancel()
+
+    assert get_index("CHG-A") is None and get_index("CHG-B") is not None
+    assert shared.lookup(port_key("PANEL-B", "1"))[0] is True  # shared cache left to the publisher
+
+
+@pytest.mark.asyncio
+async def test_listener_drops_cable_paths_of_this_process(
+    shared: SharedCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    worker_client = GraphOnly()
+    monkeypatch.setitem(netbox_client._async_clients, ("http://nb", ""), (None, worker_client))
+    listener = asyncio.create_task(invalidation.listen_for_invalidations())
+    for _ in range(5):
+        await asyncio.sleep(0)
+    worker_client.graph.path(("frontport", 10))  # re-traced after the resubscribe flush
+    assert worker_client.graph.cached_path(("frontport", 10)) is not None
+
+    await invalidation.publish_invalidation(CABLE_EVENT)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    listener.cancel()
+
+    assert worker_client.graph.cached_path(("frontport", 10)) is None
+
+
+@pytest.mark.asyncio
+async def test_blocking_lookups_are_dropped_for_touched_panels_only(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests: list[str] = []
+
+    def fake_get(url: str, params: dict, **_: object) -> httpx.Response:
+        requests.append(params["name"])
+        return httpx.Response(200, json={"results": [{"id": 1}]}, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(netbox_client.httpx, "get", fake_get)
+    netbox_client._blocking_cache.drop_prefixes(None)
+    for panel in ("PANEL-A", "PANEL-B", "PANEL-A", "PANEL-B"):
+        netbox_client._get_device_id("http://nb", "", panel)
+    assert requests == ["PANEL-A", "PANEL-B"]
+
+    set_cmdb_cache(MemoryCMDBCache(ttl=300, negative_ttl=30))
+    try:
+        await invalidation.apply_invalidation(FRONTPORT_EVENT, shared=False)
+    finally:
+        set_cmdb_cache(None)
+    for panel in ("PANEL-A", "PANEL-B"):
+        netbox_client._get_device_id("http://nb", "", panel)
+    assert requests == ["PANEL-A", "PANEL-B", "PANEL-A"]
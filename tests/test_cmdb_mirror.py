@@ -0,0 +1,213 @@
+"""Local CMDB mirror: bulk + incremental sync, pruning, and lookups without NetBox."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from packages.core.config import get_settings
+from packages.core.metrics import LatencyRecorder
+from services.mcp_netbox import handlers as handlers_mod
+from services.mcp_netbox.handlers import NetboxHandlers
+from services.mcp_netbox.src.mirror import CMDBMirror
+from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient, validate_observed_netbox
+
+
+class FakeNetBox:
+    """Minimal NetBox list API honouring last_updated__gte and limit/offset."""
+
+    def __init__(self) -> None:
+        self.up = True
+        self.requests: list[httpx.Request] = []
+        self.data: dict[str, list[dict]] = {
+            "devices": [{"id": 1, "name": "PANEL-A", "last_updated": "2024-01-01T00:00:00Z"}],
+            "cables": [
+                {
+                    "id": 7,
+                    "label": "MDF-01-R12-P24",
+                    "last_updated": "2024-01-01T00:00:00Z",
+                    "a_terminations": [{"object_type": "dcim.frontport", "object_id": 10}],
+                    "b_terminations": [{"object_type": "dcim.interface", "object_id": 99}],
+                }
+            ],
+            "front-ports": [
+                {
+                    "id": 10,
+                    "name": "P24",
+                    "device": {"id": 1, "name": "PANEL-A"},
+                    "rear_port": {"id": 20, "name": "R24"},
+                    "cable": {"id": 7},
+                    "last_updated": "2024-01-01T00:00:00Z",
+                },
+                {
+                    "id": 11,
+                    "name": "23",
+                    "device": {"id": 1, "name": "PANEL-A"},
+                    "cable": None,
+                    "last_updated": "2024-01-01T00:00:00Z",
+                },
+            ],
+            "interfaces": [
+                {
+                    "id": 99,
+                    "name": "Ethernet1/24",
+                    "device": {"id": 2, "name": "SW-01"},
+                    "cable": {"id": 7},
+                    "last_updated": "2024-01-01T00:00:00Z",
+                }
+            ],
+            "rear-ports": [
+                {
+                    "id": 20,
+                    "name": "R24",
+                    "device": {"id": 1, "name": "PANEL-A"},
+                    "cable": None,
+                    "last_updated": "2024-01-01T00:00:00Z",
+                }
+            ],
+        }
+
+    def transport(self) -> httpx.MockTransport:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            if not self.up:
+                return httpx.Response(503)
+            resource = request.url.path.removeprefix("/api/dcim/").strip("/")
+            rows = self.data.get(resource, [])
+            since = request.url.params.get("last_updated__gte")
+            if since:
+                rows = [r for r in rows if (r.get("last_updated") or "") >= since]
+            limit = int(request.url.params.get("limit", 1000))
+            offset = int(request.url.params.get("offset", 0))
+            page = rows[offset : offset + limit]
+            more = offset + limit < len(rows)
+            return httpx.Response(200, json={"results": page, "next": "more" if more else None})
+
+        return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def netbox() -> FakeNetBox:
+    return FakeNetBox()
+
+
+@pytest.fixture
+def client(netbox: FakeNetBox) -> AsyncNetBoxClient:
+    return AsyncNetBoxClient("http://nb", transport=netbox.transport(), retries=0, recorder=LatencyRecorder())
+
+
+def _mirror_url(tmp_path: Path) -> str:
+    return f"sqlite+aiosqlite:///{tmp_path / 'mirror.db'}"
+
+
+@pytest.mark.asyncio
+async def test_sync_and_lookup(
+    tmp_path: Path, netbox: FakeNetBox, client: AsyncNetBoxClient
+) -> None:
+    mirror = CMDBMirror(_mirror_url(tmp_path))
+    fetched = await mirror.sync(client)
+    assert fetched == {"devices": 1, "cables": 1, "front_ports": 2, "rear_ports": 1, "interfaces": 1}
+
+    assert await mirror.lookup_port_cable("PANEL-A", "24") == (True, {"id": 7, "label": "MDF-01-R12-P24"})
+    assert await mirror.lookup_port_cable("PANEL-A", "23") == (True, None)
+    assert await mirror.lookup_port_cable("PANEL-Z", "1") == (False, None)
+    assert (await mirror.validate_observed("C", "PANEL-A", "24", "MDF-01-R12-P24")).match is True
+    assert await mirror.lookup_many([("PANEL-A", "24"), ("PANEL-A", "23"), ("PANEL-Z", "1")]) == {
+        ("PANEL-A", "24"): (True, {"id": 7, "label": "MDF-01-R12-P24"}),
+        ("PANEL-A", "23"): (True, None),
+        ("PANEL-Z", "1"): (False, None),
+    }
+
+    status = await mirror.status()
+    assert status["resources"]["cables"]["cursor"] == "2024-01-01T00:00:00Z"
+    await mirror.close()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_fetches_only_changed_rows_and_full_prunes(
+    tmp_path: Path, netbox: FakeNetBox, client: AsyncNetBoxClient
+) -> None:
+    mirror = CMDBMirror(_mirror_url(tmp_path))
+    await mirror.sync(client)
+
+    assert "MDF-01-R12-P24" in (await mirror.label_index()).cables
+
+    netbox.data["cables"][0] = {
+        **netbox.data["cables"][0],
+        "label": "RELABELLED",
+        "last_updated": "2024-02-01T00:00:00Z",
+    }
+    netbox.requests.clear()
+    fetched = await mirror.sync(client)
+    assert all(r.url.params.get("last_updated__gte") for r in netbox.requests)
+    assert fetched["cables"] == 1
+    assert (await mirror.lookup_port_cable("PANEL-A", "24"))[1]["label"] == "RELABELLED"
+    labels = await mirror.label_index()  # rebuilt after the sync
+    assert labels.nearest("cable_tag", "RELABELLED")[0]["distance"] == 0
+
+    netbox.data["front-ports"] = netbox.data["front-ports"][1:]  # port 10 deleted in NetBox
+    await mirror.sync(client)
+    assert (await mirror.lookup_port_cable("PANEL-A", "24"))[1] is not None  # delta cannot see deletes
+    await mirror.sync(client, full=True)
+    assert await mirror.lookup_port_cable("PANEL-A", "24") == (True, None)
+    await mirror.close()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_keeps_mirror(
+    tmp_path: Path, netbox: FakeNetBox, client: AsyncNetBoxClient
+) -> None:
+    mirror = CMDBMirror(_mirror_url(tmp_path))
+    await mirror.sync(client)
+    netbox.up = False
+    with pytest.raises(httpx.HTTPStatusError):
+        await mirror.sync(client)
+    assert (await mirror.validate_observed("C", "PANEL-A", "24", "MDF-01-R12-P24")).match is True
+    await mirror.close()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_handlers_use_mirror_while_netbox_is_down(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, netbox: FakeNetBox, client: AsyncNetBoxClient
+) -> None:
+    url = _mirror_url(tmp_path)
+    mirror = CMDBMirror(url)
+    await mirror.sync(client)
+    await mirror.close()
+
+    netbox.up = False
+    monkeypatch.setenv("NETBOX_MODE", "netbox")
+    monkeypatch.setenv("CMDB_SOURCE", "mirror")
+    monkeypatch.setenv("CMDB_MIRROR_URL", url)
+    get_settings.cache_clear()
+    monkeypatch.setattr(handlers_mod, "get_async_netbox_client", lambda url, token: client)
+    try:
+        handlers = NetboxHandlers()
+        ok = await handlers.validate_observed("C", "PANEL-A", "24", "MDF-01-R12-P24")
+        unknown = await handlers.validate_observed("C", "PANEL-NEW", "1", "X")
+    finally:
+        get_settings.cache_clear()
+        await client.aclose()
+    assert ok.match is True
+    assert "Device 'PANEL-NEW' not found" in unknown.reason
+
+
+def test_blocking_validate_against_mirror(tmp_path: Path, netbox: FakeNetBox) -> None:
+    import asyncio
+
+    url = _mirror_url(tmp_path)
+
+    async def seed() -> None:
+        client = AsyncNetBoxClient("http://nb", transport=netbox.transport(), recorder=LatencyRecorder())
+        mirror = CMDBMirror(url)
+        await mirror.sync(client)
+        await mirror.close()
+        await client.aclose()
+
+    asyncio.run(seed())
+    out = validate_observed_netbox("C", "PANEL-A", "24", "WRONG", "http://nb", "", mirror_url=url)
+    assert out.match is False
+    assert "MDF-01-R12-P24" in out.reason
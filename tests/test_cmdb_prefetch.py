@@ -0,0 +1,160 @@
+"""Change-scoped CMDB prefetch: bulk NetBox load, local validation, freshness check."""
+
+from collections.abc import Iterator
+
+import httpx
+import pytest
+
+from packages.core.config import get_settings
+from packages.core.metrics import LatencyRecorder
+from services.mcp_netbox import handlers as handlers_mod
+from services.mcp_netbox.handlers import NetboxHandlers, mapping_panel_ids
+from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient
+from services.mcp_netbox.src.topology import TopologyIndex, drop_index, get_index
+
+CABLES = {7: {"id": 7, "label": "MDF-01-R12-P24"}, 8: {"id": 8, "label": "MDF-01-R12-P23"}}
+
+
+def _ports(moved: bool = False) -> list[dict]:
+    """Panel A's front ports; moved=True re-patches cable 7 (same label) from port 24 to port 21."""
+    ports = [
+        {"id": 124, "name": "24", "device": {"name": "PANEL-A"}, "cable": {"id": 7, "label": "MDF-01-R12-P24"}},
+        {"id": 123, "name": "P23", "device": {"name": "PANEL-A"}, "cable": 8},
+        {"id": 122, "name": "22", "device": {"name": "PANEL-A"}, "cable": None},
+        {"id": 121, "name": "21", "device": {"name": "PANEL-A"}, "cable": None},
+    ]
+    if moved:
+        ports[0]["cable"], ports[3]["cable"] = None, {"id": 7, "label": "MDF-01-R12-P24"}
+    return ports
+
+
+def _transport(
+    calls: list[httpx.Request], cables: dict = CABLES, moved: bool = False
+) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        path = request.url.path.removeprefix("/api/")
+        params = request.url.params
+        if path == "dcim/devices/":
+            names = [n for n in params.get_list("name") if n == "PANEL-A"]
+            return httpx.Response(200, json={"results": [{"id": 1, "name": n} for n in names], "next": None})
+        if path == "dcim/front-ports/":
+            ports = _ports(moved)
+            if params.get_list("name"):
+                ports = [p for p in ports if p["name"] in params.get_list("name")]
+            return httpx.Response(200, json={"results": ports, "next": None})
+        if path.startswith("dcim/front-ports/"):
+            port_id = int(path.rstrip("/").rsplit("/", 1)[1])
+            port = next((p for p in _ports(moved) if p["id"] == port_id), None)
+            return httpx.Response(200, json=port) if port else httpx.Response(404)
+        if path == "dcim/cables/":
+            ids = {int(i) for i in params.get_list("id")}
+            return httpx.Response(200, json={"results": [c for i, c in cables.items() if i in ids]})
+        if path.startswith("dcim/cables/"):
+            cable_id = int(path.rstrip("/").rsplit("/", 1)[1])
+            return httpx.Response(200, json=cables[cable_id]) if cable_id in cables else httpx.Response(404)
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_builds_index_in_bulk() -> None:
+    calls: list[httpx.Request] = []
+    client = AsyncNetBoxClient("http://nb", transport=_transport(calls), recorder=LatencyRecorder())
+    index = await client.prefetch_topology(["PANEL-A", "PANEL-GONE", "PANEL-A"])
+    await client.aclose()
+    assert [c.url.path for c in calls] == ["/api/dcim/devices/", "/api/dcim/front-ports/", "/api/dcim/cables/"]
+    assert index.stats() == {"devices": 1, "ports": 4, "cabled_ports": 2}
+    assert index.port_id_for("PANEL-A", "23") == 123
+    assert index.validate("PANEL-A", "24", "MDF-01-R12-P24").match is True
+    assert index.validate("PANEL-A", "23", "MDF-01-R12-P23").match is True
+    assert "no cable" in index.validate("PANEL-A", "22", "X").reason
+    assert index.validate("PANEL-GONE", "24", "X") is None
+
+
+def test_mapping_panel_ids() -> None:
+    mapping = {
+        "allowed_endpoints": [{"panel_id": "PANEL-B"}, {"panel_id": "PANEL-A"}],
+        "default": {"panel_id": "PANEL-A"},
+    }
+    assert mapping_panel_ids(mapping) == ["PANEL-A", "PANEL-B"]
+
+
+@pytest.fixture
+def netbox_mode(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("NETBOX_MODE", "netbox")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+    drop_index("CHG-PF")
+
+
+def _use_client(
+    monkeypatch: pytest.MonkeyPatch,
+    calls: list[httpx.Request],
+    cables: dict = CABLES,
+    moved: bool = False,
+) -> None:
+    client = AsyncNetBoxClient(
+        "http://nb", transport=_transport(calls, cables, moved), recorder=LatencyRecorder()
+    )
+    monkeypatch.setattr(handlers_mod, "get_async_netbox_client", lambda url, token: client)
+
+
+async def _mapping(self: NetboxHandlers, change_id: str) -> dict:
+    return {"allowed_endpoints": [{"panel_id": "PANEL-A", "port_label": "24"}]}
+
+
+@pytest.mark.asyncio
+async def test_validate_uses_index_and_confirms_match(
+    netbox_mode: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[httpx.Request] = []
+    _use_client(monkeypatch, calls)
+    monkeypatch.setattr(NetboxHandlers, "get_expected_mapping", _mapping)
+    handlers = NetboxHandlers()
+    out = await handlers.prefetch_topology("CHG-PF")
+    assert out["prefetched"] is True
+    calls.clear()
+
+    mismatch = await handlers.validate_observed("CHG-PF", "PANEL-A", "24", "WRONG")
+    assert mismatch.match is False
+    assert calls == []  # answered from the index
+
+    ok = await handlers.validate_observed("CHG-PF", "PANEL-A", "24", "MDF-01-R12-P24")
+    assert ok.match is True
+    assert [c.url.path for c in calls] == ["/api/dcim/front-ports/124/"]  # freshness check only
+
+
+@pytest.mark.asyncio
+async def test_stale_index_falls_back_to_live(
+    netbox_mode: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    index = TopologyIndex()
+    index.add_port("PANEL-A", "24", {"id": 7, "label": "OLD-TAG"}, port_id=124)
+    handlers_mod.put_index("CHG-PF", index)
+    calls: list[httpx.Request] = []
+    _use_client(monkeypatch, calls, cables={7: {"id": 7, "label": "MDF-01-R12-P24"}})
+
+    out = await NetboxHandlers().validate_observed("CHG-PF", "PANEL-A", "24", "OLD-TAG")
+    assert out.match is False
+    assert "MDF-01-R12-P24" in out.reason
+    assert get_index("CHG-PF") is None
+
+
+@pytest.mark.asyncio
+async def test_cable_moved_to_another_port_is_not_verified(
+    netbox_mode: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    index = TopologyIndex()
+    index.add_port("PANEL-A", "24", {"id": 7, "label": "MDF-01-R12-P24"}, port_id=124)
+    handlers_mod.put_index("CHG-PF", index)
+    calls: list[httpx.Request] = []
+    # Cable 7 keeps its label but now ends on port 21; port 24 is empty.
+    _use_client(monkeypatch, calls, moved=True)
+
+    out = await NetboxHandlers().validate_observed("CHG-PF", "PANEL-A", "24", "MDF-01-R12-P24")
+    assert out.match is False
+    assert "no cable" in out.reason
+    assert get_index("CHG-PF") is None
@@ -0,0 +1,77 @@
+"""CV evaluation harness: config parsing, scoring, calibration and per-stage timings."""
+
+import json
+import shutil
+from pathlib import Path
+
+import cv2
+import pytest
+
+from packages.cv.evaluation import EvalConfig, calibration, comparison_table, evaluate_dataset
+from packages.cv.ocr_backends import MockOCRBackend
+from packages.cv.pipeline import read_port_label
+
+GOOD_IMAGE = Path(__file__).resolve().parents[1] / "samples" / "images" / "evid-good.jpg"
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    (tmp_path / "images").mkdir()
+    shutil.copy(GOOD_IMAGE, tmp_path / "images" / "a.jpg")
+    shutil.copy(GOOD_IMAGE, tmp_path / "images" / "b.jpg")
+    # Mock OCR always reads "24 MDF-01-R12-P24": a is right, b is a confident miss.
+    entries = [
+        {"image": "images/a.jpg", "port_label": "P24", "cable_tag": "MDF-01-R12-P24", "quality_flags": {}},
+        {"image": "images/b.jpg", "port_label": "7", "cable_tag": "MDF-01-R12-P24", "quality_flags": {"glare": True}},
+        {"image": "images/missing.jpg", "port_label": "1", "cable_tag": None},
+    ]
+    (tmp_path / "labels.jsonl").write_text("\n".join(json.dumps(e) for e in entries) + "\n")
+    return tmp_path
+
+
+def test_eval_config_parse() -> None:
+    assert EvalConfig.parse("mock") == EvalConfig(name="mock", backend="mock")
+    cfg = EvalConfig.parse("strict:tesseract:bbox=1,port_accept=0.9")
+    assert (cfg.backend, cfg.use_bbox, cfg.port_accept) == ("tesseract", True, 0.9)
+    assert EvalConfig.parse("x:pkg.mod:MyOCR").backend == "pkg.mod:MyOCR"
+    with pytest.raises(ValueError):
+        EvalConfig.parse("x:mock:bogus=1")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_evaluate_dataset_scores_and_latency(dataset: Path, workers: int) -> None:
+    result = evaluate_dataset(dataset, EvalConfig(name="mock"), workers=workers)
+    assert result["samples"] == 2
+    assert result["missing_images"] == 1
+    assert result["port_accuracy"] == 0.5
+    assert result["tag_accuracy"] == 1.0
+    assert result["port_false_green_rate"] == 0.5
+    assert result["retake_rate"] == 0.0
+    assert set(result["retake_rate_by_flag"]) == {"glare", "clean"}
+    assert {"load", "port.ocr", "tag.parse", "total"} <= set(result["latency_ms"])
+    assert sum(result["latency_ms"]["total"]["histogram"].values()) == 2
+
+
+def test_stricter_threshold_trades_false_greens_for_retakes(dataset: Path) -> None:
+    results = {
+        "default": evaluate_dataset(dataset, EvalConfig(name="default")),
+        "strict": evaluate_dataset(dataset, EvalConfig(name="strict", port_accept=0.99)),
+    }
+    assert results["strict"]["retake_rate"] == 1.0
+    assert results["strict"]["port_false_green_rate"] == 0.0
+    rows = {r["metric"]: r for r in comparison_table(results)}
+    assert rows["retake_rate"]["default"] == 0.0
+    assert "port_ece" in rows
+
+
+def test_calibration_ece() -> None:
+    assert calibration([0.95, 0.95], [True, True])["ece"] == pytest.approx(0.05)
+    assert calibration([1.0, 1.0], [False, False])["ece"] == 1.0
+    assert calibration([], [])["ece"] == 0.0
+
+
+def test_pipeline_collects_stage_timings() -> None:
+    timings: dict[str, float] = {}
+    read_port_label(cv2.imread(str(GOOD_IMAGE)), MockOCRBackend(), timings=timings)
+    assert set(timings) == {"load", "quality", "crop", "ocr", "parse"}
+    assert all(v >= 0 for v in timings.values())
@@ -0,0 +1,92 @@
+"""Content-addressed evidence spool: handles, chunked uploads and handle pass-through to CV."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from packages.core.config import get_settings
+from packages.core.fixtures.evidence import get_evidence_bytes
+from packages.core.spool import EvidenceSpool, SpoolError, parse_handle
+from packages.mcp.client import MCPToolRouter
+from services import registry as registry_mod
+from services.mcp_camera.adapter import CameraAdapter
+from services.mcp_cv.adapter import CVAdapter
+from services.mcp_netbox.adapter import NetBoxAdapter
+from services.mcp_ticketing.adapter import TicketingAdapter
+from services.registry import HandlerRegistry
+
+
+def test_put_is_content_addressed(tmp_path: Path) -> None:
+    spool = EvidenceSpool(tmp_path)
+    handle = spool.put(b"frame")
+    assert handle == "sha256:" + hashlib.sha256(b"frame").hexdigest()
+    assert spool.put(b"frame") == handle
+    source = tmp_path / "img.png"
+    source.write_bytes(b"frame")
+    assert spool.put_file(source) == handle
+    assert spool.read(handle) == b"frame"
+    assert parse_handle("sha256:xyz") is None
+    with pytest.raises(SpoolError):
+        spool.read("sha256:" + "0" * 64)
+
+
+def test_chunked_upload_checks_order_and_hash(tmp_path: Path) -> None:
+    spool = EvidenceSpool(tmp_path)
+    upload = spool.begin_upload()
+    assert spool.append_chunk(upload, 0, b"abc") == 3
+    assert spool.append_chunk(upload, 0, b"abc") == 3  # resent chunk
+    with pytest.raises(SpoolError, match="at byte 3"):
+        spool.append_chunk(upload, 5, b"x")
+    assert spool.append_chunk(upload, 3, b"def") == 6
+    with pytest.raises(SpoolError, match="expected 7"):
+        spool.commit_upload(upload, size=7)
+    handle = spool.commit_upload(upload, sha256=hashlib.sha256(b"abcdef").hexdigest(), size=6)
+    assert spool.read(handle) == b"abcdef"
+
+    bad = spool.begin_upload()
+    spool.append_chunk(bad, 0, b"abc")
+    with pytest.raises(SpoolError, match="does not match"):
+        spool.commit_upload(bad, sha256="0" * 64)
+
+
+@pytest.mark.asyncio
+async def test_router_uploads_in_chunks_and_cv_reads_handle(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LOCAL_EVIDENCE_DIR", str(tmp_path))
+    monkeypatch.setattr(registry_mod, "_registry", HandlerRegistry())
+    get_settings.cache_clear()
+    try:
+        router = MCPToolRouter.from_adapters(
+            camera_adapter=CameraAdapter(camera_mode="mock"),
+            cv_adapter=CVAdapter(cv_mode="mock", scenario="CHG-001_A"),
+            netbox_adapter=NetBoxAdapter(netbox_mode="mock"),
+            ticketing_adapter=TicketingAdapter(ticketing_mode="mock"),
+        )
+        chunks: list[int] = []
+        upload_chunk = router.camera_upload_chunk
+
+        async def counting_chunk(**kwargs: Any) -> Any:
+            chunks.append(kwargs["offset"])
+            return await upload_chunk(**kwargs)
+
+        router.camera_upload_chunk = counting_chunk
+        data = bytes(range(256)) * 2500  # 640000 bytes
+        ref = await router.upload_evidence(data, filename="frame.png", metadata={"change_id": "CHG-001"})
+        assert chunks == [0, 262144, 524288]
+        assert ref.evidence_id == "sha256:" + hashlib.sha256(data).hexdigest()
+        assert ref.metadata["size"] == len(data) and ref.metadata["change_id"] == "CHG-001"
+        assert Path(ref.uri).is_relative_to(tmp_path)
+
+        again = await router.store_evidence(handle=ref.evidence_id, metadata={"step_id": "S1"})
+        assert again.evidence_id == ref.evidence_id and again.uri == ref.uri
+
+        assert get_evidence_bytes(ref.evidence_id) == data
+        cv = registry_mod.get_registry().cv("mock")
+        assert cv._resolve_image(ref.evidence_id) == ref.uri
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,96 @@
+"""Handler registry: one warm handler per configuration, shared by adapters and reloadable."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from packages.core.fixtures import mapping_index
+from packages.cv.ocr_backends import MockOCRBackend
+from services import registry as registry_mod
+from services.mcp_cv import handlers as cv_handlers_mod
+from services.mcp_cv.adapter import CVAdapter
+from services.mcp_netbox.adapter import NetBoxAdapter
+from services.registry import HandlerRegistry, get_registry
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> HandlerRegistry:
+    fresh = HandlerRegistry()
+    monkeypatch.setattr(registry_mod, "_registry", fresh)
+    return fresh
+
+
+@pytest.mark.asyncio
+async def test_adapters_reuse_handlers_and_fixture_outputs(
+    registry: HandlerRegistry, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    loads: list[str] = []
+    real_load = cv_handlers_mod.load_cv_outputs
+
+    def counting_load(scenario: str) -> dict:
+        loads.append(scenario)
+        return real_load(scenario)
+
+    monkeypatch.setattr(cv_handlers_mod, "load_cv_outputs", counting_load)
+    adapter = CVAdapter(cv_mode="mock", scenario="CHG-001_A")
+    for _ in range(5):
+        await adapter.read_port_label("ev-001", change_id="CHG-001")
+        await adapter.read_cable_tag("ev-001", change_id="CHG-001")
+    assert registry.builds["cv"] == 1
+    assert loads == ["CHG-001_A"]
+
+    netbox = NetBoxAdapter(netbox_mode="mock")
+    await netbox.validate_observed("CHG-001", "PANEL-A", "24", "MDF-01-R12-P24")
+    await netbox.get_expected_mapping("CHG-001")
+    assert registry.builds["netbox"] == 1
+    assert get_registry() is registry
+
+
+def test_cv_handlers_are_per_mode_not_per_scenario(
+    registry: HandlerRegistry, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cv_handlers_mod, "TesseractOCRBackend", MockOCRBackend)
+    a = registry.cv("mock")
+    assert registry.cv("MOCK") is a
+    assert registry.cv("tesseract") is not a
+    assert a.read_port_label_sync("ev-001", "CHG-001", "CHG-001_B").port_label is not None
+    assert registry.builds["cv"] == 2
+
+
+def test_warm_and_cv_activities_share_the_settings_mode(
+    registry: HandlerRegistry, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from apps.worker import activities_cv
+
+    # CV_MODE only in .env: visible to settings, not to os.environ.
+    monkeypatch.delenv("CV_MODE", raising=False)
+    monkeypatch.setattr(
+        "packages.core.config.get_settings",
+        lambda: SimpleNamespace(cv_mode="tesseract", scenario="CHG-001_A"),
+    )
+    monkeypatch.setattr(cv_handlers_mod, "TesseractOCRBackend", MockOCRBackend)
+    registry.warm(["cv"])
+    warmed = registry.cv()
+    assert warmed.cv_mode == "tesseract"
+    assert activities_cv._get_cv_handlers() is warmed
+    assert registry.builds["cv"] == 1
+
+
+def test_warm_then_reload(registry: HandlerRegistry, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CV_MODE", "mock")
+    monkeypatch.setenv("SCENARIO", "CHG-001_A")
+    mapping_index.clear_mapping_indexes()
+    builds = registry.warm()
+    assert builds == {"camera": 1, "cv": 1, "netbox": 1, "ticketing": 1}
+    assert mapping_index._indexes
+
+    netbox = registry.netbox()
+    cv = registry.cv()
+    registry.reload("cv")
+    assert registry.cv() is not cv
+    assert registry.netbox() is netbox
+    registry.reload()
+    assert registry.netbox() is not netbox
+    assert not mapping_index._indexes
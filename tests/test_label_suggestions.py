@@ -0,0 +1,66 @@
+"""Nearest-label suggestions on CMDB mismatches (symmetric-delete index over known labels)."""
+
+import random
+import time
+
+import pytest
+
+from packages.agents.cmdb import cmdb_advice
+from packages.core.logic.policy import cmdb_suggestion_guidance
+from packages.core.models.steps import ApprovalGate, StepDefinition
+from services.mcp_netbox.handlers import NetboxHandlers
+from services.mcp_netbox.src.labels import DeleteIndex, LabelIndex, edit_distance
+
+
+def test_edit_distance() -> None:
+    assert edit_distance("MDF-01-R12-P24", "MDF-01-R12-P24") == 0
+    assert edit_distance("MDF-01-R12-P2A", "MDF-01-R12-P24") == 1
+    assert edit_distance("kitten", "sitting") == 3
+    assert edit_distance("kitten", "sitting", limit=1) == 2
+
+
+def test_delete_index_matches_brute_force() -> None:
+    rng = random.Random(7)
+    words = [f"MDF-{rng.randint(0, 9):02d}-R{rng.randint(1, 40)}-P{rng.randint(1, 48)}" for _ in range(2000)]
+    tree = DeleteIndex(words)
+    for query in ("MDF-03-R12-P24", "MDF-0-R1-P1", "XYZ"):
+        expected = sorted({(edit_distance(query, w), w) for w in words if edit_distance(query, w) <= 2})
+        assert tree.search(query, 2) == expected
+
+
+def test_lookup_is_sub_millisecond() -> None:
+    labels = LabelIndex()
+    for rack in range(1, 41):
+        for port in range(1, 49):
+            labels.add("PANEL-A", str(port), f"MDF-01-R{rack:02d}-P{port:02d}")
+    start = time.perf_counter()
+    for _ in range(100):
+        out = labels.nearest("cable_tag", "MDF-01-R12-P2A")
+    assert (time.perf_counter() - start) / 100 < 0.001
+    assert out[0]["candidate"] in {"MDF-01-R12-P20", "MDF-01-R12-P24"} and out[0]["distance"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_mismatch_gets_suggestions_but_stays_blocked() -> None:
+    handlers = NetboxHandlers()
+    tag = await handlers.validate_observed("CHG-001", "PANEL-A", "24", "MDF-01-R12-P2A")
+    port = await handlers.validate_observed("CHG-001", "PANEL-A", "A-2A", "MDF-01-R12-P24")
+    panel = await handlers.validate_observed("CHG-001", "PANEL-8", "24", "MDF-01-R12-P24")
+    ok = await handlers.validate_observed("CHG-001", "PANEL-A", "24", "MDF-01-R12-P24")
+    assert tag.match is False
+    assert tag.suggestions == [
+        {"field": "cable_tag", "observed": "MDF-01-R12-P2A", "candidate": "MDF-01-R12-P24", "distance": 1}
+    ]
+    assert port.suggestions[0]["candidate"] == "A-24"
+    assert panel.suggestions[0]["candidate"] == "PANEL-A"
+    assert ok.suggestions == []
+
+
+def test_escalation_and_guidance_mention_candidates() -> None:
+    step = StepDefinition(step_id="S1", description="Patch", approval=ApprovalGate(required=True))
+    suggestions = [{"field": "cable_tag", "observed": "X-2A", "candidate": "X-24", "distance": 1}]
+    out = cmdb_advice(step, {"match": False, "reason": "mismatch", "suggestions": suggestions})
+    assert out["decision"] == "block"
+    assert "'X-24' (1 edit)" in out["escalation_text"]
+    assert "Approval required" in out["escalation_text"]
+    assert "'X-2A' is 1 character(s) from 'X-24'" in cmdb_suggestion_guidance(suggestions)[0]
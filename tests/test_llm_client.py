@@ -0,0 +1,122 @@
+"""Async LLM client: loop stays responsive, concurrency cap, rate limit, backoff and stub server."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from packages.agents import llm
+from packages.agents.llm import LLMClient, TokenBucket, agenerate_tech_prompt, get_llm_client
+from packages.core.config import get_settings
+from packages.core.metrics import LatencyRecorder
+from packages.core.models.steps import StepDefinition
+from services.llm_stub.server import create_app
+
+
+def _client(transport: httpx.AsyncBaseTransport, **kwargs: Any) -> LLMClient:
+    return LLMClient("litellm", "stub-model", "key", "http://stub", transport=transport, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_slow_llm_does_not_block_the_loop_and_respects_the_cap() -> None:
+    stub = create_app(latency_ms=50)
+    recorder = LatencyRecorder()
+    client = _client(httpx.ASGITransport(app=stub), max_concurrency=2, recorder=recorder)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    tick_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    replies = await asyncio.gather(*(client.complete(f"check port {i}") for i in range(6)))
+    elapsed = time.perf_counter() - start
+    tick_task.cancel()
+
+    assert [r.text for r in replies] == [f"Stub: check port {i}" for i in range(6)]
+    assert all(not r.fallback_used and r.input_tokens == 3 for r in replies)
+    assert stub.state.peak == 2
+    assert elapsed >= 0.15  # three rounds of two
+    assert ticks >= 10
+    assert recorder.summary()["llm.litellm"]["count"] == 6
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_out_requests_after_the_burst() -> None:
+    bucket = TokenBucket(rate=50, burst=2)
+    start = time.perf_counter()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.perf_counter() - start >= 0.05  # 3 tokens beyond the burst at 50/s
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_back_off_then_fall_back() -> None:
+    statuses: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        statuses.append(429)
+        return httpx.Response(429, json={"error": "busy"})
+
+    client = _client(httpx.MockTransport(handler), backoff=0.001)
+    reply = await client.complete("hello")
+    assert reply.fallback_used and reply.text == ""
+    assert len(statuses) == 4  # one call, three retries
+
+    hard = _client(httpx.MockTransport(handler), backoff=0.001, hard_fail=True)
+    with pytest.raises(httpx.HTTPStatusError):
+        await hard.complete("hello")
+
+
+@pytest.mark.asyncio
+async def test_auth_errors_are_not_retried() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(401, json={"error": "bad key"})
+
+    reply = await _client(httpx.MockTransport(handler)).complete("hello")
+    assert reply.fallback_used
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stub_rejections_are_retried_until_answered() -> None:
+    stub = create_app(latency_ms=20, max_concurrency=1)
+    client = _client(httpx.ASGITransport(app=stub), max_concurrency=2, backoff=0.05)
+    replies = await asyncio.gather(client.complete("a"), client.complete("b"))
+    assert [r.text for r in replies] == ["Stub: a", "Stub: b"]
+    assert stub.state.requests == 3  # one 429, then a retry
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_prompt_uses_the_shared_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_PROVIDER", "litellm")
+    monkeypatch.setenv("LITELLM_BASE_URL", "http://stub")
+    monkeypatch.setenv("LITELLM_API_KEY", "key")
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.setattr(llm, "_async_clients", {})
+    get_settings.cache_clear()
+    try:
+        client = get_llm_client()
+        assert get_llm_client() is client
+        client._transport = httpx.ASGITransport(app=create_app(latency_ms=0))
+        step = StepDefinition(step_id="S1", description="Verify panel port")
+        assert await agenerate_tech_prompt(step) == (
+            "Stub: Write a short technician instruction for this MOP step. "
+            "One sentence only. Step: Verify panel port"
+        )
+        await llm.close_llm_clients()
+    finally:
+        get_settings.cache_clear()
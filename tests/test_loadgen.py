@@ -0,0 +1,59 @@
+"""Load generator building blocks: latency percentiles, scenario mix, current-step API."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from apps.loadgen.scenarios import TECHNICIAN_SCRIPTS, Upload, assign_scenarios, parse_mix
+from packages.core.metrics import LatencyRecorder, percentile
+
+
+def test_percentile_nearest_rank() -> None:
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_latency_recorder_summary_and_errors() -> None:
+    rec = LatencyRecorder()
+    for ms in (10, 20, 30, 40):
+        rec.record("api GET /x", ms / 1000)
+    with pytest.raises(ValueError), rec.timed("activity boom"):
+        raise ValueError("boom")
+    summary = rec.summary()
+    assert summary["api GET /x"]["count"] == 4
+    assert summary["api GET /x"]["p50_ms"] == 20.0
+    assert summary["api GET /x"]["max_ms"] == 40.0
+    assert summary["activity boom"]["errors"] == 1
+
+
+def test_parse_mix_and_deterministic_assignment() -> None:
+    mix = parse_mix("A=3,B=1")
+    assert mix == {"CHG-001_A": 0.75, "CHG-001_B": 0.25}
+    assert assign_scenarios(20, mix, seed=7) == assign_scenarios(20, mix, seed=7)
+    with pytest.raises(ValueError):
+        parse_mix("Z=1")
+
+
+def test_every_script_ends_with_final_step_upload() -> None:
+    for actions in TECHNICIAN_SCRIPTS.values():
+        assert actions[-1] == Upload("S3", "EVID-003")
+
+
+def test_current_step_endpoint_queries_workflow() -> None:
+    pytest.importorskip("temporalio")
+    from fastapi.testclient import TestClient
+
+    from apps.api.main import app
+
+    client = MagicMock()
+    handle = MagicMock()
+    handle.query = AsyncMock(return_value={"change_id": "CHG-1", "step_id": "S1", "status": "blocked"})
+    client.get_workflow_handle = MagicMock(return_value=handle)
+    with patch("apps.api.main.get_temporal_client", AsyncMock(return_value=client)):
+        resp = TestClient(app).get("/v1/changes/CHG-1/current-step")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "blocked"
+    client.get_workflow_handle.assert_called_with("change-CHG-1")
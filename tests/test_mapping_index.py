@@ -0,0 +1,59 @@
+"""Expected-mapping index: alternate labels, normalization, mtime invalidation."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from packages.core.fixtures import mapping_index
+from packages.core.fixtures.mapping_index import MappingIndex, get_mapping_index
+from services.mcp_netbox.adapter import NetBoxAdapter
+
+
+def test_alt_labels_and_normalized_ports() -> None:
+    index = MappingIndex.build(
+        {
+            "allowed_endpoints": [
+                {"panel_id": "PANEL-A", "port_label": "A-24", "port_label_alt": "24", "cable_tag": "T24"},
+            ]
+        }
+    )
+    assert index.allows("PANEL-A", "24", "T24")
+    assert index.allows("PANEL-A", " a-24 ", "T24")
+    assert not index.allows("PANEL-A", "24", "T23")
+    assert not index.allows("PANEL-B", "24", "T24")
+    assert index.expected_for("PANEL-A", "24")["cable_tag"] == "T24"
+    assert index.expected_for("PANEL-A", "99") == {}
+
+
+def test_default_mapping_is_expected_fallback() -> None:
+    default = {"panel_id": "PANEL-A", "port_label": "1", "cable_tag": "T1"}
+    index = MappingIndex.build({"default": default})
+    assert index.default == default
+    assert index.expected_for("PANEL-Z", "9") == default
+
+
+def test_index_cached_until_file_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "netbox_expected_mapping.json"
+    path.write_text(json.dumps({"allowed_endpoints": [{"panel_id": "P", "port_label": "1", "cable_tag": "A"}]}))
+    monkeypatch.setattr(mapping_index, "expected_mapping_path", lambda change_id: path)
+    mapping_index.clear_mapping_indexes()
+
+    first = get_mapping_index("CHG-X")
+    assert get_mapping_index("CHG-Y") is first  # same file, parsed once
+    assert first.allows("P", "1", "A")
+
+    path.write_text(json.dumps({"allowed_endpoints": [{"panel_id": "P", "port_label": "1", "cable_tag": "B"}]}))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = get_mapping_index("CHG-X")
+    assert second is not first
+    assert second.allows("P", "1", "B") and not second.allows("P", "1", "A")
+    mapping_index.clear_mapping_indexes()
+
+
+@pytest.mark.asyncio
+async def test_adapter_port_info_from_index() -> None:
+    info = await NetBoxAdapter(netbox_mode="mock").get_port_info("PANEL-A:24")
+    assert info.cable_label == "MDF-01-R12-P24"
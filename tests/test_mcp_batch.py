@@ -0,0 +1,143 @@
+"""Batched multi-tool calls: references between calls, ordering, failures and remote rounds."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from packages.cv.schema import CableTagResult, PortLabelResult
+from packages.mcp.batch import call_ids, run_batch
+from packages.mcp.client import MCPToolRouter
+from services.mcp_camera.adapter import CameraAdapter
+from services.mcp_cv.adapter import CVAdapter
+from services.mcp_netbox.adapter import NetBoxAdapter
+from services.mcp_ticketing.adapter import TicketingAdapter
+
+CONTEXT = {"evidence_id": "ev-001", "change_id": "CHG-001", "scenario": "CHG-001_A"}
+
+VERIFY = [
+    {"id": "port", "tool": "cv.read_port_label", "arguments": CONTEXT},
+    {"id": "cable", "tool": "cv.read_cable_tag", "arguments": CONTEXT},
+    {
+        "id": "check",
+        "tool": "netbox.validate_observed",
+        "arguments": {
+            "change_id": "CHG-001",
+            "panel_id": {"$ref": "port.panel_id"},
+            "port_label": {"$ref": "port.port_label"},
+            "cable_tag": {"$ref": "cable.cable_tag"},
+        },
+    },
+]
+
+
+def _router() -> MCPToolRouter:
+    return MCPToolRouter.from_adapters(
+        camera_adapter=CameraAdapter(camera_mode="mock"),
+        cv_adapter=CVAdapter(cv_mode="mock", scenario="CHG-001_A"),
+        netbox_adapter=NetBoxAdapter(netbox_mode="mock"),
+        ticketing_adapter=TicketingAdapter(ticketing_mode="mock"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_in_process_batch_resolves_references_in_order() -> None:
+    outcomes = await _router().call_batch(VERIFY)
+    assert [o["id"] for o in outcomes] == ["port", "cable", "check"]
+    assert all(o["ok"] for o in outcomes)
+    assert outcomes[2]["result"]["match"] is True
+
+
+@pytest.mark.asyncio
+async def test_read_labels_returns_models() -> None:
+    port, cable = await _router().read_labels("ev-001", change_id="CHG-001", scenario="CHG-001_A")
+    assert isinstance(port, PortLabelResult) and port.port_label == "24"
+    assert isinstance(cable, CableTagResult) and cable.cable_tag == "MDF-01-R12-P24"
+
+
+@pytest.mark.asyncio
+async def test_independent_calls_run_concurrently_and_failures_propagate() -> None:
+    active = peak = 0
+
+    async def slow(**_: object) -> dict:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"value": 1}
+
+    async def boom(**_: object) -> dict:
+        raise RuntimeError("camera offline")
+
+    calls = [
+        {"id": "a", "tool": "slow"},
+        {"id": "b", "tool": "slow"},
+        {"id": "c", "tool": "boom"},
+        {"id": "d", "tool": "slow", "arguments": {"x": {"$ref": "c.value"}}},
+        {"id": "e", "tool": "nope"},
+    ]
+    finished: list[str] = []
+
+    async def hook(outcome: dict) -> None:
+        finished.append(outcome["id"])
+
+    outcomes = await run_batch(calls, {"slow": slow, "boom": boom}, on_result=hook)
+    assert peak == 2
+    assert [o["ok"] for o in outcomes] == [True, True, False, False, False]
+    assert outcomes[2]["error"] == "RuntimeError: camera offline"
+    assert outcomes[3]["error"] == "dependency failed: c"
+    assert "unknown tool" in outcomes[4]["error"]
+    assert sorted(finished) == ["a", "b", "c", "d", "e"]
+
+
+def test_invalid_batches_are_rejected() -> None:
+    with pytest.raises(ValueError, match="unknown call"):
+        call_ids([{"id": "a", "tool": "t", "arguments": {"x": {"$ref": "b"}}}])
+    with pytest.raises(ValueError, match="cycle"):
+        call_ids(
+            [
+                {"id": "a", "tool": "t", "arguments": {"x": {"$ref": "b"}}},
+                {"id": "b", "tool": "t", "arguments": {"x": {"$ref": "a"}}},
+            ]
+        )
+    with pytest.raises(ValueError, match="duplicate"):
+        call_ids([{"id": "a", "tool": "t"}, {"id": "a", "tool": "t"}])
+
+
+class BatchServer:
+    """A remote server's "<service>.batch" tool over in-process tools, counting requests."""
+
+    def __init__(self, tools: dict) -> None:
+        self.tools = tools
+        self.requests: list[list[str]] = []
+
+    async def call(self, tool: str, arguments: dict) -> list[dict]:
+        assert tool.endswith(".batch")
+        self.requests.append([c["tool"] for c in arguments["calls"]])
+        return await run_batch(arguments["calls"], self.tools)
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_remote_batch_sends_one_request_per_server_per_round() -> None:
+    local = _router()
+    cv = BatchServer(
+        {"cv.read_port_label": local.cv_read_port_label, "cv.read_cable_tag": local.cv_read_cable_tag}
+    )
+    netbox = BatchServer({"netbox.validate_observed": local.netbox_validate_observed})
+    remote = MCPToolRouter.from_pools({"camera": cv, "cv": cv, "netbox": netbox, "ticketing": cv})
+
+    outcomes = await remote.call_batch(VERIFY)
+    assert [o["id"] for o in outcomes] == ["port", "cable", "check"]
+    assert outcomes[2]["ok"] and outcomes[2]["result"]["match"] is True
+    assert cv.requests == [["cv.read_port_label", "cv.read_cable_tag"]]
+    assert netbox.requests == [["netbox.validate_observed"]]
+
+    broken = [dict(VERIFY[0], tool="cv.missing"), *VERIFY[1:]]
+    outcomes = await remote.call_batch(broken)
+    assert outcomes[2]["error"] == "dependency failed: port"
+    assert len(netbox.requests) == 1  # nothing sent for the dependent call
@@ -0,0 +1,175 @@
+"""Router middleware: per-tool spans and metrics, cache-hit flags and the slow-call log."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from packages.core.metrics import LatencyRecorder, note_cache_lookup
+from packages.mcp.client import MCPToolRouter
+from packages.mcp.middleware import SlowCallLog, TelemetryMiddleware, unwrap_tool
+from services.mcp_camera.adapter import CameraAdapter
+from services.mcp_cv.adapter import CVAdapter
+from services.mcp_netbox.adapter import NetBoxAdapter
+from services.mcp_ticketing.adapter import TicketingAdapter
+
+Telemetry = tuple[TelemetryMiddleware, InMemorySpanExporter, InMemoryMetricReader, LatencyRecorder]
+
+
+def _router() -> MCPToolRouter:
+    return MCPToolRouter.from_adapters(
+        camera_adapter=CameraAdapter(camera_mode="mock"),
+        cv_adapter=CVAdapter(cv_mode="mock", scenario="CHG-001_A"),
+        netbox_adapter=NetBoxAdapter(netbox_mode="mock"),
+        ticketing_adapter=TicketingAdapter(ticketing_mode="mock"),
+    )
+
+
+@pytest.fixture
+def telemetry() -> Telemetry:
+    spans = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(spans))
+    reader = InMemoryMetricReader()
+    meter = MeterProvider(metric_readers=[reader]).get_meter("test")
+    recorder = LatencyRecorder()
+    middleware = TelemetryMiddleware(
+        tracer=tracer_provider.get_tracer("test"), meter=meter, recorder=recorder
+    )
+    return middleware, spans, reader, recorder
+
+
+def _attributes(span: ReadableSpan) -> dict[str, Any]:
+    return dict(span.attributes or {})
+
+
+def _points(reader: InMemoryMetricReader) -> dict[str, list]:
+    data = reader.get_metrics_data()
+    assert data is not None
+    return {
+        metric.name: list(metric.data.data_points)
+        for resource in data.resource_metrics
+        for scope in resource.scope_metrics
+        for metric in scope.metrics
+    }
+
+
+@pytest.mark.asyncio
+async def test_spans_and_metrics_per_tool(telemetry: Telemetry) -> None:
+    middleware, spans, reader, recorder = telemetry
+    router = _router().use(middleware)
+    result = await router.validate_observed("CHG-001", "PANEL-A", "24", "MDF-01-R12-P24")
+    assert result.match is True
+
+    (span,) = spans.get_finished_spans()
+    assert span.name == "mcp.tool netbox.validate_observed"
+    attributes = _attributes(span)
+    assert attributes["mcp.request.bytes"] > 0
+    assert attributes["mcp.response.bytes"] > 0
+    points = _points(reader)
+    (duration,) = points["mcp.tool.duration"]
+    assert duration.attributes == {"mcp.tool": "netbox.validate_observed", "outcome": "ok"}
+    assert duration.count == 1
+    assert "mcp.tool.errors" not in points
+    assert recorder.summary()["netbox.validate_observed"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_recorded_by_class(telemetry: Telemetry) -> None:
+    middleware, spans, reader, recorder = telemetry
+
+    async def offline(**_: object) -> dict:
+        raise ConnectionError("camera offline")
+
+    router = _router()
+    router.camera_capture_frame = offline
+    router.use(middleware)
+    with pytest.raises(ConnectionError):
+        await router.capture_frame("cam-1")
+
+    (span,) = spans.get_finished_spans()
+    attributes = _attributes(span)
+    assert attributes["error.type"] == "ConnectionError"
+    assert "mcp.response.bytes" not in attributes
+    (errors,) = _points(reader)["mcp.tool.errors"]
+    assert errors.value == 1
+    assert errors.attributes == {"mcp.tool": "camera.capture_frame", "error.type": "ConnectionError"}
+    assert recorder.summary()["camera.capture_frame"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_lookups_reach_the_span(telemetry: Telemetry) -> None:
+    middleware, spans, reader, _ = telemetry
+
+    async def mapping(**_: object) -> dict:
+        note_cache_lookup("cmdb", True)
+        await asyncio.to_thread(note_cache_lookup, "cmdb", True)
+        return {"panel_id": "PANEL-A"}
+
+    async def validate(**_: object) -> dict:
+        note_cache_lookup("cmdb", True)
+        note_cache_lookup("cable_path", False)
+        return {"match": True}
+
+    router = _router()
+    router.netbox_get_expected_mapping = mapping
+    router.netbox_validate_observed = validate
+    router.use(middleware)
+    await router.get_expected_mapping("CHG-001")
+    await router.netbox_validate_observed(change_id="CHG-001")
+
+    hit, miss = spans.get_finished_spans()
+    assert _attributes(hit)["mcp.cache_hit"] is True
+    assert _attributes(hit)["mcp.cache.cmdb.hits"] == 2
+    assert _attributes(miss)["mcp.cache_hit"] is False
+    assert _attributes(miss)["mcp.cache.cable_path.misses"] == 1
+    lookups = {
+        (p.attributes["mcp.tool"], p.attributes["cache"], p.attributes["hit"]): p.value
+        for p in _points(reader)["mcp.tool.cache.lookups"]
+    }
+    assert lookups[("netbox.get_expected_mapping", "cmdb", True)] == 2
+    assert lookups[("netbox.validate_observed", "cable_path", False)] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_calls_are_measured_per_tool_and_use_does_not_double_wrap(
+    telemetry: Telemetry,
+) -> None:
+    middleware, spans, _, _ = telemetry
+    router = _router().use(middleware)
+    router.use()
+    assert unwrap_tool(router.cv_read_port_label) is not router.cv_read_port_label
+    await router.read_labels("ev-001", change_id="CHG-001", scenario="CHG-001_A")
+    names = sorted(span.name for span in spans.get_finished_spans())
+    assert names == ["mcp.tool cv.read_cable_tag", "mcp.tool cv.read_port_label"]
+
+
+@pytest.mark.asyncio
+async def test_slow_call_log_is_sampled_and_truncates_arguments(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    async def slow(**_: object) -> dict:
+        await asyncio.sleep(0.02)
+        return {}
+
+    draws = iter([0.1, 0.9])
+    router = _router()
+    router.camera_store_evidence = slow
+    router.use(SlowCallLog(threshold_ms=10, sample_rate=0.5, max_argument_chars=40, rng=lambda: next(draws)))
+    with caplog.at_level(logging.WARNING, logger="packages.mcp.middleware"):
+        await router.store_evidence(data_b64="A" * 1000)
+        await router.store_evidence(data_b64="B" * 1000)
+        await router.get_expected_mapping("CHG-001")  # fast: not logged
+
+    (record,) = caplog.records
+    message = record.getMessage()
+    assert message.startswith("slow tool call camera.store_evidence:")
+    assert "AAAA" in message and "chars)" in message and "BBBB" not in message
@@ -0,0 +1,276 @@
+"""Remote MCP transport: pooled sessions, multiplexing, reconnects and result decoding."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from types import SimpleNamespace
+from typing import Any
+
+import anyio
+import pytest
+
+from packages.core.config import get_settings
+from packages.core.metrics import LatencyRecorder
+from packages.core.models.legacy import ValidationResult
+from packages.cv.schema import PortLabelResult
+from packages.mcp.client import MCPToolRouter
+from packages.mcp.remote import Connector, MCPSessionPool, MCPToolError
+
+TOOLS = {
+    "cv.read_port_label": {"evidence_id"},
+    "ticketing.post_step_result": set(),
+    "netbox.validate_observed_batch": {"change_id", "observations"},
+    "slow": set(),
+    "fails": set(),
+}
+
+
+LABEL = {
+    "port_label": "24",
+    "confidence": 0.9,
+    "raw_text": "24",
+    "quality": {"blur_score": 200.0, "brightness": 120.0, "glare_score": 0.0, "too_dark": False, "too_blurry": False},
+}
+
+
+class FakeServer:
+    """Stands in for a ClientSession factory; counts sessions and concurrent calls."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.sessions = 0
+        self.active = 0
+        self.peak = 0
+        self.calls: list[tuple[str, dict]] = []
+        self.break_next = False
+        self.refuse_connects = 0
+
+    def connect(self) -> AbstractAsyncContextManager[tuple]:
+        @asynccontextmanager
+        async def streams() -> AsyncIterator[tuple]:
+            if self.refuse_connects:
+                self.refuse_connects -= 1
+                raise ConnectionRefusedError("server restarting")
+            yield (None, None)
+
+        return streams()
+
+    def session(self, read: Any, write: Any) -> Session:
+        return Session(self)
+
+    def pool(
+        self, name: str = "cv", size: int = 2, recorder: LatencyRecorder | None = None
+    ) -> MCPSessionPool:
+        return MCPSessionPool(
+            name, self.connect, size=size, recorder=recorder or LatencyRecorder(), session_factory=self.session
+        )
+
+
+class Session:
+    """A ClientSession on a FakeServer."""
+
+    def __init__(self, server: FakeServer) -> None:
+        self.server = server
+
+    async def __aenter__(self) -> Session:
+        return self
+
+    async def __aexit__(self, *exc: object) -> bool:
+        return False
+
+    async def initialize(self) -> None:
+        self.server.sessions += 1
+
+    async def list_tools(self) -> SimpleNamespace:
+        tools = [
+            SimpleNamespace(name=name, inputSchema={"properties": dict.fromkeys(args, {})})
+            for name, args in TOOLS.items()
+        ]
+        return SimpleNamespace(tools=tools)
+
+    async def call_tool(self, name: str, arguments: dict) -> SimpleNamespace:
+        server = self.server
+        if server.break_next:
+            server.break_next = False
+            raise anyio.ClosedResourceError()
+        server.calls.append((name, arguments))
+        server.active += 1
+        server.peak = max(server.peak, server.active)
+        try:
+            await asyncio.sleep(server.delay)
+        finally:
+            server.active -= 1
+        if name == "fails":
+            return _result("boom", error=True)
+        if name == "netbox.validate_observed_batch":
+            return _result(
+                *[
+                    json.dumps({"match": True, "reason": o["port_label"], "confidence": 1.0})
+                    for o in arguments["observations"]
+                ]
+            )
+        return _result(json.dumps(LABEL))
+
+
+def _result(*texts: str, error: bool = False) -> SimpleNamespace:
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=t) for t in texts], isError=error)
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_and_latency_recorded() -> None:
+    server, recorder = FakeServer(), LatencyRecorder()
+    pool = server.pool(recorder=recorder)
+    for _ in range(20):
+        await pool.call("cv.read_port_label", {"evidence_id": "ev-1"})
+    assert server.sessions == 1
+    assert recorder.summary()["cv.read_port_label"]["count"] == 20
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_multiplexed_over_bounded_sessions() -> None:
+    server = FakeServer(delay=0.02)
+    pool = server.pool(size=2)
+    await asyncio.gather(*(pool.call("slow", {}) for _ in range(10)))
+    assert server.sessions == 2
+    assert server.peak == 10
+    assert pool.stats() == {"sessions": 2, "in_flight": 0, "connects": 2}
+    await pool.aclose()
+    assert pool.stats()["sessions"] == 0
+
+
+@pytest.mark.asyncio
+async def test_dead_session_reconnects_and_retries_once() -> None:
+    server = FakeServer()
+    pool = server.pool(size=1)
+    await pool.call("cv.read_port_label", {})
+    server.break_next = True
+    await pool.call("cv.read_port_label", {})
+    assert server.sessions == 2
+    assert len(server.calls) == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_writes_are_retried_only_if_never_sent() -> None:
+    server = FakeServer()
+    pool = server.pool(size=1)
+    server.refuse_connects = 1
+    await pool.call("ticketing.post_step_result", {})
+    assert len(server.calls) == 1
+
+    server.break_next = True
+    with pytest.raises(anyio.ClosedResourceError):
+        await pool.call("ticketing.post_step_result", {})
+    assert len(server.calls) == 1  # may have reached the server: not repeated
+    await pool.call("ticketing.post_step_result", {})
+    assert server.sessions == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_tool_error_is_not_retried() -> None:
+    server, recorder = FakeServer(), LatencyRecorder()
+    pool = server.pool(recorder=recorder)
+    with pytest.raises(MCPToolError, match="boom"):
+        await pool.call("fails", {})
+    assert server.sessions == 1 and len(server.calls) == 1
+    assert recorder.summary()["fails"]["errors"] == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_router_over_pools_decodes_models_and_drops_undeclared_args() -> None:
+    server = FakeServer()
+    pool = server.pool()
+    router = MCPToolRouter.from_pools({"camera": pool, "cv": pool, "netbox": pool, "ticketing": pool})
+    label = await router.read_port_label("ev-1", change_id="CHG-001", scenario="CHG-001_A")
+    assert isinstance(label, PortLabelResult) and label.port_label == "24"
+    assert server.calls[-1] == ("cv.read_port_label", {"evidence_id": "ev-1"})
+
+    observations = [{"panel_id": "PANEL-A", "port_label": p, "cable_tag": "T"} for p in ("24", "25")]
+    results = await router.validate_observed_batch("CHG-001", observations)
+    assert [r.reason for r in results] == ["24", "25"]
+    single = await router.validate_observed_batch("CHG-001", observations[:1])
+    assert isinstance(single[0], ValidationResult)
+    await router.aclose()
+
+
+def test_from_settings_builds_lazy_remote_router(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("INFRA_MCP_TRANSPORT", "http")
+    monkeypatch.setenv("MCP_POOL_SIZE", "4")
+    get_settings.cache_clear()
+    try:
+        router = MCPToolRouter.from_settings()
+        assert set(router.pools) == {"camera", "cv", "netbox", "ticketing"}
+        assert router.pools["cv"].stats() == {"sessions": 0, "in_flight": 0, "connects": 0}
+        monkeypatch.setenv("INFRA_MCP_TRANSPORT", "carrier-pigeon")
+        get_settings.cache_clear()
+        with pytest.raises(ValueError, match="carrier-pigeon"):
+            MCPToolRouter.from_settings()
+    finally:
+        get_settings.cache_clear()
+
+
+def _in_memory(server: Any) -> Connector:
+    """Connector to a FastMCP server running in this process over memory streams."""
+    from mcp.shared.memory import create_client_server_memory_streams
+
+    low = server._mcp_server
+
+    @asynccontextmanager
+    async def connect() -> AsyncIterator[tuple]:
+        async with (
+            create_client_server_memory_streams() as (client_streams, server_streams),
+            anyio.create_task_group() as tg,
+        ):
+            tg.start_soon(lambda: low.run(*server_streams, low.create_initialization_options()))
+            try:
+                yield client_streams
+            finally:
+                tg.cancel_scope.cancel()
+
+    return connect
+
+
+def _netbox_router() -> MCPToolRouter:
+    pytest.importorskip("mcp.server.fastmcp")
+    from services.mcp_netbox.server import build_server
+
+    pool = MCPSessionPool("netbox", _in_memory(build_server()), size=1, recorder=LatencyRecorder())
+    return MCPToolRouter.from_pools({"camera": pool, "cv": pool, "netbox": pool, "ticketing": pool})
+
+
+@pytest.mark.asyncio
+async def test_remote_router_gets_the_expected_mapping() -> None:
+    router = _netbox_router()
+    mapping = await router.get_expected_mapping("CHG-001")
+    assert mapping["allowed_endpoints"][0]["panel_id"] == "PANEL-A"
+    await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_remote_netbox_batch_includes_the_expected_mapping() -> None:
+    router = _netbox_router()
+    outcomes = await router.call_batch(
+        [
+            {"id": "mapping", "tool": "netbox.get_expected_mapping", "arguments": {"change_id": "CHG-001"}},
+            {
+                "id": "check",
+                "tool": "netbox.validate_observed",
+                "arguments": {
+                    "change_id": "CHG-001",
+                    "panel_id": "PANEL-A",
+                    "port_label": "24",
+                    "cable_tag": "MDF-01-R12-P24",
+                },
+            },
+        ]
+    )
+    assert [o["ok"] for o in outcomes] == [True, True], outcomes
+    assert outcomes[0]["result"]["allowed_endpoints"][0]["port_label"] == "24"
+    assert outcomes[1]["result"]["match"] is True
+    await router.aclose()
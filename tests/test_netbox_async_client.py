@@ -0,0 +1,220 @@
+"""AsyncNetBoxClient against a mock NetBox (httpx.MockTransport)."""
+
+import json
+import re
+
+import httpx
+import pytest
+
+from packages.core.metrics import LatencyRecorder
+from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient
+
+
+def _netbox(routes: dict, calls: list[httpx.Request], fail_first: int = 0) -> httpx.MockTransport:
+    state = {"failures": fail_first}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if state["failures"]:
+            state["failures"] -= 1
+            return httpx.Response(503)
+        path = request.url.path.removeprefix("/api/")
+        if path == "dcim/front-ports/":
+            names = request.url.params.get_list("name")
+            ports = [p for p in routes.get("ports", []) if p["name"] in names]
+            return httpx.Response(200, json={"results": ports})
+        if path == "dcim/devices/":
+            devices = routes.get("devices", {})
+            name = request.url.params["name"]
+            return httpx.Response(200, json={"results": [devices[name]] if name in devices else []})
+        if path.startswith("dcim/cables/"):
+            cable_id = int(path.rstrip("/").rsplit("/", 1)[1])
+            return httpx.Response(200, json=routes["cables"][cable_id])
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def _client(
+    transport: httpx.MockTransport, recorder: LatencyRecorder | None = None
+) -> AsyncNetBoxClient:
+    return AsyncNetBoxClient(
+        "http://netbox", "tok", backoff=0.0, transport=transport, recorder=recorder or LatencyRecorder()
+    )
+
+
+@pytest.mark.asyncio
+async def test_match_with_nested_cable_is_one_request() -> None:
+    calls: list[httpx.Request] = []
+    routes = {"ports": [{"name": "P24", "cable": {"id": 7, "label": "MDF-01-R12-P24"}}]}
+    client = _client(_netbox(routes, calls))
+    result = await client.validate_observed("CHG-001", "PANEL-A", "24", "MDF-01-R12-P24")
+    await client.aclose()
+    assert result.match is True
+    assert len(calls) == 1
+    assert calls[0].url.params.get_list("name") == ["24", "P24", "p24"]
+    assert calls[0].headers["Authorization"] == "Token tok"
+
+
+@pytest.mark.asyncio
+async def test_exact_name_preferred_and_cable_fetched_by_id() -> None:
+    calls: list[httpx.Request] = []
+    routes = {
+        "ports": [{"name": "p24", "cable": 1}, {"name": "24", "cable": 2}],
+        "cables": {1: {"id": 1, "label": "WRONG"}, 2: {"id": 2, "label": "MDF-01-R12-P24"}},
+    }
+    client = _client(_netbox(routes, calls))
+    result = await client.validate_observed("CHG-001", "PANEL-A", "24", "OTHER")
+    await client.aclose()
+    assert result.match is False
+    assert "MDF-01-R12-P24" in result.reason
+    assert [c.url.path for c in calls] == ["/api/dcim/front-ports/", "/api/dcim/cables/2/"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_device_and_port_reasons() -> None:
+    calls: list[httpx.Request] = []
+    client = _client(_netbox({"devices": {"PANEL-A": {"id": 3}}}, calls))
+    missing_device = await client.validate_observed("CHG-001", "PANEL-Z", "24", "T")
+    missing_port = await client.validate_observed("CHG-001", "PANEL-A", "24", "T")
+    await client.aclose()
+    assert "Device 'PANEL-Z' not found" in missing_device.reason
+    assert "Port '24' on PANEL-A" in missing_port.reason
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_status_and_records_latency() -> None:
+    calls: list[httpx.Request] = []
+    recorder = LatencyRecorder()
+    routes = {"ports": [{"name": "24", "cable": {"id": 7, "label": "T"}}]}
+    client = _client(_netbox(routes, calls, fail_first=2), recorder)
+    result = await client.validate_observed("CHG-001", "PANEL-A", "24", "T")
+    await client.aclose()
+    assert result.match is True
+    assert len(calls) == 3
+    stats = recorder.summary()["GET dcim/front-ports"]
+    assert stats["count"] == 3
+    assert stats["errors"] == 2
+
+
+def _graphql_netbox(
+    calls: list[httpx.Request], errors: bool = False, failures: list[httpx.Response] | None = None
+) -> httpx.MockTransport:
+    ports = {
+        "PANEL-A": [
+            {"name": "P24", "cable": {"id": "7", "label": "MDF-01-R12-P24"}},
+            {"name": "23", "cable": None},
+        ]
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.url.path == "/graphql/":
+            if errors:
+                return httpx.Response(200, json={"errors": [{"message": "Unknown argument 'filters'"}]})
+            if failures:
+                return failures.pop(0)
+            body = json.loads(request.content)
+            variables = body["variables"]
+            data = {
+                alias: [{"id": "1"}] if value in ports else []
+                for alias, value in variables.items()
+                if alias.startswith("d")
+            }
+            for alias, device_var, names_var in re.findall(
+                r"(p\d+): front_port_list\(filters: \{device: \{name: \{exact: \$(d\d+)\}\}, "
+                r"name: \{in_list: \$(n\d+)\}",
+                body["query"],
+            ):
+                panel_ports = ports.get(variables[device_var], [])
+                data[alias] = [p for p in panel_ports if p["name"] in variables[names_var]]
+            return httpx.Response(200, json={"data": data})
+        if request.url.path == "/api/dcim/front-ports/":
+            names = request.url.params.get_list("name")
+            found = [p for p in ports.get(request.url.params["device"], []) if p["name"] in names]
+            return httpx.Response(200, json={"results": found})
+        return httpx.Response(200, json={"results": []})
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_graphql_resolves_many_ports_in_one_request() -> None:
+    calls: list[httpx.Request] = []
+    client = AsyncNetBoxClient(
+        "http://netbox", transport=_graphql_netbox(calls), recorder=LatencyRecorder(), lookup="graphql"
+    )
+    out = await client.lookup_many([("PANEL-A", "24"), ("PANEL-A", "23"), ("PANEL-Z", "1")])
+    await client.aclose()
+    assert len(calls) == 1
+    assert out[("PANEL-A", "24")] == (True, {"id": 7, "label": "MDF-01-R12-P24"})
+    assert out[("PANEL-A", "23")] == (True, None)
+    assert out[("PANEL-Z", "1")] == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_graphql_schema_error_falls_back_to_rest() -> None:
+    calls: list[httpx.Request] = []
+    client = AsyncNetBoxClient(
+        "http://netbox",
+        transport=_graphql_netbox(calls, errors=True),
+        recorder=LatencyRecorder(),
+        lookup="graphql",
+    )
+    first = await client.validate_observed("CHG-001", "PANEL-A", "24", "MDF-01-R12-P24")
+    calls.clear()
+    second = await client.validate_observed("CHG-001", "PANEL-A", "24", "MDF-01-R12-P24")
+    await client.aclose()
+    assert first.match is True and second.match is True
+    assert [c.url.path for c in calls] == ["/api/dcim/front-ports/"]  # GraphQL not retried
+
+
+@pytest.mark.asyncio
+async def test_transient_graphql_failures_fall_back_for_one_call_only() -> None:
+    calls: list[httpx.Request] = []
+    failures = [
+        httpx.Response(200, text="<html>upstream timeout</html>"),
+        httpx.Response(
+            200,
+            json={"data": {"p0": None}, "errors": [{"message": "timeout", "path": ["p0"]}]},
+        ),
+    ]
+    client = AsyncNetBoxClient(
+        "http://netbox",
+        transport=_graphql_netbox(calls, failures=failures),
+        recorder=LatencyRecorder(),
+        lookup="graphql",
+    )
+    for _ in range(2):
+        calls.clear()
+        found, cable = (await client.lookup_many([("PANEL-A", "24")]))[("PANEL-A", "24")]
+        assert found and cable is not None and cable["label"] == "MDF-01-R12-P24"
+        assert [c.url.path for c in calls] == ["/graphql/", "/api/dcim/front-ports/"]
+    calls.clear()
+    await client.lookup_many([("PANEL-A", "23")])
+    await client.aclose()
+    assert [c.url.path for c in calls] == ["/graphql/"]  # still on GraphQL
+
+
+def test_client_from_a_finished_loop_is_closed_when_replaced(
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import asyncio
+
+    from services.mcp_netbox.src import netbox_client as nb
+
+    monkeypatch.setattr(nb, "_async_clients", {})
+
+    async def shared() -> AsyncNetBoxClient:
+        return nb.get_async_netbox_client("http://netbox", "tok")
+
+    async def replace() -> tuple[AsyncNetBoxClient, AsyncNetBoxClient]:
+        client = nb.get_async_netbox_client("http://netbox", "tok")
+        await asyncio.gather(*nb._closing)
+        return client, nb.get_async_netbox_client("http://netbox", "tok")
+
+    old = asyncio.run(shared())
+    new, again = asyncio.run(replace())
+    assert new is not old and again is new
+    assert old._client.is_closed and not new._client.is_closed
+    asyncio.run(nb.close_async_netbox_clients())
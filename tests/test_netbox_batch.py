@@ -0,0 +1,130 @@
+"""Batch validation: one NetBox query per panel, per-item results in input order."""
+
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import pytest
+
+from packages.core.config import get_settings
+from packages.core.metrics import LatencyRecorder
+from packages.core.models.legacy import ValidationResult
+from packages.mcp.client import MCPToolRouter
+from services.mcp_netbox import handlers as handlers_mod
+from services.mcp_netbox.handlers import NetboxHandlers
+from services.mcp_netbox.src.netbox_client import AsyncNetBoxClient
+
+# Fully patched 48-port panel: port n carries cable MDF-01-R12-P{n}.
+PANEL_PORTS = {
+    "PANEL-A": [
+        {"name": f"P{n}", "cable": {"id": n, "label": f"MDF-01-R12-P{n}"}} for n in range(1, 49)
+    ],
+    "PANEL-B": [{"name": "1", "cable": None}],
+}
+
+
+def _transport(calls: list[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        path = request.url.path.removeprefix("/api/")
+        params = request.url.params
+        if path == "dcim/front-ports/":
+            names = params.get_list("name")
+            ports = [p for p in PANEL_PORTS.get(params["device"], []) if p["name"] in names]
+            return httpx.Response(200, json={"results": ports, "next": None})
+        if path == "dcim/devices/":
+            found = params["name"] in PANEL_PORTS
+            return httpx.Response(200, json={"results": [{"id": 1}] if found else []})
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def netbox_mode(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[httpx.Request]]:
+    calls: list[httpx.Request] = []
+    client = AsyncNetBoxClient("http://nb", transport=_transport(calls), recorder=LatencyRecorder())
+    monkeypatch.setenv("NETBOX_MODE", "netbox")
+    get_settings.cache_clear()
+    monkeypatch.setattr(handlers_mod, "get_async_netbox_client", lambda url, token: client)
+    yield calls
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_full_panel_is_one_request(netbox_mode: list[httpx.Request]) -> None:
+    observations = [
+        {"panel_id": "PANEL-A", "port_label": str(n), "cable_tag": f"MDF-01-R12-P{n}"}
+        for n in range(1, 49)
+    ]
+    observations[5]["cable_tag"] = "WRONG"
+    results = await NetboxHandlers().validate_observed_batch("CHG-001", observations)
+    assert len(netbox_mode) == 1
+    assert [r.match for r in results] == [i != 5 for i in range(48)]
+    assert "MDF-01-R12-P6" in results[5].reason
+
+
+@pytest.mark.asyncio
+async def test_device_resolved_once_per_panel(netbox_mode: list[httpx.Request]) -> None:
+    observations = [
+        {"panel_id": "PANEL-Z", "port_label": "1", "cable_tag": "T"},
+        {"panel_id": "PANEL-B", "port_label": "1", "cable_tag": "T"},
+        {"panel_id": "PANEL-Z", "port_label": "2", "cable_tag": "T"},
+        {"panel_id": "PANEL-B", "port_label": "2", "cable_tag": "T"},
+    ]
+    results = await NetboxHandlers().validate_observed_batch("CHG-001", observations)
+    paths = sorted(c.url.path for c in netbox_mode)
+    # Front ports per panel; only PANEL-Z (no port matched) needs a device check.
+    assert paths == ["/api/dcim/devices/", "/api/dcim/front-ports/", "/api/dcim/front-ports/"]
+    assert "Device 'PANEL-Z' not found" in results[0].reason
+    assert "Device 'PANEL-Z' not found" in results[2].reason
+    assert "Port '1' on PANEL-B" in results[1].reason
+    assert "Port '2' on PANEL-B" in results[3].reason
+
+
+@pytest.mark.asyncio
+async def test_mock_mode_batch_matches_single_calls() -> None:
+    handlers = NetboxHandlers()
+    observations = [
+        {"panel_id": "PANEL-A", "port_label": "24", "cable_tag": "MDF-01-R12-P24"},
+        {"panel_id": "PANEL-A", "port_label": "99", "cable_tag": "MDF-01-R12-P24"},
+    ]
+    batch = await handlers.validate_observed_batch("CHG-001", observations)
+    singles = [await handlers.validate_observed("CHG-001", **o) for o in observations]
+    assert batch == singles
+    assert [r.match for r in batch] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_router_without_batch_tool_fans_out() -> None:
+    seen: list[str] = []
+
+    async def validate(
+        change_id: str, panel_id: str, port_label: str, cable_tag: str
+    ) -> ValidationResult:
+        seen.append(port_label)
+        return ValidationResult(match=port_label == "24", reason="", confidence=0.9)
+
+    async def unused(**kwargs: Any) -> Any:
+        raise AssertionError("not called")
+
+    router = MCPToolRouter(
+        camera_capture_frame=unused,
+        camera_store_evidence=unused,
+        cv_read_port_label=unused,
+        cv_read_cable_tag=unused,
+        netbox_get_expected_mapping=unused,
+        netbox_validate_observed=validate,
+        ticketing_get_change=unused,
+        ticketing_post_step_result=unused,
+        ticketing_request_approval=unused,
+    )
+    results = await router.validate_observed_batch(
+        "CHG-001",
+        [
+            {"panel_id": "PANEL-A", "port_label": "24", "cable_tag": "T"},
+            {"panel_id": "PANEL-A", "port_label": "23", "cable_tag": "T"},
+        ],
+    )
+    assert [r.match for r in results] == [True, False]
+    assert sorted(seen) == ["23", "24"]
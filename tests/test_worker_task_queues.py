@@ -0,0 +1,47 @@
+"""CV task queue split: sync CV activities and worker wiring."""
+
+import inspect
+import os
+from collections.abc import Iterator
+
+import pytest
+
+pytest.importorskip("temporalio")
+from temporalio.testing import ActivityEnvironment
+
+from apps.worker.activities_cv import activity_cv_extract, activity_quality_gate
+from apps.worker.main import CV_ACTIVITIES, IO_ACTIVITIES, cv_process_count
+from packages.core.config import Settings
+
+
+@pytest.fixture(autouse=True)
+def set_scenario_a() -> Iterator[None]:
+    os.environ["SCENARIO"] = "CHG-001_A"
+    yield
+    os.environ.pop("SCENARIO", None)
+
+
+def test_cv_activities_are_sync_and_not_on_io_queue() -> None:
+    for fn in CV_ACTIVITIES:
+        assert not inspect.iscoroutinefunction(fn)
+        assert fn not in IO_ACTIVITIES
+
+
+def test_cv_process_count_defaults_to_cores() -> None:
+    assert cv_process_count(Settings(WORKER_CV_PROCESSES=3)) == 3
+    assert cv_process_count(Settings(WORKER_CV_PROCESSES=0)) == (os.cpu_count() or 1)
+
+
+def test_activity_cv_extract_runs_sync() -> None:
+    env = ActivityEnvironment()
+    port, tag = env.run(activity_cv_extract, "CHG-001", "S1", "EVID-001", "CHG-001_A")
+    assert port["port_label"] == "24"
+    assert tag["cable_tag"] == "MDF-01-R12-P24"
+
+
+def test_activity_quality_gate_runs_sync_on_blurry_image() -> None:
+    env = ActivityEnvironment()
+    out = env.run(activity_quality_gate, "CHG-001", "S1", "EVID-002-BADQUALITY")
+    assert out["pass"] is False
+    assert out["tool_call"]["decision"] == "needs_retake"
+    assert out["guidance"]
@@ -2,6 +2,7 @@
 
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -11,12 +12,13 @@ from temporalio.client import Client
 from temporalio.testing import WorkflowEnvironment
 from temporalio.worker import Worker
 
+from apps.worker.activities_cv import activity_cv_extract, activity_quality_gate
 from apps.worker.activities_execution import (
+    activity_cmdb_prefetch,
     activity_cmdb_validate,
-    activity_cv_extract,
+    activity_get_mop_prompts,
     activity_load_change,
     activity_persist_step_and_proofpack,
-    activity_quality_gate,
     activity_set_scenario,
 )
 from apps.worker.workflows.change_execution_workflow import ChangeExecutionWorkflow, WorkflowInput
@@ -59,9 +61,12 @@ async def test_quality_gate_blocks_bad_then_passes(ensure_sample_images) -> None
                 activity_set_scenario,
                 activity_quality_gate,
                 activity_cv_extract,
+                activity_cmdb_prefetch,
                 activity_cmdb_validate,
+                activity_get_mop_prompts,
                 activity_persist_step_and_proofpack,
             ],
+            activity_executor=ThreadPoolExecutor(max_workers=4),
         ):
             handle = await client.start_workflow(
                 ChangeExecutionWorkflow.run,